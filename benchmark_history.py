@@ -0,0 +1,116 @@
+"""
+Benchmark history for server.py: runs POSTed by benchmark.html are appended to a JSON
+file so results can be compared across versions.
+
+    benchmarks/cups/         synthetic liners + manifest.json (python -m wear_batch.synthetic)
+    benchmarks/history.json  {"runs": [...]}, oldest first; 404 as a static file (it and its
+                             staging copy are only read through GET /api/benchmarks)
+
+HTTP API (see BenchmarkMixin):
+    GET  /api/benchmarks     the history
+    POST /api/benchmarks     one run {"label", "systemVersion", "environment", "results": [...]}
+                             -> 201 {"id", "revision"}; the server stamps id, time and git revision
+"""
+import json
+import os
+import secrets
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+MAX_RUN_BYTES = 4 * 1024 * 1024
+
+
+def current_revision(root):
+    """Short git commit of the served tree, or None outside a checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class BenchmarkHistory:
+    """Append-only run log; every write replaces the file atomically."""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.revision = current_revision(self.path.parent)
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {'runs': []}
+
+    def append(self, run):
+        if not isinstance(run, dict) or not isinstance(run.get('results'), list):
+            raise ValueError('expected {"results": [...]}')
+        run = {
+            **run,
+            'id': secrets.token_hex(6),
+            'receivedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'revision': self.revision,
+        }
+        with self.lock:
+            history = self.load()
+            history['runs'].append(run)
+            staging = self.path.with_suffix('.tmp')
+            staging.write_text(json.dumps(history, indent=2), encoding='utf-8')
+            os.replace(staging, self.path)
+        return run
+
+
+class BenchmarkMixin:
+    """
+    /api/benchmarks for a handler that also mixes in CaseStorageMixin (for send_json and
+    the do_POST fallthrough). List it first so its do_POST runs before the case routes.
+    """
+
+    benchmark_history = None  # BenchmarkHistory, set by run_server
+
+    def handle_benchmark_request(self, head_only=False):
+        if self.is_history_path():
+            self.send_json(404, {'error': 'not found'}, head_only=head_only)
+            return True
+        if self.path.split('?', 1)[0] != '/api/benchmarks':
+            return False
+        if self.benchmark_history is None:
+            self.send_json(503, {'error': 'benchmark history disabled'}, head_only=head_only)
+        else:
+            self.send_json(200, self.benchmark_history.load(), head_only=head_only)
+        return True
+
+    def is_history_path(self):
+        """True when the request maps to the history file or its staging copy (cups stay public)."""
+        if self.benchmark_history is None:
+            return False
+        history = self.benchmark_history.path
+        return Path(self.translate_path(self.path)).resolve() in (history, history.with_suffix('.tmp'))
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != '/api/benchmarks':
+            super().do_POST()
+            return
+        if self.benchmark_history is None:
+            self.send_json(503, {'error': 'benchmark history disabled'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:  # Malformed header: rejected below like a missing body
+            length = 0
+        if length <= 0 or length > MAX_RUN_BYTES:
+            self.close_connection = True
+            self.send_json(400, {'error': f'expected a JSON body up to {MAX_RUN_BYTES} bytes'})
+            return
+        try:
+            run = self.benchmark_history.append(json.loads(self.rfile.read(length)))
+        except ValueError as error:
+            self.send_json(400, {'error': str(error)})
+            return
+        print(f"[BENCH] Stored run {run['id']} ({len(run['results'])} files, revision {run['revision']})")
+        self.send_json(201, {'id': run['id'], 'revision': run['revision']})
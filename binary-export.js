@@ -0,0 +1,217 @@
+/**
+ * Binary Export
+ * Typed-array exports assembled as Blob parts, never as one big string.
+ *
+ * - stl():    binary STL (50 bytes per triangle instead of ~250 in ASCII)
+ * - glb():    glTF 2.0 binary container; the typed arrays are the BIN chunk parts as they are
+ * - base64(): base64 as ASCII bytes (Uint8Array), to embed binary data in text files
+ *             (the standalone HTML viewer) without building JS strings
+ *
+ * Vertex colours are quantized to normalized Uint8 (4x smaller than Float32, same 8-bit
+ * precision the screen shows).
+ */
+
+class BinaryExport {
+    static BASE64_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/';
+    static GLB_MAGIC = 0x46546C67;       // 'glTF'
+    static GLB_CHUNK_JSON = 0x4E4F534A;  // 'JSON'
+    static GLB_CHUNK_BIN = 0x004E4942;   // 'BIN\0'
+    static GL_FLOAT = 5126;
+    static GL_UNSIGNED_BYTE = 5121;
+    static GL_UNSIGNED_INT = 5125;
+
+    /**
+     * Binary STL of a triangle list. positions: xyz per vertex; index: optional vertex ids
+     * (3 per triangle), otherwise consecutive vertex triples. Returns an ArrayBuffer.
+     */
+    static stl(positions, index = null, name = 'model') {
+        const triangleCount = (index ? index.length : positions.length / 3) / 3;
+        const buffer = new ArrayBuffer(84 + triangleCount * 50);
+        const bytes = new Uint8Array(buffer);
+        const view = new DataView(buffer);
+
+        // The header must not start with "solid" or readers take the file for ASCII
+        const header = `binary STL ${name}`.slice(0, 80);
+        for (let i = 0; i < header.length; i++) bytes[i] = header.charCodeAt(i) & 0x7f;
+        view.setUint32(80, triangleCount, true);
+
+        let offset = 84;
+        for (let t = 0; t < triangleCount; t++) {
+            const a = (index ? index[t * 3] : t * 3) * 3;
+            const b = (index ? index[t * 3 + 1] : t * 3 + 1) * 3;
+            const c = (index ? index[t * 3 + 2] : t * 3 + 2) * 3;
+            const e1x = positions[b] - positions[a], e1y = positions[b + 1] - positions[a + 1], e1z = positions[b + 2] - positions[a + 2];
+            const e2x = positions[c] - positions[a], e2y = positions[c + 1] - positions[a + 1], e2z = positions[c + 2] - positions[a + 2];
+            let nx = e1y * e2z - e1z * e2y, ny = e1z * e2x - e1x * e2z, nz = e1x * e2y - e1y * e2x;
+            const length = Math.sqrt(nx * nx + ny * ny + nz * nz) || 1;
+            nx /= length; ny /= length; nz /= length;
+
+            view.setFloat32(offset, nx, true);
+            view.setFloat32(offset + 4, ny, true);
+            view.setFloat32(offset + 8, nz, true);
+            offset += 12;
+            for (const v of [a, b, c]) {
+                view.setFloat32(offset, positions[v], true);
+                view.setFloat32(offset + 4, positions[v + 1], true);
+                view.setFloat32(offset + 8, positions[v + 2], true);
+                offset += 12;
+            }
+            view.setUint16(offset, 0, true);  // Attribute byte count
+            offset += 2;
+        }
+        return buffer;
+    }
+
+    /**
+     * Float colours in [0, 1] (itemSize per vertex) to normalized Uint8 with `components`
+     * channels per vertex; a missing alpha channel is filled with 255.
+     */
+    static quantizeColors(colors, itemSize = 3, components = itemSize) {
+        const count = colors.length / itemSize;
+        const quantized = new Uint8Array(count * components);
+        for (let i = 0; i < count; i++) {
+            for (let k = 0; k < components; k++) {
+                const value = k < itemSize ? colors[i * itemSize + k] : 1;
+                quantized[i * components + k] = Math.round(Math.min(1, Math.max(0, value)) * 255);
+            }
+        }
+        return quantized;
+    }
+
+    /**
+     * Base64 of the bytes of any typed array, as ASCII bytes ready to be a Blob part
+     */
+    static base64(array) {
+        const bytes = array instanceof Uint8Array ? array : new Uint8Array(array.buffer, array.byteOffset, array.byteLength);
+        const table = BinaryExport.base64Table();
+        const out = new Uint8Array(Math.ceil(bytes.length / 3) * 4);
+        const whole = bytes.length - (bytes.length % 3);
+        let o = 0;
+        for (let i = 0; i < whole; i += 3) {
+            const n = (bytes[i] << 16) | (bytes[i + 1] << 8) | bytes[i + 2];
+            out[o] = table[n >> 18];
+            out[o + 1] = table[(n >> 12) & 63];
+            out[o + 2] = table[(n >> 6) & 63];
+            out[o + 3] = table[n & 63];
+            o += 4;
+        }
+        if (whole < bytes.length) {
+            const n = (bytes[whole] << 16) | ((bytes[whole + 1] || 0) << 8);
+            out[o] = table[n >> 18];
+            out[o + 1] = table[(n >> 12) & 63];
+            out[o + 2] = whole + 1 < bytes.length ? table[(n >> 6) & 63] : 61;  // '='
+            out[o + 3] = 61;
+        }
+        return out;
+    }
+
+    static base64Table() {
+        if (!BinaryExport._base64Table) {
+            BinaryExport._base64Table = Uint8Array.from(BinaryExport.BASE64_ALPHABET, ch => ch.charCodeAt(0));
+        }
+        return BinaryExport._base64Table;
+    }
+
+    /**
+     * glTF 2.0 binary (GLB) as Blob parts.
+     * meshes: [{ name, positions: Float32Array, index?: Uint32Array, colors?: Float32Array (RGB),
+     *            color?: [r, g, b, a] base colour }]
+     * extras: JSON-safe metadata stored on the scene (analysis results)
+     */
+    static glb({ meshes, extras = null, generator = 'Acetabular Wear Analysis' }) {
+        const gltf = {
+            asset: { version: '2.0', generator },
+            scene: 0,
+            scenes: [{ nodes: [] }],
+            nodes: [],
+            meshes: [],
+            materials: [],
+            accessors: [],
+            bufferViews: [],
+            buffers: [{ byteLength: 0 }]
+        };
+        if (extras) gltf.scenes[0].extras = extras;
+
+        const binParts = [];
+        let byteLength = 0;
+        const addView = (array, target) => {
+            binParts.push(array);
+            gltf.bufferViews.push({ buffer: 0, byteOffset: byteLength, byteLength: array.byteLength, target });
+            byteLength += array.byteLength;
+            const padding = (4 - (byteLength % 4)) % 4;  // Every view starts 4-byte aligned
+            if (padding) {
+                binParts.push(new Uint8Array(padding));
+                byteLength += padding;
+            }
+            return gltf.bufferViews.length - 1;
+        };
+        const addAccessor = (accessor) => {
+            gltf.accessors.push(accessor);
+            return gltf.accessors.length - 1;
+        };
+
+        for (const mesh of meshes) {
+            const positions = mesh.positions instanceof Float32Array ? mesh.positions : Float32Array.from(mesh.positions);
+            const count = positions.length / 3;
+            const min = [Infinity, Infinity, Infinity], max = [-Infinity, -Infinity, -Infinity];
+            for (let i = 0; i < positions.length; i += 3) {
+                for (let k = 0; k < 3; k++) {
+                    const value = positions[i + k];
+                    if (value < min[k]) min[k] = value;
+                    if (value > max[k]) max[k] = value;
+                }
+            }
+            const attributes = {
+                POSITION: addAccessor({
+                    bufferView: addView(positions, 34962), componentType: BinaryExport.GL_FLOAT,
+                    count, type: 'VEC3', min, max
+                })
+            };
+            if (mesh.colors) {
+                // RGBA: vertex attribute elements must be 4-byte aligned
+                attributes.COLOR_0 = addAccessor({
+                    bufferView: addView(BinaryExport.quantizeColors(mesh.colors, 3, 4), 34962),
+                    componentType: BinaryExport.GL_UNSIGNED_BYTE, normalized: true, count, type: 'VEC4'
+                });
+            }
+            const primitive = { attributes, mode: 4 };
+            if (mesh.index) {
+                const index = mesh.index instanceof Uint32Array ? mesh.index : Uint32Array.from(mesh.index);
+                primitive.indices = addAccessor({
+                    bufferView: addView(index, 34963), componentType: BinaryExport.GL_UNSIGNED_INT,
+                    count: index.length, type: 'SCALAR'
+                });
+            }
+            const color = mesh.color || [1, 1, 1, 1];
+            gltf.materials.push({
+                name: mesh.name,
+                doubleSided: true,
+                alphaMode: color[3] < 1 ? 'BLEND' : 'OPAQUE',
+                pbrMetallicRoughness: { baseColorFactor: color, metallicFactor: 0, roughnessFactor: 0.8 }
+            });
+            primitive.material = gltf.materials.length - 1;
+            gltf.meshes.push({ name: mesh.name, primitives: [primitive] });
+            gltf.nodes.push({ name: mesh.name, mesh: gltf.meshes.length - 1 });
+            gltf.scenes[0].nodes.push(gltf.nodes.length - 1);
+        }
+        gltf.buffers[0].byteLength = byteLength;
+
+        const encoded = new TextEncoder().encode(JSON.stringify(gltf));
+        const jsonBytes = new Uint8Array(Math.ceil(encoded.length / 4) * 4).fill(0x20);  // Space padded
+        jsonBytes.set(encoded);
+        const header = new DataView(new ArrayBuffer(20));
+        header.setUint32(0, BinaryExport.GLB_MAGIC, true);
+        header.setUint32(4, 2, true);
+        header.setUint32(8, 12 + 8 + jsonBytes.length + 8 + byteLength, true);
+        header.setUint32(12, jsonBytes.length, true);
+        header.setUint32(16, BinaryExport.GLB_CHUNK_JSON, true);
+        const binHeader = new DataView(new ArrayBuffer(8));
+        binHeader.setUint32(0, byteLength, true);
+        binHeader.setUint32(4, BinaryExport.GLB_CHUNK_BIN, true);
+        return [header.buffer, jsonBytes, binHeader.buffer, ...binParts];
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { BinaryExport };
+}
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Prebuilt, purged stylesheet for index.html and benchmark.html (replaces the Tailwind CDN
+runtime, which compiled the CSS in the browser on every load and needed the network).
+
+    python build_css.py            write app.css
+    python build_css.py --check    exit 1 if app.css is out of date with the pages
+
+Only the utility classes the pages actually use are emitted: class attributes, className
+assignments and classList calls are scanned. Values follow Tailwind CSS v3 (spacing scale,
+palette, type scale, breakpoints), so the markup keeps its Tailwind class names. Classes
+defined in a page's own <style> block are left alone; anything else that is not a known
+utility is reported, so a new class is not silently unstyled.
+
+Rerun after adding a utility class to the markup. The output also carries Tailwind's
+preflight (base reset) and the Inter @font-face rules for the vendored font files, with the
+pinned CDN copy as a second source for deploys without vendor/.
+"""
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from vendor_assets import upstream_url
+
+ROOT = Path(__file__).resolve().parent
+PAGES = ['index.html', 'benchmark.html']
+OUTPUT = 'app.css'
+FONT_DIR = 'vendor/@fontsource/inter@5.0.16/files'
+FONT_WEIGHTS = (400, 500, 600, 700, 800)
+
+BREAKPOINTS = {'sm': 640, 'md': 768, 'lg': 1024, 'xl': 1280, '2xl': 1536}
+PSEUDO_VARIANTS = {'hover': ':hover', 'focus': ':focus', 'disabled': ':disabled'}
+
+PALETTE = {
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d'],
+    'orange': ['#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316', '#ea580c', '#c2410c', '#9a3412', '#7c2d12'],
+    'yellow': ['#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308', '#ca8a04', '#a16207', '#854d0e', '#713f12'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a'],
+    'indigo': ['#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81'],
+    'purple': ['#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87'],
+}
+SHADES = [50, 100, 200, 300, 400, 500, 600, 700, 800, 900]
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'),
+}
+FONT_WEIGHT_NAMES = {'normal': 400, 'medium': 500, 'semibold': 600, 'bold': 700, 'extrabold': 800}
+RADII = {'': '0.25rem', 'sm': '0.125rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem', '2xl': '1rem', 'full': '9999px'}
+SPACING_PROPERTIES = {
+    'm': ['margin'], 'mx': ['margin-left', 'margin-right'], 'my': ['margin-top', 'margin-bottom'],
+    'mt': ['margin-top'], 'mr': ['margin-right'], 'mb': ['margin-bottom'], 'ml': ['margin-left'],
+    'p': ['padding'], 'px': ['padding-left', 'padding-right'], 'py': ['padding-top', 'padding-bottom'],
+    'pt': ['padding-top'], 'pr': ['padding-right'], 'pb': ['padding-bottom'], 'pl': ['padding-left'],
+}
+TRANSITION_TIMING = 'cubic-bezier(0.4, 0, 0.2, 1)'
+TRANSITION_PROPERTIES = {
+    'transition': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter',
+    'transition-all': 'all',
+    'transition-colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'transition-opacity': 'opacity',
+    'transition-transform': 'transform',
+}
+
+STATIC_UTILITIES = {
+    'block': 'display: block', 'inline-block': 'display: inline-block', 'inline': 'display: inline',
+    'flex': 'display: flex', 'inline-flex': 'display: inline-flex', 'grid': 'display: grid',
+    'hidden': 'display: none',
+    'static': 'position: static', 'fixed': 'position: fixed', 'absolute': 'position: absolute',
+    'relative': 'position: relative', 'sticky': 'position: sticky',
+    'flex-row': 'flex-direction: row', 'flex-col': 'flex-direction: column', 'flex-wrap': 'flex-wrap: wrap',
+    'flex-1': 'flex: 1 1 0%', 'flex-none': 'flex: none', 'shrink-0': 'flex-shrink: 0',
+    'items-start': 'align-items: flex-start', 'items-center': 'align-items: center', 'items-end': 'align-items: flex-end',
+    'justify-start': 'justify-content: flex-start', 'justify-center': 'justify-content: center',
+    'justify-end': 'justify-content: flex-end', 'justify-between': 'justify-content: space-between',
+    'overflow-hidden': 'overflow: hidden', 'overflow-auto': 'overflow: auto', 'overflow-x-auto': 'overflow-x: auto',
+    'text-left': 'text-align: left', 'text-center': 'text-align: center', 'text-right': 'text-align: right',
+    'text-white': 'color: #fff', 'text-black': 'color: #000', 'bg-white': 'background-color: #fff',
+    'bg-transparent': 'background-color: transparent',
+    'uppercase': 'text-transform: uppercase', 'italic': 'font-style: italic',
+    'truncate': 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap',
+    'whitespace-nowrap': 'white-space: nowrap', 'break-all': 'word-break: break-all',
+    'border': 'border-width: 1px', 'border-0': 'border-width: 0px', 'border-2': 'border-width: 2px',
+    'border-t': 'border-top-width: 1px', 'border-b': 'border-bottom-width: 1px',
+    'border-l': 'border-left-width: 1px', 'border-r': 'border-right-width: 1px',
+    'bg-gradient-to-r': 'background-image: linear-gradient(to right, var(--tw-gradient-stops))',
+    'bg-gradient-to-b': 'background-image: linear-gradient(to bottom, var(--tw-gradient-stops))',
+    'cursor-pointer': 'cursor: pointer', 'cursor-not-allowed': 'cursor: not-allowed',
+    'pointer-events-none': 'pointer-events: none', 'select-none': 'user-select: none',
+    'mx-auto': 'margin-left: auto; margin-right: auto',
+    'w-full': 'width: 100%', 'h-full': 'height: 100%', 'w-auto': 'width: auto',
+    'inset-0': 'inset: 0px',
+    'font-mono': 'font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+
+# Rule order of Tailwind's core plugins (first matching pattern): later groups win conflicts
+# on the same element (hidden after flex, px-* after p-*), whatever order the markup uses
+RULE_ORDER = [
+    r'container$', r'pointer-events', r'(static|fixed|absolute|relative|sticky)$', r'inset-', r'z-', r'col-span-',
+    r'-?m[xy]?-', r'-?m[trbl]-', r'(block|inline-block|inline|flex|inline-flex|grid|hidden)$', r'h-', r'w-',
+    r'flex-(1|none)$', r'shrink-', r'cursor-', r'select-', r'grid-cols-', r'flex-(row|col)$', r'flex-wrap$',
+    r'items-', r'justify-', r'gap-', r'space-', r'overflow-', r'(truncate|whitespace-|break-)', r'rounded',
+    r'border(-[0-2tblr])?$', r'border-', r'bg-gradient-', r'bg-', r'from-', r'to-', r'p[xy]?-', r'p[trbl]-',
+    r'text-(left|center|right)$', r'font-mono$', r'text-(xs|sm|base|lg|[2-4]?xl)$', r'font-', r'(uppercase|italic)$',
+    r'text-', r'opacity-', r'transition', r'duration-',
+]
+DISPLAY_ORDER = ['block', 'inline-block', 'inline', 'flex', 'inline-flex', 'grid', 'hidden']
+
+PREFLIGHT = """\
+*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }
+::before, ::after { --tw-content: ''; }
+html { line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"; }
+body { margin: 0; line-height: inherit; }
+hr { height: 0; color: inherit; border-top-width: 1px; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+code, kbd, samp, pre { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; font-size: 1em; }
+small { font-size: 80%; }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse; }
+button, input, optgroup, select, textarea { font-family: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0; }
+button, select { text-transform: none; }
+button, [type='button'], [type='reset'], [type='submit'] { -webkit-appearance: button; background-color: transparent; background-image: none; }
+:-moz-focusring { outline: auto; }
+progress { vertical-align: baseline; }
+summary { display: list-item; }
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+fieldset { margin: 0; padding: 0; }
+ol, ul, menu { list-style: none; margin: 0; padding: 0; }
+textarea { resize: vertical; }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af; }
+button, [role="button"] { cursor: pointer; }
+:disabled { cursor: default; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+img, video { max-width: 100%; height: auto; }
+[hidden] { display: none; }
+"""
+
+
+def spacing(value):
+    """Tailwind spacing scale: n -> n * 0.25rem (0 -> 0px, px -> 1px)"""
+    if value == 'px':
+        return '1px'
+    number = float(value)
+    return '0px' if number == 0 else f'{number / 4:g}rem'
+
+
+def color(name):
+    """'gray-500' -> '#6b7280', 'white' -> '#fff'; None for unknown colours"""
+    if name in ('white', 'black', 'transparent'):
+        return {'white': '#fff', 'black': '#000', 'transparent': 'transparent'}[name]
+    family, _, shade = name.rpartition('-')
+    if family in PALETTE and shade.isdigit() and int(shade) in SHADES:
+        return PALETTE[family][SHADES.index(int(shade))]
+    return None
+
+
+def hex_rgb(value):
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(ch * 2 for ch in value)
+    return ' '.join(str(int(value[i:i + 2], 16)) for i in (0, 2, 4))
+
+
+def utility(name):
+    """
+    (selector suffix, declarations) of one utility class without variants, or None.
+    The suffix is appended to the class selector (space-y-* targets the children).
+    """
+    if name in STATIC_UTILITIES:
+        return '', STATIC_UTILITIES[name]
+    if name in TRANSITION_PROPERTIES:
+        return '', (f'transition-property: {TRANSITION_PROPERTIES[name]}; '
+                    f'transition-timing-function: {TRANSITION_TIMING}; transition-duration: 150ms')
+    if name == 'container':
+        return '', 'width: 100%'
+
+    match = re.fullmatch(r'-?(m|mx|my|mt|mr|mb|ml|p|px|py|pt|pr|pb|pl)-(\d+(?:\.5)?|px)', name)
+    if match:
+        sign = '-' if name.startswith('-') else ''
+        value = sign + spacing(match.group(2))
+        return '', '; '.join(f'{prop}: {value}' for prop in SPACING_PROPERTIES[match.group(1)])
+    match = re.fullmatch(r'gap(-[xy])?-(\d+(?:\.5)?|px)', name)
+    if match:
+        prop = {'': 'gap', '-x': 'column-gap', '-y': 'row-gap'}[match.group(1) or '']
+        return '', f'{prop}: {spacing(match.group(2))}'
+    match = re.fullmatch(r'space-([xy])-(\d+(?:\.5)?|px)', name)
+    if match:
+        prop = 'margin-top' if match.group(1) == 'y' else 'margin-left'
+        return ' > :not([hidden]) ~ :not([hidden])', f'{prop}: {spacing(match.group(2))}'
+    match = re.fullmatch(r'([wh])-(\d+(?:\.5)?|px)', name)
+    if match:
+        return '', f"{'width' if match.group(1) == 'w' else 'height'}: {spacing(match.group(2))}"
+    match = re.fullmatch(r'grid-cols-(\d+)', name)
+    if match:
+        return '', f'grid-template-columns: repeat({match.group(1)}, minmax(0, 1fr))'
+    match = re.fullmatch(r'col-span-(\d+)', name)
+    if match:
+        return '', f'grid-column: span {match.group(1)} / span {match.group(1)}'
+    match = re.fullmatch(r'z-(\d+)', name)
+    if match:
+        return '', f'z-index: {match.group(1)}'
+    match = re.fullmatch(r'opacity-(\d+)', name)
+    if match and int(match.group(1)) <= 100:
+        return '', f'opacity: {int(match.group(1)) / 100:g}'
+    match = re.fullmatch(r'duration-(\d+)', name)
+    if match:
+        return '', f'transition-duration: {match.group(1)}ms'
+    match = re.fullmatch(r'text-(xs|sm|base|lg|xl|[2-4]xl)', name)
+    if match:
+        size, line_height = FONT_SIZES[match.group(1)]
+        return '', f'font-size: {size}; line-height: {line_height}'
+    match = re.fullmatch(r'font-(normal|medium|semibold|bold|extrabold)', name)
+    if match:
+        return '', f'font-weight: {FONT_WEIGHT_NAMES[match.group(1)]}'
+    match = re.fullmatch(r'rounded(?:-(sm|md|lg|xl|2xl|full))?', name)
+    if match:
+        return '', f'border-radius: {RADII[match.group(1) or ""]}'
+
+    match = re.fullmatch(r'(text|bg|border)-([a-z]+-\d+|white|black|transparent)', name)
+    if match and color(match.group(2)):
+        prop = {'text': 'color', 'bg': 'background-color', 'border': 'border-color'}[match.group(1)]
+        return '', f'{prop}: {color(match.group(2))}'
+    match = re.fullmatch(r'(from|to)-([a-z]+-\d+)', name)
+    if match and color(match.group(2)):
+        value = color(match.group(2))
+        if match.group(1) == 'to':
+            return '', f'--tw-gradient-to: {value}'
+        return '', (f'--tw-gradient-from: {value}; --tw-gradient-to: rgb({hex_rgb(value)} / 0); '
+                    '--tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)')
+    return None
+
+
+def rule_order(name):
+    """Sort key of a utility: its RULE_ORDER group, then its value within the group"""
+    group = next((i for i, pattern in enumerate(RULE_ORDER) if re.match(pattern, name)), len(RULE_ORDER))
+    if name in DISPLAY_ORDER:
+        return group, DISPLAY_ORDER.index(name)
+    value = re.search(r'(\d+(?:\.\d+)?)$', name)
+    return group, float(value.group(1)) if value else 0.0
+
+
+def escape(name):
+    return re.sub(r'([:./\[\]])', r'\\\1', name)
+
+
+def split_variants(token):
+    """'md:hover:text-white' -> (['md', 'hover'], 'text-white')"""
+    *variants, name = token.split(':')
+    return variants, name
+
+
+def scan_classes(text):
+    """Class tokens used by a page, in first-use order"""
+    tokens = []
+    for match in re.finditer(r'\bclass="([^"]*)"', text):
+        tokens += match.group(1).split()
+    for match in re.finditer(r"\bclassName\s*=\s*'([^']*)'", text):
+        tokens += match.group(1).split()
+    for match in re.finditer(r'classList\.(?:add|remove|toggle)\(([^)]*)\)', text):
+        tokens += re.findall(r"'([^']+)'", match.group(1))
+    return list(dict.fromkeys(token for token in tokens if '${' not in token))
+
+
+def own_classes(text):
+    """Classes a page styles itself in its <style> blocks"""
+    names = set()
+    for block in re.findall(r'<style>(.*?)</style>', text, re.S):
+        block = re.sub(r'\{[^{}]*\}', '{}', block)  # Drop declarations (decimal numbers, urls)
+        names.update(re.findall(r'\.([A-Za-z_][\w-]*)', block))
+    return names
+
+
+def font_faces():
+    faces = []
+    for weight in FONT_WEIGHTS:
+        path = f'{FONT_DIR}/inter-latin-{weight}-normal.woff2'
+        cdn = upstream_url(path.removeprefix('vendor/'))
+        faces.append(f"@font-face {{ font-family: 'Inter'; font-style: normal; font-weight: {weight}; font-display: swap; "
+                     f"src: url('{path}') format('woff2'), url('{cdn}') format('woff2'); }}\n")
+    return ''.join(faces)
+
+
+def build(pages=PAGES, root=ROOT):
+    """(css text, unknown class tokens per page)"""
+    tokens, unknown = [], {}
+    for page in pages:
+        text = (root / page).read_text(encoding='utf-8')
+        custom = own_classes(text)
+        for token in scan_classes(text):
+            variants, name = split_variants(token)
+            known = utility(name) is not None and all(v in BREAKPOINTS or v in PSEUDO_VARIANTS for v in variants)
+            if known:
+                tokens.append(token)
+            elif token not in custom:
+                unknown.setdefault(page, []).append(token)
+    tokens = sorted(set(tokens), key=lambda token: (rule_order(split_variants(token)[1]), token))
+
+    # Base utilities in RULE_ORDER, pseudo-class variants after them, then each breakpoint
+    # in ascending width, so state and responsive classes win like they do in Tailwind
+    base, pseudo, responsive = [], [], {bp: [] for bp in BREAKPOINTS}
+    for token in tokens:
+        variants, name = split_variants(token)
+        suffix, declarations = utility(name)
+        states = ''.join(PSEUDO_VARIANTS[v] for v in variants if v in PSEUDO_VARIANTS)
+        rule = f'.{escape(token)}{states}{suffix} {{ {declarations}; }}'
+        breakpoints = [v for v in variants if v in BREAKPOINTS]
+        if breakpoints:
+            responsive[breakpoints[0]].append(rule)
+        elif states:
+            pseudo.append(rule)
+        else:
+            base.append(rule)
+    if 'container' in tokens:
+        for bp, width in BREAKPOINTS.items():
+            responsive[bp].insert(0, f'.container {{ max-width: {width}px; }}')
+
+    css = [f'/* Generated by build_css.py from {", ".join(pages)}; do not edit. Tailwind CSS v3 values, */\n'
+           f'/* only the {len(tokens)} classes in use. */\n', font_faces(), PREFLIGHT, '\n'.join(base), '\n']
+    if pseudo:
+        css += ['\n'.join(pseudo), '\n']
+    for bp, rules in responsive.items():
+        if rules:
+            css.append(f'@media (min-width: {BREAKPOINTS[bp]}px) {{\n' + ''.join(f'    {rule}\n' for rule in rules) + '}\n')
+    return ''.join(css), unknown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the purged app.css from the Tailwind classes in the pages')
+    parser.add_argument('--check', action='store_true', help=f'verify {OUTPUT} is up to date, do not write it')
+    args = parser.parse_args(argv)
+
+    css, unknown = build()
+    for page, tokens in unknown.items():
+        print(f"[CSS] {page}: no rule for {', '.join(tokens)}")
+    target = ROOT / OUTPUT
+    if args.check:
+        current = target.read_text(encoding='utf-8') if target.exists() else ''
+        if current != css:
+            print(f"[CSS] {OUTPUT} is out of date: run python build_css.py")
+            return 1
+        print(f"[CSS] {OUTPUT} is up to date")
+        return 0
+    target.write_text(css, encoding='utf-8')
+    print(f"[CSS] Wrote {OUTPUT} ({len(css.encode('utf-8')) / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+/**
+ * Case Storage Client - resumable STL uploads to server.py and Range-loaded cases
+ * Large scans are pushed to the lab server in CHUNK_SIZE pieces; an interrupted upload
+ * resumes from the offset the server reports instead of starting over. Stored cases
+ * come back as RemoteCaseFile objects whose slice() fetches byte ranges, so
+ * StreamingGeometryLoader parses them progressively exactly like a local File.
+ *
+ * Endpoints are served by case_storage.py (see server.py --cases-dir).
+ */
+
+class CaseStorageClient {
+    static CHUNK_SIZE = 8 * 1024 * 1024;
+    static MAX_RETRIES = 4;
+    static STORAGE_PREFIX = 'wear-upload:';  // localStorage: file signature -> upload id
+
+    constructor(baseUrl = '') {
+        this.baseUrl = baseUrl;
+    }
+
+    /**
+     * True when the page is served by server.py with case storage enabled
+     * (a plain static host answers 404 here)
+     */
+    async isAvailable() {
+        try {
+            const response = await fetch(`${this.baseUrl}/api/cases`, { method: 'HEAD' });
+            return response.ok;
+        } catch (error) {
+            return false;
+        }
+    }
+
+    async listCases() {
+        const response = await fetch(`${this.baseUrl}/api/cases`);
+        if (!response.ok) {
+            throw new Error(`Case list failed: HTTP ${response.status}`);
+        }
+        return (await response.json()).cases;
+    }
+
+    static uploadSignature(file) {
+        return `${CaseStorageClient.STORAGE_PREFIX}${file.name}:${file.size}:${file.lastModified || 0}`;
+    }
+
+    /**
+     * Upload `file`, resuming a previous attempt for the same file if the server still
+     * has it. onProgress(bytesSent, totalBytes). Resolves with the stored case metadata.
+     */
+    async upload(file, options = {}) {
+        const { onProgress = null } = options;
+        const signature = CaseStorageClient.uploadSignature(file);
+        let uploadId = localStorage.getItem(signature);
+        let offset = uploadId ? await this.uploadOffset(uploadId) : null;
+
+        if (offset === null) {
+            const response = await fetch(`${this.baseUrl}/api/uploads`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ name: file.name, size: file.size })
+            });
+            if (!response.ok) {
+                throw new Error(`Upload rejected: ${(await response.json()).error || response.status}`);
+            }
+            uploadId = (await response.json()).id;
+            offset = 0;
+            localStorage.setItem(signature, uploadId);
+        } else {
+            console.log(`📤 Resuming upload of ${file.name} at ${(offset / 1048576).toFixed(1)} MB`);
+        }
+
+        let retries = 0;
+        while (true) {
+            const end = Math.min(offset + CaseStorageClient.CHUNK_SIZE, file.size);
+            let response;
+            try {
+                response = await fetch(`${this.baseUrl}/api/uploads/${uploadId}`, {
+                    method: 'PUT',
+                    headers: { 'Upload-Offset': String(offset), 'Content-Type': 'application/octet-stream' },
+                    body: file.slice(offset, end)
+                });
+            } catch (error) {
+                // Network drop: ask the server how far it got and continue from there
+                if (++retries > CaseStorageClient.MAX_RETRIES) throw error;
+                await new Promise(resolve => setTimeout(resolve, 500 * 2 ** retries));
+                const serverOffset = await this.uploadOffset(uploadId);
+                if (serverOffset === null) throw error;
+                offset = serverOffset;
+                continue;
+            }
+
+            const result = await response.json();
+            if (response.status === 201) {
+                localStorage.removeItem(signature);
+                onProgress?.(file.size, file.size);
+                return result.case;
+            }
+            if (response.status === 409 && typeof result.offset === 'number') {
+                offset = result.offset;  // Server has a different view (e.g. a chunk half-written)
+            } else if (!response.ok) {
+                throw new Error(`Upload failed: ${result.error || response.status}`);
+            } else {
+                offset = result.offset;
+                retries = 0;
+            }
+            onProgress?.(offset, file.size);
+        }
+    }
+
+    /**
+     * Bytes the server already holds for an upload, or null if it no longer knows it
+     */
+    async uploadOffset(uploadId) {
+        try {
+            const response = await fetch(`${this.baseUrl}/api/uploads/${uploadId}`, { method: 'HEAD' });
+            if (!response.ok) return null;
+            return parseInt(response.headers.get('Upload-Offset'), 10);
+        } catch (error) {
+            return null;
+        }
+    }
+
+    openCase(info) {
+        return new RemoteCaseFile(`${this.baseUrl}${info.url}`, info);
+    }
+}
+
+/**
+ * File-like view of a stored case: name, size and slice(start, end).arrayBuffer(),
+ * each slice being one HTTP Range request
+ */
+class RemoteCaseFile {
+    constructor(url, info) {
+        this.url = url;
+        this.name = info.name;
+        this.size = info.size;
+        this.sha256 = info.sha256;
+        this.remote = true;
+    }
+
+    slice(start = 0, end = this.size) {
+        const url = this.url;
+        const last = Math.min(end, this.size) - 1;
+        return {
+            size: Math.max(0, last - start + 1),
+            async arrayBuffer() {
+                if (last < start) return new ArrayBuffer(0);
+                const response = await fetch(url, { headers: { Range: `bytes=${start}-${last}` } });
+                if (response.status !== 206 && response.status !== 200) {
+                    throw new Error(`Range request failed: HTTP ${response.status}`);
+                }
+                const buffer = await response.arrayBuffer();
+                // A server ignoring Range sends the whole file
+                return response.status === 206 ? buffer : buffer.slice(start, last + 1);
+            }
+        };
+    }
+
+    async arrayBuffer(options = {}) {
+        const { onProgress = null } = options;
+        const response = await fetch(this.url);
+        if (!response.ok) {
+            throw new Error(`Case download failed: HTTP ${response.status}`);
+        }
+        if (!onProgress || !response.body) {
+            return response.arrayBuffer();
+        }
+        const bytes = new Uint8Array(this.size);
+        const reader = response.body.getReader();
+        let loaded = 0;
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            bytes.set(value, loaded);
+            loaded += value.byteLength;
+            onProgress(loaded);
+        }
+        return bytes.buffer;
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { CaseStorageClient, RemoteCaseFile };
+}
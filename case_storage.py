@@ -0,0 +1,398 @@
+"""
+Case storage for server.py: resumable chunked STL uploads and Range-served scans.
+
+Everything lives in a local directory (default ./cases), so sharing a case works offline:
+
+    cases/<id>.stl          content-addressed scan (id = first 16 hex chars of its SHA-256)
+    cases/<id>.json         {id, name, size, sha256, created}
+    cases/.uploads/<u>.part bytes received so far (its size is the resume offset)
+    cases/.uploads/<u>.json {name, size, created} of the pending upload
+
+HTTP API (see CaseStorageMixin):
+    GET  /api/cases                 list stored cases
+    POST /api/uploads               {"name", "size"} -> 201 {"id", "offset"}
+    HEAD /api/uploads/<u>           Upload-Offset / Upload-Length headers, for resuming
+    PUT  /api/uploads/<u>           body = bytes starting at the Upload-Offset header
+                                    -> 200 {"offset"} or 201 {"case"} once complete
+    GET  /cases/<id>.stl            scan bytes, with single-range Range / If-Range support
+
+Request bodies are streamed to disk in CHUNK_BYTES pieces and hashed on the way in; the
+running SHA-256 is kept per upload, so finishing an upload never re-reads the file.
+"""
+import hashlib
+import json
+import mmap
+import os
+import re
+import secrets
+import threading
+import time
+from pathlib import Path
+
+CHUNK_BYTES = 1024 * 1024
+MAX_CASE_BYTES = 16 * 1024 ** 3
+STALE_UPLOAD_SECONDS = 7 * 24 * 3600
+
+CASE_ID = re.compile(r'^[0-9a-f]{16}$')
+UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+CASE_PATH = re.compile(r'^/cases/([0-9a-f]{16})\.stl$')
+UPLOAD_PATH = re.compile(r'^/api/uploads/([0-9a-f]{32})$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class CaseStoreError(Exception):
+    """Client error: carries the HTTP status and a JSON payload for the response."""
+
+    def __init__(self, status, message, **payload):
+        super().__init__(message)
+        self.status = status
+        self.payload = {'error': message, **payload}
+
+
+class CaseStore:
+    """Content-addressed case directory plus the staging area for pending uploads."""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.uploads = self.root / '.uploads'
+        self.uploads.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.upload_locks = {}  # upload id -> Lock, one writer per upload
+        self.hashers = {}  # upload id -> (offset, sha256 object) for the bytes on disk
+
+    def prune_uploads(self, max_age=STALE_UPLOAD_SECONDS):
+        """Drop staged uploads nobody has touched for max_age seconds."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for meta_path in self.uploads.glob('*.json'):
+            part = meta_path.with_suffix('.part')
+            newest = max(meta_path.stat().st_mtime, part.stat().st_mtime if part.exists() else 0)
+            if newest < cutoff:
+                part.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    # Cases ------------------------------------------------------------------
+
+    def case_path(self, case_id):
+        if not CASE_ID.match(case_id):
+            return None
+        path = self.root / f'{case_id}.stl'
+        return path if path.is_file() else None
+
+    def list_cases(self):
+        cases = []
+        for meta_path in self.root.glob('*.json'):
+            try:
+                cases.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(cases, key=lambda case: case.get('created', 0), reverse=True)
+
+    # Uploads ----------------------------------------------------------------
+
+    def create_upload(self, name, size):
+        if not isinstance(size, int) or size <= 0 or size > MAX_CASE_BYTES:
+            raise CaseStoreError(400, f'size must be between 1 and {MAX_CASE_BYTES} bytes')
+        name = Path(str(name or 'case.stl')).name[:200]
+        upload_id = secrets.token_hex(16)
+        (self.uploads / f'{upload_id}.part').touch()
+        (self.uploads / f'{upload_id}.json').write_text(
+            json.dumps({'name': name, 'size': size, 'created': time.time()}))
+        return {'id': upload_id, 'offset': 0, 'size': size}
+
+    def upload_status(self, upload_id):
+        """(offset, meta) of a pending upload."""
+        if not UPLOAD_ID.match(upload_id):
+            raise CaseStoreError(404, 'unknown upload')
+        meta_path = self.uploads / f'{upload_id}.json'
+        part = self.uploads / f'{upload_id}.part'
+        try:
+            meta = json.loads(meta_path.read_text())
+            return part.stat().st_size, meta
+        except (OSError, ValueError):
+            raise CaseStoreError(404, 'unknown upload')
+
+    def upload_lock(self, upload_id):
+        with self.lock:
+            return self.upload_locks.setdefault(upload_id, threading.Lock())
+
+    def hasher_at(self, upload_id, part, offset):
+        """SHA-256 state covering the first `offset` bytes of the part file."""
+        cached = self.hashers.get(upload_id)
+        if cached and cached[0] == offset:
+            return cached[1]
+        # Server restarted (or a write was cut short): rebuild from what is on disk
+        hasher = hashlib.sha256()
+        with open(part, 'rb') as source:
+            remaining = offset
+            while remaining > 0:
+                block = source.read(min(CHUNK_BYTES, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+        return hasher
+
+    def append(self, upload_id, offset, length, stream):
+        """
+        Write `length` bytes from `stream` at `offset` (which must equal the bytes already
+        received). Returns {'offset'} while incomplete, {'case'} once the upload is finished.
+        """
+        lock = self.upload_lock(upload_id)
+        if not lock.acquire(blocking=False):
+            raise CaseStoreError(409, 'upload already in progress')
+        try:
+            current, meta = self.upload_status(upload_id)
+            if offset != current:
+                raise CaseStoreError(409, 'offset mismatch', offset=current)
+            if offset + length > meta['size']:
+                raise CaseStoreError(413, 'chunk runs past the declared size', offset=current)
+
+            part = self.uploads / f'{upload_id}.part'
+            hasher = self.hasher_at(upload_id, part, offset)
+            written = 0
+            try:
+                with open(part, 'r+b') as target:
+                    target.seek(offset)
+                    while written < length:
+                        block = stream.read(min(CHUNK_BYTES, length - written))
+                        if not block:
+                            break  # Client went away; the next HEAD reports how far we got
+                        target.write(block)
+                        hasher.update(block)
+                        written += len(block)
+            finally:
+                self.hashers[upload_id] = (offset + written, hasher)
+
+            if offset + written < meta['size']:
+                return {'offset': offset + written}
+            return {'case': self.finish(upload_id, part, meta, hasher.hexdigest())}
+        finally:
+            lock.release()
+
+    def finish(self, upload_id, part, meta, sha256):
+        case_id = sha256[:16]
+        target = self.root / f'{case_id}.stl'
+        if target.exists():
+            part.unlink()  # Same bytes already stored
+        else:
+            os.replace(part, target)
+        case = {'id': case_id, 'name': meta['name'], 'size': meta['size'],
+                'sha256': sha256, 'created': time.time(), 'url': f'/cases/{case_id}.stl'}
+        meta_path = self.root / f'{case_id}.json'
+        if meta_path.exists():
+            case = json.loads(meta_path.read_text())
+        else:
+            meta_path.write_text(json.dumps(case))
+        (self.uploads / f'{upload_id}.json').unlink(missing_ok=True)
+        with self.lock:
+            self.hashers.pop(upload_id, None)
+            self.upload_locks.pop(upload_id, None)
+        return case
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single `bytes=` range, None to send the whole file
+    (no header, multiple ranges, or a syntax we do not handle), or 'unsatisfiable'.
+    """
+    if not header:
+        return None
+    match = RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return 'unsatisfiable'
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, end
+
+
+class CaseStorageMixin:
+    """
+    Case endpoints for a SimpleHTTPRequestHandler subclass. Handlers call
+    handle_case_request() at the top of do_GET/do_HEAD and inherit do_POST/do_PUT.
+    """
+
+    case_store = None  # CaseStore, set by run_server
+    case_cache_control = None  # e.g. immutable caching in production (case files never change)
+
+    def handle_case_request(self, head_only=False):
+        """Serve /api/cases, /api/uploads/<u> (HEAD) and /cases/<id>.stl; False otherwise."""
+        path = self.path.split('?', 1)[0]
+        if path == '/api/cases':
+            if self.require_case_store():
+                self.send_json(200, {'cases': self.case_store.list_cases()}, head_only=head_only)
+            return True
+        match = UPLOAD_PATH.match(path)
+        if match:
+            if self.require_case_store():
+                try:
+                    offset, meta = self.case_store.upload_status(match.group(1))
+                    self.send_response(200)
+                    self.send_header('Upload-Offset', str(offset))
+                    self.send_header('Upload-Length', str(meta['size']))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                except CaseStoreError as error:
+                    self.send_json(error.status, error.payload, head_only=True)
+            return True
+        match = CASE_PATH.match(path)
+        if match:
+            if self.require_case_store():
+                self.send_case_file(match.group(1), head_only)
+            return True
+        if path.startswith('/cases/'):
+            self.send_json(404, {'error': 'unknown case'}, head_only=head_only)
+            return True
+        return False
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != '/api/uploads':
+            self.send_json(404, {'error': 'not found'})
+            return
+        if not self.require_case_store():
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:  # Malformed header: rejected below like a missing body
+            length = 0
+        if length <= 0 or length > 64 * 1024:
+            self.close_connection = True  # The body (if any) was not consumed
+            self.send_json(400, {'error': 'expected a small JSON body'})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+            upload = self.case_store.create_upload(body.get('name'), body.get('size'))
+        except CaseStoreError as error:
+            self.send_json(error.status, error.payload)
+            return
+        except (ValueError, AttributeError):
+            self.send_json(400, {'error': 'invalid JSON body'})
+            return
+        self.send_json(201, upload, extra_headers={'Location': f"/api/uploads/{upload['id']}"})
+
+    def do_PUT(self):
+        match = UPLOAD_PATH.match(self.path.split('?', 1)[0])
+        if not match:
+            self.send_json(404, {'error': 'not found'})
+            return
+        if not self.require_case_store():
+            return
+        length = self.headers.get('Content-Length') or ''
+        offset = self.headers.get('Upload-Offset') or ''
+        # ASCII digits only: str.isdigit() also accepts '²', which int() rejects
+        if not (length.isascii() and length.isdigit() and offset.isascii() and offset.isdigit()):
+            # Without a length we cannot stream the body; drop the connection afterwards
+            self.close_connection = True
+            self.send_json(411, {'error': 'Content-Length and Upload-Offset headers are required'})
+            return
+
+        length = int(length)
+        try:
+            result = self.case_store.append(match.group(1), int(offset), length, self.rfile)
+        except CaseStoreError as error:
+            self.close_connection = True  # The body was not consumed
+            self.send_json(error.status, error.payload)
+            return
+        if 'case' in result:
+            print(f"[CASES] Stored {result['case']['name']} as {result['case']['id']} "
+                  f"({result['case']['size'] / 1048576:.1f} MB)")
+            self.send_json(201, result)
+        else:
+            if result['offset'] < int(offset) + length:
+                self.close_connection = True  # Short body: the client disconnected
+            self.send_json(200, result, extra_headers={'Upload-Offset': str(result['offset'])})
+
+    def require_case_store(self):
+        if self.case_store is None:
+            self.send_json(503, {'error': 'case storage disabled'})
+            return False
+        return True
+
+    def send_json(self, status, payload, head_only=False, extra_headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def send_case_file(self, case_id, head_only):
+        path = self.case_store.case_path(case_id)
+        if path is None:
+            self.send_json(404, {'error': 'unknown case'}, head_only=head_only)
+            return
+        size = path.stat().st_size
+        # Content-addressed: the id is the ETag and the bytes never change
+        etag = f'"{case_id}"'
+        if etag in (self.headers.get('If-None-Match') or ''):
+            self.send_response(304)
+            self.send_case_headers(etag)
+            self.end_headers()
+            return
+
+        byte_range = parse_range(self.headers.get('Range'), size)
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() != etag:
+            byte_range = None
+        if byte_range == 'unsatisfiable':
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start, end = byte_range or (0, size - 1)
+        self.send_response(206 if byte_range else 200)
+        self.send_case_headers(etag)
+        self.send_header('Content-Type', 'model/stl')
+        self.send_header('Content-Length', str(end - start + 1))
+        if byte_range:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if not head_only and size > 0:
+            self.copy_file_range(path, start, end - start + 1)
+
+    def send_case_headers(self, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        if self.case_cache_control:
+            self.send_header('Cache-Control', self.case_cache_control)
+
+    def copy_file_range(self, path, offset, count):
+        """Zero-copy os.sendfile where available, memory-mapped writes otherwise."""
+        with open(path, 'rb') as source:
+            if hasattr(os, 'sendfile'):
+                try:
+                    self.wfile.flush()
+                    socket_fd = self.connection.fileno()
+                    while count > 0:
+                        sent = os.sendfile(socket_fd, source.fileno(), offset, count)
+                        if sent == 0:
+                            return
+                        offset += sent
+                        count -= sent
+                    return
+                except (OSError, AttributeError, ValueError):
+                    if count <= 0:
+                        return
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                while count > 0:
+                    block = min(CHUNK_BYTES, count)
+                    self.wfile.write(view[offset:offset + block])
+                    offset += block
+                    count -= block
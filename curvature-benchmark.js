@@ -0,0 +1,208 @@
+/**
+ * Curvature Benchmark
+ * CurvatureEngine (curvature-engine.js) on 1M+ vertex meshes: face-centric batched pass vs.
+ * the per-vertex neighbourhood walk it replaces, in-thread and in the worker.
+ *
+ * Usage: Abrir en consola F12 y ejecutar:
+ *   runCurvatureBenchmark()
+ *   runCurvatureBenchmark({ vertexCounts: [1e6, 4e6], repeats: 3, worker: false })
+ * O desde Node (sin worker):
+ *   node curvature-benchmark.js 1000000 2000000
+ */
+
+/**
+ * Closed, indexed UV sphere with about targetVertices vertices (poles + rings x segments)
+ */
+function buildSyntheticIndexedSphere(targetVertices, radius = 14) {
+    const segments = Math.max(8, Math.round(Math.sqrt(targetVertices * 2)));
+    const rings = Math.max(4, Math.round(targetVertices / segments) + 1);
+    const vertexCount = (rings - 1) * segments + 2;
+    const positions = new Float32Array(vertexCount * 3);
+    const index = new Uint32Array(segments * (rings - 1) * 6);
+
+    positions[2] = radius;
+    for (let r = 1; r < rings; r++) {
+        const theta = (r / rings) * Math.PI;
+        for (let s = 0; s < segments; s++) {
+            const phi = (s / segments) * Math.PI * 2;
+            const i = (1 + (r - 1) * segments + s) * 3;
+            positions[i] = radius * Math.sin(theta) * Math.cos(phi);
+            positions[i + 1] = radius * Math.sin(theta) * Math.sin(phi);
+            positions[i + 2] = radius * Math.cos(theta);
+        }
+    }
+    const south = vertexCount - 1;
+    positions[south * 3 + 2] = -radius;
+
+    const ringVertex = (r, s) => 1 + (r - 1) * segments + (s % segments);
+    let t = 0;
+    for (let s = 0; s < segments; s++) {
+        index[t++] = 0; index[t++] = ringVertex(1, s); index[t++] = ringVertex(1, s + 1);
+        index[t++] = south; index[t++] = ringVertex(rings - 1, s + 1); index[t++] = ringVertex(rings - 1, s);
+    }
+    for (let r = 1; r < rings - 1; r++) {
+        for (let s = 0; s < segments; s++) {
+            const a = ringVertex(r, s), b = ringVertex(r, s + 1);
+            const c = ringVertex(r + 1, s), d = ringVertex(r + 1, s + 1);
+            index[t++] = a; index[t++] = c; index[t++] = d;
+            index[t++] = a; index[t++] = d; index[t++] = b;
+        }
+    }
+
+    return { positions, index, vertexCount, faceCount: index.length / 3, radius };
+}
+
+/**
+ * Previous CurvatureAnalyzer approach, kept as the baseline: for each vertex, walk its faces
+ * (vertex -> faces CSR) once for the angle sum and once more for the mixed area, with acos
+ * per corner. Gaussian curvature only.
+ */
+function perVertexGaussianCurvature(positions, index, vertexCount) {
+    const faceCount = index.length / 3;
+    const offsets = new Uint32Array(vertexCount + 1);
+    for (let c = 0; c < index.length; c++) offsets[index[c] + 1]++;
+    for (let v = 0; v < vertexCount; v++) offsets[v + 1] += offsets[v];
+    const fill = offsets.slice(0, vertexCount);
+    const vertexFaces = new Uint32Array(index.length);
+    for (let f = 0; f < faceCount; f++) {
+        for (let k = 0; k < 3; k++) vertexFaces[fill[index[f * 3 + k]]++] = f;
+    }
+
+    const start = performance.now();
+    const angle = (ax, ay, az, bx, by, bz) => {
+        const lengths = Math.sqrt((ax * ax + ay * ay + az * az) * (bx * bx + by * by + bz * bz));
+        if (lengths < 1e-10) return 0;
+        return Math.acos(Math.max(-1, Math.min(1, (ax * bx + ay * by + az * bz) / lengths)));
+    };
+    const forEachCorner = (v, callback) => {
+        for (let i = offsets[v]; i < offsets[v + 1]; i++) {
+            const f = vertexFaces[i];
+            let local = 0;
+            while (local < 2 && index[f * 3 + local] !== v) local++;
+            const p0 = index[f * 3 + local] * 3;
+            const p1 = index[f * 3 + (local + 1) % 3] * 3;
+            const p2 = index[f * 3 + (local + 2) % 3] * 3;
+            const e1x = positions[p1] - positions[p0], e1y = positions[p1 + 1] - positions[p0 + 1], e1z = positions[p1 + 2] - positions[p0 + 2];
+            const e2x = positions[p2] - positions[p0], e2y = positions[p2 + 1] - positions[p0 + 1], e2z = positions[p2 + 2] - positions[p0 + 2];
+            const e12x = e2x - e1x, e12y = e2y - e1y, e12z = e2z - e1z;
+            const cx = e1y * e2z - e1z * e2y, cy = e1z * e2x - e1x * e2z, cz = e1x * e2y - e1y * e2x;
+            callback(
+                angle(e1x, e1y, e1z, e2x, e2y, e2z),
+                angle(-e1x, -e1y, -e1z, e12x, e12y, e12z),
+                angle(-e2x, -e2y, -e2z, -e12x, -e12y, -e12z),
+                0.5 * Math.sqrt(cx * cx + cy * cy + cz * cz)
+            );
+        }
+    };
+
+    const gaussian = new Float32Array(vertexCount);
+    for (let v = 0; v < vertexCount; v++) {
+        let angleSum = 0;
+        forEachCorner(v, (angle0) => { angleSum += angle0; });
+        let mixedArea = 0;
+        forEachCorner(v, (angle0, angle1, angle2, triangleArea) => {
+            if (angle0 > Math.PI / 2) mixedArea += triangleArea / 2;
+            else if (angle1 > Math.PI / 2 || angle2 > Math.PI / 2) mixedArea += triangleArea / 4;
+            else mixedArea += triangleArea / 3;
+        });
+        gaussian[v] = (2 * Math.PI - angleSum) / Math.max(mixedArea, 1e-10);
+    }
+    return { gaussian, computeTime: performance.now() - start };
+}
+
+/**
+ * One engine run in a fresh worker (buffers are copied in, results transferred back)
+ */
+function benchmarkWorkerCurvature(mesh) {
+    return new Promise((resolve, reject) => {
+        const worker = new Worker('stl-processor-worker.js');
+        const positions = mesh.positions.slice();
+        const index = mesh.index.slice();
+        const start = performance.now();
+        worker.onmessage = (event) => {
+            const { type, data, error } = event.data;
+            if (type !== 'computeCurvature') return;
+            worker.terminate();
+            if (error) {
+                reject(new Error(error));
+                return;
+            }
+            resolve({ computeTime: data.computeTime, wallTime: performance.now() - start });
+        };
+        worker.onerror = (event) => {
+            worker.terminate();
+            reject(new Error(event.message));
+        };
+        worker.postMessage({
+            type: 'computeCurvature',
+            payload: { positions, index, vertexCount: mesh.vertexCount }
+        }, [positions.buffer, index.buffer]);
+    });
+}
+
+async function runCurvatureBenchmark(options = {}) {
+    const {
+        vertexCounts = [250000, 1000000, 2000000],
+        repeats = 3,
+        baseline = true,
+        worker = typeof Worker !== 'undefined'
+    } = options;
+    const Engine = typeof CurvatureEngine !== 'undefined' ? CurvatureEngine : require('./curvature-engine.js').CurvatureEngine;
+    console.log('⏱️  Curvature Benchmark (Gaussian, mean, principal)\n');
+
+    const median = (values) => values.slice().sort((a, b) => a - b)[Math.floor(values.length / 2)];
+    const results = [];
+
+    for (const target of vertexCounts) {
+        const mesh = buildSyntheticIndexedSphere(target);
+        const engineTimes = [];
+        let engine;
+        for (let r = 0; r < repeats; r++) {
+            engine = Engine.compute(mesh.positions, mesh.index, { vertexCount: mesh.vertexCount });
+            engineTimes.push(engine.computeTime);
+        }
+
+        const result = {
+            vertices: mesh.vertexCount,
+            faces: mesh.faceCount,
+            engineMs: median(engineTimes).toFixed(1),
+            mVerticesPerS: (mesh.vertexCount / median(engineTimes) / 1000).toFixed(2),
+            gaussianError: (Math.abs(engine.stats.totalGaussian / (4 * Math.PI) - 1)).toExponential(1),
+            meanRadius: (1 / median(Array.from(engine.mean))).toFixed(4)
+        };
+        if (baseline) {
+            const baselineTimes = [];
+            for (let r = 0; r < repeats; r++) {
+                baselineTimes.push(perVertexGaussianCurvature(mesh.positions, mesh.index, mesh.vertexCount).computeTime);
+            }
+            result.perVertexMs = median(baselineTimes).toFixed(1);
+            result.speedup = (median(baselineTimes) / median(engineTimes)).toFixed(1) + 'x';
+        }
+        if (worker) {
+            const runs = [];
+            for (let r = 0; r < repeats; r++) runs.push(await benchmarkWorkerCurvature(mesh));
+            result.workerWallMs = median(runs.map(run => run.wallTime)).toFixed(1);
+        }
+        results.push(result);
+        console.log(`${mesh.vertexCount.toLocaleString()} vertices: engine ${result.engineMs} ms (${result.mVerticesPerS} M vertices/s)` +
+            (baseline ? `, per-vertex ${result.perVertexMs} ms (${result.speedup})` : '') +
+            (worker ? `, worker round trip ${result.workerWallMs} ms` : '') +
+            `, radius from H ${result.meanRadius} mm (true ${mesh.radius})`);
+    }
+
+    console.table(results);
+    return results;
+}
+
+if (typeof window !== 'undefined') {
+    window.runCurvatureBenchmark = runCurvatureBenchmark;
+    window.buildSyntheticIndexedSphere = buildSyntheticIndexedSphere;
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { buildSyntheticIndexedSphere, perVertexGaussianCurvature, runCurvatureBenchmark };
+    if (require.main === module) {
+        const counts = process.argv.slice(2).map(Number).filter(n => n > 0);
+        runCurvatureBenchmark({ ...(counts.length ? { vertexCounts: counts } : {}), worker: false });
+    }
+}
@@ -0,0 +1,198 @@
+/**
+ * Curvature Engine
+ * Discrete Gaussian, mean and principal curvature per vertex (Meyer et al. 2003).
+ *
+ * One pass over the faces of an index buffer: every triangle adds its interior angle to
+ * the angle defect of its three vertices, its cotangent weights to their cot-Laplacian
+ * (mean curvature normal), its share of the mixed Voronoi area and its area-weighted
+ * normal. A second pass over the vertices turns the sums into curvatures:
+ *
+ *   K  = (2π - Σθ) / A_mixed                      Gaussian
+ *   H  = ±|Σ (cot α + cot β)(xi - xj)| / (4 A_mixed)  mean, sign from the vertex normal
+ *   k1 = H + sqrt(max(0, H² - K)),  k2 = H - sqrt(max(0, H² - K))
+ *
+ * - Angle sums, areas and the Laplacian accumulate in Float64Arrays: 2π - Σθ is a
+ *   difference of nearly equal numbers (~1e-6 on a fine scan) and is lost in float32.
+ * - Outputs are Float32Arrays, one value per vertex; boundary, isolated and zero-area
+ *   vertices are NaN. A boundary vertex is one whose one-ring does not close, detected by
+ *   XOR-ing the neighbour ids of each incident face (every neighbour of an interior vertex
+ *   of a manifold appears twice and cancels).
+ * - Positions are either indexed (vertex v at positions[3v]) or a triangle soup with the
+ *   index buffer as a weld map (corner c at positions[3c], MeshTopology.cornerVertex).
+ *
+ * Loaded by index.html (defer) and by the worker itself (importScripts).
+ */
+
+class CurvatureEngine {
+    static BLOCK_SIZE = 65536;   // Faces between progress callbacks
+    static AREA_EPSILON = 1e-12; // mm²; faces with less twice-area are skipped as degenerate
+
+    /**
+     * positions: Float32Array, index: Uint32Array (3 per face)
+     * options: vertexCount (default: max index + 1), faceMask (Uint8Array per face, 0 = skip),
+     *          cornerPositions (positions per corner instead of per vertex), onProgress(0..1)
+     * Returns { gaussian, mean, k1, k2, stats, computeTime }
+     */
+    static compute(positions, index, options = {}) {
+        const startTime = performance.now();
+        const { faceMask = null, cornerPositions = false, onProgress = null } = options;
+        const blockSize = options.blockSize || CurvatureEngine.BLOCK_SIZE;
+        const faceCount = Math.floor(index.length / 3);
+        let vertexCount = options.vertexCount;
+        if (vertexCount === undefined) {
+            vertexCount = 0;
+            for (let c = 0; c < index.length; c++) {
+                if (index[c] >= vertexCount) vertexCount = index[c] + 1;
+            }
+        }
+
+        const angleSum = new Float64Array(vertexCount);
+        const area = new Float64Array(vertexCount);
+        const laplacian = new Float64Array(vertexCount * 3);
+        const normal = new Float32Array(vertexCount * 3);
+        const ring = new Uint32Array(vertexCount);
+        const touched = new Uint8Array(vertexCount);
+        let skippedFaces = 0;
+
+        for (let blockStart = 0; blockStart < faceCount; blockStart += blockSize) {
+            const blockEnd = Math.min(faceCount, blockStart + blockSize);
+            for (let f = blockStart; f < blockEnd; f++) {
+                if (faceMask && !faceMask[f]) continue;
+                const c = f * 3;
+                const a = index[c], b = index[c + 1], d = index[c + 2];
+                const pa = (cornerPositions ? c : a) * 3;
+                const pb = (cornerPositions ? c + 1 : b) * 3;
+                const pd = (cornerPositions ? c + 2 : d) * 3;
+
+                const ax = positions[pa], ay = positions[pa + 1], az = positions[pa + 2];
+                const abx = positions[pb] - ax, aby = positions[pb + 1] - ay, abz = positions[pb + 2] - az;
+                const adx = positions[pd] - ax, ady = positions[pd + 1] - ay, adz = positions[pd + 2] - az;
+                const bdx = adx - abx, bdy = ady - aby, bdz = adz - abz;
+
+                const nx = aby * adz - abz * ady;
+                const ny = abz * adx - abx * adz;
+                const nz = abx * ady - aby * adx;
+                const twiceArea = Math.sqrt(nx * nx + ny * ny + nz * nz);
+                if (twiceArea < CurvatureEngine.AREA_EPSILON || a === b || b === d || a === d) {
+                    skippedFaces++;
+                    continue;
+                }
+
+                // Dot products of the two edges leaving each corner; cot = dot / 2A, θ = atan2(2A, dot)
+                const dotA = abx * adx + aby * ady + abz * adz;
+                const dotB = -(abx * bdx + aby * bdy + abz * bdz);
+                const dotD = adx * bdx + ady * bdy + adz * bdz;
+                const cotA = dotA / twiceArea, cotB = dotB / twiceArea, cotD = dotD / twiceArea;
+                angleSum[a] += Math.atan2(twiceArea, dotA);
+                angleSum[b] += Math.atan2(twiceArea, dotB);
+                angleSum[d] += Math.atan2(twiceArea, dotD);
+
+                // Mixed Voronoi area: circumcentric share for non-obtuse triangles, else A/2 at
+                // the obtuse corner and A/4 at the other two
+                const lab = abx * abx + aby * aby + abz * abz;
+                const lad = adx * adx + ady * ady + adz * adz;
+                const lbd = bdx * bdx + bdy * bdy + bdz * bdz;
+                if (dotA >= 0 && dotB >= 0 && dotD >= 0) {
+                    area[a] += (lab * cotD + lad * cotB) / 8;
+                    area[b] += (lab * cotD + lbd * cotA) / 8;
+                    area[d] += (lad * cotB + lbd * cotA) / 8;
+                } else {
+                    const triangleArea = twiceArea / 2;
+                    area[a] += dotA < 0 ? triangleArea / 2 : triangleArea / 4;
+                    area[b] += dotB < 0 ? triangleArea / 2 : triangleArea / 4;
+                    area[d] += dotD < 0 ? triangleArea / 2 : triangleArea / 4;
+                }
+
+                // Cot-Laplacian: edge opposite each corner weighted by that corner's cotangent
+                const la = a * 3, lb = b * 3, ld = d * 3;
+                laplacian[lb] -= cotA * bdx; laplacian[lb + 1] -= cotA * bdy; laplacian[lb + 2] -= cotA * bdz;
+                laplacian[ld] += cotA * bdx; laplacian[ld + 1] += cotA * bdy; laplacian[ld + 2] += cotA * bdz;
+                laplacian[la] -= cotB * adx; laplacian[la + 1] -= cotB * ady; laplacian[la + 2] -= cotB * adz;
+                laplacian[ld] += cotB * adx; laplacian[ld + 1] += cotB * ady; laplacian[ld + 2] += cotB * adz;
+                laplacian[la] -= cotD * abx; laplacian[la + 1] -= cotD * aby; laplacian[la + 2] -= cotD * abz;
+                laplacian[lb] += cotD * abx; laplacian[lb + 1] += cotD * aby; laplacian[lb + 2] += cotD * abz;
+
+                normal[la] += nx; normal[la + 1] += ny; normal[la + 2] += nz;
+                normal[lb] += nx; normal[lb + 1] += ny; normal[lb + 2] += nz;
+                normal[ld] += nx; normal[ld + 1] += ny; normal[ld + 2] += nz;
+
+                ring[a] ^= b ^ d;
+                ring[b] ^= a ^ d;
+                ring[d] ^= a ^ b;
+                touched[a] = touched[b] = touched[d] = 1;
+            }
+            if (onProgress) onProgress(blockEnd / faceCount);
+        }
+
+        const gaussian = new Float32Array(vertexCount);
+        const mean = new Float32Array(vertexCount);
+        const k1 = new Float32Array(vertexCount);
+        const k2 = new Float32Array(vertexCount);
+        let boundaryVertices = 0;
+        let validVertices = 0;
+        let totalGaussian = 0;  // Σ K·A: 2π·χ on a closed surface (Gauss-Bonnet)
+
+        for (let v = 0; v < vertexCount; v++) {
+            const mixedArea = area[v];
+            if (!touched[v] || ring[v] !== 0 || !(mixedArea > 0)) {
+                if (touched[v] && ring[v] !== 0) boundaryVertices++;
+                gaussian[v] = mean[v] = k1[v] = k2[v] = NaN;
+                continue;
+            }
+            const defect = 2 * Math.PI - angleSum[v];
+            const K = defect / mixedArea;
+            const i = v * 3;
+            const hx = laplacian[i], hy = laplacian[i + 1], hz = laplacian[i + 2];
+            // |K_H| = |Σ cot (xi - xj)| / (2 A), H = |K_H| / 2; positive where the surface bends
+            // away from its normal (convex side of an outward-oriented closed mesh)
+            let H = Math.sqrt(hx * hx + hy * hy + hz * hz) / (4 * mixedArea);
+            if (hx * normal[i] + hy * normal[i + 1] + hz * normal[i + 2] < 0) H = -H;
+            const spread = Math.sqrt(Math.max(0, H * H - K));
+
+            gaussian[v] = K;
+            mean[v] = H;
+            k1[v] = H + spread;
+            k2[v] = H - spread;
+            totalGaussian += defect;
+            validVertices++;
+        }
+
+        return {
+            gaussian, mean, k1, k2,
+            stats: {
+                vertexCount,
+                faceCount,
+                skippedFaces,
+                validVertices,
+                boundaryVertices,
+                totalGaussian
+            },
+            computeTime: performance.now() - startTime
+        };
+    }
+
+    /**
+     * [low, high] quantiles of the finite values (colour ranges robust to spikes at slivers).
+     * Large arrays are strided down to ~sampleSize values before sorting.
+     */
+    static quantileRange(values, low = 0.02, high = 0.98, sampleSize = 65536) {
+        const stride = Math.max(1, Math.floor(values.length / sampleSize));
+        const sample = [];
+        for (let i = 0; i < values.length; i += stride) {
+            if (Number.isFinite(values[i])) sample.push(values[i]);
+        }
+        if (sample.length === 0) return [0, 0];
+        const sorted = Float64Array.from(sample).sort();
+        const at = (q) => sorted[Math.min(sorted.length - 1, Math.max(0, Math.round(q * (sorted.length - 1))))];
+        return [at(low), at(high)];
+    }
+
+    // Arrays to hand back from a worker without copying
+    static transferList(result) {
+        return [result.gaussian.buffer, result.mean.buffer, result.k1.buffer, result.k2.buffer];
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { CurvatureEngine };
+}
@@ -13,7 +13,24 @@ from pathlib import Path
 import webbrowser
 from threading import Thread
 
-class QuietHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+from vendor_assets import VendorMixin
+
+class QuietHTTPRequestHandler(VendorMixin, http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        # Libraries not downloaded into vendor/ yet: redirect to the CDN (vendor_assets.py)
+        if not self.handle_vendor_request(head_only=False):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.handle_vendor_request(head_only=True):
+            super().do_HEAD()
+
+    def end_headers(self):
+        # COOP/COEP: SharedArrayBuffer para el worker pool (ver server.py)
+        self.send_header('Cross-Origin-Opener-Policy', 'same-origin')
+        self.send_header('Cross-Origin-Embedder-Policy', 'credentialless')
+        super().end_headers()
+
     def log_message(self, format, *args):
         # Solo log de errores
         if "error" in format.lower() or args and "error" in str(args):
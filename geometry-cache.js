@@ -0,0 +1,403 @@
+/**
+ * Content-addressed geometry cache (IndexedDB)
+ * Re-opening the same STL skips parsing, precompression, isolation, classification and
+ * fitting: every stage result is stored under a key derived from a streaming hash of the
+ * file bytes, so renamed copies hit and edited files miss.
+ *
+ * - Entries hold typed arrays packed into a single Blob plus a small JSON `meta` object.
+ * - A separate `lru` store tracks size and last access, so touching an entry never
+ *   rewrites its blob; the least recently used entries are evicted past the byte budget.
+ * - Without IndexedDB (private windows, file://) every call degrades to a miss.
+ *
+ * Usage from the console:
+ *   await window.geometryCache.usage()
+ *   await window.geometryCache.clear()
+ */
+
+/**
+ * Incremental 64-bit content hash (two interleaved MurmurHash3 lanes over 8-byte blocks).
+ * Not cryptographic: it only has to tell scans apart, and it runs at memory speed.
+ * Words are read in platform byte order (little-endian on every browser we target).
+ */
+class ContentHasher {
+    constructor(seed = 0) {
+        this.h1 = (0x9747b28c ^ seed) | 0;
+        this.h2 = (0x5bd1e995 ^ seed) | 0;
+        this.length = 0;
+        this.tail = new Uint8Array(8);
+        this.tailWords = new Uint32Array(this.tail.buffer);
+        this.tailLength = 0;
+    }
+
+    /**
+     * Feed the next bytes of the file; chunk boundaries do not change the digest
+     */
+    update(bytes) {
+        this.length += bytes.length;
+        let pos = 0;
+
+        if (this.tailLength > 0) {
+            const take = Math.min(8 - this.tailLength, bytes.length);
+            this.tail.set(bytes.subarray(0, take), this.tailLength);
+            this.tailLength += take;
+            pos = take;
+            if (this.tailLength < 8) return this;
+            this.mixBlocks(this.tailWords, 0, 2);
+            this.tailLength = 0;
+        }
+
+        const blockBytes = (bytes.length - pos) & ~7;
+        if (blockBytes > 0) {
+            const offset = bytes.byteOffset + pos;
+            const words = offset % 4 === 0
+                ? new Uint32Array(bytes.buffer, offset, blockBytes / 4)
+                : new Uint32Array(bytes.slice(pos, pos + blockBytes).buffer);
+            this.mixBlocks(words, 0, words.length);
+            pos += blockBytes;
+        }
+
+        if (pos < bytes.length) {
+            this.tail.set(bytes.subarray(pos), 0);
+            this.tailLength = bytes.length - pos;
+        }
+        return this;
+    }
+
+    mixBlocks(words, start, end) {
+        let h1 = this.h1;
+        let h2 = this.h2;
+        for (let i = start; i < end; i += 2) {
+            let k1 = Math.imul(words[i], 0xcc9e2d51);
+            k1 = Math.imul((k1 << 15) | (k1 >>> 17), 0x1b873593);
+            h1 ^= k1;
+            h1 = (h1 << 13) | (h1 >>> 19);
+            h1 = (Math.imul(h1, 5) + 0xe6546b64) | 0;
+
+            let k2 = Math.imul(words[i + 1], 0x1b873593);
+            k2 = Math.imul((k2 << 17) | (k2 >>> 15), 0xcc9e2d51);
+            h2 ^= k2;
+            h2 = (h2 << 13) | (h2 >>> 19);
+            h2 = (Math.imul(h2, 5) + 0x561ccd1b) | 0;
+        }
+        this.h1 = h1;
+        this.h2 = h2;
+    }
+
+    static fmix(h) {
+        h ^= h >>> 16;
+        h = Math.imul(h, 0x85ebca6b);
+        h ^= h >>> 13;
+        h = Math.imul(h, 0xc2b2ae35);
+        h ^= h >>> 16;
+        return h;
+    }
+
+    /**
+     * 16 hex characters; the hasher can keep being updated afterwards
+     */
+    digest() {
+        let h1 = this.h1;
+        let h2 = this.h2;
+
+        if (this.tailLength > 0) {
+            const padded = new Uint8Array(8);
+            padded.set(this.tail.subarray(0, this.tailLength));
+            const words = new Uint32Array(padded.buffer);
+            h1 ^= Math.imul(Math.imul(words[0], 0xcc9e2d51), 0x1b873593);
+            h2 ^= Math.imul(Math.imul(words[1], 0x1b873593), 0xcc9e2d51);
+        }
+
+        h1 ^= this.length | 0;
+        h2 ^= Math.floor(this.length / 0x100000000) | 0;
+        h1 = (h1 + h2) | 0;
+        h2 = (h2 + h1) | 0;
+        h1 = ContentHasher.fmix(h1);
+        h2 = ContentHasher.fmix(h2);
+        h1 = (h1 + h2) | 0;
+        h2 = (h2 + h1) | 0;
+
+        const hex = (h) => (h >>> 0).toString(16).padStart(8, '0');
+        return hex(h1) + hex(h2);
+    }
+}
+
+class GeometryCache {
+    static DB_NAME = 'wear-analysis-cache';
+    static DB_VERSION = 1;
+    static DEFAULT_BUDGET_BYTES = 1024 * 1024 * 1024;  // 1 GB, capped to a quarter of the origin quota
+    static HASH_CHUNK_BYTES = 8 * 1024 * 1024;
+
+    static isSupported() {
+        return typeof indexedDB !== 'undefined';
+    }
+
+    /**
+     * Stream the file through ContentHasher. The size is part of the key, so
+     * two files only collide if they also have the same length.
+     */
+    static async hashFile(file, options = {}) {
+        const { chunkSize = GeometryCache.HASH_CHUNK_BYTES, onProgress = null } = options;
+        const hasher = new ContentHasher();
+
+        for (let offset = 0; offset < file.size; offset += chunkSize) {
+            const end = Math.min(offset + chunkSize, file.size);
+            const chunk = await file.slice(offset, end).arrayBuffer();
+            hasher.update(new Uint8Array(chunk));
+            if (onProgress) onProgress(end, file.size);
+        }
+
+        return `${hasher.digest()}-${file.size.toString(16)}`;
+    }
+
+    /**
+     * Pack named typed arrays into one Blob (8-byte aligned) plus a layout table
+     */
+    static pack(arrays = {}) {
+        const layout = [];
+        const parts = [];
+        let byteOffset = 0;
+
+        for (const [name, array] of Object.entries(arrays)) {
+            if (!array) continue;
+            const padding = (8 - (byteOffset % 8)) % 8;
+            if (padding) parts.push(new Uint8Array(padding));
+            byteOffset += padding;
+            layout.push({ name, type: array.constructor.name, byteOffset, length: array.length });
+            parts.push(new Uint8Array(array.buffer, array.byteOffset, array.byteLength));
+            byteOffset += array.byteLength;
+        }
+
+        return { blob: new Blob(parts), layout, bytes: byteOffset };
+    }
+
+    /**
+     * Inverse of pack(): typed-array views over one ArrayBuffer read from the blob
+     */
+    static async unpack(blob, layout) {
+        const buffer = await blob.arrayBuffer();
+        const arrays = {};
+        for (const { name, type, byteOffset, length } of layout) {
+            arrays[name] = new globalThis[type](buffer, byteOffset, length);
+        }
+        return arrays;
+    }
+
+    constructor(options = {}) {
+        this.budgetBytes = options.budgetBytes || GeometryCache.DEFAULT_BUDGET_BYTES;
+        this.db = null;
+        this.opening = null;
+        this.enabled = GeometryCache.isSupported();
+        this.stats = { hits: 0, misses: 0, writes: 0, evictions: 0, clears: 0, bytesRead: 0, bytesWritten: 0 };
+        this.fileKey = null;
+        this.lookups = new Map();  // stage label -> 'hit' | 'miss' | 'stored', for the current file
+    }
+
+    async open() {
+        if (!this.enabled) return null;
+        if (this.db) return this.db;
+        if (this.opening) return this.opening;
+
+        this.opening = new Promise((resolve, reject) => {
+            const request = indexedDB.open(GeometryCache.DB_NAME, GeometryCache.DB_VERSION);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                if (!db.objectStoreNames.contains('entries')) {
+                    db.createObjectStore('entries', { keyPath: 'key' });
+                }
+                if (!db.objectStoreNames.contains('lru')) {
+                    db.createObjectStore('lru', { keyPath: 'key' });
+                }
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+            request.onblocked = () => reject(new Error('IndexedDB open blocked by another tab'));
+        }).then(async (db) => {
+            this.db = db;
+            if (globalThis.navigator?.storage?.estimate) {
+                const { quota } = await globalThis.navigator.storage.estimate();
+                if (quota) this.budgetBytes = Math.min(this.budgetBytes, Math.floor(quota / 4));
+            }
+            return db;
+        }).catch((error) => {
+            console.warn('⚠️  Geometry cache disabled:', error.message || error);
+            this.enabled = false;
+            return null;
+        }).finally(() => {
+            this.opening = null;
+        });
+
+        return this.opening;
+    }
+
+    /**
+     * Start tracking lookups for a newly opened file (drives the dashboard indicator)
+     */
+    beginSession(fileKey) {
+        this.fileKey = fileKey;
+        this.lookups.clear();
+    }
+
+    static requestPromise(request) {
+        return new Promise((resolve, reject) => {
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+
+    static transactionDone(tx) {
+        return new Promise((resolve, reject) => {
+            tx.oncomplete = () => resolve();
+            tx.onerror = () => reject(tx.error);
+            tx.onabort = () => reject(tx.error || new Error('Transaction aborted'));
+        });
+    }
+
+    /**
+     * Returns { arrays, meta } or null. `label` names the stage in the dashboard.
+     */
+    async get(key, label = key) {
+        const db = await this.open();
+        if (!db || !key) {
+            this.lookups.set(label, 'miss');
+            return null;
+        }
+
+        try {
+            const tx = db.transaction(['entries', 'lru'], 'readwrite');
+            const record = await GeometryCache.requestPromise(tx.objectStore('entries').get(key));
+            if (record) {
+                tx.objectStore('lru').put({ key, bytes: record.bytes, lastAccess: Date.now() });
+            }
+            await GeometryCache.transactionDone(tx);
+
+            if (!record) {
+                this.stats.misses++;
+                this.lookups.set(label, 'miss');
+                return null;
+            }
+
+            const arrays = await GeometryCache.unpack(record.blob, record.layout);
+            this.stats.hits++;
+            this.stats.bytesRead += record.bytes;
+            this.lookups.set(label, 'hit');
+            return { arrays, meta: record.meta };
+        } catch (error) {
+            console.warn(`⚠️  Cache read failed for ${label}:`, error);
+            this.stats.misses++;
+            this.lookups.set(label, 'miss');
+            return null;
+        }
+    }
+
+    /**
+     * Store typed arrays + JSON-safe meta under `key`, then trim to the budget.
+     * Arrays are copied into the Blob, so callers may keep using (or transfer) them.
+     */
+    async put(key, arrays, meta = {}, label = key) {
+        if (!this.enabled || !key) return false;
+
+        // Pack before the first await so callers can transfer or mutate the arrays right after
+        const { blob, layout, bytes } = GeometryCache.pack(arrays);
+        const db = await this.open();
+        if (!db) return false;
+        if (bytes > this.budgetBytes) {
+            console.warn(`⚠️  ${label} (${(bytes / 1048576).toFixed(1)} MB) exceeds the cache budget, not stored`);
+            return false;
+        }
+
+        try {
+            const tx = db.transaction(['entries', 'lru'], 'readwrite');
+            tx.objectStore('entries').put({ key, layout, meta, blob, bytes });
+            tx.objectStore('lru').put({ key, bytes, lastAccess: Date.now() });
+            await GeometryCache.transactionDone(tx);
+
+            this.stats.writes++;
+            this.stats.bytesWritten += bytes;
+            if (!this.lookups.has(label) || this.lookups.get(label) === 'miss') {
+                this.lookups.set(label, 'stored');
+            }
+            await this.enforceBudget();
+            return true;
+        } catch (error) {
+            // QuotaExceededError included: the analysis itself must never fail on caching
+            console.warn(`⚠️  Cache write failed for ${label}:`, error);
+            return false;
+        }
+    }
+
+    /**
+     * Evict least recently used entries until the total fits the byte budget
+     */
+    async enforceBudget(budgetBytes = this.budgetBytes) {
+        const db = await this.open();
+        if (!db) return 0;
+
+        const records = await GeometryCache.requestPromise(db.transaction('lru').objectStore('lru').getAll());
+        let total = records.reduce((sum, r) => sum + r.bytes, 0);
+        if (total <= budgetBytes) return 0;
+
+        records.sort((a, b) => a.lastAccess - b.lastAccess);
+        const tx = db.transaction(['entries', 'lru'], 'readwrite');
+        let evicted = 0;
+        for (const record of records) {
+            if (total <= budgetBytes) break;
+            tx.objectStore('entries').delete(record.key);
+            tx.objectStore('lru').delete(record.key);
+            total -= record.bytes;
+            evicted++;
+        }
+        await GeometryCache.transactionDone(tx);
+
+        this.stats.evictions += evicted;
+        console.log(`🗑️  Geometry cache evicted ${evicted} entries (${(total / 1048576).toFixed(1)} MB kept)`);
+        return evicted;
+    }
+
+    async usage() {
+        const db = await this.open();
+        if (!db) return { entries: 0, bytes: 0, budgetBytes: this.budgetBytes };
+
+        const records = await GeometryCache.requestPromise(db.transaction('lru').objectStore('lru').getAll());
+        return {
+            entries: records.length,
+            bytes: records.reduce((sum, r) => sum + r.bytes, 0),
+            budgetBytes: this.budgetBytes
+        };
+    }
+
+    async delete(key) {
+        const db = await this.open();
+        if (!db) return;
+
+        const tx = db.transaction(['entries', 'lru'], 'readwrite');
+        tx.objectStore('entries').delete(key);
+        tx.objectStore('lru').delete(key);
+        await GeometryCache.transactionDone(tx);
+    }
+
+    async clear() {
+        const db = await this.open();
+        if (!db) return;
+
+        const tx = db.transaction(['entries', 'lru'], 'readwrite');
+        tx.objectStore('entries').clear();
+        tx.objectStore('lru').clear();
+        await GeometryCache.transactionDone(tx);
+        this.lookups.clear();
+        this.stats.clears++;
+        console.log('🗑️  Geometry cache cleared');
+    }
+
+    getStats() {
+        return {
+            enabled: this.enabled,
+            fileKey: this.fileKey,
+            lookups: Object.fromEntries(this.lookups),
+            ...this.stats
+        };
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { GeometryCache, ContentHasher };
+}
@@ -191,46 +191,123 @@ class GeometryCompressor {
 
 /**
  * Streaming geometry loader for large files
- * Loads STL in chunks to prevent memory spikes
+ * Feeds STL chunks straight into the worker parser to prevent memory spikes
  */
 class StreamingGeometryLoader {
-    static async loadSTLStreaming(file, chunkSize = 1024 * 1024) {
+    /**
+     * Stream an STL file into the worker's incremental parser.
+     * Chunks come from file.stream() (or file.slice() where streams are not
+     * available) and are transferred to the worker as they arrive, so the
+     * whole file never sits in main-thread memory. At most maxChunksInFlight
+     * chunks are unacknowledged at any time (back-pressure).
+     *
+     * Resolves with the worker's parse result: { positions, index, vertexCount, faceCount, ... }
+     */
+    static async loadSTLStreaming(file, options = {}) {
+        const { worker, chunkSize = 4 * 1024 * 1024, maxChunksInFlight = 4 } = options;
+        if (!worker) {
+            throw new Error('StreamingGeometryLoader requires the STL worker');
+        }
+
         return new Promise((resolve, reject) => {
-            const fileSize = file.size;
-            let offset = 0;
-            const chunks = [];
-            const reader = new FileReader();
-
-            const readChunk = () => {
-                if (offset >= fileSize) {
-                    // All chunks read
-                    const combinedArray = new Uint8Array(fileSize);
-                    let pos = 0;
-                    for (const chunk of chunks) {
-                        combinedArray.set(chunk, pos);
-                        pos += chunk.length;
-                    }
-                    resolve(combinedArray);
-                    return;
+            const totalBytes = file.size;
+            let bytesRead = 0;
+            let inFlight = 0;
+            let wake = null;
+            let settled = false;
+            let reader = null;
+
+            const finish = (error, data) => {
+                if (settled) return;
+                settled = true;
+                worker.removeEventListener('message', onMessage);
+                if (wake) wake();
+                if (error) {
+                    if (reader) reader.cancel().catch(() => {});
+                    reject(error);
+                } else {
+                    resolve(data);
                 }
+            };
 
-                const chunk = file.slice(offset, offset + chunkSize);
-                reader.onload = (e) => {
-                    chunks.push(new Uint8Array(e.target.result));
-                    offset += chunkSize;
+            const onMessage = (event) => {
+                const message = event.data;
+                if (message.type === 'streamProgress') {
+                    inFlight--;
+                    window.dispatchEvent(new CustomEvent('streamProgress', {
+                        detail: {
+                            progress: (message.bytesParsed / totalBytes) * 100,
+                            bytesRead,
+                            bytesParsed: message.bytesParsed,
+                            triangles: message.triangles
+                        }
+                    }));
+                    if (wake) wake();
+                } else if (message.type === 'streamChunk' || message.type === 'streamEnd') {
+                    if (message.error) {
+                        finish(new Error(message.error));
+                    } else {
+                        finish(null, message.data);
+                    }
+                }
+            };
 
-                    // Report progress
-                    const progress = (offset / fileSize) * 100;
-                    window.dispatchEvent(new CustomEvent('streamProgress', { detail: { progress } }));
+            const send = async (bytes) => {
+                // Only whole buffers can be transferred
+                const chunk = (bytes.byteOffset === 0 && bytes.byteLength === bytes.buffer.byteLength)
+                    ? bytes
+                    : bytes.slice();
+                while (inFlight >= maxChunksInFlight && !settled) {
+                    await new Promise((r) => { wake = r; });
+                    wake = null;
+                }
+                if (settled) return;
+                inFlight++;
+                bytesRead += chunk.byteLength;
+                worker.postMessage({ type: 'streamChunk', payload: { chunk: chunk.buffer } }, [chunk.buffer]);
+            };
 
-                    readChunk();
-                };
+            const pump = async () => {
+                worker.postMessage({ type: 'streamBegin', payload: { fileName: file.name, totalBytes } });
+
+                if (typeof file.stream === 'function') {
+                    // Stream reads are small (~64 KB); batch them into chunkSize messages
+                    reader = file.stream().getReader();
+                    let batch = new Uint8Array(Math.min(chunkSize, totalBytes));
+                    let fill = 0;
+                    for (;;) {
+                        const { done, value } = await reader.read();
+                        if (done || settled) break;
+                        let pos = 0;
+                        while (pos < value.length) {
+                            const n = Math.min(batch.length - fill, value.length - pos);
+                            batch.set(value.subarray(pos, pos + n), fill);
+                            fill += n;
+                            pos += n;
+                            if (fill === batch.length) {
+                                await send(batch);
+                                batch = new Uint8Array(Math.max(1, Math.min(chunkSize, totalBytes - bytesRead)));
+                                fill = 0;
+                            }
+                        }
+                    }
+                    if (fill > 0) {
+                        await send(batch.subarray(0, fill));
+                    }
+                } else {
+                    for (let offset = 0; offset < totalBytes && !settled; offset += chunkSize) {
+                        const buffer = await file.slice(offset, offset + chunkSize).arrayBuffer();
+                        await send(new Uint8Array(buffer));
+                    }
+                }
 
-                reader.onerror = () => reject(reader.error);
-                reader.readAsArrayBuffer(chunk);
+                if (!settled) {
+                    worker.postMessage({ type: 'streamEnd' });
+                }
             };
 
-            readChunk();
+            worker.addEventListener('message', onMessage);
+            pump().catch((error) => finish(error));
         });
     }
 }
@@ -265,6 +342,12 @@ class PerformanceMonitor {
         };
 
         this.metrics.set(label, result);
+        // Every measured stage also becomes a span in the trace (trace-recorder.js)
+        if (metric.startTime !== undefined) {
+            globalThis.traceRecorder?.complete(label, metric.startTime, endTime, {
+                memoryDeltaMB: (endMemory - metric.startMemory) / (1024 * 1024)
+            }, 'stage');
+        }
         return result;
     }
 
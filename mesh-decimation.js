@@ -0,0 +1,683 @@
+/**
+ * Mesh Decimation
+ * Precompression engine for large scans, run in the STL worker (importScripts) with a
+ * main-thread fallback. All state lives in flat typed arrays.
+ *
+ * - GridWelder: vertices snapped to an integer grid (cell = tolerance) and merged through
+ *   an open-addressing hash on the cell coordinates; no string keys. A merged vertex sits
+ *   at the mean of the corners it absorbed; triangles that collapse are dropped.
+ * - MeshDecimator: quadric error metric edge collapse (Garland & Heckbert 1997) down to a
+ *   triangle budget and/or a maximum error. Open boundaries get penalty planes and creases
+ *   (the liner rim, the slope break at the wear-scar boundary) get heavier quadrics, so
+ *   flat and evenly curved regions are simplified first.
+ * - MeshDecimator.hausdorff: two-sided vertex-to-surface deviation between the input and
+ *   the result (BVH from spatial-index.js), plus the enclosed volume of both.
+ *
+ * Meshes are { positions: Float32Array(3 * vertexCount), index: Uint32Array(3 * faceCount) }.
+ */
+
+// Cell coordinates are hashed as int32 triples (murmur3 finalizer)
+function gridCellHash(i, j, k) {
+    let h = Math.imul(i, 0x8DA6B343) ^ Math.imul(j, 0xD8163841) ^ Math.imul(k, 0xCB1AB31F);
+    h ^= h >>> 16;
+    h = Math.imul(h, 0x85EBCA6B);
+    h ^= h >>> 13;
+    h = Math.imul(h, 0xC2B2AE35);
+    return h ^ (h >>> 16);
+}
+
+class GridWelder {
+    /**
+     * Weld a triangle soup (9 floats per face) on a grid of cellSize (mm)
+     */
+    static weld(soup, cellSize) {
+        const startTime = performance.now();
+        const cornerCount = soup.length / 3;
+        const faceCount = cornerCount / 3;
+        const inverse = 1 / cellSize;
+
+        let size = 1;
+        while (size < cornerCount) size <<= 1;  // Load stays below 0.5 even with no sharing at all
+        const mask = size - 1;
+        const table = new Int32Array(size).fill(-1);
+        const cells = new Int32Array(cornerCount * 3);
+        const sums = new Float64Array(cornerCount * 3);
+        const members = new Uint32Array(cornerCount);
+        const corners = new Uint32Array(cornerCount);
+        let vertexCount = 0;
+
+        for (let c = 0; c < cornerCount; c++) {
+            const x = soup[c * 3], y = soup[c * 3 + 1], z = soup[c * 3 + 2];
+            const i = Math.round(x * inverse) | 0, j = Math.round(y * inverse) | 0, k = Math.round(z * inverse) | 0;
+            let slot = gridCellHash(i, j, k) & mask;
+            let id;
+            while ((id = table[slot]) !== -1) {
+                if (cells[id * 3] === i && cells[id * 3 + 1] === j && cells[id * 3 + 2] === k) break;
+                slot = (slot + 1) & mask;
+            }
+            if (id === -1) {
+                id = vertexCount++;
+                table[slot] = id;
+                cells[id * 3] = i; cells[id * 3 + 1] = j; cells[id * 3 + 2] = k;
+            }
+            sums[id * 3] += x; sums[id * 3 + 1] += y; sums[id * 3 + 2] += z;
+            members[id]++;
+            corners[c] = id;
+        }
+
+        // Drop triangles whose corners fell into the same cell, then number the vertices
+        // still in use in first-use order (sourceCorner: first input corner of each vertex)
+        const remap = new Int32Array(vertexCount).fill(-1);
+        const sourceCorner = new Uint32Array(vertexCount);
+        let kept = 0, used = 0;
+        for (let f = 0; f < faceCount; f++) {
+            const a = corners[f * 3], b = corners[f * 3 + 1], c = corners[f * 3 + 2];
+            if (a === b || b === c || a === c) continue;
+            if (remap[a] === -1) { sourceCorner[used] = f * 3; remap[a] = used++; }
+            if (remap[b] === -1) { sourceCorner[used] = f * 3 + 1; remap[b] = used++; }
+            if (remap[c] === -1) { sourceCorner[used] = f * 3 + 2; remap[c] = used++; }
+            corners[kept * 3] = remap[a]; corners[kept * 3 + 1] = remap[b]; corners[kept * 3 + 2] = remap[c];
+            kept++;
+        }
+
+        const positions = new Float32Array(used * 3);
+        for (let v = 0; v < vertexCount; v++) {
+            const r = remap[v];
+            if (r === -1) continue;
+            const n = members[v];
+            positions[r * 3] = sums[v * 3] / n;
+            positions[r * 3 + 1] = sums[v * 3 + 1] / n;
+            positions[r * 3 + 2] = sums[v * 3 + 2] / n;
+        }
+
+        return {
+            positions,
+            index: corners.slice(0, kept * 3),
+            sourceCorner: sourceCorner.slice(0, used),
+            vertexCount: used,
+            faceCount: kept,
+            degenerate: faceCount - kept,
+            weldTime: performance.now() - startTime
+        };
+    }
+}
+
+class MeshDecimator {
+    static FEATURE_ANGLE = Math.PI / 12;  // Dihedral angle (15°) at which a crease gets the full feature weight
+    static BOUNDARY_WEIGHT = 100;  // Penalty-plane weight for open boundary edges
+    static FLIP_COS = 0.2;  // Reject collapses that turn a neighbouring face by more than ~78°
+    static HAUSDORFF_SAMPLES = 1000000;  // Corners measured per side of the deviation report
+
+    /**
+     * Collapse edges in order of quadric error until the mesh has targetFaces faces or the
+     * next collapse would move the surface more than maxError (mm).
+     *
+     * options.targetFaces: triangle budget (default: no budget)
+     * options.maxError: tolerance in mm on the quadric error, i.e. the area-weighted RMS distance
+     *   to the planes merged into a vertex (default: none); hausdorff() gives the true maximum
+     * options.featureWeight: extra quadric weight at creases (default 10, 0 = plain QEM)
+     * options.onProgress(fraction)
+     */
+    static decimate(mesh, options = {}) {
+        const { targetFaces = 0, maxError = Infinity, featureWeight = 10, onProgress = null } = options;
+        const startTime = performance.now();
+        const decimator = new MeshDecimator(mesh, featureWeight);
+        const collapses = decimator.run(targetFaces, maxError, onProgress);
+        const result = decimator.compact();
+        result.collapses = collapses;
+        result.decimateTime = performance.now() - startTime;
+        return result;
+    }
+
+    /**
+     * Whole precompression step on a triangle soup: weld on a grid of options.cellSize, then
+     * decimate when options.targetFaces / options.maxError ask for fewer faces, and measure
+     * what it cost against the input. Same result in the worker and on the main thread.
+     */
+    static precompress(soup, options = {}) {
+        const { cellSize, targetFaces = 0, maxError = Infinity, featureWeight = 10, hausdorffSamples, onProgress = null } = options;
+        const trace = globalThis.traceRecorder;
+        const span = (name, fn, args) => trace ? trace.span(name, fn, args, 'precompress') : fn();
+
+        const welded = span('precompress:weld', () => GridWelder.weld(soup, cellSize), { faces: soup.length / 9, cellSize });
+        let mesh = welded;
+        if ((targetFaces > 0 && targetFaces < welded.faceCount) || maxError < Infinity) {
+            mesh = span('precompress:decimate', () => MeshDecimator.decimate(welded, { targetFaces, maxError, featureWeight, onProgress }),
+                { faces: welded.faceCount, targetFaces });
+        }
+
+        const decimatedSoup = MeshDecimator.toSoup(mesh);
+        const hausdorff = span('precompress:hausdorff', () => MeshDecimator.hausdorff(soup, decimatedSoup, hausdorffSamples), {});
+        return {
+            positions: mesh.positions,
+            index: mesh.index,
+            vertexCount: mesh.vertexCount,
+            faceCount: mesh.faceCount,
+            stats: {
+                inputFaces: soup.length / 9,
+                weldedVertices: welded.vertexCount,
+                weldedFaces: welded.faceCount,
+                degenerateRemoved: welded.degenerate,
+                collapses: mesh.collapses || 0,
+                hausdorff,
+                volumeBefore: MeshDecimator.soupVolume(soup),
+                volumeAfter: MeshDecimator.soupVolume(decimatedSoup),
+                weldTime: welded.weldTime,
+                decimateTime: mesh.decimateTime || 0
+            }
+        };
+    }
+
+    /**
+     * Level-of-detail chain for rendering: weld once, then decimate each level from the
+     * previous one to ratios[i] of the welded faces (levels under minFaces are not built).
+     * Each level carries its Hausdorff deviation from the input, the geometric error for a
+     * screen-space-error test, and the input corner each of its vertices was kept from, so
+     * per-corner attributes of the soup (zone colours, face groups) can be gathered onto it.
+     */
+    static levels(soup, options = {}) {
+        const { cellSize, ratios = [0.25, 0.0625], minFaces = 20000, featureWeight = 10, hausdorffSamples = 200000, onProgress = null } = options;
+        const welded = GridWelder.weld(soup, cellSize);
+        const levels = [];
+        let mesh = welded;
+        let sourceCorner = welded.sourceCorner;
+        for (let i = 0; i < ratios.length; i++) {
+            const targetFaces = Math.round(welded.faceCount * ratios[i]);
+            if (targetFaces < minFaces || targetFaces >= mesh.faceCount) break;
+            const level = MeshDecimator.decimate(mesh, {
+                targetFaces,
+                featureWeight,
+                onProgress: onProgress ? (progress) => onProgress((i + progress) / ratios.length) : null
+            });
+            const levelCorner = new Uint32Array(level.vertexCount);
+            for (let v = 0; v < level.vertexCount; v++) levelCorner[v] = sourceCorner[level.sourceVertex[v]];
+            const deviation = MeshDecimator.hausdorff(soup, MeshDecimator.toSoup(level), hausdorffSamples);
+            levels.push({
+                positions: level.positions,
+                index: level.index,
+                sourceCorner: levelCorner,
+                vertexCount: level.vertexCount,
+                faceCount: level.faceCount,
+                error: deviation.max,
+                buildTime: level.decimateTime + deviation.time
+            });
+            mesh = level;
+            sourceCorner = levelCorner;
+        }
+        return { levels, inputFaces: soup.length / 9, weldTime: welded.weldTime };
+    }
+
+    constructor(mesh, featureWeight) {
+        const vertexCount = mesh.positions.length / 3;
+        const faceCount = mesh.index.length / 3;
+        this.vertexCount = vertexCount;
+        this.faceCount = faceCount;
+        this.liveFaces = faceCount;
+        this.positions = Float64Array.from(mesh.positions);
+        this.index = Int32Array.from(mesh.index);
+        this.faceAlive = new Uint8Array(faceCount).fill(1);
+        this.vertexAlive = new Uint8Array(vertexCount).fill(1);
+        this.changedAt = new Int32Array(vertexCount);  // Collapse counter when the vertex last moved
+        this.boundary = new Uint8Array(vertexCount);
+        this.quadrics = new Float64Array(vertexCount * 10);  // Symmetric 4x4: a², ab, ac, ad, b², bc, bd, c², cd, d²
+        this.areas = new Float64Array(vertexCount);  // Area behind each quadric, to turn costs into mm²
+        this.weights = new Float32Array(vertexCount).fill(1);
+        this.marks = new Int32Array(vertexCount).fill(-1);
+        this.markFace = new Int32Array(vertexCount);
+        this.stamp = 0;
+        this.collapseCount = 0;
+
+        // Per-vertex corner lists (corner = 3 * face + k), linked through cornerNext
+        this.head = new Int32Array(vertexCount).fill(-1);
+        this.tail = new Int32Array(vertexCount).fill(-1);
+        this.cornerNext = new Int32Array(faceCount * 3).fill(-1);
+        for (let c = 0; c < faceCount * 3; c++) {
+            const v = this.index[c];
+            if (this.head[v] === -1) this.head[v] = c; else this.cornerNext[this.tail[v]] = c;
+            this.tail[v] = c;
+        }
+
+        // Binary min-heap of candidate collapses (lazy deletion: stale entries are skipped)
+        this.heapSize = 0;
+        this.allocHeap(Math.max(1024, faceCount * 2));
+
+        this.normal = new Float64Array(3);
+        this.target = new Float64Array(3);
+        this.initQuadrics(featureWeight);
+    }
+
+    allocHeap(capacity) {
+        const keys = new Float32Array(capacity), a = new Int32Array(capacity), b = new Int32Array(capacity), at = new Int32Array(capacity);
+        if (this.heapKeys) {
+            keys.set(this.heapKeys); a.set(this.heapA); b.set(this.heapB); at.set(this.heapAt);
+        }
+        this.heapKeys = keys; this.heapA = a; this.heapB = b; this.heapAt = at;
+    }
+
+    // Unnormalized normal of face f (twice its area) into this.normal
+    faceNormal(f, moved = -1, px = 0, py = 0, pz = 0) {
+        const p = this.positions, idx = this.index;
+        const o = f * 3;
+        const v0 = idx[o], v1 = idx[o + 1], v2 = idx[o + 2];
+        const ax = v0 === moved ? px : p[v0 * 3], ay = v0 === moved ? py : p[v0 * 3 + 1], az = v0 === moved ? pz : p[v0 * 3 + 2];
+        const bx = v1 === moved ? px : p[v1 * 3], by = v1 === moved ? py : p[v1 * 3 + 1], bz = v1 === moved ? pz : p[v1 * 3 + 2];
+        const cx = v2 === moved ? px : p[v2 * 3], cy = v2 === moved ? py : p[v2 * 3 + 1], cz = v2 === moved ? pz : p[v2 * 3 + 2];
+        const ux = bx - ax, uy = by - ay, uz = bz - az;
+        const vx = cx - ax, vy = cy - ay, vz = cz - az;
+        const n = this.normal;
+        n[0] = uy * vz - uz * vy;
+        n[1] = uz * vx - ux * vz;
+        n[2] = ux * vy - uy * vx;
+        return n;
+    }
+
+    addPlane(v, nx, ny, nz, d, weight) {
+        const q = this.quadrics, o = v * 10;
+        q[o] += weight * nx * nx; q[o + 1] += weight * nx * ny; q[o + 2] += weight * nx * nz; q[o + 3] += weight * nx * d;
+        q[o + 4] += weight * ny * ny; q[o + 5] += weight * ny * nz; q[o + 6] += weight * ny * d;
+        q[o + 7] += weight * nz * nz; q[o + 8] += weight * nz * d;
+        q[o + 9] += weight * d * d;
+    }
+
+    initQuadrics(featureWeight) {
+        const p = this.positions, idx = this.index;
+        const crease = new Float32Array(this.vertexCount);
+        const faceNormals = new Float32Array(this.faceCount * 3);
+
+        // Face planes, area weighted
+        for (let f = 0; f < this.faceCount; f++) {
+            const n = this.faceNormal(f);
+            const length = Math.hypot(n[0], n[1], n[2]);
+            if (length === 0) continue;
+            const nx = n[0] / length, ny = n[1] / length, nz = n[2] / length;
+            faceNormals[f * 3] = nx; faceNormals[f * 3 + 1] = ny; faceNormals[f * 3 + 2] = nz;
+            const v0 = idx[f * 3];
+            const d = -(nx * p[v0 * 3] + ny * p[v0 * 3 + 1] + nz * p[v0 * 3 + 2]);
+            const area = length / 2;
+            for (let k = 0; k < 3; k++) {
+                const v = idx[f * 3 + k];
+                this.addPlane(v, nx, ny, nz, d, area);
+                this.areas[v] += area;
+            }
+        }
+
+        // Edges from each vertex's faces: seen once = boundary, twice = interior (dihedral -> crease)
+        const counts = new Int32Array(this.vertexCount);
+        for (let a = 0; a < this.vertexCount; a++) {
+            this.stamp++;
+            for (let c = this.head[a]; c !== -1; c = this.cornerNext[c]) {
+                const f = (c / 3) | 0;
+                for (let k = 0; k < 3; k++) {
+                    const b = idx[f * 3 + k];
+                    if (b <= a) continue;  // Each edge handled from its lower vertex
+                    if (this.marks[b] !== this.stamp) {
+                        this.marks[b] = this.stamp;
+                        counts[b] = 0;
+                        this.markFace[b] = f;
+                    } else if (counts[b] === 1) {
+                        const g = this.markFace[b];
+                        const cos = faceNormals[f * 3] * faceNormals[g * 3] + faceNormals[f * 3 + 1] * faceNormals[g * 3 + 1] +
+                            faceNormals[f * 3 + 2] * faceNormals[g * 3 + 2];
+                        const angle = Math.acos(Math.max(-1, Math.min(1, cos)));
+                        if (angle > crease[a]) crease[a] = angle;
+                        if (angle > crease[b]) crease[b] = angle;
+                    }
+                    counts[b]++;
+                }
+            }
+            for (let c = this.head[a]; c !== -1; c = this.cornerNext[c]) {
+                const f = (c / 3) | 0;
+                for (let k = 0; k < 3; k++) {
+                    const b = idx[f * 3 + k];
+                    if (b <= a || this.marks[b] !== this.stamp || counts[b] === 2) continue;
+                    this.marks[b] = -1;  // Visit each boundary (or non-manifold) edge once
+                    this.boundary[a] = 1;
+                    this.boundary[b] = 1;
+                    this.addBoundaryPlanes(a, b, this.markFace[b], faceNormals);
+                }
+            }
+        }
+
+        // Curvature-aware weights: creases keep their quadrics heavier than smooth regions
+        if (featureWeight > 0) {
+            const q = this.quadrics;
+            for (let v = 0; v < this.vertexCount; v++) {
+                const weight = 1 + featureWeight * Math.min(1, crease[v] / MeshDecimator.FEATURE_ANGLE);
+                this.weights[v] = weight;
+                if (weight === 1) continue;
+                for (let i = 0; i < 10; i++) q[v * 10 + i] *= weight;
+            }
+        }
+        this.marks.fill(-1);
+        this.stamp = 0;
+
+        // Initial candidates: every edge once
+        for (let f = 0; f < this.faceCount; f++) {
+            for (let k = 0; k < 3; k++) {
+                const a = idx[f * 3 + k], b = idx[f * 3 + (k + 1) % 3];
+                // Interior edges appear in two faces with opposite orientation; boundary ones once
+                if (a < b || this.boundary[a] && this.boundary[b]) this.pushEdge(a, b);
+            }
+        }
+    }
+
+    // Plane through the edge, perpendicular to its face: keeps open borders in place
+    addBoundaryPlanes(a, b, f, faceNormals) {
+        const p = this.positions;
+        const ex = p[b * 3] - p[a * 3], ey = p[b * 3 + 1] - p[a * 3 + 1], ez = p[b * 3 + 2] - p[a * 3 + 2];
+        const fx = faceNormals[f * 3], fy = faceNormals[f * 3 + 1], fz = faceNormals[f * 3 + 2];
+        let mx = ey * fz - ez * fy, my = ez * fx - ex * fz, mz = ex * fy - ey * fx;
+        const length = Math.hypot(mx, my, mz);
+        if (length === 0) return;
+        mx /= length; my /= length; mz /= length;
+        const d = -(mx * p[a * 3] + my * p[a * 3 + 1] + mz * p[a * 3 + 2]);
+        const weight = MeshDecimator.BOUNDARY_WEIGHT * (ex * ex + ey * ey + ez * ez);
+        this.addPlane(a, mx, my, mz, d, weight);
+        this.addPlane(b, mx, my, mz, d, weight);
+    }
+
+    /**
+     * Best position for collapsing a-b into this.target; returns the error in mm²
+     * (quadric cost over the area behind both quadrics)
+     */
+    collapseCost(a, b) {
+        const q = this.quadrics, p = this.positions, t = this.target;
+        const oa = a * 10, ob = b * 10;
+        const q0 = q[oa] + q[ob], q1 = q[oa + 1] + q[ob + 1], q2 = q[oa + 2] + q[ob + 2], q3 = q[oa + 3] + q[ob + 3];
+        const q4 = q[oa + 4] + q[ob + 4], q5 = q[oa + 5] + q[ob + 5], q6 = q[oa + 6] + q[ob + 6];
+        const q7 = q[oa + 7] + q[ob + 7], q8 = q[oa + 8] + q[ob + 8], q9 = q[oa + 9] + q[ob + 9];
+
+        // Minimizer of the quadric: A x = -b (Cramer), unless A is near singular
+        const c00 = q4 * q7 - q5 * q5, c01 = q2 * q5 - q1 * q7, c02 = q1 * q5 - q2 * q4;
+        const det = q0 * c00 + q1 * c01 + q2 * c02;
+        const scale = q0 + q4 + q7;
+        let cost = Infinity;
+        if (Math.abs(det) > 1e-12 * scale * scale * scale) {
+            const c11 = q0 * q7 - q2 * q2, c12 = q1 * q2 - q0 * q5, c22 = q0 * q4 - q1 * q1;
+            const x = -(c00 * q3 + c01 * q6 + c02 * q8) / det;
+            const y = -(c01 * q3 + c11 * q6 + c12 * q8) / det;
+            const z = -(c02 * q3 + c12 * q6 + c22 * q8) / det;
+            // Far-off minimizers (nearly flat quadrics) are numerically meaningless
+            const mx = (p[a * 3] + p[b * 3]) / 2, my = (p[a * 3 + 1] + p[b * 3 + 1]) / 2, mz = (p[a * 3 + 2] + p[b * 3 + 2]) / 2;
+            const ex = p[a * 3] - p[b * 3], ey = p[a * 3 + 1] - p[b * 3 + 1], ez = p[a * 3 + 2] - p[b * 3 + 2];
+            const dx = x - mx, dy = y - my, dz = z - mz;
+            if (dx * dx + dy * dy + dz * dz <= 4 * (ex * ex + ey * ey + ez * ez)) {
+                // At the minimizer v'Qv reduces to d² + b·x
+                cost = q9 + q3 * x + q6 * y + q8 * z;
+                t[0] = x; t[1] = y; t[2] = z;
+            }
+        }
+        if (cost === Infinity) {
+            // Endpoints and midpoint
+            for (let s = 0; s <= 2; s++) {
+                const w = s / 2;
+                const x = p[a * 3] * (1 - w) + p[b * 3] * w;
+                const y = p[a * 3 + 1] * (1 - w) + p[b * 3 + 1] * w;
+                const z = p[a * 3 + 2] * (1 - w) + p[b * 3 + 2] * w;
+                const value = q0 * x * x + 2 * q1 * x * y + 2 * q2 * x * z + 2 * q3 * x +
+                    q4 * y * y + 2 * q5 * y * z + 2 * q6 * y +
+                    q7 * z * z + 2 * q8 * z + q9;
+                if (value < cost) {
+                    cost = value;
+                    t[0] = x; t[1] = y; t[2] = z;
+                }
+            }
+        }
+        const area = this.areas[a] * this.weights[a] + this.areas[b] * this.weights[b];
+        return Math.max(0, cost) / (area > 0 ? area : 1);
+    }
+
+    pushEdge(a, b) {
+        const key = this.collapseCost(a, b) * Math.max(this.weights[a], this.weights[b]);
+        if (this.heapSize === this.heapKeys.length) this.allocHeap(this.heapKeys.length * 2);
+        const keys = this.heapKeys, ha = this.heapA, hb = this.heapB, at = this.heapAt;
+        let i = this.heapSize++;
+        while (i > 0) {
+            const parent = (i - 1) >> 1;
+            if (keys[parent] <= key) break;
+            keys[i] = keys[parent]; ha[i] = ha[parent]; hb[i] = hb[parent]; at[i] = at[parent];
+            i = parent;
+        }
+        keys[i] = key; ha[i] = a; hb[i] = b; at[i] = this.collapseCount;
+    }
+
+    // Remove the heap top into (this.topA, this.topB, this.topAt)
+    popEdge() {
+        const keys = this.heapKeys, ha = this.heapA, hb = this.heapB, at = this.heapAt;
+        this.topA = ha[0]; this.topB = hb[0]; this.topAt = at[0];
+        const n = --this.heapSize;
+        const key = keys[n], a = ha[n], b = hb[n], stamp = at[n];
+        let i = 0;
+        while (true) {
+            let child = 2 * i + 1;
+            if (child >= n) break;
+            if (child + 1 < n && keys[child + 1] < keys[child]) child++;
+            if (keys[child] >= key) break;
+            keys[i] = keys[child]; ha[i] = ha[child]; hb[i] = hb[child]; at[i] = at[child];
+            i = child;
+        }
+        keys[i] = key; ha[i] = a; hb[i] = b; at[i] = stamp;
+    }
+
+    /**
+     * Collapse is allowed if a and b share exactly the faces' opposite vertices (link
+     * condition: no pinched, non-manifold result) and no surrounding face flips over
+     */
+    canCollapse(a, b, px, py, pz) {
+        const idx = this.index;
+        const stamp = ++this.stamp;
+        let sharedFaces = 0;
+        for (let c = this.head[a]; c !== -1; c = this.cornerNext[c]) {
+            const f = (c / 3) | 0;
+            if (!this.faceAlive[f]) continue;
+            for (let k = 0; k < 3; k++) this.marks[idx[f * 3 + k]] = stamp;
+        }
+        let common = 0;
+        const counted = ++this.stamp;
+        for (let c = this.head[b]; c !== -1; c = this.cornerNext[c]) {
+            const f = (c / 3) | 0;
+            if (!this.faceAlive[f]) continue;
+            let hasA = false;
+            for (let k = 0; k < 3; k++) {
+                const v = idx[f * 3 + k];
+                if (v === a) hasA = true;
+                else if (v !== b && this.marks[v] === stamp) {
+                    this.marks[v] = counted;
+                    common++;
+                }
+            }
+            if (hasA) sharedFaces++;
+        }
+        if (sharedFaces === 0 || common !== sharedFaces) return false;
+        // Two border vertices joined across the interior would pinch the surface
+        if (sharedFaces === 2 && this.boundary[a] && this.boundary[b]) return false;
+
+        for (let side = 0; side < 2; side++) {
+            const v = side === 0 ? a : b;
+            for (let c = this.head[v]; c !== -1; c = this.cornerNext[c]) {
+                const f = (c / 3) | 0;
+                if (!this.faceAlive[f]) continue;
+                const o = f * 3;
+                if ((idx[o] === a || idx[o + 1] === a || idx[o + 2] === a) &&
+                    (idx[o] === b || idx[o + 1] === b || idx[o + 2] === b)) continue;  // Removed by the collapse
+                const n = this.faceNormal(f);
+                const bx = n[0], by = n[1], bz = n[2];
+                const after = this.faceNormal(f, v, px, py, pz);
+                const dot = bx * after[0] + by * after[1] + bz * after[2];
+                const lengths = Math.hypot(bx, by, bz) * Math.hypot(after[0], after[1], after[2]);
+                if (lengths === 0 || dot < MeshDecimator.FLIP_COS * lengths) return false;
+            }
+        }
+        return true;
+    }
+
+    collapse(a, b, px, py, pz) {
+        const idx = this.index, q = this.quadrics, p = this.positions;
+        p[a * 3] = px; p[a * 3 + 1] = py; p[a * 3 + 2] = pz;
+        for (let i = 0; i < 10; i++) q[a * 10 + i] += q[b * 10 + i];
+        this.areas[a] += this.areas[b];
+        this.weights[a] = Math.max(this.weights[a], this.weights[b]);
+        this.boundary[a] |= this.boundary[b];
+        this.vertexAlive[b] = 0;
+
+        for (let c = this.head[b]; c !== -1; c = this.cornerNext[c]) {
+            const f = (c / 3) | 0;
+            if (!this.faceAlive[f]) continue;
+            const o = f * 3;
+            if (idx[o] === a || idx[o + 1] === a || idx[o + 2] === a) {
+                this.faceAlive[f] = 0;
+                this.liveFaces--;
+            } else {
+                idx[c] = a;
+            }
+        }
+        // Append b's corners to a's list, then drop corners of dead faces from it
+        this.cornerNext[this.tail[a]] = this.head[b];
+        this.tail[a] = this.tail[b];
+        let previous = -1;
+        for (let c = this.head[a]; c !== -1; c = this.cornerNext[c]) {
+            if (!this.faceAlive[(c / 3) | 0]) continue;
+            if (previous === -1) this.head[a] = c; else this.cornerNext[previous] = c;
+            previous = c;
+        }
+        this.head[a] = previous === -1 ? -1 : this.head[a];
+        this.tail[a] = previous;
+        if (previous !== -1) this.cornerNext[previous] = -1;
+
+        this.collapseCount++;
+        this.changedAt[a] = this.collapseCount;
+        this.changedAt[b] = this.collapseCount;
+
+        // New candidates around the merged vertex
+        const stamp = ++this.stamp;
+        this.marks[a] = stamp;
+        for (let c = this.head[a]; c !== -1; c = this.cornerNext[c]) {
+            const f = (c / 3) | 0;
+            for (let k = 0; k < 3; k++) {
+                const v = idx[f * 3 + k];
+                if (this.marks[v] === stamp) continue;
+                this.marks[v] = stamp;
+                this.pushEdge(a, v);
+            }
+        }
+    }
+
+    run(targetFaces, maxError, onProgress) {
+        const maxErrorSq = maxError * maxError;
+        const t = this.target;
+        const startFaces = this.liveFaces;
+        const budget = Math.max(0, startFaces - targetFaces);
+        while (this.liveFaces > targetFaces && this.heapSize > 0) {
+            this.popEdge();
+            const a = this.topA, b = this.topB;
+            if (!this.vertexAlive[a] || !this.vertexAlive[b]) continue;
+            if (this.changedAt[a] > this.topAt || this.changedAt[b] > this.topAt) continue;  // Stale entry
+
+            // Edges over the tolerance are dropped; they come back if a neighbour collapse changes them
+            if (this.collapseCost(a, b) > maxErrorSq) continue;
+            const px = t[0], py = t[1], pz = t[2];
+            if (!this.canCollapse(a, b, px, py, pz)) continue;
+            this.collapse(a, b, px, py, pz);
+
+            if (onProgress && (this.collapseCount & 0xFFFF) === 0) {
+                onProgress(budget > 0 ? Math.min(1, (startFaces - this.liveFaces) / budget) : 0);
+            }
+        }
+        return this.collapseCount;
+    }
+
+    // Live faces and vertices renumbered; sourceVertex: input vertex kept as each output vertex
+    compact() {
+        const remap = new Int32Array(this.vertexCount).fill(-1);
+        const index = new Uint32Array(this.liveFaces * 3);
+        const sourceVertex = new Uint32Array(this.vertexCount);
+        let vertexCount = 0, o = 0;
+        for (let f = 0; f < this.faceCount; f++) {
+            if (!this.faceAlive[f]) continue;
+            for (let k = 0; k < 3; k++) {
+                const v = this.index[f * 3 + k];
+                if (remap[v] === -1) {
+                    sourceVertex[vertexCount] = v;
+                    remap[v] = vertexCount++;
+                }
+                index[o++] = remap[v];
+            }
+        }
+        const positions = new Float32Array(vertexCount * 3);
+        for (let v = 0; v < this.vertexCount; v++) {
+            const r = remap[v];
+            if (r === -1) continue;
+            positions[r * 3] = this.positions[v * 3];
+            positions[r * 3 + 1] = this.positions[v * 3 + 1];
+            positions[r * 3 + 2] = this.positions[v * 3 + 2];
+        }
+        return { positions, index, sourceVertex: sourceVertex.slice(0, vertexCount), vertexCount, faceCount: this.liveFaces };
+    }
+
+    /**
+     * Indexed mesh -> triangle soup (9 floats per face)
+     */
+    static toSoup(mesh) {
+        const { positions, index } = mesh;
+        const soup = new Float32Array(index.length * 3);
+        for (let c = 0; c < index.length; c++) {
+            const v = index[c] * 3;
+            soup[c * 3] = positions[v];
+            soup[c * 3 + 1] = positions[v + 1];
+            soup[c * 3 + 2] = positions[v + 2];
+        }
+        return soup;
+    }
+
+    /**
+     * Signed enclosed volume of a triangle soup (divergence theorem; exact for closed meshes)
+     */
+    static soupVolume(soup) {
+        let volume = 0;
+        for (let o = 0; o < soup.length; o += 9) {
+            const ax = soup[o], ay = soup[o + 1], az = soup[o + 2];
+            const bx = soup[o + 3], by = soup[o + 4], bz = soup[o + 5];
+            const cx = soup[o + 6], cy = soup[o + 7], cz = soup[o + 8];
+            volume += ax * (by * cz - bz * cy) + ay * (bz * cx - bx * cz) + az * (bx * cy - by * cx);
+        }
+        return volume / 6;
+    }
+
+    /**
+     * Two-sided Hausdorff deviation between two triangle soups, sampled at their corners:
+     * original corners -> decimated surface and decimated corners -> original surface.
+     * At most sampleLimit corners per side (evenly strided) are measured.
+     */
+    static hausdorff(originalSoup, decimatedSoup, sampleLimit = MeshDecimator.HAUSDORFF_SAMPLES) {
+        const startTime = performance.now();
+        const oneSided = (points, surface) => {
+            const index = SpatialIndex.build(surface, 9);
+            const corners = points.length / 3;
+            const step = Math.max(1, Math.ceil(corners / sampleLimit));
+            let max = 0, sum = 0, sumSq = 0, samples = 0;
+            for (let c = 0; c < corners; c += step) {
+                const { distances } = index.nearest(points[c * 3], points[c * 3 + 1], points[c * 3 + 2], 1);
+                const d = distances[0];
+                if (d > max) max = d;
+                sum += d;
+                sumSq += d * d;
+                samples++;
+            }
+            return { max, mean: sum / samples, rms: Math.sqrt(sumSq / samples), samples };
+        };
+        const forward = oneSided(originalSoup, decimatedSoup);
+        const backward = oneSided(decimatedSoup, originalSoup);
+        return {
+            max: Math.max(forward.max, backward.max),
+            mean: forward.mean,
+            rms: forward.rms,
+            forward,
+            backward,
+            time: performance.now() - startTime
+        };
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { GridWelder, MeshDecimator };
+}
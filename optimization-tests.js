@@ -26,6 +26,54 @@ async function runOptimizationTests() {
     // Test 5: Streaming Loader
     tests.push(testStreamingLoader());
     
+    // Test 6: Spatial Index
+    tests.push(testSpatialIndex());
+    
+    // Test 7: Worker Pool
+    tests.push(testWorkerPool());
+    
+    // Test 8: Geometry Cache
+    tests.push(testGeometryCache());
+    
+    // Test 9: Stage Graph
+    tests.push(testStageGraph());
+    
+    // Test 10: Trace Recorder
+    tests.push(testTraceRecorder());
+    
+    // Test 11: Mesh Decimation
+    tests.push(testMeshDecimation());
+    
+    // Test 12: Surface Model
+    tests.push(testSurfaceModel());
+    
+    // Test 13: Ray Clustering
+    tests.push(testRayClustering());
+    
+    // Test 14: Progressive Analysis
+    tests.push(testProgressiveAnalysis());
+    
+    // Test 15: Binary Export
+    tests.push(testBinaryExport());
+    
+    // Test 16: Curvature Engine
+    tests.push(testCurvatureEngine());
+    
+    // Test 17: LOD Levels
+    tests.push(testLodLevels());
+    
+    // Test 18: RANSAC
+    tests.push(testRansac());
+    
+    // Test 19: ASCII STL Tokenizer
+    tests.push(testAsciiTokenizer());
+    
+    // Test 20: Binary STL Parser
+    tests.push(testBinaryStlParser());
+    
+    // Test 21: Mesh Topology
+    tests.push(testMeshTopology());
+    
     const results = await Promise.all(tests);
     
     console.log('\n📊 Test Results:\n');
@@ -244,12 +292,12 @@ function testStreamingLoader() {
                 return;
             }
             
-            // Check if FileReader API available
-            if (typeof FileReader === 'undefined') {
+            // Chunks come from Blob.stream(), or Blob.slice().arrayBuffer() as fallback
+            if (typeof Blob === 'undefined' || (!Blob.prototype.stream && !Blob.prototype.arrayBuffer)) {
                 resolve({
                     passed: false,
                     name: 'Streaming Loader',
-                    message: 'FileReader API not available'
+                    message: 'Blob stream/arrayBuffer API not available'
                 });
                 return;
             }
@@ -258,7 +306,7 @@ function testStreamingLoader() {
                 passed: true,
                 name: 'Streaming Loader',
                 message: 'Streaming loader ready for large files',
-                details: 'API available - will activate for files > 50MB'
+                details: `${Blob.prototype.stream ? 'Blob.stream()' : 'Blob.slice()'} → worker parser, activates for files > 50MB`
             });
         } catch (error) {
             resolve({
@@ -270,6 +318,1046 @@ function testStreamingLoader() {
     });
 }
 
+function testSpatialIndex() {
+    return new Promise((resolve) => {
+        try {
+            if (typeof SpatialIndex === 'undefined') {
+                resolve({
+                    passed: false,
+                    name: 'Spatial Index',
+                    message: 'SpatialIndex not found'
+                });
+                return;
+            }
+            
+            // Random points and small triangles, checked against brute force
+            const pointCount = 5000;
+            const points = new Float32Array(pointCount * 3).map(() => Math.random() * 40 - 20);
+            const triangles = new Float32Array(pointCount * 9);
+            for (let i = 0; i < pointCount; i++) {
+                for (let k = 0; k < 9; k++) {
+                    triangles[i * 9 + k] = points[i * 3 + (k % 3)] + (Math.random() - 0.5);
+                }
+            }
+            const pointIndex = SpatialIndex.build(points, 3);
+            const triangleIndex = SpatialIndex.build(triangles, 9);
+            
+            let failures = 0;
+            for (let q = 0; q < 20; q++) {
+                const x = Math.random() * 40 - 20, y = Math.random() * 40 - 20, z = Math.random() * 40 - 20;
+                for (const index of [pointIndex, triangleIndex]) {
+                    let bestItem = -1, bestDist = Infinity, inRadius = 0;
+                    for (let i = 0; i < index.itemCount; i++) {
+                        const d = index.itemDistanceSq(i, x, y, z);
+                        if (d < bestDist) {
+                            bestDist = d;
+                            bestItem = i;
+                        }
+                        if (d <= 9) inRadius++;
+                    }
+                    if (index.nearest(x, y, z, 1).items[0] !== bestItem) failures++;
+                    if (index.radiusSearch(x, y, z, 3).length !== inRadius) failures++;
+                }
+                
+                // Ray from the query point towards the centroid of triangle q
+                const o = q * 9;
+                const tx = (triangles[o] + triangles[o + 3] + triangles[o + 6]) / 3;
+                const ty = (triangles[o + 1] + triangles[o + 4] + triangles[o + 7]) / 3;
+                const tz = (triangles[o + 2] + triangles[o + 5] + triangles[o + 8]) / 3;
+                const hit = triangleIndex.raycast(x, y, z, tx - x, ty - y, tz - z);
+                if (!hit || hit.t > 1 + 1e-4) failures++;
+            }
+            
+            resolve({
+                passed: failures === 0,
+                name: 'Spatial Index',
+                message: failures === 0 ? 'BVH radius, k-NN and ray queries match brute force' : `${failures} query mismatches`,
+                details: `${pointCount} points / ${pointCount} triangles, build ${(pointIndex.buildTime + triangleIndex.buildTime).toFixed(1)}ms`
+            });
+        } catch (error) {
+            resolve({
+                passed: false,
+                name: 'Spatial Index',
+                message: error.message
+            });
+        }
+    });
+}
+
+async function testWorkerPool() {
+    try {
+        if (typeof WorkerPool === 'undefined') {
+            return {
+                passed: false,
+                name: 'Worker Pool',
+                message: 'WorkerPool not found'
+            };
+        }
+        
+        // Pool result must be bit-identical to the same kernel run in-thread
+        const faceCount = 100000;
+        const positions = new Float32Array(faceCount * 9).map(() => Math.random() * 40 - 20);
+        const normals = new Float32Array(faceCount * 9).map(() => Math.random() * 2 - 1);
+        const options = {
+            buffers: { positions: 9, normals: 9 },
+            params: { cx: 0.5, cy: -1.5, cz: 2.5 },
+            blockSize: 16384
+        };
+        
+        const pool = new WorkerPool('stl-processor-worker.js', 2);
+        const local = new WorkerPool('stl-processor-worker.js', 0);
+        for (const p of [pool, local]) {
+            p.share('positions', positions);
+            p.share('normals', normals);
+        }
+        const start = performance.now();
+        const pooled = await pool.run('isolateFaceMetrics', faceCount, options);
+        const poolTime = performance.now() - start;
+        const reference = await local.run('isolateFaceMetrics', faceCount, options);
+        pool.terminate();
+        
+        let mismatches = 0;
+        for (let i = 0; i < faceCount; i++) {
+            if (pooled.arrays.dot[i] !== reference.arrays.dot[i] ||
+                pooled.arrays.distance[i] !== reference.arrays.distance[i]) mismatches++;
+        }
+        
+        // Commercial-radius sweep: every radius equals the single-radius kernels exactly
+        const plane = { nx: 0, ny: 0.6, nz: 0.8, d: 1, cx: 0.5, cy: -1.5, cz: 2.5 };
+        const radii = [14, 16, 18, 20];
+        const sweepCount = 20000;
+        const triangles = positions.subarray(0, sweepCount * 9);
+        const points = positions.subarray(0, sweepCount * 3);
+        const volumeSweep = PoolKernels.volumetricWearSweep({ triangles }, 0, sweepCount, 0, { ...plane, radii }).scalars;
+        const linearSweep = PoolKernels.linearWearSweep({ points }, 0, sweepCount, 0, { ...plane, radii }).scalars;
+        const sweepOk = radii.every((radius, r) => {
+            const volume = PoolKernels.volumetricWear({ triangles }, 0, sweepCount, 0, { ...plane, radius }).scalars;
+            const linear = PoolKernels.linearWear({ points }, 0, sweepCount, 0, { ...plane, radius }).scalars;
+            return volume.volume === volumeSweep[`volume${r}`] && volume.processed === volumeSweep[`processed${r}`] &&
+                linear.sum === linearSweep[`sum${r}`] && linear.max === linearSweep[`max${r}`];
+        });
+        const passed = mismatches === 0 && sweepOk;
+        
+        return {
+            passed,
+            name: 'Worker Pool',
+            message: passed ? `Pooled kernel matches in-thread result (${pool.mode}), radius sweep matches single-radius kernels` :
+                `${mismatches} faces differ, sweep=${sweepOk}`,
+            details: `${faceCount} faces in ${poolTime.toFixed(1)}ms, ${WorkerPool.defaultSize()} cores available, crossOriginIsolated=${!!self.crossOriginIsolated}`
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Worker Pool',
+            message: error.message
+        };
+    }
+}
+
+async function testGeometryCache() {
+    try {
+        if (typeof GeometryCache === 'undefined') {
+            return {
+                passed: false,
+                name: 'Geometry Cache',
+                message: 'GeometryCache not found'
+            };
+        }
+        
+        // Content key must not depend on how the file is chunked
+        const bytes = new Uint8Array(1000003).map((_, i) => (i * 2654435761) >>> 24);
+        const file = new File([bytes], 'cache-test.stl');
+        const keyA = await GeometryCache.hashFile(file, { chunkSize: 65536 });
+        const keyB = await GeometryCache.hashFile(file, { chunkSize: 99991 });
+        bytes[500000] ^= 1;
+        const keyC = await GeometryCache.hashFile(new File([bytes], 'cache-test.stl'));
+        const hashStable = keyA === keyB && keyA !== keyC;
+        
+        // Typed arrays survive an IndexedDB round trip bit for bit
+        const cache = new GeometryCache();
+        const positions = new Float32Array(3000).map(() => Math.random() * 40 - 20);
+        const faces = new Uint32Array([3, 1, 4, 1, 5, 9, 2, 6]);
+        let roundTrip = 'skipped (no IndexedDB)';
+        let roundTripOk = true;
+        if (await cache.open()) {
+            const key = `${keyA}|test|round-trip`;
+            await cache.put(key, { positions, faces }, { note: 'test' });
+            const cached = await cache.get(key);
+            await cache.delete(key);
+            roundTripOk = !!cached && cached.meta.note === 'test' &&
+                cached.arrays.positions.every((v, i) => v === positions[i]) &&
+                cached.arrays.faces.every((v, i) => v === faces[i]);
+            roundTrip = roundTripOk ? 'round trip OK' : 'round trip mismatch';
+        }
+        
+        return {
+            passed: hashStable && roundTripOk,
+            name: 'Geometry Cache',
+            message: hashStable ? `Content key stable across chunk sizes, ${roundTrip}` : 'Content key depends on chunking',
+            details: `key ${keyA}`
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Geometry Cache',
+            message: error.message
+        };
+    }
+}
+
+async function testStageGraph() {
+    try {
+        if (typeof StageGraph === 'undefined') {
+            return {
+                passed: false,
+                name: 'Stage Graph',
+                message: 'StageGraph not found'
+            };
+        }
+        
+        // fit(method) → constrain(radius) → wear: a radius change must not re-run the fit
+        const runs = { fit: 0, constrain: 0, wear: 0 };
+        const graph = new StageGraph();
+        graph.define('fit', {
+            params: (o) => ({ method: o.method || 'gauss-newton' }),
+            run: (inputs, params) => { runs.fit++; return { method: params.method }; }
+        });
+        graph.define('constrain', {
+            deps: ['fit'],
+            params: (o) => ({ radius: o.radius || 14 }),
+            run: ({ fit }, params) => { runs.constrain++; return { ...fit, radius: params.radius }; }
+        });
+        graph.define('wear', {
+            deps: ['constrain'],
+            run: ({ constrain }) => { runs.wear++; return constrain.radius * 2; }
+        });
+        
+        await graph.get('wear', { radius: 14 });
+        await graph.get('wear', { radius: 16 });
+        const radiusOnly = runs.fit === 1 && runs.constrain === 2 && runs.wear === 2;
+        
+        const sweep = await graph.sweep('wear', [14, 16, 18, 20].map(radius => ({ radius })));
+        const sweepOk = sweep.join(',') === '28,32,36,40' && runs.fit === 1 && runs.wear === 4;
+        
+        graph.invalidate('fit');
+        await graph.get('wear', { radius: 14 });
+        const cascadeOk = runs.fit === 2 && runs.wear === 5;
+        
+        return {
+            passed: radiusOnly && sweepOk && cascadeOk,
+            name: 'Stage Graph',
+            message: radiusOnly && sweepOk && cascadeOk ?
+                'Radius changes reuse the fit, sweep memoizes, invalidation cascades' :
+                `Unexpected re-runs: ${JSON.stringify(runs)}`,
+            details: graph.getStats()
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Stage Graph',
+            message: error.message
+        };
+    }
+}
+
+async function testTraceRecorder() {
+    try {
+        if (typeof TraceRecorder === 'undefined') {
+            return {
+                passed: false,
+                name: 'Trace Recorder',
+                message: 'TraceRecorder not found'
+            };
+        }
+        
+        // Main-thread spans plus a batch drained from a "worker" recorder merge into one trace
+        const main = new TraceRecorder();
+        const worker = new TraceRecorder({ tid: 101, threadName: 'pool worker 0' });
+        main.span('outer', () => main.span('inner', () => 42));
+        await main.span('async', () => new Promise(resolve => setTimeout(resolve, 5)));
+        worker.span('kernel:test', () => 0);
+        main.addEvents(worker.drain());
+        main.counter('fit:residual', { rms: 0.01 });
+        
+        const trace = main.toChromeTrace({ test: true });
+        const spans = trace.traceEvents.filter(e => e.ph === 'X');
+        const outer = spans.find(e => e.name === 'outer');
+        const inner = spans.find(e => e.name === 'inner');
+        const nested = outer && inner && inner.ts >= outer.ts && inner.ts + inner.dur <= outer.ts + outer.dur;
+        const asyncOk = spans.find(e => e.name === 'async')?.dur >= 4000;
+        const threads = trace.traceEvents.filter(e => e.name === 'thread_name').map(e => e.args.name);
+        const mergedOk = worker.eventCount === 0 && threads.includes('pool worker 0') &&
+            spans.some(e => e.name === 'kernel:test' && e.tid === 101);
+        const passed = nested && asyncOk && mergedOk && JSON.parse(JSON.stringify(trace)).otherData.test === true;
+        
+        return {
+            passed,
+            name: 'Trace Recorder',
+            message: passed ?
+                'Nested and async spans timed, worker batch merged under its own thread' :
+                `nested=${nested}, async=${asyncOk}, merged=${mergedOk}`,
+            details: { events: main.eventCount, threads }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Trace Recorder',
+            message: error.message
+        };
+    }
+}
+
+function testMeshDecimation() {
+    try {
+        if (typeof MeshDecimator === 'undefined' || typeof GridWelder === 'undefined') {
+            return {
+                passed: false,
+                name: 'Mesh Decimation',
+                message: 'mesh-decimation.js not loaded'
+            };
+        }
+        
+        // Closed UV sphere (r = 10 mm) as a triangle soup: every corner is shared
+        const rings = 40, segments = 80, radius = 10;
+        const point = (i, j) => {
+            const theta = Math.PI * i / rings, phi = 2 * Math.PI * j / segments;
+            return [radius * Math.sin(theta) * Math.cos(phi), radius * Math.sin(theta) * Math.sin(phi), radius * Math.cos(theta)];
+        };
+        const soup = [];
+        for (let i = 0; i < rings; i++) {
+            for (let j = 0; j < segments; j++) {
+                const a = point(i, j), b = point(i + 1, j), c = point(i + 1, j + 1), d = point(i, j + 1);
+                if (i > 0) soup.push(...a, ...b, ...d);
+                if (i < rings - 1) soup.push(...b, ...c, ...d);
+            }
+        }
+        const faces = soup.length / 9;
+        const result = MeshDecimator.precompress(new Float32Array(soup), { cellSize: 1e-4, targetFaces: Math.round(faces / 10) });
+        const { stats } = result;
+        
+        const weldOk = stats.weldedVertices === (rings - 1) * segments + 2 && stats.weldedFaces === faces;
+        const budgetOk = result.faceCount <= Math.round(faces / 10);
+        const deviationOk = stats.hausdorff.max < 0.02 * radius;
+        const volumeDelta = Math.abs(stats.volumeAfter - stats.volumeBefore) / stats.volumeBefore;
+        const passed = weldOk && budgetOk && deviationOk && volumeDelta < 0.01;
+        
+        return {
+            passed,
+            name: 'Mesh Decimation',
+            message: passed ?
+                `${faces} → ${result.faceCount} faces, Hausdorff ${stats.hausdorff.max.toFixed(3)} mm, volume ${(volumeDelta * 100).toFixed(2)}%` :
+                `weld=${weldOk}, budget=${budgetOk}, deviation=${stats.hausdorff.max.toFixed(3)}, volume=${(volumeDelta * 100).toFixed(2)}%`,
+            details: stats
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Mesh Decimation',
+            message: error.message
+        };
+    }
+}
+
+function testSurfaceModel() {
+    try {
+        if (typeof VertexSet === 'undefined' || typeof FaceSet === 'undefined') {
+            return {
+                passed: false,
+                name: 'Surface Model',
+                message: 'surface-model.js not loaded'
+            };
+        }
+        
+        // 1000-face soup; faces 0, 2, 4... form the "inner surface"
+        const faceCount = 1000;
+        const positions = new Float32Array(faceCount * 9).map((_, i) => i * 0.5);
+        const innerFaces = new FaceSet(positions, Uint32Array.from({ length: faceCount / 2 }, (_, i) => i * 2));
+        const vertices = VertexSet.fromFaces(positions, innerFaces.faces);
+        const point = { set(x, y, z) { this.x = x; this.y = y; this.z = z; return this; } };
+        
+        // Item 4 = face 2, corner 1 = position 7
+        const positionOk = vertices.length === 1500 && vertices.index(4) === 7 &&
+            vertices.getPosition(4, point).x === positions[21] && point.z === positions[23];
+        const packed = innerFaces.packPositions();
+        const packedOk = packed.length === 4500 && packed[9] === positions[18] && packed[4499] === positions[998 * 9 + 8];
+        const mask = innerFaces.toMask(faceCount);
+        const maskOk = mask[0] === 1 && mask[1] === 0 && mask.reduce((a, b) => a + b, 0) === 500;
+        
+        // Subsets keep their order and share the positions
+        const even = vertices.filter((i, c) => c % 2 === 0);
+        const points = even.toPoints();
+        const subsetOk = even.positions === positions && even.length === 1000 &&
+            points[3] === positions[even.index(1) * 3] && even.index(1) > even.index(0);
+        
+        const report = SurfaceModel.memoryReport({ vertices, subsets: [even], faces: innerFaces, packed: [packed] });
+        const memoryOk = report.typedBytes === 1500 * 4 + 1000 * 4 + 500 * 4 + 4500 * 4 && report.savedBytes > report.typedBytes;
+        const passed = positionOk && packedOk && maskOk && subsetOk && memoryOk;
+        
+        return {
+            passed,
+            name: 'Surface Model',
+            message: passed ?
+                `${(report.typedBytes / 1024).toFixed(1)} KB typed, ~${(report.savedBytes / 1024).toFixed(1)} KB saved vs objects` :
+                `position=${positionOk}, packed=${packedOk}, mask=${maskOk}, subset=${subsetOk}, memory=${memoryOk}`,
+            details: report
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Surface Model',
+            message: error.message
+        };
+    }
+}
+
+function testRayClustering() {
+    try {
+        if (typeof RayClusterer === 'undefined') {
+            return {
+                passed: false,
+                name: 'Ray Clustering',
+                message: 'ray-clustering.js not loaded'
+            };
+        }
+        
+        // Two spherical patches (r = 20 mm) whose normals converge on centres 1 mm apart
+        const count = 20000;
+        const rays = new RayClusterer(count);
+        const truth = [[0, 0, 0], [1, 0, 0]];
+        for (let i = 0; i < count; i++) {
+            const k = i < count * 0.7 ? 0 : 1;
+            const theta = 0.2 + 1.2 * ((i * 0.618034) % 1), phi = (k === 0 ? 0 : Math.PI) + 2.5 * ((i * 0.414214) % 1);
+            const dir = [Math.sin(theta) * Math.cos(phi), Math.sin(theta) * Math.sin(phi), -Math.cos(theta)];
+            rays.ox[i] = truth[k][0] + 20 * dir[0];
+            rays.oy[i] = truth[k][1] + 20 * dir[1];
+            rays.oz[i] = truth[k][2] + 20 * dir[2];
+            rays.dx[i] = -dir[0]; rays.dy[i] = -dir[1]; rays.dz[i] = -dir[2];
+        }
+        
+        const centers = Float64Array.of(0.2, 0.1, 0.3, 2, -0.5, 1);
+        const result = rays.cluster(centers);
+        const centerError = Math.max(
+            Math.hypot(centers[0] - truth[0][0], centers[1] - truth[0][1], centers[2] - truth[0][2]),
+            Math.hypot(centers[3] - truth[1][0], centers[4] - truth[1][1], centers[5] - truth[1][2]));
+        
+        // Final assignment matches an unpruned pass against the final centres
+        let mismatches = 0;
+        for (let i = 0; i < count; i++) {
+            const nearest = rays.distance(i, centers[0], centers[1], centers[2]) <= rays.distance(i, centers[3], centers[4], centers[5]) ? 0 : 1;
+            if (nearest !== result.assignment[i]) mismatches++;
+        }
+        const residuals = rays.radiusFit(result.assignment, centers, [14, 16, 18, 20], 20);
+        const radiusOk = residuals[0][3] < 1e-6 && residuals[1][3] < 1e-6 && Math.abs(residuals[0][2] - 2) < 1e-6;
+        const passed = result.converged && centerError < 1e-6 && mismatches === 0 && radiusOk && result.pruned > 0;
+        
+        return {
+            passed,
+            name: 'Ray Clustering',
+            message: passed ?
+                `${result.iterations} iterations, ${(result.pruned / (result.pruned + result.evaluated) * 100).toFixed(0)}% of assignments pruned` :
+                `converged=${result.converged}, centerError=${centerError.toExponential(2)}, mismatches=${mismatches}, radius=${radiusOk}`,
+            details: { iterations: result.iterations, evaluated: result.evaluated, pruned: result.pruned, counts: result.counts }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Ray Clustering',
+            message: error.message
+        };
+    }
+}
+
+function testProgressiveAnalysis() {
+    try {
+        if (typeof ProgressiveAnalysis === 'undefined' || typeof VertexSet === 'undefined') {
+            return {
+                passed: false,
+                name: 'Progressive Analysis',
+                message: 'progressive-analysis.js or surface-model.js not loaded'
+            };
+        }
+        
+        // 10% budget with a floor; small meshes skip the preview
+        const budgetOk = ProgressiveAnalysis.previewBudget(1000000) === 100000 &&
+            ProgressiveAnalysis.previewBudget(100000) === 20000 && ProgressiveAnalysis.previewBudget(30000) === 0;
+        
+        // Two right triangles of area 0.5 and 2; corners of the second carry 2/3 of the area
+        const positions = Float32Array.of(0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 0, 2, 0);
+        const areaOk = ProgressiveAnalysis.packedArea(positions) === 2.5 &&
+            Math.abs(ProgressiveAnalysis.vertexSetArea(new VertexSet(positions, Uint32Array.of(3, 4))) - 4 / 3) < 1e-12;
+        
+        const run = new ProgressiveAnalysis(1000000);
+        const cancelBeforeRefine = run.cancel();
+        run.record('coarse', 'fit', { center: [0, 0, 0], radius: 18.01, rmsError: 0.02, iterations: 6, warmStart: false });
+        run.record('coarse', 'calculate', { volumetricWear: 110, linearWearMax: 0.5 });
+        run.record('fine', 'fit', { center: [0.003, 0, 0.004], radius: 18, rmsError: 0.01, iterations: 2, warmStart: true });
+        run.record('fine', 'calculate', { volumetricWear: 100, linearWearMax: 0.48 });
+        const fit = run.convergence('fit');
+        const wear = run.convergence('calculate');
+        const convergenceOk = Math.abs(fit.error - 0.01) < 1e-9 && Math.abs(wear.error - 10) < 1e-9 &&
+            run.convergence('isolate') === null && run.report().length === 2;
+        run.phase = 'refine';
+        const cancelOk = !cancelBeforeRefine && run.cancel() && run.cancelled;
+        const passed = budgetOk && areaOk && convergenceOk && cancelOk;
+        
+        return {
+            passed,
+            name: 'Progressive Analysis',
+            message: passed ? `${fit.text}; ${wear.text}` :
+                `budget=${budgetOk}, area=${areaOk}, convergence=${convergenceOk}, cancel=${cancelOk}`,
+            details: run.report()
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Progressive Analysis',
+            message: error.message
+        };
+    }
+}
+
+async function testBinaryExport() {
+    try {
+        if (typeof BinaryExport === 'undefined') {
+            return {
+                passed: false,
+                name: 'Binary Export',
+                message: 'binary-export.js not loaded'
+            };
+        }
+        
+        // Base64 bytes match btoa for every padding case
+        let base64Ok = true;
+        for (const length of [0, 1, 2, 3, 4, 5, 1000]) {
+            const bytes = Uint8Array.from({ length }, (_, i) => (i * 37 + 11) & 255);
+            const expected = btoa(String.fromCharCode(...bytes));
+            base64Ok = base64Ok && String.fromCharCode(...BinaryExport.base64(bytes)) === expected;
+        }
+        
+        // One triangle in the XY plane: 84-byte header + 50 bytes, normal +Z
+        const triangle = Float32Array.of(0, 0, 0, 1, 0, 0, 0, 1, 0);
+        const stl = new DataView(BinaryExport.stl(triangle, null, 'test'));
+        const stlOk = stl.byteLength === 134 && stl.getUint32(80, true) === 1 &&
+            stl.getFloat32(92, true) === 1 && stl.getFloat32(108, true) === 1;
+        
+        // GLB: header length, 4-byte aligned chunks and views, accessors as written
+        const parts = BinaryExport.glb({
+            meshes: [{ name: 'surface', positions: triangle, index: Uint16Array.of(0, 1, 2), colors: Float32Array.of(1, 0, 0, 0, 1, 0, 0, 0, 1) }],
+            extras: { volumetricWear: 12.5 }
+        });
+        const buffer = await new Blob(parts).arrayBuffer();
+        const view = new DataView(buffer);
+        const jsonLength = view.getUint32(12, true);
+        const gltf = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 20, jsonLength)));
+        const glbOk = view.getUint32(0, true) === BinaryExport.GLB_MAGIC && view.getUint32(8, true) === buffer.byteLength &&
+            jsonLength % 4 === 0 && view.getUint32(20 + jsonLength, true) === gltf.buffers[0].byteLength &&
+            gltf.bufferViews.every(v => v.byteOffset % 4 === 0) &&
+            gltf.accessors[1].type === 'VEC4' && gltf.accessors[2].componentType === BinaryExport.GL_UNSIGNED_INT &&
+            gltf.scenes[0].extras.volumetricWear === 12.5;
+        const passed = base64Ok && stlOk && glbOk;
+        
+        return {
+            passed,
+            name: 'Binary Export',
+            message: passed ? `GLB ${buffer.byteLength} bytes, ${gltf.accessors.length} accessors` :
+                `base64=${base64Ok}, stl=${stlOk}, glb=${glbOk}`,
+            details: { glbBytes: buffer.byteLength, stlBytes: stl.byteLength }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Binary Export',
+            message: error.message
+        };
+    }
+}
+
+function testCurvatureEngine() {
+    try {
+        if (typeof CurvatureEngine === 'undefined' || typeof buildSyntheticIndexedSphere === 'undefined') {
+            return {
+                passed: false,
+                name: 'Curvature Engine',
+                message: 'curvature-engine.js / curvature-benchmark.js not loaded'
+            };
+        }
+        
+        // Sphere of radius R: K = 1/R², H = k1 = k2 = 1/R, Σ K·A = 4π (Gauss-Bonnet)
+        const sphere = buildSyntheticIndexedSphere(20000, 14);
+        const result = CurvatureEngine.compute(sphere.positions, sphere.index);
+        const median = (values) => {
+            const sorted = Array.from(values).filter(Number.isFinite).sort((a, b) => a - b);
+            return sorted[sorted.length >> 1];
+        };
+        const near = (value, expected) => Math.abs(value / expected - 1) < 0.01;
+        const sphereOk = near(median(result.gaussian), 1 / 196) && near(median(result.mean), 1 / 14) &&
+            near(median(result.k1), 1 / 14) && near(median(result.k2), 1 / 14) &&
+            Math.abs(result.stats.totalGaussian - 4 * Math.PI) < 1e-6 && result.stats.boundaryVertices === 0;
+        
+        // Triangle soup + weld map (MeshTopology layout) gives the same values
+        const { index } = sphere;
+        const soup = new Float32Array(index.length * 3);
+        for (let c = 0; c < index.length; c++) soup.set(sphere.positions.subarray(index[c] * 3, index[c] * 3 + 3), c * 3);
+        const fromSoup = CurvatureEngine.compute(soup, index, { cornerPositions: true, vertexCount: sphere.vertexCount });
+        const soupOk = fromSoup.gaussian.every((k, v) => Object.is(k, result.gaussian[v]));
+        
+        // Upper half only: the cut ring is boundary (NaN), the lower half has no value
+        const faceMask = new Uint8Array(index.length / 3);
+        for (let f = 0; f < faceMask.length; f++) faceMask[f] = sphere.positions[index[f * 3] * 3 + 2] > 0.1 ? 1 : 0;
+        const hemisphere = CurvatureEngine.compute(sphere.positions, index, { faceMask });
+        const maskOk = hemisphere.stats.boundaryVertices > 0 && Number.isNaN(hemisphere.mean[sphere.vertexCount - 1]) &&
+            hemisphere.stats.validVertices < result.stats.validVertices / 2 + 1;
+        const passed = sphereOk && soupOk && maskOk;
+        
+        return {
+            passed,
+            name: 'Curvature Engine',
+            message: passed ? `${sphere.vertexCount.toLocaleString()} vertices in ${result.computeTime.toFixed(1)}ms, H = ${median(result.mean).toFixed(4)} (1/R = ${(1 / 14).toFixed(4)})` :
+                `sphere=${sphereOk}, soup=${soupOk}, mask=${maskOk}`,
+            details: result.stats
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Curvature Engine',
+            message: error.message
+        };
+    }
+}
+
+function testLodLevels() {
+    try {
+        if (typeof MeshDecimator === 'undefined' || typeof buildSyntheticIndexedSphere === 'undefined') {
+            return {
+                passed: false,
+                name: 'LOD Levels',
+                message: 'mesh-decimation.js / curvature-benchmark.js not loaded'
+            };
+        }
+        
+        // Triangle soup of a closed sphere, as state.geometry holds it
+        const sphere = buildSyntheticIndexedSphere(20000, 14);
+        const { index } = sphere;
+        const soup = new Float32Array(index.length * 3);
+        for (let c = 0; c < index.length; c++) soup.set(sphere.positions.subarray(index[c] * 3, index[c] * 3 + 3), c * 3);
+        const result = MeshDecimator.levels(soup, { cellSize: 1e-4, ratios: [0.25, 0.0625], minFaces: 500 });
+        const { levels } = result;
+        
+        // Each level is smaller and coarser than the previous one
+        const sizesOk = levels.length === 2 && levels[0].faceCount < result.inputFaces && levels[1].faceCount < levels[0].faceCount;
+        const errorOk = levels.length === 2 && levels[0].error > 0 && levels[1].error >= levels[0].error && levels[1].error < 1;
+        
+        // Every level vertex maps back to an input corner within about one level edge of it
+        // (QEM slides collapsed vertices along the surface, so not onto the corner itself)
+        const distance = (a, i, b, j) => Math.hypot(a[i] - b[j], a[i + 1] - b[j + 1], a[i + 2] - b[j + 2]);
+        const mapOk = levels.every(level => {
+            let edgeSum = 0;
+            for (let f = 0; f < level.faceCount; f++) {
+                for (let k = 0; k < 3; k++) {
+                    edgeSum += distance(level.positions, level.index[f * 3 + k] * 3, level.positions, level.index[f * 3 + (k + 1) % 3] * 3);
+                }
+            }
+            const meanEdge = edgeSum / (level.faceCount * 3);
+            for (let v = 0; v < level.vertexCount; v++) {
+                const c = level.sourceCorner[v];
+                if (c * 3 >= soup.length || distance(level.positions, v * 3, soup, c * 3) > 2 * meanEdge) return false;
+            }
+            return true;
+        });
+        const passed = sizesOk && errorOk && mapOk;
+        
+        return {
+            passed,
+            name: 'LOD Levels',
+            message: passed ? levels.map(level => `${level.faceCount.toLocaleString()} faces (${level.error.toFixed(3)} mm)`).join(', ') :
+                `sizes=${sizesOk}, error=${errorOk}, sourceCorner=${mapOk}`,
+            details: { inputFaces: result.inputFaces, weldTime: result.weldTime }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'LOD Levels',
+            message: error.message
+        };
+    }
+}
+
+async function testRansac() {
+    try {
+        if (typeof window.FittingService === 'undefined') {
+            return {
+                passed: false,
+                name: 'RANSAC',
+                message: 'FittingService not exposed (index.html not loaded)'
+            };
+        }
+        const fitting = window.FittingService;
+        const { Vector3 } = await import('three');
+
+        // Cup-sized sphere patch with ±0.3mm noise plus 30% scattered outliers (seeded, so fixed)
+        const random = fitting.createRandom(7);
+        const center = new Vector3(1, -2, 3);
+        const radius = 25;
+        const points = [];
+        for (let i = 0; i < 1400; i++) {
+            const theta = Math.acos(random());  // upper hemisphere
+            const phi = random() * Math.PI * 2;
+            const r = radius + (random() - 0.5) * 0.6;
+            points.push(new Vector3(
+                center.x + r * Math.sin(theta) * Math.cos(phi),
+                center.y + r * Math.sin(theta) * Math.sin(phi),
+                center.z + r * Math.cos(theta)
+            ));
+        }
+        for (let i = 0; i < 600; i++) {
+            points.push(new Vector3((random() - 0.5) * 60, (random() - 0.5) * 60, (random() - 0.5) * 30));
+        }
+
+        // Same seed -> same hypotheses, same winner, same stats
+        const first = fitting.fitSphereRANSAC(points, { seed: 42 });
+        const second = fitting.fitSphereRANSAC(points, { seed: 42 });
+        const statsKeys = ['iterations', 'rejected', 'scored', 'inlierRatio'];
+        const seedOk = first.center.equals(second.center) && first.radius === second.radius && first.inliers === second.inliers &&
+            statsKeys.every(key => first.ransac[key] === second.ransac[key]);
+        const fitOk = first.center.distanceTo(center) < 0.2 && Math.abs(first.radius - radius) < 0.2;
+
+        // log(1 - p) / log(1 - w^(m + d)), clamped to [1, maxIterations]
+        const bound = (w, m, d, max = 1000) => fitting.ransacIterationBound(w, m, d, 0.99, max);
+        const boundOk = bound(0.5, 4, 0) === 72 && bound(0.5, 3, 1) === 72 && bound(0.9, 20, 1) === 40 &&
+            bound(0.5, 20, 1, 100) === 100 && bound(1, 20, 1) === 1 && bound(0, 20, 1) === 1000;
+
+        // One batched sweep counts the same inliers as scoring each hypothesis on its own
+        const soa = fitting.toSoA(points);
+        const batchOk = ['sphere', 'ellipsoid'].every(kind => {
+            const batch = 8;
+            const params = new Float64Array(batch * 6);
+            const hypotheses = [];
+            for (let h = 0; h < batch; h++) {
+                const fit = {
+                    center: { x: center.x + (random() - 0.5) * 4, y: center.y + (random() - 0.5) * 4, z: center.z + (random() - 0.5) * 4 },
+                    radius: radius + (random() - 0.5) * 2,
+                    radii: { x: radius + random(), y: radius - random(), z: radius + random() * 2 }
+                };
+                params.set(kind === 'sphere' ? [fit.center.x, fit.center.y, fit.center.z, fit.radius, 0, 0] :
+                    [fit.center.x, fit.center.y, fit.center.z, fit.radii.x, fit.radii.y, fit.radii.z], h * 6);
+                hypotheses.push(fit);
+            }
+            const threshold = kind === 'sphere' ? 1.5 : 0.05;
+            const counts = new Uint32Array(batch);
+            fitting.scoreHypotheses(soa, kind, params, batch, threshold, counts);
+            return hypotheses.every((fit, h) => {
+                let count = 0;
+                for (let i = 0; i < soa.n; i++) {
+                    if (fitting.hypothesisResidual(soa, i, kind, fit) < threshold) count++;
+                }
+                return count === counts[h] && count > 0;
+            });
+        });
+        const passed = seedOk && fitOk && boundOk && batchOk;
+
+        return {
+            passed,
+            name: 'RANSAC',
+            message: passed ? `seed 42: r = ${first.radius.toFixed(3)} mm, ${first.inliers} inliers after ${first.ransac.iterations} iterations ` +
+                `(${first.ransac.rejected} rejected, ${first.ransac.scored} scored)` :
+                `seed=${seedOk}, fit=${fitOk}, bound=${boundOk}, batch=${batchOk}`,
+            details: first.ransac
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'RANSAC',
+            message: error.message
+        };
+    }
+}
+
+/**
+ * Parse STL bytes in a fresh stl-processor-worker.js: whole ('parseSTL'), or streamed as
+ * StreamingGeometryLoader sends it, in chunks of nextChunkSize() bytes
+ */
+function parseInWorker(bytes, nextChunkSize = null) {
+    return new Promise((resolve, reject) => {
+        const worker = new Worker('stl-processor-worker.js');
+        const resultType = nextChunkSize ? 'streamEnd' : 'parseSTL';
+        worker.onmessage = (event) => {
+            const { type, data, error } = event.data;
+            if (error) {
+                worker.terminate();
+                reject(new Error(error));
+                return;
+            }
+            if (type !== resultType) return;
+            worker.terminate();
+            resolve(data);
+        };
+        worker.onerror = (event) => {
+            worker.terminate();
+            reject(new Error(event.message));
+        };
+        
+        if (!nextChunkSize) {
+            const copy = bytes.slice();
+            worker.postMessage({ type: 'parseSTL', payload: { arrayBuffer: copy.buffer, fileName: 'test.stl' } }, [copy.buffer]);
+            return;
+        }
+        worker.postMessage({ type: 'streamBegin', payload: { fileName: 'test.stl', totalBytes: bytes.length } });
+        for (let offset = 0; offset < bytes.length;) {
+            const chunk = bytes.slice(offset, offset + nextChunkSize());
+            offset += chunk.length;
+            worker.postMessage({ type: 'streamChunk', payload: { chunk: chunk.buffer } }, [chunk.buffer]);
+        }
+        worker.postMessage({ type: 'streamEnd' });
+    });
+}
+
+// Same welded vertices in the same order and the same index buffer
+function sameParsedGeometry(a, b) {
+    return a.positions.length === b.positions.length && a.index.length === b.index.length &&
+        a.positions.every((value, i) => value === b.positions[i]) && a.index.every((value, i) => value === b.index[i]);
+}
+
+async function testAsciiTokenizer() {
+    try {
+        if (typeof Worker === 'undefined') {
+            return {
+                passed: false,
+                name: 'ASCII STL Tokenizer',
+                message: 'Web Workers not supported in this browser'
+            };
+        }
+        
+        // Spellings parseASCIIFloat must read exactly like parseFloat: signs, exponents, bare dots,
+        // -0, and > 15 significant digits or |exp| > 22 (the parseFloat fallback)
+        const spellings = ['1.5e+01', '-2.25E-3', '+3', '.5', '-0.0', '7.', '123456.789', '-1e-5', '4.0E2', '0.1',
+            '-17.25', '2.5e-1', '1234567.891234567891', '+6.02E+23', '9.87654321e-30', '-6e1', '0', '-.75'];
+        const separators = [' ', '\t', '   ', ' \t '];
+        const newlines = ['\n', '\r\n'];
+        const faceCount = 60;
+        const expected = new Float32Array(faceCount * 9);
+        let text = 'solid tokenizer\n';
+        for (let f = 0; f < faceCount; f++) {
+            const nl = newlines[f % newlines.length];
+            text += `  facet normal 0 0 1${nl}    outer loop${nl}`;
+            for (let v = 0; v < 3; v++) {
+                text += '      vertex';
+                for (let k = 0; k < 3; k++) {
+                    const c = (f * 3 + v) * 3 + k;
+                    const token = spellings[(c * 7 + f) % spellings.length];
+                    text += separators[c % separators.length] + token;
+                    expected[c] = parseFloat(token);
+                }
+                text += nl;
+            }
+            text += `    endloop${nl}  endfacet${nl}`;
+        }
+        text += 'endsolid tokenizer\n';
+        const bytes = new TextEncoder().encode(text);
+        
+        // Whole buffer: every corner reads back as Math.fround(parseFloat(token)), -0 welded onto +0
+        const whole = await parseInWorker(bytes);
+        let floatOk = whole.format === 'ascii' && whole.faceCount === faceCount;
+        for (let c = 0; c < faceCount * 3 && floatOk; c++) {
+            for (let k = 0; k < 3; k++) {
+                if (whole.positions[whole.index[c] * 3 + k] !== expected[c * 3 + k]) floatOk = false;
+            }
+        }
+        
+        // One byte at a time splits every keyword and number; then seeded random chunks of 1-23 bytes
+        let seed = 0x2545F491;
+        const randomChunk = () => 1 + (seed = (Math.imul(seed, 1664525) + 1013904223) >>> 0) % 23;
+        const streamed = [await parseInWorker(bytes, () => 1)];
+        for (let run = 0; run < 3; run++) {
+            streamed.push(await parseInWorker(bytes, randomChunk));
+        }
+        const chunkOk = streamed.every(result => sameParsedGeometry(result, whole));
+        const passed = floatOk && chunkOk;
+        
+        return {
+            passed,
+            name: 'ASCII STL Tokenizer',
+            message: passed ? `${faceCount} facets, ${whole.vertexCount} welded vertices, identical across ${streamed.length} chunkings` :
+                `parseFloat=${floatOk}, chunks=${chunkOk}`,
+            details: { bytes: bytes.length, spellings: spellings.length }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'ASCII STL Tokenizer',
+            message: error.message
+        };
+    }
+}
+
+async function testBinaryStlParser() {
+    try {
+        if (typeof Worker === 'undefined') {
+            return {
+                passed: false,
+                name: 'Binary STL Parser',
+                message: 'Web Workers not supported in this browser'
+            };
+        }
+        
+        // 12x12 grid on z = 0 (169 shared vertices, the x = 0 / y = 0 lines written as -0 in every
+        // other triangle) plus 400 separate triangles, so the welder outgrows its 1024-vertex table
+        const grid = 12;
+        const loose = 400;
+        const faceCount = grid * grid * 2 + loose;
+        const corners = [];
+        const at = (i, j, negativeZero) => {
+            const x = (i - grid / 2) * 0.25;
+            const y = (j - grid / 2) * 0.25;
+            return [x === 0 && negativeZero ? -0 : x, y === 0 && negativeZero ? -0 : y, negativeZero ? -0 : 0];
+        };
+        for (let i = 0; i < grid; i++) {
+            for (let j = 0; j < grid; j++) {
+                corners.push(at(i, j, false), at(i + 1, j, false), at(i + 1, j + 1, false));
+                corners.push(at(i, j, true), at(i + 1, j + 1, true), at(i, j + 1, true));
+            }
+        }
+        for (let t = 0; t < loose; t++) {
+            const z = 1 + t * 0.01;
+            corners.push([t, 0.5, z], [t + 0.5, 1, z], [t, 1.5, z]);
+        }
+        
+        // Header starts with "solid": the size check must still classify the file as binary
+        const bytes = new Uint8Array(84 + faceCount * 50);
+        bytes.set(new TextEncoder().encode('solid binary header'));
+        const view = new DataView(bytes.buffer);
+        view.setUint32(80, faceCount, true);
+        corners.forEach((corner, c) => {
+            const offset = 84 + Math.floor(c / 3) * 50 + 12 + (c % 3) * 12;
+            corner.forEach((value, k) => view.setFloat32(offset + k * 4, value, true));
+        });
+        
+        // Weld counts: -0 folds onto +0, loose triangles keep their own vertices
+        const whole = await parseInWorker(bytes);
+        let weldOk = whole.format === 'binary' && whole.faceCount === faceCount &&
+            whole.vertexCount === (grid + 1) * (grid + 1) + loose * 3;
+        for (let c = 0; c < corners.length && weldOk; c++) {
+            for (let k = 0; k < 3; k++) {
+                const value = whole.positions[whole.index[c] * 3 + k];
+                if (value !== Math.fround(corners[c][k]) || Object.is(value, -0)) weldOk = false;
+            }
+        }
+        
+        // Records split across chunk boundaries: around the 84-byte header and the 50-byte record
+        // size, one byte at a time, and seeded random sizes
+        let seed = 0x9E3779B9;
+        const randomChunk = () => 1 + (seed = (Math.imul(seed, 1664525) + 1013904223) >>> 0) % 160;
+        const chunkings = [() => 1, () => 49, () => 50, () => 51, () => 83, () => 85, () => 4096, randomChunk];
+        const streamed = [];
+        for (const nextChunkSize of chunkings) {
+            streamed.push(await parseInWorker(bytes, nextChunkSize));
+        }
+        const chunkOk = streamed.every(result => result.format === 'binary' && sameParsedGeometry(result, whole));
+        const passed = weldOk && chunkOk;
+        
+        return {
+            passed,
+            name: 'Binary STL Parser',
+            message: passed ? `${faceCount} triangles -> ${whole.vertexCount} welded vertices, identical across ${streamed.length} chunkings` :
+                `weld=${weldOk}, chunks=${chunkOk}`,
+            details: { vertexCount: whole.vertexCount, workingBytes: whole.workingBytes }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Binary STL Parser',
+            message: error.message
+        };
+    }
+}
+
+function testMeshTopology() {
+    try {
+        if (typeof window.MeshTopology === 'undefined') {
+            return {
+                passed: false,
+                name: 'Mesh Topology',
+                message: 'MeshTopology not exposed (index.html not loaded)'
+            };
+        }
+        const topologyService = window.MeshTopology;
+        
+        // Triangle soup: a 6x6 grid (one corner nudged 0.0002mm, still the same 0.001mm weld cell)
+        // and a separate tetrahedron, so the largest component is the grid
+        const grid = 6;
+        const soup = [];
+        for (let i = 0; i < grid; i++) {
+            for (let j = 0; j < grid; j++) {
+                soup.push(i, j, 0, i + 1, j, 0, i + 1, j + 1, 0);
+                soup.push(i, j, 0, i + 1, j + 1, 0, i, j + 1, 0);
+            }
+        }
+        soup[4] += 0.0002;
+        const tetra = [[10, 10, 0], [11, 10, 0], [10, 11, 0], [10, 10, 1]];
+        for (const [a, b, c] of [[0, 2, 1], [0, 1, 3], [1, 2, 3], [2, 0, 3]]) {
+            soup.push(...tetra[a], ...tetra[b], ...tetra[c]);
+        }
+        const positions = new Float32Array(soup);
+        const cornerCount = positions.length / 3;
+        const faceCount = cornerCount / 3;
+        
+        // Naive build: string keys on the same quantization, Sets for the adjacency
+        const precision = topologyService.precision;
+        const ids = new Map();
+        const exactIds = new Map();
+        const cornerVertex = [];
+        const weldIndex = new Uint32Array(cornerCount);
+        for (let c = 0; c < cornerCount; c++) {
+            const p = positions.subarray(c * 3, c * 3 + 3);
+            const key = Array.from(p, value => Math.round(value * precision)).join(',');
+            if (!ids.has(key)) ids.set(key, ids.size);
+            cornerVertex.push(ids.get(key));
+            const exactKey = p.join(',');  // Worker weld map: bit-identical corners only
+            if (!exactIds.has(exactKey)) exactIds.set(exactKey, exactIds.size);
+            weldIndex[c] = exactIds.get(exactKey);
+        }
+        const vertexFaces = Array.from({ length: ids.size }, () => new Set());
+        cornerVertex.forEach((v, c) => vertexFaces[v].add(Math.floor(c / 3)));
+        const faceNeighbors = [];
+        for (let f = 0; f < faceCount; f++) {
+            const neighbors = new Set();
+            for (let k = 0; k < 3; k++) vertexFaces[cornerVertex[f * 3 + k]].forEach(g => neighbors.add(g));
+            neighbors.delete(f);
+            faceNeighbors.push(neighbors);
+        }
+        
+        const sameSet = (csr, set) => csr.length === set.size && csr.every(value => set.has(value));
+        const matches = (topology) => {
+            topologyService.faceAdjacency(topology);
+            const { vertexFaceOffsets: vo, faceNeighborOffsets: fo } = topology;
+            return topology.vertexCount === ids.size && topology.cornerVertex.every((v, c) => v === cornerVertex[c]) &&
+                vertexFaces.every((faces, v) => sameSet(Array.from(topology.vertexFaces.subarray(vo[v], vo[v + 1])), faces)) &&
+                faceNeighbors.every((faces, f) => sameSet(Array.from(topology.faceNeighbors.subarray(fo[f], fo[f + 1])), faces));
+        };
+        const hashed = topologyService.build(positions);
+        const csrOk = matches(hashed);
+        const weldOk = matches(topologyService.build(positions, weldIndex));
+        
+        // Largest component over all faces is exactly the grid
+        const { faces, componentCount } = topologyService.largestComponent(hashed, new Uint8Array(faceCount).fill(1));
+        const componentOk = componentCount === 2 && faces.length === grid * grid * 2 && faces.every((f, i) => f === i);
+        const passed = csrOk && weldOk && componentOk;
+        
+        return {
+            passed,
+            name: 'Mesh Topology',
+            message: passed ? `${faceCount} faces, ${hashed.vertexCount} welded vertices, CSR matches the Map build` :
+                `csr=${csrOk}, weldIndex=${weldOk}, components=${componentOk}`,
+            details: { neighborEntries: hashed.faceNeighborOffsets[faceCount], exactVertices: exactIds.size }
+        };
+    } catch (error) {
+        return {
+            passed: false,
+            name: 'Mesh Topology',
+            message: error.message
+        };
+    }
+}
+
 /**
  * Detailed Performance Profiling
  */
@@ -314,7 +1402,9 @@ function checkBrowserCapabilities() {
         'Promise': typeof Promise !== 'undefined',
         'Fetch': typeof fetch !== 'undefined',
         'Performance API': typeof performance !== 'undefined',
-        'Memory API': typeof performance.memory !== 'undefined'
+        'Memory API': typeof performance.memory !== 'undefined',
+        'IndexedDB': typeof indexedDB !== 'undefined',
+        'SharedArrayBuffer (COOP/COEP)': typeof SharedArrayBuffer !== 'undefined' && self.crossOriginIsolated === true
     };
     
     Object.entries(capabilities).forEach(([feature, available]) => {
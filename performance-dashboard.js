@@ -10,6 +10,7 @@ class PerformanceDashboard {
         this.updateInterval = null;
         this.isMinimized = false;
         this.iconButton = null;
+        this.cacheUsageVersion = -1;
     }
 
     /**
@@ -184,6 +185,10 @@ class PerformanceDashboard {
             <span class="metric-label">Tasks Processed</span>
             <span class="metric-value" id="worker-tasks">0</span>
         </div>
+        <div class="metric-row">
+            <span class="metric-label">Pool</span>
+            <span class="metric-value" id="worker-pool">--</span>
+        </div>
 
         <div class="section-title">Current Operation</div>
         <div class="metric-row">
@@ -208,6 +213,58 @@ class PerformanceDashboard {
             <span class="metric-label">Buffer Pool</span>
             <span class="metric-value" id="buffer-pool">0 buffers</span>
         </div>
+
+        <div class="section-title">Surface Model</div>
+        <div class="metric-row">
+            <span class="metric-label">Typed Arrays</span>
+            <span class="metric-value" id="surface-typed">--</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label">Saved vs Objects</span>
+            <span class="metric-value" id="surface-saved">--</span>
+        </div>
+
+        <div class="section-title">Rendering</div>
+        <div class="metric-row">
+            <span class="metric-label">Frame (CPU)</span>
+            <span class="metric-value" id="render-frame">--</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label">Frames Drawn</span>
+            <span class="metric-value" id="render-frames">0</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label">GPU Buffers</span>
+            <span class="metric-value" id="render-gpu">--</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label">Main LOD</span>
+            <span class="metric-value" id="render-lod">--</span>
+        </div>
+
+        <div class="section-title">Geometry Cache</div>
+        <div class="metric-row">
+            <span class="metric-label">This File</span>
+            <span class="metric-value" id="cache-status">--</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label">Stored</span>
+            <span class="metric-value" id="cache-usage">--</span>
+        </div>
+        <div class="metric-row">
+            <span class="metric-label"></span>
+            <button class="dashboard-toggle" id="cache-clear-btn">Clear cache</button>
+        </div>
+
+        <div class="section-title">Trace</div>
+        <div class="metric-row">
+            <span class="metric-label">Events</span>
+            <span class="metric-value" id="trace-events">0</span>
+        </div>
+        <div class="metric-row">
+            <button class="dashboard-toggle" id="trace-download-btn">Download</button>
+            <button class="dashboard-toggle" id="trace-clear-btn">Clear</button>
+        </div>
         `;
 
         document.body.appendChild(dashboard);
@@ -226,6 +283,15 @@ class PerformanceDashboard {
         }
 
         icon.addEventListener('click', () => this.restore());
+
+        const clearCacheBtn = dashboard.querySelector('#cache-clear-btn');
+        if (clearCacheBtn) {
+            clearCacheBtn.addEventListener('click', () => window.geometryCache?.clear());
+        }
+
+        // Chrome trace JSON (trace-recorder.js), for chrome://tracing or ui.perfetto.dev
+        dashboard.querySelector('#trace-download-btn').addEventListener('click', () => window.traceRecorder?.download());
+        dashboard.querySelector('#trace-clear-btn').addEventListener('click', () => window.traceRecorder?.clear());
         this.isVisible = true;
 
         // Start update loop
@@ -290,6 +356,40 @@ class PerformanceDashboard {
             document.getElementById('buffer-pool').textContent = `${stats.totalBuffers} buffers`;
         }
 
+        // Worker pool (worker-pool.js)
+        if (window.workerPool) {
+            const pool = window.workerPool.getStats();
+            document.getElementById('worker-pool').textContent = `${pool.busy}/${pool.size} busy · ${pool.mode}`;
+            document.getElementById('worker-tasks').textContent = pool.tasksCompleted.toLocaleString();
+        }
+
+        // Inner surface model (surface-model.js): typed footprint and estimated savings
+        if (window.surfaceMemory) {
+            const { typedBytes, legacyBytes, savedBytes } = window.surfaceMemory;
+            document.getElementById('surface-typed').textContent = `${(typedBytes / (1024 * 1024)).toFixed(1)} MB`;
+            document.getElementById('surface-saved').textContent = legacyBytes > 0
+                ? `${(savedBytes / (1024 * 1024)).toFixed(1)} MB (${(savedBytes / legacyBytes * 100).toFixed(0)}%)`
+                : '--';
+        }
+
+        // On-demand rendering and LOD (render-loop.js)
+        if (window.renderLoop) {
+            this.updateRenderMetrics(window.renderLoop.getStats(), window.mainLod?.getStats());
+        }
+
+        // Geometry cache (geometry-cache.js): per-stage hit/miss for the current file
+        if (window.geometryCache) {
+            this.updateCacheMetrics(window.geometryCache);
+        }
+
+        // Trace events recorded for the current case
+        if (window.traceRecorder) {
+            const trace = window.traceRecorder;
+            document.getElementById('trace-events').textContent = trace.dropped > 0
+                ? `${trace.eventCount.toLocaleString()} (${trace.dropped.toLocaleString()} dropped)`
+                : trace.eventCount.toLocaleString();
+        }
+
         // Web Worker status
         if (typeof state !== 'undefined' && state.stlWorker) {
             const status = state.stlWorker ? 'Active' : 'Inactive';
@@ -297,6 +397,56 @@ class PerformanceDashboard {
         }
     }
 
+    updateRenderMetrics(render, lod) {
+        const mb = (bytes) => `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+        document.getElementById('render-frame').textContent = render.frames > 0
+            ? `${render.frameP50.toFixed(1)} / ${render.frameP95.toFixed(1)} ms (p50/p95)`
+            : '--';
+        document.getElementById('render-frames').textContent =
+            `${render.frames.toLocaleString()} (${render.requests.toLocaleString()} requests)`;
+        const { memory } = render;
+        document.getElementById('render-gpu').textContent = memory.sharedBytes > 0
+            ? `${mb(memory.bytes)} · saved ${mb(memory.sharedBytes)}`
+            : mb(memory.bytes);
+
+        const lodEl = document.getElementById('render-lod');
+        if (!lod) {
+            lodEl.textContent = '--';
+        } else if (lod.drawn) {
+            lodEl.textContent = `${lod.drawn.faces.toLocaleString()} faces · ${lod.drawn.error.toFixed(3)} mm`;
+        } else {
+            lodEl.textContent = lod.pending ? 'building…' : 'full';
+        }
+    }
+
+    updateCacheMetrics(cache) {
+        const stats = cache.getStats();
+        const statusEl = document.getElementById('cache-status');
+        const lookups = Object.entries(stats.lookups);
+        const hits = lookups.filter(([, result]) => result === 'hit').map(([stage]) => stage);
+
+        statusEl.className = 'metric-value';
+        if (!stats.enabled) {
+            statusEl.textContent = 'Unavailable';
+            statusEl.classList.add('warning');
+        } else if (lookups.length === 0) {
+            statusEl.textContent = 'No file';
+        } else {
+            statusEl.textContent = hits.length > 0 ? `Hit ${hits.length}/${lookups.length} stages` : 'Miss';
+            statusEl.title = lookups.map(([stage, result]) => `${stage}: ${result}`).join('\n');
+        }
+
+        // Usage needs an IndexedDB scan, so only refresh it after writes, evictions or a clear
+        const version = stats.writes + stats.evictions + stats.clears;
+        if (stats.enabled && version !== this.cacheUsageVersion) {
+            this.cacheUsageVersion = version;
+            cache.usage().then(({ entries, bytes, budgetBytes }) => {
+                document.getElementById('cache-usage').textContent =
+                    `${entries} entries · ${(bytes / 1048576).toFixed(0)}/${(budgetBytes / 1048576).toFixed(0)} MB`;
+            }).catch(() => {});
+        }
+    }
+
     minimize() {
         if (!this.container) return;
         this.container.style.display = 'none';
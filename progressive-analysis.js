@@ -0,0 +1,129 @@
+/**
+ * Progressive Analysis
+ * Coarse-to-fine bookkeeping for the progressive preview.
+ *
+ * The pipeline (isolate → detect → fit → wear) runs unchanged twice: first on a decimated
+ * copy of the mesh for provisional metrics and colours, then on the full mesh with the
+ * coarse fit as the Levenberg-Marquardt starting point. This class holds the preview face
+ * budget, one summary per stage and pass, the convergence error between the two passes
+ * and the cancellation flag checked between refinement stages.
+ *
+ * Summaries are resolution independent (areas and area fractions, not vertex counts), so
+ * the difference between passes measures the analysis, not the triangle density.
+ */
+
+class ProgressiveAnalysis {
+    static PREVIEW_FRACTION = 0.1;     // Preview keeps 10% of the triangles...
+    static MIN_PREVIEW_FACES = 20000;  // ...but never fewer than this
+    static STAGES = ['isolate', 'detect', 'fit', 'calculate'];
+    static LABELS = { isolate: 'Isolation', detect: 'Wear zones', fit: 'Sphere fit', calculate: 'Wear volume' };
+
+    constructor(faceCount) {
+        this.faceCount = faceCount;
+        this.previewFaces = ProgressiveAnalysis.previewBudget(faceCount);
+        this.phase = 'idle';  // 'preview' | 'refine' | 'done' | 'cancelled'
+        this.cancelled = false;
+        this.coarse = {};
+        this.fine = {};
+    }
+
+    /**
+     * Preview triangle budget; 0 when the mesh is small enough to analyse directly
+     */
+    static previewBudget(faceCount) {
+        const target = Math.max(ProgressiveAnalysis.MIN_PREVIEW_FACES,
+            Math.round(faceCount * ProgressiveAnalysis.PREVIEW_FRACTION));
+        return target * 2 <= faceCount ? target : 0;
+    }
+
+    // Total area of triangles packed 9 floats per face (FaceSet.packPositions)
+    static packedArea(packed) {
+        let area = 0;
+        for (let o = 0; o + 8 < packed.length; o += 9) {
+            area += ProgressiveAnalysis.triangleArea(packed, o);
+        }
+        return area;
+    }
+
+    /**
+     * Area carried by a VertexSet: each corner takes a third of its face
+     * (non-indexed soup, corner c belongs to face floor(c / 3))
+     */
+    static vertexSetArea(vertices) {
+        let area = 0;
+        for (let i = 0; i < vertices.length; i++) {
+            area += ProgressiveAnalysis.triangleArea(vertices.positions, Math.floor(vertices.index(i) / 3) * 9);
+        }
+        return area / 3;
+    }
+
+    static triangleArea(p, o) {
+        const ax = p[o + 3] - p[o], ay = p[o + 4] - p[o + 1], az = p[o + 5] - p[o + 2];
+        const bx = p[o + 6] - p[o], by = p[o + 7] - p[o + 1], bz = p[o + 8] - p[o + 2];
+        const cx = ay * bz - az * by, cy = az * bx - ax * bz, cz = ax * by - ay * bx;
+        return 0.5 * Math.sqrt(cx * cx + cy * cy + cz * cz);
+    }
+
+    // Only a running refinement can be cancelled; it stops at the next stage boundary
+    cancel() {
+        if (this.phase === 'refine') this.cancelled = true;
+        return this.cancelled;
+    }
+
+    /**
+     * pass: 'coarse' | 'fine'. Summary fields per stage:
+     *   isolate   { innerArea }                       mm²
+     *   detect    { wornFraction }                    worn / classified area
+     *   fit       { center: [x, y, z], radius, rmsError, iterations, warmStart }
+     *   calculate { volumetricWear, linearWearMax }   mm³, mm
+     */
+    record(pass, stage, summary) {
+        (pass === 'coarse' ? this.coarse : this.fine)[stage] = summary;
+    }
+
+    /**
+     * Difference between the preview and the full-resolution result of one stage, or null
+     * until both passes have it: { stage, error, unit, text }
+     */
+    convergence(stage) {
+        const coarse = this.coarse[stage], fine = this.fine[stage];
+        if (!coarse || !fine) return null;
+        const relative = (a, b) => Math.abs(a - b) / Math.max(Math.abs(b), 1e-12) * 100;
+
+        if (stage === 'isolate') {
+            const error = relative(coarse.innerArea, fine.innerArea);
+            return { stage, error, unit: '%', text: `inner area ${fine.innerArea.toFixed(1)} mm² (Δ ${error.toFixed(2)}%)` };
+        }
+        if (stage === 'detect') {
+            const error = Math.abs(coarse.wornFraction - fine.wornFraction) * 100;
+            return { stage, error, unit: 'pp', text: `worn ${(fine.wornFraction * 100).toFixed(1)}% of area (Δ ${error.toFixed(2)} pp)` };
+        }
+        if (stage === 'fit') {
+            const shift = Math.sqrt(coarse.center.reduce((sum, value, axis) => sum + (value - fine.center[axis]) ** 2, 0));
+            const radiusDelta = Math.abs(coarse.radius - fine.radius);
+            const iterations = fine.warmStart ? `${fine.iterations} LM iterations from the preview fit` : `${fine.iterations} LM iterations`;
+            return {
+                stage,
+                error: Math.max(shift, radiusDelta),
+                unit: 'mm',
+                text: `Δ centre ${shift.toFixed(4)} mm, Δ r ${radiusDelta.toFixed(4)} mm, RMS ${fine.rmsError.toFixed(4)} (${iterations})`
+            };
+        }
+        const error = relative(coarse.volumetricWear, fine.volumetricWear);
+        return {
+            stage,
+            error,
+            unit: '%',
+            text: `${fine.volumetricWear.toFixed(3)} mm³ (Δ ${error.toFixed(2)}%), max linear Δ ${Math.abs(coarse.linearWearMax - fine.linearWearMax).toFixed(4)} mm`
+        };
+    }
+
+    // Convergence of every stage both passes have reached, in pipeline order
+    report() {
+        return ProgressiveAnalysis.STAGES.map(stage => this.convergence(stage)).filter(Boolean);
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { ProgressiveAnalysis };
+}
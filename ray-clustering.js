@@ -0,0 +1,205 @@
+/**
+ * Ray Clustering
+ * Two-centre least-squares clustering of surface normal rays (dual-sphere wear detection).
+ *
+ * Every inner surface vertex casts a ray along its inward normal; each ray is assigned to the
+ * centre it passes closest to (perpendicular distance) and each centre is re-solved as the
+ * point closest to its rays:  (Σ I - d⊗d) p = Σ (I - d⊗d) o.
+ *
+ * - Rays live in SoA Float64Arrays (origins ox/oy/oz, unit directions dx/dy/dz).
+ * - Assignment is pruned with the triangle inequality: distance to a line is 1-Lipschitz in
+ *   the query point, so after the centres move by s0, s1 a ray whose upper bound to its own
+ *   centre stays below the lower bound to the other one keeps its cluster without being
+ *   evaluated (Hamerly bounds for k = 2). Assignments are exactly those of a full pass.
+ * - The 3x3 normal equations are kept per cluster as running sums; only rays that switch
+ *   cluster are subtracted / added, so an iteration costs O(evaluated + changed).
+ * - radiusFit() gives the RMS residual of each cluster against any number of radii from a
+ *   single sweep of shifted distance moments.
+ */
+
+class RayClusterer {
+    static MAX_ITERATIONS = 30;
+    static MIN_CLUSTER_RAYS = 10;  // A centre is only re-solved from more rays than this
+    static BOUND_EPSILON = 1e-9;   // mm; skips must hold with margin against rounding in the bounds
+
+    constructor(count) {
+        this.count = count;
+        this.ox = new Float64Array(count);
+        this.oy = new Float64Array(count);
+        this.oz = new Float64Array(count);
+        this.dx = new Float64Array(count);
+        this.dy = new Float64Array(count);
+        this.dz = new Float64Array(count);
+    }
+
+    /**
+     * Rays from a VertexSet (surface-model.js) and per-corner normals, oriented towards `toward`
+     * (the reference sphere centre) so that every direction points into the cup.
+     */
+    static fromVertices(vertices, normals, toward) {
+        const rays = new RayClusterer(vertices.length);
+        const { positions } = vertices;
+        for (let i = 0; i < vertices.length; i++) {
+            const c = vertices.index(i) * 3;
+            const ox = positions[c], oy = positions[c + 1], oz = positions[c + 2];
+            let nx = normals[c], ny = normals[c + 1], nz = normals[c + 2];
+            const inv = 1 / (Math.sqrt(nx * nx + ny * ny + nz * nz) || 1);
+            nx *= inv; ny *= inv; nz *= inv;
+            if (nx * (toward.x - ox) + ny * (toward.y - oy) + nz * (toward.z - oz) < 0) {
+                nx = -nx; ny = -ny; nz = -nz;
+            }
+            rays.ox[i] = ox; rays.oy[i] = oy; rays.oz[i] = oz;
+            rays.dx[i] = nx; rays.dy[i] = ny; rays.dz[i] = nz;
+        }
+        return rays;
+    }
+
+    // Perpendicular distance from (x, y, z) to ray i
+    distance(i, x, y, z) {
+        const vx = x - this.ox[i], vy = y - this.oy[i], vz = z - this.oz[i];
+        const t = vx * this.dx[i] + vy * this.dy[i] + vz * this.dz[i];
+        const px = vx - this.dx[i] * t, py = vy - this.dy[i] * t, pz = vz - this.dz[i] * t;
+        return Math.sqrt(px * px + py * py + pz * pz);
+    }
+
+    // Add (sign = 1) or remove (sign = -1) ray i from the normal equations of one cluster.
+    // sums: [Σdxdx, Σdxdy, Σdxdz, Σdydy, Σdydz, Σdzdz, Σbx, Σby, Σbz, n] with b = o - d (d·o)
+    accumulate(sums, offset, i, sign) {
+        const dx = this.dx[i], dy = this.dy[i], dz = this.dz[i];
+        const ox = this.ox[i], oy = this.oy[i], oz = this.oz[i];
+        const along = dx * ox + dy * oy + dz * oz;
+        sums[offset] += sign * dx * dx;
+        sums[offset + 1] += sign * dx * dy;
+        sums[offset + 2] += sign * dx * dz;
+        sums[offset + 3] += sign * dy * dy;
+        sums[offset + 4] += sign * dy * dz;
+        sums[offset + 5] += sign * dz * dz;
+        sums[offset + 6] += sign * (ox - dx * along);
+        sums[offset + 7] += sign * (oy - dy * along);
+        sums[offset + 8] += sign * (oz - dz * along);
+        sums[offset + 9] += sign;
+    }
+
+    /**
+     * Least-squares convergence point of one cluster from its running sums into out[o..o+2].
+     * Gaussian elimination with partial pivoting; singular directions resolve to 0 as before.
+     */
+    static solveCenter(sums, offset, out, o) {
+        const n = sums[offset + 9];
+        const aug = [
+            [n - sums[offset], -sums[offset + 1], -sums[offset + 2], sums[offset + 6]],
+            [-sums[offset + 1], n - sums[offset + 3], -sums[offset + 4], sums[offset + 7]],
+            [-sums[offset + 2], -sums[offset + 4], n - sums[offset + 5], sums[offset + 8]]
+        ];
+        for (let col = 0; col < 3; col++) {
+            let maxRow = col;
+            for (let row = col + 1; row < 3; row++) {
+                if (Math.abs(aug[row][col]) > Math.abs(aug[maxRow][col])) maxRow = row;
+            }
+            [aug[col], aug[maxRow]] = [aug[maxRow], aug[col]];
+            if (Math.abs(aug[col][col]) < 1e-10) continue;
+            for (let row = col + 1; row < 3; row++) {
+                const factor = aug[row][col] / aug[col][col];
+                for (let j = col; j < 4; j++) aug[row][j] -= factor * aug[col][j];
+            }
+        }
+        for (let i = 2; i >= 0; i--) {
+            if (Math.abs(aug[i][i]) < 1e-10) {
+                out[o + i] = 0;
+                continue;
+            }
+            let value = aug[i][3];
+            for (let j = i + 1; j < 3; j++) value -= aug[i][j] * out[o + j];
+            out[o + i] = value / aug[i][i];
+        }
+    }
+
+    /**
+     * Iterate assignment / centre updates until no ray changes cluster.
+     * centers: Float64Array(6) [x0, y0, z0, x1, y1, z1], updated in place.
+     * Returns { assignment (Uint8Array), counts, iterations, converged, evaluated, pruned }.
+     */
+    cluster(centers, { maxIterations = RayClusterer.MAX_ITERATIONS, minClusterRays = RayClusterer.MIN_CLUSTER_RAYS } = {}) {
+        const n = this.count;
+        const eps = RayClusterer.BOUND_EPSILON;
+        const assignment = new Uint8Array(n);
+        const upper = new Float64Array(n);   // >= distance to the assigned centre
+        const lower = new Float64Array(n);   // <= distance to the other centre
+        const sums = new Float64Array(20);
+        const previous = new Float64Array(6);
+        let iterations = 0, converged = false, evaluated = 0, pruned = 0;
+        let shift0 = Infinity, shift1 = Infinity;  // First pass evaluates every ray
+
+        while (!converged && iterations < maxIterations) {
+            iterations++;
+            let changed = 0;
+            const [x0, y0, z0, x1, y1, z1] = centers;
+
+            for (let i = 0; i < n; i++) {
+                const own = assignment[i];
+                if (iterations > 1) {
+                    upper[i] += own === 0 ? shift0 : shift1;
+                    lower[i] = Math.max(0, lower[i] - (own === 0 ? shift1 : shift0));
+                    if (upper[i] + eps < lower[i]) {
+                        pruned++;
+                        continue;
+                    }
+                }
+                evaluated++;
+                const dist0 = this.distance(i, x0, y0, z0);
+                const dist1 = this.distance(i, x1, y1, z1);
+                const next = dist0 <= dist1 ? 0 : 1;
+                upper[i] = next === 0 ? dist0 : dist1;
+                lower[i] = next === 0 ? dist1 : dist0;
+                if (iterations === 1) {
+                    this.accumulate(sums, next * 10, i, 1);
+                    changed++;
+                } else if (next !== own) {
+                    this.accumulate(sums, own * 10, i, -1);
+                    this.accumulate(sums, next * 10, i, 1);
+                    changed++;
+                }
+                assignment[i] = next;
+            }
+
+            // Update: re-solve centres with enough rays, from the running normal equations
+            previous.set(centers);
+            if (sums[9] > minClusterRays) RayClusterer.solveCenter(sums, 0, centers, 0);
+            if (sums[19] > minClusterRays) RayClusterer.solveCenter(sums, 10, centers, 3);
+            shift0 = Math.hypot(centers[0] - previous[0], centers[1] - previous[1], centers[2] - previous[2]);
+            shift1 = Math.hypot(centers[3] - previous[3], centers[4] - previous[4], centers[5] - previous[5]);
+
+            if (changed === 0) converged = true;
+        }
+
+        return { assignment, counts: [sums[9], sums[19]], iterations, converged, evaluated, pruned };
+    }
+
+    /**
+     * RMS of |origin - centre_k| - r for every cluster k and radius r, in one sweep.
+     * Moments are taken around `reference` (e.g. the reference sphere radius) so the
+     * subtraction stays well conditioned. Returns residuals[k][r]; Infinity for empty clusters.
+     */
+    radiusFit(assignment, centers, radii, reference = 0) {
+        const moments = new Float64Array(6);  // [n, Σe, Σe²] per cluster, e = distance - reference
+        for (let i = 0; i < this.count; i++) {
+            const k = assignment[i] * 3;
+            const x = this.ox[i] - centers[k], y = this.oy[i] - centers[k + 1], z = this.oz[i] - centers[k + 2];
+            const e = Math.sqrt(x * x + y * y + z * z) - reference;
+            moments[k] += 1;
+            moments[k + 1] += e;
+            moments[k + 2] += e * e;
+        }
+        return [0, 1].map(k => radii.map(radius => {
+            const count = moments[k * 3];
+            if (count === 0) return Infinity;
+            const shift = radius - reference;
+            const sumSq = moments[k * 3 + 2] - 2 * shift * moments[k * 3 + 1] + count * shift * shift;
+            return Math.sqrt(Math.max(0, sumSq) / count);
+        }));
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { RayClusterer };
+}
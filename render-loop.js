@@ -0,0 +1,344 @@
+/**
+ * Render Loop
+ * On-demand rendering for the three viewers and screen-space-error LOD for the main one
+ * (ES module).
+ *
+ * - One WebGL context: the main viewer's renderer also draws the secondary viewers
+ *   (secondary-viewer.js), so a BufferAttribute shared between viewers is one GPU buffer.
+ * - A frame is requested only when a view is invalidated (controls 'change', resize, UI
+ *   input, status updates); idle viewers cost nothing. Damped orbiting keeps invalidating
+ *   itself until the camera settles.
+ * - ScreenSpaceLOD swaps the main mesh for the coarsest decimated level whose Hausdorff
+ *   error projects to at most TOLERANCE_PX pixels (MOVING_TOLERANCE_PX while the camera
+ *   moves, refined once it settles). Levels are built in a worker of their own
+ *   (MeshDecimator.levels) and take the mesh's material, zone colours and opacity groups
+ *   from the corners their vertices were kept from.
+ * - getStats(): CPU frame times and the bytes of every distinct geometry buffer in the
+ *   views, for the performance dashboard.
+ */
+import * as THREE from 'three';
+
+const worldCenter = new THREE.Vector3();
+const drawingBuffer = new THREE.Vector2();
+
+export class RenderLoop {
+    static FRAME_SAMPLES = 120;
+
+    constructor(renderer) {
+        this.renderer = renderer;
+        this.views = [];  // Drawn in order; views drawn through the shared canvas come first
+        this.scheduled = false;
+        this.frameTimes = new Float64Array(RenderLoop.FRAME_SAMPLES);
+        this.frames = 0;
+        this.viewRenders = 0;
+        this.requests = 0;
+        this.frame = this.frame.bind(this);
+    }
+
+    /**
+     * view: { render() -> false when nothing was drawn, scene, sharesCanvas, ownsCanvas,
+     * geometries() -> extra geometries drawn outside the scene (optional) }
+     * A view that owns the canvas is redrawn whenever a sharing view painted over it.
+     */
+    add(view) {
+        view.loop = this;
+        this.views.push(view);
+        this.invalidate(view);
+        return view;
+    }
+
+    invalidate(view = null) {
+        if (view) view.dirty = true;
+        else for (const each of this.views) each.dirty = true;
+        this.requests++;
+        if (!this.scheduled) {
+            this.scheduled = true;
+            requestAnimationFrame(this.frame);
+        }
+    }
+
+    frame() {
+        this.scheduled = false;
+        const start = performance.now();
+        let drawn = 0;
+        let canvasUsed = false;
+        for (const view of this.views) {
+            if (!view.dirty && !(canvasUsed && view.ownsCanvas)) continue;
+            view.dirty = false;  // render() may invalidate again (damping)
+            if (view.render() === false) continue;
+            drawn++;
+            if (view.sharesCanvas) canvasUsed = true;
+        }
+        if (drawn === 0) return;
+        this.frameTimes[this.frames % RenderLoop.FRAME_SAMPLES] = performance.now() - start;
+        this.frames++;
+        this.viewRenders += drawn;
+    }
+
+    // Distinct vertex / index buffers reachable from the views: what the shared context holds.
+    // sharedBytes is what per-viewer copies of the shared ones would add on top.
+    gpuMemory() {
+        const references = new Map();
+        const count = (geometry) => {
+            if (!geometry?.isBufferGeometry) return;
+            const buffers = Object.values(geometry.attributes);
+            if (geometry.index) buffers.push(geometry.index);
+            for (const attribute of buffers) {
+                if (attribute.array) references.set(attribute, (references.get(attribute) || 0) + 1);
+            }
+        };
+        for (const view of this.views) {
+            view.scene?.traverse(object => count(object.geometry));
+            view.geometries?.().forEach(count);
+        }
+        let bytes = 0, sharedBytes = 0;
+        for (const [attribute, uses] of references) {
+            bytes += attribute.array.byteLength;
+            sharedBytes += (uses - 1) * attribute.array.byteLength;
+        }
+        return { bytes, sharedBytes, buffers: references.size, ...this.renderer.info.memory };
+    }
+
+    getStats() {
+        const samples = Math.min(this.frames, RenderLoop.FRAME_SAMPLES);
+        const times = Array.from(this.frameTimes.subarray(0, samples)).sort((a, b) => a - b);
+        const quantile = (q) => samples > 0 ? times[Math.min(samples - 1, Math.floor(q * samples))] : 0;
+        return {
+            frames: this.frames,
+            viewRenders: this.viewRenders,
+            requests: this.requests,
+            frameP50: quantile(0.5),
+            frameP95: quantile(0.95),
+            memory: this.gpuMemory()
+        };
+    }
+}
+
+export class ScreenSpaceLOD {
+    static MIN_FACES = 400000;          // Smaller meshes always draw at full resolution
+    static RATIOS = [0.25, 0.0625];     // Level sizes relative to the full mesh
+    static LEVEL_MIN_FACES = 50000;
+    static TOLERANCE_PX = 1;            // Projected error allowed at rest
+    static MOVING_TOLERANCE_PX = 4;     // ... while the camera moves
+    static SETTLE_MS = 200;             // Camera still this long = at rest
+    static WELD_CELL = 1e-5;            // Weld grid as a fraction of the largest dimension
+    static CACHED_MESHES = 2;           // Level sets kept (full mesh + progressive preview)
+
+    constructor(workerUrl) {
+        this.workerUrl = workerUrl;
+        this.cache = new Map();  // positions array -> { levels, pending }
+        this.current = null;     // Entry for the mesh drawn last
+        this.drawnLevel = null;  // Level drawn in the last frame (null = full mesh)
+        this.onReady = null;     // Called when a level set has been built
+    }
+
+    /**
+     * Draw `scene` with `mesh` replaced by its coarsest acceptable level. Returns true when a
+     * coarser level than the at-rest choice was used, i.e. a refinement frame is due.
+     */
+    draw(renderer, scene, camera, mesh, moving) {
+        const entry = mesh?.parent && mesh.visible ? this.levelsFor(mesh) : null;
+        const height = renderer.getDrawingBufferSize(drawingBuffer).y;
+        const level = entry ? this.select(entry.levels, mesh, camera, height, moving ? ScreenSpaceLOD.MOVING_TOLERANCE_PX : ScreenSpaceLOD.TOLERANCE_PX) : null;
+        this.drawnLevel = level;
+        if (!level) {
+            renderer.render(scene, camera);
+            return false;
+        }
+
+        this.sync(level, mesh);
+        const parent = mesh.parent;
+        mesh.visible = false;
+        parent.add(level.mesh);
+        renderer.render(scene, camera);
+        parent.remove(level.mesh);
+        mesh.visible = true;
+        return moving && level !== this.select(entry.levels, mesh, camera, height, ScreenSpaceLOD.TOLERANCE_PX);
+    }
+
+    // Coarsest level whose error, projected at the mesh's nearest possible distance, is within tolerance
+    select(levels, mesh, camera, viewportHeight, tolerancePx) {
+        const bounds = mesh.geometry.boundingSphere;
+        if (!bounds || levels.length === 0) return null;
+        worldCenter.copy(bounds.center).applyMatrix4(mesh.matrixWorld);
+        const distance = Math.max(camera.near, camera.position.distanceTo(worldCenter) - bounds.radius);
+        const pixelsPerUnit = viewportHeight / (2 * distance * Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2));
+        for (let i = levels.length - 1; i >= 0; i--) {
+            if (levels[i].error * pixelsPerUnit <= tolerancePx) return levels[i];
+        }
+        return null;
+    }
+
+    // Level set for the mesh's geometry; started in the background the first time it is drawn
+    levelsFor(mesh) {
+        const positions = mesh.geometry.attributes.position.array;
+        let entry = this.cache.get(positions);
+        if (!entry) {
+            entry = { levels: [], pending: false };
+            this.cache.set(positions, entry);
+            while (this.cache.size > ScreenSpaceLOD.CACHED_MESHES) {
+                const [oldest, evicted] = this.cache.entries().next().value;
+                this.disposeEntry(evicted);
+                this.cache.delete(oldest);
+            }
+            if (positions.length / 9 >= ScreenSpaceLOD.MIN_FACES && typeof Worker !== 'undefined') {
+                this.build(entry, mesh.geometry);
+            }
+        }
+        this.current = entry;
+        return entry;
+    }
+
+    build(entry, geometry) {
+        if (!geometry.boundingBox) geometry.computeBoundingBox();
+        const size = geometry.boundingBox.getSize(new THREE.Vector3());
+        const cellSize = Math.max(size.x, size.y, size.z) * ScreenSpaceLOD.WELD_CELL;
+        const soup = geometry.attributes.position.array.slice();  // The worker takes ownership
+        const worker = new Worker(this.workerUrl);
+        const start = performance.now();
+        entry.pending = true;
+        entry.worker = worker;
+
+        worker.onmessage = (event) => {
+            const { type, data, error } = event.data;
+            if (type !== 'buildLod' && !error) return;
+            worker.terminate();
+            entry.pending = false;
+            entry.worker = null;
+            if (error || entry.disposed) {
+                if (error) console.warn('LOD build failed:', error);
+                return;
+            }
+            entry.levels = data.levels.map(level => this.createLevel(level));
+            console.log(`🔭 LOD: ${entry.levels.map(level => `${level.faceCount.toLocaleString()} faces (±${level.error.toFixed(4)} mm)`).join(', ')} ` +
+                `built in ${((performance.now() - start) / 1000).toFixed(1)}s`);
+            this.onReady?.();
+        };
+        worker.onerror = (event) => {
+            worker.terminate();
+            entry.pending = false;
+            console.warn('LOD worker failed:', event.message);
+        };
+        worker.postMessage({
+            type: 'buildLod',
+            payload: { soup, cellSize, ratios: ScreenSpaceLOD.RATIOS, minFaces: ScreenSpaceLOD.LEVEL_MIN_FACES }
+        }, [soup.buffer]);
+    }
+
+    createLevel({ positions, index, sourceCorner, faceCount, error }) {
+        const geometry = new THREE.BufferGeometry();
+        geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+        geometry.setIndex(new THREE.BufferAttribute(index, 1));
+        geometry.computeVertexNormals();
+        geometry.computeBoundingSphere();
+        const mesh = new THREE.Mesh(geometry);
+        mesh.matrixAutoUpdate = false;
+        return { mesh, index, sourceCorner, faceCount, error, synced: {} };
+    }
+
+    /**
+     * Follow the full mesh: same material and transform, zone colours gathered from the
+     * corners the level's vertices were kept from, faces regrouped by the material of those
+     * corners' faces (majority of three). Recomputed only when the mesh's buffers change.
+     */
+    sync(level, mesh) {
+        const source = mesh.geometry;
+        const geometry = level.mesh.geometry;
+        const { synced, sourceCorner } = level;
+        level.mesh.material = mesh.material;
+        level.mesh.renderOrder = mesh.renderOrder;
+        level.mesh.matrix.copy(mesh.matrixWorld);
+
+        const color = source.getAttribute('color');
+        if (synced.color !== color || synced.colorVersion !== color?.version) {
+            if (color) {
+                const colors = new Float32Array(sourceCorner.length * 3);
+                for (let v = 0; v < sourceCorner.length; v++) {
+                    const c = sourceCorner[v] * color.itemSize;
+                    colors[v * 3] = color.array[c];
+                    colors[v * 3 + 1] = color.array[c + 1];
+                    colors[v * 3 + 2] = color.array[c + 2];
+                }
+                geometry.setAttribute('color', new THREE.BufferAttribute(colors, 3));
+            } else {
+                geometry.deleteAttribute('color');
+            }
+            synced.color = color;
+            synced.colorVersion = color?.version;
+        }
+
+        const groupsKey = source.groups.map(group => `${group.start}:${group.count}:${group.materialIndex}`).join(',');
+        if (synced.sourceIndex !== source.index || synced.groupsKey !== groupsKey) {
+            this.regroup(level, source);
+            synced.sourceIndex = source.index;
+            synced.groupsKey = groupsKey;
+        }
+    }
+
+    regroup(level, source) {
+        const geometry = level.mesh.geometry;
+        geometry.clearGroups();
+        if (source.groups.length === 0) {
+            geometry.setIndex(new THREE.BufferAttribute(level.index, 1));
+            return;
+        }
+
+        // Material per face of the full mesh (groups run over its index, or over its corners)
+        const sourceIndex = source.index?.array;
+        const faceMaterial = new Uint8Array(source.attributes.position.count / 3);
+        for (const group of source.groups) {
+            for (let i = group.start; i < group.start + group.count; i += 3) {
+                faceMaterial[Math.floor((sourceIndex ? sourceIndex[i] : i) / 3)] = group.materialIndex;
+            }
+        }
+
+        const { index, sourceCorner } = level;
+        const faceCount = index.length / 3;
+        const levelMaterial = new Uint8Array(faceCount);
+        const counts = new Uint32Array(256);
+        for (let f = 0; f < faceCount; f++) {
+            const a = faceMaterial[Math.floor(sourceCorner[index[f * 3]] / 3)];
+            const b = faceMaterial[Math.floor(sourceCorner[index[f * 3 + 1]] / 3)];
+            const c = faceMaterial[Math.floor(sourceCorner[index[f * 3 + 2]] / 3)];
+            levelMaterial[f] = a === b || a === c ? a : b === c ? b : a;
+            counts[levelMaterial[f]]++;
+        }
+
+        // Counting sort of the faces by material, one group per material
+        const offsets = new Uint32Array(256);
+        for (let m = 0, start = 0; m < 256; m++) {
+            offsets[m] = start;
+            if (counts[m] > 0) geometry.addGroup(start * 3, counts[m] * 3, m);
+            start += counts[m];
+        }
+        const grouped = new Uint32Array(index.length);
+        for (let f = 0; f < faceCount; f++) {
+            const o = offsets[levelMaterial[f]]++ * 3;
+            grouped[o] = index[f * 3];
+            grouped[o + 1] = index[f * 3 + 1];
+            grouped[o + 2] = index[f * 3 + 2];
+        }
+        geometry.setIndex(new THREE.BufferAttribute(grouped, 1));
+    }
+
+    // Level geometries of the mesh drawn last (for the GPU memory figure)
+    geometries() {
+        return this.current ? this.current.levels.map(level => level.mesh.geometry) : [];
+    }
+
+    getStats() {
+        const levels = this.current?.levels || [];
+        return {
+            levels: levels.map(level => ({ faces: level.faceCount, error: level.error })),
+            pending: !!this.current?.pending,
+            drawn: this.drawnLevel ? { faces: this.drawnLevel.faceCount, error: this.drawnLevel.error } : null
+        };
+    }
+
+    disposeEntry(entry) {
+        entry.disposed = true;
+        entry.worker?.terminate();
+        for (const level of entry.levels) level.mesh.geometry.dispose();
+        if (this.current === entry) this.current = null;
+    }
+}
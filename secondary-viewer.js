@@ -0,0 +1,136 @@
+/**
+ * Secondary Viewer
+ * Reference-sphere and volumetric wear viewers, created on demand (ES module).
+ *
+ * Scene, camera and lights exist from startup: analysis code adds its objects to the scene
+ * whenever a result is computed. The orbit controls and the view's canvas are only created
+ * by ensure(), when step 3 / 4 first has something to show, so until then the viewer costs
+ * no canvas and no render.
+ *
+ * There is no WebGL context per viewer: the view is drawn by the main viewer's renderer
+ * (one context, so geometry buffers shared with overlayGeometry() are uploaded once) and
+ * copied into a 2D canvas. Drawing happens only when the RenderLoop (render-loop.js) finds
+ * the view invalidated: camera moves, resizes, new results.
+ */
+import * as THREE from 'three';
+import { OrbitControls } from 'three/addons/controls/OrbitControls.js';
+
+const drawingBuffer = new THREE.Vector2();
+
+export class SecondaryViewer {
+    constructor(containerId, { background = 0x1a202c, far = 1000, renderer = null } = {}) {
+        this.container = document.getElementById(containerId);
+        this.scene = new THREE.Scene();
+        this.scene.background = new THREE.Color(background);
+
+        this.camera = new THREE.PerspectiveCamera(75, this.aspect(), 0.1, far);
+        this.camera.position.set(50, 50, 50);
+
+        const ambientLight = new THREE.AmbientLight(0xffffff, 0.6);
+        const directionalLight = new THREE.DirectionalLight(0xffffff, 0.8);
+        directionalLight.position.set(50, 50, 50);
+        this.scene.add(ambientLight, directionalLight);
+
+        this.shared = renderer;  // Main viewer's WebGLRenderer
+        this.renderer = null;    // Set to the shared renderer by ensure()
+        this.controls = null;
+        this.canvas = null;
+        this.context = null;
+
+        // RenderLoop view fields: drawn through the shared canvas, which the main view repaints
+        this.dirty = false;
+        this.sharesCanvas = true;
+        this.loop = null;
+    }
+
+    get ready() {
+        return this.renderer !== null;
+    }
+
+    aspect() {
+        return this.container.clientWidth / this.container.clientHeight || 1;
+    }
+
+    // Canvas and controls on first use; returns the viewer for chaining
+    ensure() {
+        if (this.renderer) return this;
+        const start = performance.now();
+        this.renderer = this.shared;
+        this.canvas = document.createElement('canvas');
+        this.canvas.style.display = 'block';
+        this.context = this.canvas.getContext('2d');
+        this.container.appendChild(this.canvas);
+
+        this.controls = new OrbitControls(this.camera, this.canvas);
+        this.controls.enableDamping = true;
+        this.controls.dampingFactor = 0.05;
+        this.controls.addEventListener('change', () => this.invalidate());
+
+        this.resize();
+        console.log(`🖼️ Viewer #${this.container.id} created on demand (${(performance.now() - start).toFixed(1)} ms)`);
+        return this;
+    }
+
+    invalidate() {
+        if (this.loop) this.loop.invalidate(this);
+        else this.dirty = true;
+    }
+
+    // Draw into the bottom-left corner of the shared canvas (scaled down if this view is
+    // larger than it) and copy that block here. False when there is nothing to draw.
+    render() {
+        if (!this.renderer) return false;
+        this.controls.update();
+        const { canvas, renderer } = this;
+        renderer.getDrawingBufferSize(drawingBuffer);
+        const scale = Math.min(1, drawingBuffer.x / canvas.width, drawingBuffer.y / canvas.height);
+        const width = Math.floor(canvas.width * scale);
+        const height = Math.floor(canvas.height * scale);
+        if (width === 0 || height === 0) return false;
+
+        const pixelRatio = renderer.getPixelRatio();
+        renderer.setViewport(0, 0, width / pixelRatio, height / pixelRatio);
+        renderer.setScissor(0, 0, width / pixelRatio, height / pixelRatio);
+        renderer.setScissorTest(true);
+        renderer.render(this.scene, this.camera);
+        // WebGL rows start at the bottom; the frame is still readable until this task ends
+        this.context.drawImage(renderer.domElement, 0, drawingBuffer.y - height, width, height, 0, 0, canvas.width, canvas.height);
+        renderer.setScissorTest(false);
+        renderer.setViewport(0, 0, drawingBuffer.x / pixelRatio, drawingBuffer.y / pixelRatio);
+        return true;
+    }
+
+    resize() {
+        if (!this.renderer) return;
+        this.canvas.width = this.container.clientWidth;
+        this.canvas.height = this.container.clientHeight;
+        this.camera.aspect = this.aspect();
+        this.camera.updateProjectionMatrix();
+        this.invalidate();
+    }
+}
+
+/**
+ * Geometry that draws `source`'s position / normal / index buffers (the same BufferAttribute
+ * objects, so one upload in the shared context) with its own per-viewer attributes (zone
+ * colours...) and, unless groups is false, a copy of its opacity groups.
+ * Never dispose() an overlay: that would free the source's buffers as well.
+ */
+export function overlayGeometry(source, { groups = true, attributes = {} } = {}) {
+    const geometry = new THREE.BufferGeometry();
+    for (const name of ['position', 'normal']) {
+        const attribute = source.getAttribute(name);
+        if (attribute) geometry.setAttribute(name, attribute);
+    }
+    if (source.index) geometry.setIndex(source.index);
+    if (groups) {
+        for (const group of source.groups) geometry.addGroup(group.start, group.count, group.materialIndex);
+    }
+    for (const [name, attribute] of Object.entries(attributes)) {
+        if (attribute) geometry.setAttribute(name, attribute);
+    }
+    if (!source.boundingSphere) source.computeBoundingSphere();
+    geometry.boundingSphere = source.boundingSphere.clone();
+    if (source.boundingBox) geometry.boundingBox = source.boundingBox.clone();
+    return geometry;
+}
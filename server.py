@@ -1,51 +1,377 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server for the Acetabular Wear Analysis System.
-Serves static files with proper cache control headers to prevent caching issues.
+
+Two modes:
+- dev (default): single-threaded, every response sent with no-cache headers so edits show
+  up on reload.
+- production (--production or WEAR_SERVER_MODE=production): threaded, HTTP/1.1 keep-alive,
+  static assets served from an in-memory cache with strong ETags (If-None-Match -> 304)
+  and gzip/brotli variants compressed once at startup. Brotli needs the optional `brotli`
+  package; without it only gzip variants are built.
+
+Both modes also expose case storage (case_storage.py): resumable chunked STL uploads and
+Range-served scans under --cases-dir (default ./cases, or WEAR_CASES_DIR), the
+benchmark history behind benchmark.html (benchmark_history.py, benchmarks/history.json)
+and, with --trace-log, an NDJSON log of client pipeline traces (trace_log.py). The trace log,
+traces/ and the history file answer 404 as static paths; only their /api routes read them.
+
+Third-party libraries are served from ./vendor (vendor_assets.py); files not downloaded
+yet redirect to their pinned CDN URL.
 """
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import mimetypes
 import os
+import socketserver
+import threading
 from pathlib import Path
 
+from benchmark_history import BenchmarkHistory, BenchmarkMixin
+from case_storage import CaseStorageMixin, CaseStore
+from trace_log import DEFAULT_TRACE_LOG, TraceLog, TraceLogMixin
+from vendor_assets import VendorMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Text assets worth holding compressed in memory; anything else (STL scans, images)
+# goes through SimpleHTTPRequestHandler straight from disk
+CACHEABLE_EXTENSIONS = {'.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.md', '.map', '.wasm'}
+MAX_CACHED_BYTES = 8 * 1024 * 1024
+MIN_COMPRESS_BYTES = 1024
+SKIPPED_DIRS = {'__pycache__', 'node_modules', 'attached_assets', 'cases', 'benchmarks', 'traces'}
+
+
+def send_isolation_headers(handler):
+    """
+    Make the page crossOriginIsolated so SharedArrayBuffer is available to the
+    worker pool. 'credentialless' keeps CDN fallbacks for libraries not vendored yet
+    loading without CORP headers; browsers without it fall back to transferables.
+    """
+    handler.send_header('Cross-Origin-Opener-Policy', 'same-origin')
+    handler.send_header('Cross-Origin-Embedder-Policy', 'credentialless')
+
 
 class ReuseAddressTCPServer(socketserver.TCPServer):
     """TCPServer with SO_REUSEADDR enabled."""
     allow_reuse_address = True
 
 
-class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+class ReuseAddressThreadingServer(http.server.ThreadingHTTPServer):
+    """Thread-per-connection server: a slow client no longer blocks the others."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class NoCacheHTTPRequestHandler(VendorMixin, TraceLogMixin, BenchmarkMixin, CaseStorageMixin,
+                                http.server.SimpleHTTPRequestHandler):
     """HTTP request handler with disabled caching for development."""
-    
+
+    def do_GET(self):
+        if (not self.handle_vendor_request(head_only=False) and not self.handle_trace_request(head_only=False)
+                and not self.handle_benchmark_request(head_only=False) and not self.handle_case_request(head_only=False)):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if (not self.handle_vendor_request(head_only=True) and not self.handle_trace_request(head_only=True)
+                and not self.handle_benchmark_request(head_only=True) and not self.handle_case_request(head_only=True)):
+            super().do_HEAD()
+
     def end_headers(self):
         """Add cache control headers to prevent browser caching."""
         self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
         self.send_header('Pragma', 'no-cache')
         self.send_header('Expires', '0')
+        send_isolation_headers(self)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        """Custom log format for cleaner output."""
+        print(f"[{self.log_date_time_string()}] {format % args}")
+
+
+def guess_content_type(path):
+    """Content type as SimpleHTTPRequestHandler would send it."""
+    return mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+
+
+class StaticAsset:
+    """One file held in memory with its precompressed variants."""
+
+    def __init__(self, path, content_type):
+        stat = path.stat()
+        body = path.read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.path = path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.content_type = content_type
+        self.last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        # encoding -> (body, etag); each representation gets its own strong ETag
+        self.variants = {'identity': (body, f'"{digest}"')}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants['gzip'] = (compressed, f'"{digest}-gz"')
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants['br'] = (compressed, f'"{digest}-br"')
+
+    def is_stale(self):
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return True
+        return stat.st_mtime_ns != self.mtime_ns or stat.st_size != self.size
+
+    @property
+    def etags(self):
+        return {etag for _, etag in self.variants.values()}
+
+
+class StaticAssetCache:
+    """
+    Static assets under `root`, compressed once at startup. Entries are re-read when the
+    file changes on disk, so a deploy does not need a server restart.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self.assets = {}  # path relative to root (posix) -> StaticAsset
+        self.lock = threading.Lock()
+
+    def warm(self):
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d not in SKIPPED_DIRS]
+            for filename in filenames:
+                path = Path(directory) / filename
+                if self.cacheable(path):
+                    self.load(path)
+        return self
+
+    def cacheable(self, path):
+        return (path.suffix.lower() in CACHEABLE_EXTENSIONS and path.is_file() and
+                path.stat().st_size <= MAX_CACHED_BYTES)
+
+    def load(self, path):
+        key = path.relative_to(self.root).as_posix()
+        asset = StaticAsset(path, guess_content_type(path))
+        with self.lock:
+            self.assets[key] = asset
+        return asset
+
+    def get(self, path):
+        """Asset for a filesystem path inside root, or None to serve it from disk."""
+        path = Path(path).resolve()
+        try:
+            key = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        with self.lock:
+            asset = self.assets.get(key)
+        if asset is not None and not asset.is_stale():
+            return asset
+        if path.is_file() and self.cacheable(path):
+            return self.load(path)
+        with self.lock:
+            self.assets.pop(key, None)
+        return None
+
+    def stats(self):
+        with self.lock:
+            assets = list(self.assets.values())
+        totals = {}
+        for asset in assets:
+            for encoding, (body, _) in asset.variants.items():
+                totals[encoding] = totals.get(encoding, 0) + len(body)
+        return len(assets), totals
+
+
+def parse_accept_encoding(header):
+    """Accepted content codings with their q-values ({'gzip': 1.0, 'br': 0.8})."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+class ProductionHTTPRequestHandler(VendorMixin, TraceLogMixin, BenchmarkMixin, CaseStorageMixin,
+                                   http.server.SimpleHTTPRequestHandler):
+    """Keep-alive handler serving cached static assets with ETags and precompressed bodies."""
+
+    protocol_version = 'HTTP/1.1'
+    asset_cache = None  # StaticAssetCache, set by run_server
+    max_age = 0  # seconds browsers may reuse a cached asset before revalidating
+    case_cache_control = 'public, max-age=31536000, immutable'
+
+    def end_headers(self):
+        send_isolation_headers(self)
         super().end_headers()
-    
+
     def log_message(self, format, *args):
         """Custom log format for cleaner output."""
         print(f"[{self.log_date_time_string()}] {format % args}")
 
+    def do_GET(self):
+        if (not self.handle_vendor_request(head_only=False) and not self.handle_trace_request(head_only=False)
+                and not self.handle_benchmark_request(head_only=False) and not self.handle_case_request(head_only=False)
+                and not self.send_cached_asset(head_only=False)):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if (not self.handle_vendor_request(head_only=True) and not self.handle_trace_request(head_only=True)
+                and not self.handle_benchmark_request(head_only=True) and not self.handle_case_request(head_only=True)
+                and not self.send_cached_asset(head_only=True)):
+            super().do_HEAD()
+
+    def send_cached_asset(self, head_only):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not self.path.split('?', 1)[0].endswith('/'):
+                return False  # Let SimpleHTTPRequestHandler send its redirect
+            path = os.path.join(path, 'index.html')
+        asset = self.asset_cache.get(path) if self.asset_cache else None
+        if asset is None:
+            return False
+
+        encoding = self.choose_encoding(asset)
+        body, etag = asset.variants[encoding]
+        if self.etag_matches(asset):
+            self.send_response(304)
+            self.send_asset_headers(asset, etag)
+            self.end_headers()
+            return True
+
+        self.send_response(200)
+        self.send_asset_headers(asset, etag)
+        self.send_header('Content-Type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+        return True
+
+    def send_asset_headers(self, asset, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('Vary', 'Accept-Encoding')
+        # HTML always revalidates so a deploy is picked up on the next load; the 304 is cheap.
+        # Vendored libraries sit under a pinned version in their path and never change.
+        if self.path.startswith('/vendor/'):
+            self.send_header('Cache-Control', self.case_cache_control)
+        elif asset.content_type.startswith('text/html') or self.max_age <= 0:
+            self.send_header('Cache-Control', 'no-cache')
+        else:
+            self.send_header('Cache-Control', f'public, max-age={self.max_age}')
+
+    def choose_encoding(self, asset):
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding'))
+        for encoding in ('br', 'gzip'):
+            quality = accepted.get(encoding, accepted.get('*', 0.0))
+            if encoding in asset.variants and quality > 0:
+                return encoding
+        return 'identity'
 
-def run_server(port=5000, host='0.0.0.0'):
+    def etag_matches(self, asset):
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+        candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+        return not candidates.isdisjoint(asset.etags)
+
+
+def run_server(port=5000, host='0.0.0.0', production=False, max_age=0, cases_dir='cases', trace_log=None):
     """Start the HTTP server."""
     os.chdir(Path(__file__).parent)
-    
-    with ReuseAddressTCPServer((host, port), NoCacheHTTPRequestHandler) as httpd:
+    case_store = CaseStore(cases_dir)
+    pruned = case_store.prune_uploads()
+
+    if production:
+        handler = ProductionHTTPRequestHandler
+        handler.max_age = max_age
+        handler.asset_cache = StaticAssetCache('.').warm()
+        server_class = ReuseAddressThreadingServer
+    else:
+        handler = NoCacheHTTPRequestHandler
+        server_class = ReuseAddressTCPServer
+    handler.case_store = case_store
+    handler.benchmark_history = BenchmarkHistory('benchmarks/history.json')
+    handler.trace_log = TraceLog(trace_log) if trace_log else None
+
+    with server_class((host, port), handler) as httpd:
         print(f"========================================")
         print(f"Acetabular Wear Analysis System Server")
         print(f"========================================")
         print(f"Serving at http://{host}:{port}/")
+        if production:
+            count, totals = handler.asset_cache.stats()
+            sizes = ', '.join(f"{encoding} {size / 1024:.0f} KB" for encoding, size in totals.items())
+            print(f"Mode: production (threaded, keep-alive, ETag)")
+            print(f"Cached {count} static assets: {sizes}"
+                  f"{'' if brotli else ' (install brotli for br variants)'}")
+        else:
+            print(f"Mode: development (no-cache)")
+        print(f"Cases: {case_store.root} ({len(case_store.list_cases())} stored"
+              f"{f', {pruned} stale uploads removed' if pruned else ''})")
+        print(f"Benchmarks: http://{host}:{port}/benchmark.html "
+              f"({len(handler.benchmark_history.load()['runs'])} runs in history)")
+        if handler.trace_log:
+            print(f"Traces: {handler.trace_log.path} ({handler.trace_log.count()} stored)")
+        else:
+            print(f"Traces: disabled (--trace-log to collect client traces)")
         print(f"Press Ctrl+C to stop the server")
         print(f"========================================\n")
-        
+
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\n\nServer stopped.")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Acetabular Wear Analysis System server')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--production', action='store_true',
+                        default=os.environ.get('WEAR_SERVER_MODE', '').lower() == 'production',
+                        help='threaded keep-alive serving with ETags and precompressed assets '
+                             '(or WEAR_SERVER_MODE=production)')
+    parser.add_argument('--max-age', type=int, default=0,
+                        help='seconds browsers may reuse JS/CSS without revalidating (production; default 0)')
+    parser.add_argument('--cases-dir', default=os.environ.get('WEAR_CASES_DIR', 'cases'),
+                        help='directory for uploaded cases (default ./cases, or WEAR_CASES_DIR)')
+    parser.add_argument('--trace-log', nargs='?', const=DEFAULT_TRACE_LOG, default=os.environ.get('WEAR_TRACE_LOG'),
+                        help=f'collect client pipeline traces as NDJSON (default {DEFAULT_TRACE_LOG}, '
+                             'or WEAR_TRACE_LOG); off unless given')
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    run_server()
+    args = parse_args()
+    run_server(port=args.port, host=args.host, production=args.production, max_age=args.max_age,
+               cases_dir=args.cases_dir, trace_log=args.trace_log)
@@ -12,8 +12,32 @@ required_files=(
     "index.html"
     "stl-processor-worker.js"
     "geometry-optimizer.js"
+    "spatial-index.js"
+    "surface-model.js"
+    "ray-clustering.js"
+    "curvature-engine.js"
+    "progressive-analysis.js"
+    "binary-export.js"
+    "secondary-viewer.js"
+    "render-loop.js"
+    "app.css"
+    "build_css.py"
+    "vendor_assets.py"
+    "mesh-decimation.js"
+    "worker-pool.js"
+    "geometry-cache.js"
+    "case-storage.js"
+    "case_storage.py"
+    "wear_batch/__main__.py"
+    "benchmark.html"
+    "benchmark_history.py"
+    "trace-recorder.js"
+    "trace_log.py"
+    "stage-graph.js"
     "performance-dashboard.js"
     "optimization-tests.js"
+    "stl-parse-benchmark.js"
+    "curvature-benchmark.js"
     "OPTIMIZATION_GUIDE.md"
     "DEPLOY_GUIDE.md"
     "IMPLEMENTATION_SUMMARY.md"
@@ -29,6 +53,16 @@ for file in "${required_files[@]}"; do
     fi
 done
 
+# Librerías de vendor/ (sin ellas index.html usa el CDN fijado, que requiere Internet)
+echo ""
+echo "✓ Verificando vendor/..."
+if python3 vendor_assets.py --check > /dev/null; then
+    echo "  ✅ vendor/"
+else
+    echo "  ⚠️  vendor/ incompleto - se usará el CDN; para arrancar sin conexión ejecuta"
+    echo "     'python vendor_assets.py' con Internet y versiona vendor/ junto con vendor/SHA256SUMS"
+fi
+
 echo ""
 if [ $missing -eq 0 ]; then
     echo "✅ Todos los archivos están presentes!"
@@ -36,6 +70,7 @@ if [ $missing -eq 0 ]; then
     echo "📖 Próximos pasos:"
     echo ""
     echo "1. DESARROLLO LOCAL:"
+    echo "   python vendor_assets.py   # Librerías locales (una vez, con Internet)"
     echo "   python server.py"
     echo "   # O: python -m http.server 5000"
     echo "   # Luego abre: http://localhost:5000"
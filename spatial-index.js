@@ -0,0 +1,367 @@
+/**
+ * Spatial Index (BVH)
+ * Bounding volume hierarchy over points or triangles stored in flat typed arrays.
+ * Built in the STL worker (importScripts) and rebuilt from its transferred
+ * arrays on the main thread, where queries run.
+ *
+ * Items are addressed by their position in the input array:
+ *   points:    coords = Float32Array(3 * n), stride 3
+ *   triangles: coords = Float32Array(9 * n), stride 9
+ */
+
+class SpatialIndex {
+    constructor(data) {
+        this.coords = data.coords;
+        this.stride = data.stride;
+        this.itemCount = data.coords.length / data.stride;
+        this.nodeBounds = data.nodeBounds;  // minX, minY, minZ, maxX, maxY, maxZ per node
+        this.nodeData = data.nodeData;      // [firstItem, count] for leaves, [leftChild, 0] for inner nodes
+        this.itemOrder = data.itemOrder;    // Items grouped by leaf
+        this.buildTime = data.buildTime || 0;
+        this.stack = new Uint32Array(128);
+    }
+
+    /**
+     * Build a BVH with median splits on the longest centroid axis
+     */
+    static build(coords, stride, leafSize = 8) {
+        const startTime = performance.now();
+        const itemCount = coords.length / stride;
+        const cornersPerItem = stride / 3;
+
+        const centroids = new Float32Array(itemCount * 3);
+        for (let i = 0; i < itemCount; i++) {
+            let x = 0, y = 0, z = 0;
+            for (let k = 0; k < cornersPerItem; k++) {
+                x += coords[i * stride + k * 3];
+                y += coords[i * stride + k * 3 + 1];
+                z += coords[i * stride + k * 3 + 2];
+            }
+            centroids[i * 3] = x / cornersPerItem;
+            centroids[i * 3 + 1] = y / cornersPerItem;
+            centroids[i * 3 + 2] = z / cornersPerItem;
+        }
+
+        // Median splits leave at least (leafSize + 1) / 2 items per leaf
+        const maxNodes = 2 * (Math.ceil((2 * itemCount) / (leafSize + 1)) + 1);
+        const nodeBounds = new Float32Array(maxNodes * 6);
+        const nodeData = new Uint32Array(maxNodes * 2);
+        const itemOrder = new Uint32Array(itemCount);
+        for (let i = 0; i < itemCount; i++) itemOrder[i] = i;
+
+        let nodeCount = 1;
+        const work = [[0, 0, itemCount]];
+        while (work.length > 0) {
+            const [node, start, end] = work.pop();
+
+            // Node bounds from item corners, split axis from centroid extent
+            let minX = Infinity, minY = Infinity, minZ = Infinity;
+            let maxX = -Infinity, maxY = -Infinity, maxZ = -Infinity;
+            let cMinX = Infinity, cMinY = Infinity, cMinZ = Infinity;
+            let cMaxX = -Infinity, cMaxY = -Infinity, cMaxZ = -Infinity;
+            for (let i = start; i < end; i++) {
+                const item = itemOrder[i];
+                for (let k = 0; k < cornersPerItem; k++) {
+                    const o = item * stride + k * 3;
+                    const x = coords[o], y = coords[o + 1], z = coords[o + 2];
+                    if (x < minX) minX = x;
+                    if (x > maxX) maxX = x;
+                    if (y < minY) minY = y;
+                    if (y > maxY) maxY = y;
+                    if (z < minZ) minZ = z;
+                    if (z > maxZ) maxZ = z;
+                }
+                const cx = centroids[item * 3], cy = centroids[item * 3 + 1], cz = centroids[item * 3 + 2];
+                if (cx < cMinX) cMinX = cx;
+                if (cx > cMaxX) cMaxX = cx;
+                if (cy < cMinY) cMinY = cy;
+                if (cy > cMaxY) cMaxY = cy;
+                if (cz < cMinZ) cMinZ = cz;
+                if (cz > cMaxZ) cMaxZ = cz;
+            }
+            const b = node * 6;
+            nodeBounds[b] = minX;
+            nodeBounds[b + 1] = minY;
+            nodeBounds[b + 2] = minZ;
+            nodeBounds[b + 3] = maxX;
+            nodeBounds[b + 4] = maxY;
+            nodeBounds[b + 5] = maxZ;
+
+            if (end - start <= leafSize) {
+                nodeData[node * 2] = start;
+                nodeData[node * 2 + 1] = end - start;
+                continue;
+            }
+
+            const ex = cMaxX - cMinX, ey = cMaxY - cMinY, ez = cMaxZ - cMinZ;
+            const axis = ex >= ey && ex >= ez ? 0 : (ey >= ez ? 1 : 2);
+            const mid = (start + end) >>> 1;
+            SpatialIndex.selectNth(itemOrder, centroids, axis, start, end - 1, mid);
+
+            const left = nodeCount;
+            nodeCount += 2;
+            nodeData[node * 2] = left;
+            nodeData[node * 2 + 1] = 0;
+            work.push([left, start, mid], [left + 1, mid, end]);
+        }
+
+        return new SpatialIndex({
+            coords,
+            stride,
+            nodeBounds: nodeBounds.slice(0, nodeCount * 6),
+            nodeData: nodeData.slice(0, nodeCount * 2),
+            itemOrder,
+            buildTime: performance.now() - startTime
+        });
+    }
+
+    // Quickselect: partially order itemOrder[lo..hi] so position n holds the median centroid
+    static selectNth(order, centroids, axis, lo, hi, n) {
+        while (hi > lo) {
+            const pivot = centroids[order[(lo + hi) >>> 1] * 3 + axis];
+            let i = lo, j = hi;
+            while (i <= j) {
+                while (centroids[order[i] * 3 + axis] < pivot) i++;
+                while (centroids[order[j] * 3 + axis] > pivot) j--;
+                if (i <= j) {
+                    const t = order[i];
+                    order[i] = order[j];
+                    order[j] = t;
+                    i++;
+                    j--;
+                }
+            }
+            if (n <= j) hi = j;
+            else if (n >= i) lo = i;
+            else return;
+        }
+    }
+
+    /**
+     * Arrays to post between threads (all buffers are transferable)
+     */
+    toTransferable() {
+        return {
+            coords: this.coords,
+            stride: this.stride,
+            nodeBounds: this.nodeBounds,
+            nodeData: this.nodeData,
+            itemOrder: this.itemOrder,
+            buildTime: this.buildTime
+        };
+    }
+
+    static transferList(data) {
+        return [data.coords.buffer, data.nodeBounds.buffer, data.nodeData.buffer, data.itemOrder.buffer];
+    }
+
+    // Squared distance from (x, y, z) to node's box (0 if inside)
+    boxDistanceSq(node, x, y, z) {
+        const b = node * 6;
+        const bounds = this.nodeBounds;
+        const dx = x < bounds[b] ? bounds[b] - x : (x > bounds[b + 3] ? x - bounds[b + 3] : 0);
+        const dy = y < bounds[b + 1] ? bounds[b + 1] - y : (y > bounds[b + 4] ? y - bounds[b + 4] : 0);
+        const dz = z < bounds[b + 2] ? bounds[b + 2] - z : (z > bounds[b + 5] ? z - bounds[b + 5] : 0);
+        return dx * dx + dy * dy + dz * dz;
+    }
+
+    // Squared distance from (x, y, z) to an item (point, or closest point on triangle)
+    itemDistanceSq(item, x, y, z) {
+        const c = this.coords;
+        const o = item * this.stride;
+        if (this.stride === 3) {
+            const dx = c[o] - x, dy = c[o + 1] - y, dz = c[o + 2] - z;
+            return dx * dx + dy * dy + dz * dz;
+        }
+
+        // Closest point on triangle (Ericson, Real-Time Collision Detection 5.1.5)
+        const ax = c[o], ay = c[o + 1], az = c[o + 2];
+        const abx = c[o + 3] - ax, aby = c[o + 4] - ay, abz = c[o + 5] - az;
+        const acx = c[o + 6] - ax, acy = c[o + 7] - ay, acz = c[o + 8] - az;
+        const apx = x - ax, apy = y - ay, apz = z - az;
+        const d1 = abx * apx + aby * apy + abz * apz;
+        const d2 = acx * apx + acy * apy + acz * apz;
+        let px, py, pz;
+        if (d1 <= 0 && d2 <= 0) {
+            px = ax; py = ay; pz = az;
+        } else {
+            const bpx = x - c[o + 3], bpy = y - c[o + 4], bpz = z - c[o + 5];
+            const d3 = abx * bpx + aby * bpy + abz * bpz;
+            const d4 = acx * bpx + acy * bpy + acz * bpz;
+            const cpx = x - c[o + 6], cpy = y - c[o + 7], cpz = z - c[o + 8];
+            const d5 = abx * cpx + aby * cpy + abz * cpz;
+            const d6 = acx * cpx + acy * cpy + acz * cpz;
+            const vc = d1 * d4 - d3 * d2;
+            const vb = d5 * d2 - d1 * d6;
+            const va = d3 * d6 - d5 * d4;
+            if (d3 >= 0 && d4 <= d3) {
+                px = c[o + 3]; py = c[o + 4]; pz = c[o + 5];
+            } else if (d6 >= 0 && d5 <= d6) {
+                px = c[o + 6]; py = c[o + 7]; pz = c[o + 8];
+            } else if (vc <= 0 && d1 >= 0 && d3 <= 0) {
+                const v = d1 / (d1 - d3);
+                px = ax + v * abx; py = ay + v * aby; pz = az + v * abz;
+            } else if (vb <= 0 && d2 >= 0 && d6 <= 0) {
+                const w = d2 / (d2 - d6);
+                px = ax + w * acx; py = ay + w * acy; pz = az + w * acz;
+            } else if (va <= 0 && (d4 - d3) >= 0 && (d5 - d6) >= 0) {
+                const w = (d4 - d3) / ((d4 - d3) + (d5 - d6));
+                px = c[o + 3] + w * (c[o + 6] - c[o + 3]);
+                py = c[o + 4] + w * (c[o + 7] - c[o + 4]);
+                pz = c[o + 5] + w * (c[o + 8] - c[o + 5]);
+            } else {
+                const denom = 1 / (va + vb + vc);
+                const v = vb * denom, w = vc * denom;
+                px = ax + abx * v + acx * w;
+                py = ay + aby * v + acy * w;
+                pz = az + abz * v + acz * w;
+            }
+        }
+        const dx = px - x, dy = py - y, dz = pz - z;
+        return dx * dx + dy * dy + dz * dz;
+    }
+
+    pushNode(depth, node) {
+        if (depth === this.stack.length) {
+            const grown = new Uint32Array(this.stack.length * 2);
+            grown.set(this.stack);
+            this.stack = grown;
+        }
+        this.stack[depth] = node;
+    }
+
+    /**
+     * All items within radius of (x, y, z)
+     */
+    radiusSearch(x, y, z, radius, out = []) {
+        if (this.itemCount === 0) return out;
+        const r2 = radius * radius;
+        let depth = 0;
+        this.pushNode(depth++, 0);
+        while (depth > 0) {
+            const node = this.stack[--depth];
+            if (this.boxDistanceSq(node, x, y, z) > r2) continue;
+            const first = this.nodeData[node * 2];
+            const count = this.nodeData[node * 2 + 1];
+            if (count === 0) {
+                this.pushNode(depth++, first);
+                this.pushNode(depth++, first + 1);
+                continue;
+            }
+            for (let i = first; i < first + count; i++) {
+                const item = this.itemOrder[i];
+                if (this.itemDistanceSq(item, x, y, z) <= r2) out.push(item);
+            }
+        }
+        return out;
+    }
+
+    /**
+     * k nearest items to (x, y, z), closest first: { items, distances }
+     */
+    nearest(x, y, z, k = 1) {
+        const items = [];
+        const distSq = [];
+        if (this.itemCount === 0 || k <= 0) return { items, distances: [] };
+
+        let depth = 0;
+        this.pushNode(depth++, 0);
+        while (depth > 0) {
+            const node = this.stack[--depth];
+            const worst = items.length === k ? distSq[k - 1] : Infinity;
+            if (this.boxDistanceSq(node, x, y, z) > worst) continue;
+            const first = this.nodeData[node * 2];
+            const count = this.nodeData[node * 2 + 1];
+            if (count === 0) {
+                // Visit the nearer child first (pushed last)
+                const nearLeft = this.boxDistanceSq(first, x, y, z) <= this.boxDistanceSq(first + 1, x, y, z);
+                this.pushNode(depth++, nearLeft ? first + 1 : first);
+                this.pushNode(depth++, nearLeft ? first : first + 1);
+                continue;
+            }
+            for (let i = first; i < first + count; i++) {
+                const item = this.itemOrder[i];
+                const d = this.itemDistanceSq(item, x, y, z);
+                if (items.length === k && d >= distSq[k - 1]) continue;
+                // Insertion into the sorted k-best list
+                let pos = items.length === k ? k - 1 : items.length;
+                while (pos > 0 && distSq[pos - 1] > d) {
+                    distSq[pos] = distSq[pos - 1];
+                    items[pos] = items[pos - 1];
+                    pos--;
+                }
+                distSq[pos] = d;
+                items[pos] = item;
+            }
+        }
+        return { items, distances: distSq.map(Math.sqrt) };
+    }
+
+    /**
+     * Closest triangle hit along a ray (Möller–Trumbore): { item, t } or null
+     * Direction does not need to be normalized; t is in units of its length.
+     */
+    raycast(ox, oy, oz, dx, dy, dz, maxT = Infinity) {
+        if (this.stride !== 9 || this.itemCount === 0) return null;
+        const invX = 1 / dx, invY = 1 / dy, invZ = 1 / dz;
+        const bounds = this.nodeBounds;
+        const c = this.coords;
+        let bestT = maxT;
+        let bestItem = -1;
+
+        let depth = 0;
+        this.pushNode(depth++, 0);
+        while (depth > 0) {
+            const node = this.stack[--depth];
+
+            // Slab test
+            const b = node * 6;
+            let t1 = (bounds[b] - ox) * invX, t2 = (bounds[b + 3] - ox) * invX;
+            let tMin = Math.min(t1, t2), tMax = Math.max(t1, t2);
+            t1 = (bounds[b + 1] - oy) * invY;
+            t2 = (bounds[b + 4] - oy) * invY;
+            tMin = Math.max(tMin, Math.min(t1, t2));
+            tMax = Math.min(tMax, Math.max(t1, t2));
+            t1 = (bounds[b + 2] - oz) * invZ;
+            t2 = (bounds[b + 5] - oz) * invZ;
+            tMin = Math.max(tMin, Math.min(t1, t2));
+            tMax = Math.min(tMax, Math.max(t1, t2));
+            if (tMax < Math.max(tMin, 0) || tMin > bestT) continue;
+
+            const first = this.nodeData[node * 2];
+            const count = this.nodeData[node * 2 + 1];
+            if (count === 0) {
+                this.pushNode(depth++, first);
+                this.pushNode(depth++, first + 1);
+                continue;
+            }
+            for (let i = first; i < first + count; i++) {
+                const item = this.itemOrder[i];
+                const o = item * 9;
+                const e1x = c[o + 3] - c[o], e1y = c[o + 4] - c[o + 1], e1z = c[o + 5] - c[o + 2];
+                const e2x = c[o + 6] - c[o], e2y = c[o + 7] - c[o + 1], e2z = c[o + 8] - c[o + 2];
+                const px = dy * e2z - dz * e2y, py = dz * e2x - dx * e2z, pz = dx * e2y - dy * e2x;
+                const det = e1x * px + e1y * py + e1z * pz;
+                if (Math.abs(det) < 1e-12) continue;
+                const invDet = 1 / det;
+                const sx = ox - c[o], sy = oy - c[o + 1], sz = oz - c[o + 2];
+                const u = (sx * px + sy * py + sz * pz) * invDet;
+                if (u < 0 || u > 1) continue;
+                const qx = sy * e1z - sz * e1y, qy = sz * e1x - sx * e1z, qz = sx * e1y - sy * e1x;
+                const v = (dx * qx + dy * qy + dz * qz) * invDet;
+                if (v < 0 || u + v > 1) continue;
+                const t = (e2x * qx + e2y * qy + e2z * qz) * invDet;
+                if (t >= 0 && t < bestT) {
+                    bestT = t;
+                    bestItem = item;
+                }
+            }
+        }
+        return bestItem === -1 ? null : { item: bestItem, t: bestT };
+    }
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { SpatialIndex };
+}
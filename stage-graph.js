@@ -0,0 +1,189 @@
+/**
+ * Stage Graph - memoized analysis stages with dependency tracking
+ * Fit → transition plane → wear is modelled as a small DAG. Each stage declares the stages
+ * it reads and the parameters it depends on; a result is memoized under the stage's own
+ * parameters plus the keys of its inputs. Changing the commercial radius therefore re-runs
+ * the constraint, plane and wear stages but not the (expensive) raw fit, and switching back
+ * to a previous setting is a memo hit.
+ *
+ * - `invalidate(name)` drops a stage and everything downstream (new file, new detection).
+ * - Requests are serialized: stages share worker-pool buffers, so two resolutions never
+ *   interleave.
+ * - `sweep(name, overridesList)` resolves one stage for several parameter sets in one pass,
+ *   sharing every upstream result they have in common.
+ *
+ * Usage from the console:
+ *   window.stageGraph.getStats()
+ *   await window.stageGraph.sweep('surfaceFit', [{ commercialRadius: '14' }, { commercialRadius: '16' }])
+ */
+
+class StageGraph {
+    static DEFAULT_KEEP = 8;  // Memoized results per stage (least recently used are dropped)
+
+    /**
+     * Canonical JSON (sorted object keys) so {a, b} and {b, a} produce the same memo key
+     */
+    static stableKey(value) {
+        if (value === undefined) return 'null';
+        if (value === null || typeof value !== 'object') return JSON.stringify(value);
+        if (Array.isArray(value)) return `[${value.map(StageGraph.stableKey).join(',')}]`;
+        return `{${Object.keys(value).sort()
+            .map(key => `${JSON.stringify(key)}:${StageGraph.stableKey(value[key])}`).join(',')}}`;
+    }
+
+    constructor(options = {}) {
+        this.monitor = options.monitor || null;  // PerformanceMonitor for per-stage timings
+        this.stages = new Map();  // name -> { deps, params, run, keep, memo, epoch }
+        this.queue = Promise.resolve();
+        this.lastRun = [];  // [{ stage, hit, ms }] for the most recent request
+        this.hits = 0;
+        this.misses = 0;
+        this.invalidations = 0;
+    }
+
+    /**
+     * Register a stage.
+     * deps: upstream stage names (must already be defined)
+     * params(overrides): the parameters this stage reads; overrides come from get()/sweep()
+     * run(inputs, params): inputs maps each dep name to its value; may be async.
+     * Memoized values are shared between callers and must be treated as read-only.
+     */
+    define(name, { deps = [], params = () => ({}), run, keep = StageGraph.DEFAULT_KEEP }) {
+        for (const dep of deps) {
+            if (!this.stages.has(dep)) {
+                throw new Error(`Stage ${name}: unknown dependency ${dep}`);
+            }
+        }
+        this.stages.set(name, { deps, params, run, keep, memo: new Map(), epoch: 0 });
+        return this;
+    }
+
+    get(name, overrides = {}) {
+        return this.enqueue(async () => {
+            const entry = await this.resolve(name, overrides, new Map());
+            return entry.value;
+        });
+    }
+
+    /**
+     * Resolve `name` once per overrides object; upstream stages they share run once
+     */
+    sweep(name, overridesList) {
+        return this.enqueue(async () => {
+            const values = [];
+            for (const overrides of overridesList) {
+                values.push((await this.resolve(name, overrides, new Map())).value);
+            }
+            return values;
+        });
+    }
+
+    enqueue(task) {
+        const result = this.queue.then(() => {
+            this.lastRun = [];
+            return task();
+        });
+        this.queue = result.catch(() => {});
+        return result;
+    }
+
+    async resolve(name, overrides, resolved) {
+        if (resolved.has(name)) return resolved.get(name);
+        const stage = this.stages.get(name);
+        if (!stage) {
+            throw new Error(`Unknown stage: ${name}`);
+        }
+
+        const inputs = {};
+        const depKeys = [];
+        for (const dep of stage.deps) {
+            const entry = await this.resolve(dep, overrides, resolved);
+            inputs[dep] = entry.value;
+            depKeys.push(entry.key);
+        }
+        const params = stage.params(overrides);
+        const key = `${name}#${stage.epoch}${StageGraph.stableKey(params)}<${depKeys.join(',')}>`;
+
+        let entry = stage.memo.get(key);
+        if (entry) {
+            // Refresh LRU position
+            stage.memo.delete(key);
+            stage.memo.set(key, entry);
+            this.hits++;
+            this.lastRun.push({ stage: name, hit: true, ms: 0 });
+            console.log(`⚡ Stage ${name}: memo hit`);
+        } else {
+            const epoch = stage.epoch;
+            const start = performance.now();
+            this.monitor?.startMeasure(`stage:${name}`);
+            const value = await stage.run(inputs, params);
+            this.monitor?.endMeasure(`stage:${name}`);
+            const ms = performance.now() - start;
+
+            entry = { key, value };
+            // An invalidation while the stage was running makes this result stale: return it
+            // to the caller that asked, but do not memoize it
+            if (stage.epoch === epoch) {
+                stage.memo.set(key, entry);
+                while (stage.memo.size > stage.keep) {
+                    stage.memo.delete(stage.memo.keys().next().value);
+                }
+            }
+            this.misses++;
+            this.lastRun.push({ stage: name, hit: false, ms });
+            console.log(`⏱️ Stage ${name}: ${ms.toFixed(1)} ms`);
+        }
+
+        resolved.set(name, entry);
+        return entry;
+    }
+
+    /**
+     * Drop the memoized results of `name` and of every stage downstream of it
+     */
+    invalidate(name) {
+        const stage = this.stages.get(name);
+        if (!stage) return;
+        stage.memo.clear();
+        stage.epoch++;
+        this.invalidations++;
+        for (const [other, candidate] of this.stages) {
+            if (candidate.deps.includes(name)) this.invalidate(other);
+        }
+    }
+
+    clear() {
+        for (const stage of this.stages.values()) {
+            stage.memo.clear();
+            stage.epoch++;
+        }
+    }
+
+    /**
+     * "rawFit (memo), surfaceFit 12 ms" for status lines
+     */
+    describeLastRun() {
+        return this.lastRun
+            .map(run => run.hit ? `${run.stage} (memo)` : `${run.stage} ${run.ms.toFixed(0)} ms`)
+            .join(', ');
+    }
+
+    getStats() {
+        const memoized = {};
+        for (const [name, stage] of this.stages) {
+            memoized[name] = stage.memo.size;
+        }
+        return {
+            stages: this.stages.size,
+            memoized,
+            hits: this.hits,
+            misses: this.misses,
+            invalidations: this.invalidations,
+            lastRun: this.lastRun.slice()
+        };
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { StageGraph };
+}
@@ -0,0 +1,145 @@
+/**
+ * STL Parse Throughput Benchmark
+ * Measures the worker-side binary STL parser (MB/s, welded vertex ratio, buffer footprint)
+ *
+ * Usage: Abrir en consola F12 y ejecutar:
+ *   runParseBenchmark()
+ *   runParseBenchmark({ triangleCounts: [1e5, 1e6, 4e6], repeats: 3 })
+ */
+
+/**
+ * Build a closed UV-sphere mesh as a binary STL ArrayBuffer.
+ * Every interior vertex is shared by 6 triangles, like a real scan.
+ */
+function buildSyntheticBinarySTL(targetTriangles, radius = 20) {
+    const segments = Math.max(8, Math.round(Math.sqrt(targetTriangles / 2)));
+    const rings = Math.max(4, Math.round(targetTriangles / (2 * segments)));
+    const triangleCount = 2 * segments * rings;
+
+    const buffer = new ArrayBuffer(84 + triangleCount * 50);
+    const view = new DataView(buffer);
+    view.setUint32(80, triangleCount, true);
+
+    const point = (ring, seg) => {
+        const theta = (ring / rings) * Math.PI;
+        const phi = ((seg % segments) / segments) * Math.PI * 2;
+        return [
+            radius * Math.sin(theta) * Math.cos(phi),
+            radius * Math.sin(theta) * Math.sin(phi),
+            radius * Math.cos(theta)
+        ];
+    };
+
+    let offset = 84;
+    const writeTriangle = (a, b, c) => {
+        offset += 12; // normal left as zero
+        for (const v of [a, b, c]) {
+            view.setFloat32(offset, v[0], true);
+            view.setFloat32(offset + 4, v[1], true);
+            view.setFloat32(offset + 8, v[2], true);
+            offset += 12;
+        }
+        offset += 2;
+    };
+
+    for (let r = 0; r < rings; r++) {
+        for (let s = 0; s < segments; s++) {
+            const p00 = point(r, s);
+            const p01 = point(r, s + 1);
+            const p10 = point(r + 1, s);
+            const p11 = point(r + 1, s + 1);
+            writeTriangle(p00, p10, p11);
+            writeTriangle(p00, p11, p01);
+        }
+    }
+
+    return { buffer, triangleCount };
+}
+
+/**
+ * Parse one buffer in a fresh worker. The parse runs in the worker's own heap, which the
+ * main thread cannot sample, so memory is reported as the buffers the worker holds at its
+ * peak: the transferred file plus the parser's largest welder + index arrays.
+ */
+function benchmarkWorkerParse(buffer) {
+    return new Promise((resolve, reject) => {
+        const worker = new Worker('stl-processor-worker.js');
+        const byteLength = buffer.byteLength;
+
+        const start = performance.now();
+        worker.onmessage = (event) => {
+            const { type, data, error } = event.data;
+            if (type !== 'parseSTL') return;
+
+            const wallTime = performance.now() - start;
+            worker.terminate();
+            if (error) {
+                reject(new Error(error));
+                return;
+            }
+
+            resolve({
+                byteLength,
+                wallTime,
+                parseTime: data.parseTime,
+                faceCount: data.faceCount,
+                vertexCount: data.vertexCount,
+                resultBytes: data.allocatedBytes,
+                workerBufferBytes: byteLength + data.workingBytes
+            });
+        };
+        worker.onerror = (event) => {
+            worker.terminate();
+            reject(new Error(event.message));
+        };
+
+        worker.postMessage({ type: 'parseSTL', payload: { arrayBuffer: buffer, fileName: 'benchmark.stl' } }, [buffer]);
+    });
+}
+
+async function runParseBenchmark(options = {}) {
+    const { triangleCounts = [100000, 1000000, 4000000], repeats = 3 } = options;
+    console.log('⏱️  STL Parse Benchmark (worker, zero-copy)\n');
+
+    if (typeof Worker === 'undefined') {
+        console.warn('⚠️  Web Workers not supported, benchmark skipped');
+        return [];
+    }
+    const toMB = (bytes) => bytes / (1024 * 1024);
+    const results = [];
+
+    for (const target of triangleCounts) {
+        const runs = [];
+        let triangleCount = 0;
+        for (let r = 0; r < repeats; r++) {
+            // Buffers are transferred (detached) by each run, so rebuild per repeat
+            const synthetic = buildSyntheticBinarySTL(target);
+            triangleCount = synthetic.triangleCount;
+            runs.push(await benchmarkWorkerParse(synthetic.buffer));
+        }
+
+        // Report the median run
+        runs.sort((a, b) => a.parseTime - b.parseTime);
+        const median = runs[Math.floor(runs.length / 2)];
+        const result = {
+            triangles: triangleCount,
+            fileMB: toMB(median.byteLength).toFixed(1),
+            parseMs: median.parseTime.toFixed(1),
+            wallMs: median.wallTime.toFixed(1),
+            throughputMBs: (toMB(median.byteLength) / (median.parseTime / 1000)).toFixed(1),
+            weldedVertices: median.vertexCount,
+            weldRatio: (median.vertexCount / (triangleCount * 3)).toFixed(3),
+            resultMB: toMB(median.resultBytes).toFixed(1),
+            workerBuffersMB: toMB(median.workerBufferBytes).toFixed(1)
+        };
+        results.push(result);
+        console.log(`${triangleCount.toLocaleString()} triangles (${result.fileMB} MB): ${result.throughputMBs} MB/s, ` +
+            `${result.weldedVertices.toLocaleString()} vertices, result ${result.resultMB} MB, worker buffers ${result.workerBuffersMB} MB (file + parser arrays)`);
+    }
+
+    console.table(results);
+    return results;
+}
+
+window.runParseBenchmark = runParseBenchmark;
+window.buildSyntheticBinarySTL = buildSyntheticBinarySTL;
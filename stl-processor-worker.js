@@ -4,17 +4,39 @@
  * Allows UI to remain responsive during analysis
  */
 
+importScripts('trace-recorder.js', 'spatial-index.js', 'worker-pool.js', 'mesh-decimation.js', 'curvature-engine.js');
+
 // Worker-side state
 let geometryData = null;
+let streamState = null;  // Incremental parser for the STL currently being streamed in
+const sharedBuffers = new Map();  // Geometry shared by the WorkerPool (SharedArrayBuffer views by name)
+
+let activeRequestId = null;  // requestId of the message being handled, echoed on every reply
+
+// postMessage for handler replies and progress: tags them with the request they belong to, so
+// the main thread can tell apart two requests of the same type (handlers are synchronous)
+function reply(message, transfer = []) {
+    self.postMessage(activeRequestId === null ? message : { ...message, requestId: activeRequestId }, transfer);
+}
 
 self.onmessage = async (event) => {
     const { type, payload } = event.data;
+    activeRequestId = event.data.requestId ?? null;
 
     try {
         switch (type) {
             case 'parseSTL':
                 handleParseSTL(payload);
                 break;
+            case 'streamBegin':
+                handleStreamBegin(payload);
+                break;
+            case 'streamChunk':
+                handleStreamChunk(payload);
+                break;
+            case 'streamEnd':
+                handleStreamEnd();
+                break;
             case 'isolateInnerSurface':
                 handleIsolateInnerSurface(payload);
                 break;
@@ -24,28 +46,58 @@ self.onmessage = async (event) => {
             case 'calculateVolumetricWear':
                 handleCalculateVolumetricWear(payload);
                 break;
+            case 'buildSpatialIndex':
+                handleBuildSpatialIndex(payload);
+                break;
+            case 'precompress':
+                handlePrecompress(payload);
+                break;
+            case 'buildLod':
+                handleBuildLod(payload);
+                break;
+            case 'computeCurvature':
+                handleComputeCurvature(payload);
+                break;
+            case 'attachBuffer':
+                handleAttachBuffer(payload);
+                break;
+            case 'releaseBuffers':
+                sharedBuffers.clear();
+                break;
+            case 'runKernel':
+                handleRunKernel(payload);
+                break;
             case 'memoryCleanup':
                 handleMemoryCleanup();
                 break;
+            case 'traceInit':
+                // Pool workers record under their own thread id (default: 'stl worker')
+                self.traceRecorder.setThread(payload.tid, payload.threadName);
+                break;
             default:
-                self.postMessage({ error: `Unknown message type: ${type}` });
+                reply({ error: `Unknown message type: ${type}` });
         }
     } catch (error) {
-        self.postMessage({ 
+        reply({ 
             type, 
             error: error.message,
             stack: error.stack 
         });
+    } finally {
+        activeRequestId = null;
     }
 };
 
 /**
- * Parse STL file in chunks to manage memory
+ * Parse STL file into a welded, indexed geometry and hand the buffers back
+ * as transferables (zero-copy). Set payload.retainGeometry to keep a copy
+ * in the worker for the follow-up isolate/detect messages.
  */
 function handleParseSTL(payload) {
-    const { arrayBuffer, fileName } = payload;
+    const { arrayBuffer, fileName, retainGeometry = false } = payload;
     
     try {
+        const startTime = performance.now();
         const view = new Uint8Array(arrayBuffer);
         const isASCII = isASCIISTL(view);
         
@@ -56,21 +108,15 @@ function handleParseSTL(payload) {
             geometry = parseBinarySTL(view);
         }
         
-        // Store parsed data
-        geometryData = geometry;
-        
-        self.postMessage({
-            type: 'parseSTL',
-            success: true,
-            data: {
-                vertexCount: geometry.positions.length / 3,
-                faceCount: geometry.faces.length,
-                fileName,
-                boundingBox: geometry.boundingBox
-            }
+        postParsedGeometry('parseSTL', geometry, {
+            fileName,
+            format: isASCII ? 'ascii' : 'binary',
+            parseTime: performance.now() - startTime,
+            byteLength: view.byteLength,
+            retainGeometry
         });
     } catch (error) {
-        self.postMessage({
+        reply({
             type: 'parseSTL',
             error: `Failed to parse STL: ${error.message}`
         });
@@ -78,131 +124,578 @@ function handleParseSTL(payload) {
 }
 
 /**
- * Detect if STL is ASCII format
+ * Start an incremental parse; chunks follow as 'streamChunk' messages
  */
-function isASCIISTL(view) {
-    const header = new TextDecoder().decode(view.slice(0, 5));
-    return header === 'solid';
+function handleStreamBegin(payload) {
+    const { fileName, totalBytes, retainGeometry = false } = payload;
+    streamState = {
+        fileName,
+        totalBytes,
+        retainGeometry,
+        head: new Uint8Array(0),  // Bytes held back until the format can be sniffed
+        parser: null,
+        startTime: performance.now()
+    };
 }
 
 /**
- * Parse binary STL file
+ * Feed one chunk to the incremental parser. Every chunk is acknowledged with a
+ * 'streamProgress' message, which the loader also uses for back-pressure.
  */
-function parseBinarySTL(view) {
-    const positions = [];
-    const faces = [];
+function handleStreamChunk(payload) {
+    if (!streamState) {
+        throw new Error('streamChunk received before streamBegin');
+    }
+    const chunk = payload.chunk instanceof Uint8Array ? payload.chunk : new Uint8Array(payload.chunk);
     
-    // Header (80 bytes) + triangle count (4 bytes)
-    const triangles = new DataView(view.buffer).getUint32(80, true);
+    if (streamState.parser) {
+        streamState.parser.push(chunk);
+    } else {
+        const head = new Uint8Array(streamState.head.length + chunk.length);
+        head.set(streamState.head);
+        head.set(chunk, streamState.head.length);
+        streamState.head = head;
+        if (head.length >= 84 || head.length >= streamState.totalBytes) {
+            startStreamParser(streamState, head);
+        }
+    }
     
-    let offset = 84;
-    for (let i = 0; i < triangles; i++) {
-        // Normal (12 bytes - skip)
-        offset += 12;
+    const parser = streamState.parser;
+    reply({
+        type: 'streamProgress',
+        bytesParsed: parser ? parser.bytesParsed : 0,
+        triangles: parser ? parser.triangleCount : 0,
+        totalBytes: streamState.totalBytes
+    });
+}
+
+function startStreamParser(stream, head) {
+    const isASCII = isASCIISTL(head, stream.totalBytes);
+    stream.format = isASCII ? 'ascii' : 'binary';
+    stream.parser = isASCII
+        ? new ASCIISTLStreamParser(stream.totalBytes)
+        : new BinarySTLStreamParser();
+    stream.head = null;
+    stream.parser.push(head);
+}
+
+function handleStreamEnd() {
+    if (!streamState) {
+        throw new Error('streamEnd received before streamBegin');
+    }
+    const stream = streamState;
+    streamState = null;
+    
+    try {
+        // Files shorter than the 84-byte binary header only get a parser here
+        if (!stream.parser) {
+            startStreamParser(stream, stream.head);
+        }
+        const geometry = stream.parser.finish();
+        postParsedGeometry('streamEnd', geometry, {
+            fileName: stream.fileName,
+            format: stream.format,
+            parseTime: performance.now() - stream.startTime,
+            byteLength: stream.parser.bytesParsed,
+            retainGeometry: stream.retainGeometry
+        });
+    } catch (error) {
+        reply({
+            type: 'streamEnd',
+            error: `Failed to parse STL stream: ${error.message}`
+        });
+    }
+}
+
+/**
+ * Post a parsed geometry to the main thread, transferring its buffers
+ */
+function postParsedGeometry(type, geometry, meta) {
+    // Keep our own copy only when asked; otherwise the buffers move to the main thread
+    geometryData = meta.retainGeometry ? {
+        positions: geometry.positions.slice(),
+        index: geometry.index.slice(),
+        boundingBox: geometry.boundingBox
+    } : null;
+    
+    self.traceRecorder.complete('worker:parse', performance.now() - meta.parseTime, performance.now(), {
+        format: meta.format, bytes: meta.byteLength, faces: geometry.index.length / 3
+    }, 'parse');
+    
+    reply({
+        type,
+        success: true,
+        trace: self.traceRecorder.drain(),
+        data: {
+            positions: geometry.positions,
+            index: geometry.index,
+            vertexCount: geometry.positions.length / 3,
+            faceCount: geometry.index.length / 3,
+            fileName: meta.fileName,
+            format: meta.format,
+            boundingBox: geometry.boundingBox,
+            parseTime: meta.parseTime,
+            byteLength: meta.byteLength,
+            allocatedBytes: geometry.positions.byteLength + geometry.index.byteLength,
+            workingBytes: geometry.workingBytes  // Parser arrays (welder + index), input excluded
+        }
+    }, [geometry.positions.buffer, geometry.index.buffer]);
+}
+
+/**
+ * Detect if STL is ASCII format
+ * Binary files may also start with "solid", so the header claim is checked
+ * against the size implied by the triangle count. totalBytes lets a streamed
+ * file be sniffed from its first chunk.
+ */
+function isASCIISTL(view, totalBytes = view.byteLength) {
+    const header = new TextDecoder().decode(view.subarray(0, 5));
+    if (header !== 'solid') return false;
+    if (view.byteLength >= 84) {
+        const triangles = new DataView(view.buffer, view.byteOffset, view.byteLength).getUint32(80, true);
+        if (84 + triangles * 50 === totalBytes) return false;
+    }
+    return true;
+}
+
+// Int32 view of -0.0f (bit patterns are read as int32 to stay in Smi range)
+const NEGATIVE_ZERO_BITS = -0x80000000;
+
+// murmur3-style mixing of the three float bit patterns; the rotations
+// matter because integral coordinates leave the low mantissa bits zero
+function mixHash(h, k) {
+    k = Math.imul(k, 0xCC9E2D51);
+    k = (k << 15) | (k >>> 17);
+    k = Math.imul(k, 0x1B873593);
+    h ^= k;
+    h = (h << 13) | (h >>> 19);
+    return (Math.imul(h, 5) + 0xE6546B64) | 0;
+}
+
+function hashVertexBits(a, b, c) {
+    let h = mixHash(mixHash(mixHash(0, a), b), c) ^ 12;
+    h ^= h >>> 16;
+    h = Math.imul(h, 0x85EBCA6B);
+    h ^= h >>> 13;
+    h = Math.imul(h, 0xC2B2AE35);
+    return h ^ (h >>> 16);
+}
+
+/**
+ * Vertex welder backed by an open-addressing integer hash table.
+ * Vertices are keyed on the exact float32 bit pattern, so shared STL corners
+ * collapse to one index without building string keys.
+ */
+class VertexWelder {
+    constructor(expectedVertices) {
+        this.capacity = Math.max(1024, expectedVertices | 0);
+        this.positions = new Float32Array(this.capacity * 3);
+        this.bits = new Int32Array(this.positions.buffer);
+        this.count = 0;
+        this.allocTable(this.capacity * 2);
+        this.peakBytes = this.positions.byteLength + this.table.byteLength;  // Largest footprint held at once
+        this.scratch = new Float32Array(3);
+        this.scratchBits = new Int32Array(this.scratch.buffer);
+        this.min = [Infinity, Infinity, Infinity];
+        this.max = [-Infinity, -Infinity, -Infinity];
+    }
+
+    allocTable(minSize) {
+        let size = 1;
+        while (size < minSize) size <<= 1;
+        this.table = new Int32Array(size).fill(-1);
+        this.mask = size - 1;
+    }
+
+    grow() {
+        const capacity = Math.ceil(this.capacity * 1.5);
+        const positions = new Float32Array(capacity * 3);
+        positions.set(this.positions.subarray(0, this.count * 3));
+        const oldBytes = this.positions.byteLength + this.table.byteLength;
+        this.positions = positions;
+        this.bits = new Int32Array(positions.buffer);
+        this.capacity = capacity;
+
+        // Rehash existing vertices into a table that keeps load below 0.5
+        this.allocTable(capacity * 2);
+        this.peakBytes = Math.max(this.peakBytes, oldBytes + positions.byteLength + this.table.byteLength);
+        const bits = this.bits;
+        for (let v = 0; v < this.count; v++) {
+            let slot = hashVertexBits(bits[v * 3], bits[v * 3 + 1], bits[v * 3 + 2]) & this.mask;
+            while (this.table[slot] !== -1) slot = (slot + 1) & this.mask;
+            this.table[slot] = v;
+        }
+    }
+
+    add(x, y, z) {
+        const s = this.scratch;
+        s[0] = x; s[1] = y; s[2] = z;
+        const sb = this.scratchBits;
+        // Fold -0 onto +0 so mirrored zeros weld together
+        const a = sb[0] === NEGATIVE_ZERO_BITS ? 0 : sb[0];
+        const b = sb[1] === NEGATIVE_ZERO_BITS ? 0 : sb[1];
+        const c = sb[2] === NEGATIVE_ZERO_BITS ? 0 : sb[2];
+
+        const table = this.table;
+        const bits = this.bits;
+        let slot = hashVertexBits(a, b, c) & this.mask;
+        let id;
+        while ((id = table[slot]) !== -1) {
+            const o = id * 3;
+            if (bits[o] === a && bits[o + 1] === b && bits[o + 2] === c) return id;
+            slot = (slot + 1) & this.mask;
+        }
+
+        if (this.count === this.capacity) {
+            this.grow();
+            return this.add(x, y, z);
+        }
+
+        id = this.count++;
+        const o = id * 3;
+        bits[o] = a; bits[o + 1] = b; bits[o + 2] = c;
+        table[slot] = id;
+
+        const p = this.positions;
+        if (p[o] < this.min[0]) this.min[0] = p[o];
+        if (p[o] > this.max[0]) this.max[0] = p[o];
+        if (p[o + 1] < this.min[1]) this.min[1] = p[o + 1];
+        if (p[o + 1] > this.max[1]) this.max[1] = p[o + 1];
+        if (p[o + 2] < this.min[2]) this.min[2] = p[o + 2];
+        if (p[o + 2] > this.max[2]) this.max[2] = p[o + 2];
+        return id;
+    }
+
+    /**
+     * Trimmed positions buffer (copied only if more than 25% would be wasted)
+     */
+    finish() {
+        const used = this.count * 3;
+        const positions = used < this.positions.length * 0.75
+            ? this.positions.slice(0, used)
+            : this.positions.subarray(0, used);
+        this.table = null;
+        return positions;
+    }
+
+    boundingBox() {
+        const [minX, minY, minZ] = this.min;
+        const [maxX, maxY, maxZ] = this.max;
+        return {
+            min: { x: minX, y: minY, z: minZ },
+            max: { x: maxX, y: maxY, z: maxZ },
+            size: {
+                x: maxX - minX,
+                y: maxY - minY,
+                z: maxZ - minZ
+            }
+        };
+    }
+}
+
+/**
+ * Incremental binary STL parser
+ * Reads whole 50-byte records straight out of each chunk through one DataView
+ * and carries a partial record across chunk boundaries. The index buffer is
+ * preallocated from the header's triangle count.
+ */
+class BinarySTLStreamParser {
+    constructor() {
+        this.header = new Uint8Array(84);
+        this.headerFill = 0;
+        this.carry = new Uint8Array(50);
+        this.carryFill = 0;
+        this.triangles = null;
+        this.parsedTriangles = 0;
+        this.bytesParsed = 0;
+        this.onProgress = null;
+    }
+
+    get triangleCount() {
+        return this.parsedTriangles;
+    }
+
+    push(chunk) {
+        let pos = 0;
         
-        // Vertices (36 bytes)
-        const v1x = new DataView(view.buffer).getFloat32(offset, true);
-        const v1y = new DataView(view.buffer).getFloat32(offset + 4, true);
-        const v1z = new DataView(view.buffer).getFloat32(offset + 8, true);
-        offset += 12;
+        // Header (80 bytes) + triangle count (4 bytes)
+        if (this.headerFill < 84) {
+            const n = Math.min(84 - this.headerFill, chunk.length);
+            this.header.set(chunk.subarray(0, n), this.headerFill);
+            this.headerFill += n;
+            pos = n;
+            if (this.headerFill === 84) {
+                this.begin();
+            }
+        }
         
-        const v2x = new DataView(view.buffer).getFloat32(offset, true);
-        const v2y = new DataView(view.buffer).getFloat32(offset + 4, true);
-        const v2z = new DataView(view.buffer).getFloat32(offset + 8, true);
-        offset += 12;
+        const remainingTriangles = () => (this.triangles === null ? 0 : this.triangles - this.parsedTriangles);
         
-        const v3x = new DataView(view.buffer).getFloat32(offset, true);
-        const v3y = new DataView(view.buffer).getFloat32(offset + 4, true);
-        const v3z = new DataView(view.buffer).getFloat32(offset + 8, true);
-        offset += 12;
+        // Complete a record split across the previous chunk boundary
+        if (this.carryFill > 0 && pos < chunk.length) {
+            const n = Math.min(50 - this.carryFill, chunk.length - pos);
+            this.carry.set(chunk.subarray(pos, pos + n), this.carryFill);
+            this.carryFill += n;
+            pos += n;
+            if (this.carryFill === 50) {
+                this.readRecords(new DataView(this.carry.buffer), 1);
+                this.carryFill = 0;
+            }
+        }
         
-        // Attribute byte count (2 bytes - skip)
-        offset += 2;
+        const whole = Math.min(Math.floor((chunk.length - pos) / 50), remainingTriangles());
+        if (whole > 0) {
+            this.readRecords(new DataView(chunk.buffer, chunk.byteOffset + pos, whole * 50), whole);
+            pos += whole * 50;
+        }
         
-        positions.push(v1x, v1y, v1z, v2x, v2y, v2z, v3x, v3y, v3z);
-        faces.push([
-            positions.length / 3 - 3,
-            positions.length / 3 - 2,
-            positions.length / 3 - 1
-        ]);
+        // Trailing bytes after the last declared triangle are ignored
+        if (pos < chunk.length && remainingTriangles() > 0) {
+            this.carry.set(chunk.subarray(pos), 0);
+            this.carryFill = chunk.length - pos;
+        }
         
-        // Progress update every 10000 triangles
-        if (i % 10000 === 0) {
-            self.postMessage({
-                type: 'parseProgress',
-                progress: (i / triangles) * 100
-            });
+        this.bytesParsed += chunk.length;
+    }
+
+    begin() {
+        this.triangles = new DataView(this.header.buffer).getUint32(80, true);
+        this.index = new Uint32Array(this.triangles * 3);
+        this.welder = new VertexWelder(Math.ceil(this.triangles * 0.55));
+        this.progressStep = Math.max(10000, Math.floor(this.triangles / 100));
+    }
+
+    readRecords(data, count) {
+        const index = this.index;
+        const welder = this.welder;
+        const progressStep = this.progressStep;
+        let t = this.parsedTriangles * 3;
+        
+        // Normal (12 bytes) is skipped; attribute byte count (2 bytes) is skipped
+        let offset = 12;
+        for (let i = 0; i < count; i++, offset += 50) {
+            index[t++] = welder.add(data.getFloat32(offset, true), data.getFloat32(offset + 4, true), data.getFloat32(offset + 8, true));
+            index[t++] = welder.add(data.getFloat32(offset + 12, true), data.getFloat32(offset + 16, true), data.getFloat32(offset + 20, true));
+            index[t++] = welder.add(data.getFloat32(offset + 24, true), data.getFloat32(offset + 28, true), data.getFloat32(offset + 32, true));
+            
+            if (this.onProgress && (this.parsedTriangles + i) % progressStep === 0) {
+                this.onProgress(((this.parsedTriangles + i) / this.triangles) * 100);
+            }
         }
+        this.parsedTriangles += count;
+    }
+
+    finish() {
+        if (this.triangles === null) {
+            throw new Error('Truncated binary STL: missing header');
+        }
+        if (this.parsedTriangles < this.triangles) {
+            throw new Error(`Truncated binary STL: header declares ${this.triangles} triangles, found ${this.parsedTriangles}`);
+        }
+        return {
+            positions: this.welder.finish(),
+            index: this.index,
+            boundingBox: this.welder.boundingBox(),
+            workingBytes: this.welder.peakBytes + this.index.byteLength
+        };
     }
-    
-    return {
-        positions: new Float32Array(positions),
-        faces,
-        boundingBox: calculateBoundingBox(positions)
-    };
 }
 
+// Exact powers of ten for the fast float path (10^22 is the largest exact double)
+const POW10 = new Float64Array(23).map((_, i) => Math.pow(10, i));
+
 /**
- * Parse ASCII STL file
+ * Parse a decimal float from bytes[start, end) without building a string.
+ * Accepts the same characters as the old regex ([-+.0-9eE]); returns NaN
+ * when the token is not a number. Up to 15 significant digits and |exp| <= 22
+ * the result is a single correctly rounded operation, identical to
+ * parseFloat; anything longer falls back to parseFloat.
  */
-function parseASCIISTL(view) {
-    const text = new TextDecoder().decode(view);
-    const positions = [];
-    const faces = [];
+function parseASCIIFloat(bytes, start, end) {
+    let i = start;
+    let negative = false;
+    if (bytes[i] === 45) {          // '-'
+        negative = true;
+        i++;
+    } else if (bytes[i] === 43) {   // '+'
+        i++;
+    }
     
-    const vertexRegex = /vertex\s+([-\d.eE+]+)\s+([-\d.eE+]+)\s+([-\d.eE+]+)/g;
-    let match;
-    let vertexCount = 0;
+    let mantissa = 0;
+    let significant = 0;
+    let exponent = 0;
+    let digits = false;
+    let d;
+    for (; i < end && (d = bytes[i] - 48) >= 0 && d <= 9; i++) {
+        mantissa = mantissa * 10 + d;
+        if (mantissa !== 0) significant++;
+        digits = true;
+    }
+    if (i < end && bytes[i] === 46) { // '.'
+        for (i++; i < end && (d = bytes[i] - 48) >= 0 && d <= 9; i++) {
+            mantissa = mantissa * 10 + d;
+            if (mantissa !== 0) significant++;
+            exponent--;
+            digits = true;
+        }
+    }
+    if (!digits) return NaN;
     
-    while ((match = vertexRegex.exec(text)) !== null) {
-        positions.push(parseFloat(match[1]), parseFloat(match[2]), parseFloat(match[3]));
-        vertexCount++;
-        
-        if (vertexCount % 3 === 0) {
-            faces.push([vertexCount - 3, vertexCount - 2, vertexCount - 1]);
+    if (i < end && (bytes[i] | 32) === 101) { // 'e' / 'E'
+        i++;
+        let expNegative = false;
+        if (bytes[i] === 45) {
+            expNegative = true;
+            i++;
+        } else if (bytes[i] === 43) {
+            i++;
         }
-        
-        if (vertexCount % 30000 === 0) {
-            self.postMessage({
-                type: 'parseProgress',
-                progress: (vertexCount / (view.length / 100)) * 100
-            });
+        let e = 0;
+        const expStart = i;
+        for (; i < end && (d = bytes[i] - 48) >= 0 && d <= 9; i++) {
+            e = e * 10 + d;
         }
+        if (i === expStart) return NaN;
+        exponent += expNegative ? -e : e;
     }
+    if (i !== end) return NaN;
     
-    return {
-        positions: new Float32Array(positions),
-        faces,
-        boundingBox: calculateBoundingBox(positions)
-    };
+    if (significant > 15 || exponent < -22 || exponent > 22) {
+        let text = '';
+        for (let k = start; k < end; k++) text += String.fromCharCode(bytes[k]);
+        return parseFloat(text);
+    }
+    const value = exponent < 0 ? mantissa / POW10[-exponent] : mantissa * POW10[exponent];
+    return negative ? -value : value;
 }
 
 /**
- * Calculate bounding box
+ * Incremental ASCII STL parser
+ * Byte-level tokenizer: splits on whitespace (space, tab, CR, LF, ...) and
+ * reads the three numbers after each "vertex" keyword straight into the
+ * welder, so no string is ever built for the file. Only a token split
+ * across a chunk boundary is copied.
  */
-function calculateBoundingBox(positions) {
-    let minX = Infinity, maxX = -Infinity;
-    let minY = Infinity, maxY = -Infinity;
-    let minZ = Infinity, maxZ = -Infinity;
-    
-    for (let i = 0; i < positions.length; i += 3) {
-        minX = Math.min(minX, positions[i]);
-        maxX = Math.max(maxX, positions[i]);
-        minY = Math.min(minY, positions[i + 1]);
-        maxY = Math.max(maxY, positions[i + 1]);
-        minZ = Math.min(minZ, positions[i + 2]);
-        maxZ = Math.max(maxZ, positions[i + 2]);
+class ASCIISTLStreamParser {
+    constructor(totalBytes) {
+        this.carry = null;        // Bytes of a token cut off at the end of the previous chunk
+        this.expect = 0;          // 0 = looking for "vertex", 1..3 = next coordinate
+        this.coords = new Float64Array(3);
+        // Rough upper bound: a facet block is at least ~150 bytes
+        this.welder = new VertexWelder(Math.ceil(totalBytes / 300));
+        this.index = new Uint32Array(Math.max(3, Math.ceil(totalBytes / 150) * 3));
+        this.vertexCount = 0;
+        this.bytesParsed = 0;
     }
-    
-    return {
-        min: { x: minX, y: minY, z: minZ },
-        max: { x: maxX, y: maxY, z: maxZ },
-        size: {
-            x: maxX - minX,
-            y: maxY - minY,
-            z: maxZ - minZ
+
+    get triangleCount() {
+        return Math.floor(this.vertexCount / 3);
+    }
+
+    push(chunk) {
+        const length = chunk.length;
+        let i = 0;
+        
+        // Finish the token left open by the previous chunk
+        if (this.carry) {
+            while (i < length && chunk[i] > 32) i++;
+            const joined = new Uint8Array(this.carry.length + i);
+            joined.set(this.carry);
+            joined.set(chunk.subarray(0, i), this.carry.length);
+            if (i === length) {
+                this.carry = joined;
+                this.bytesParsed += length;
+                return;
+            }
+            this.carry = null;
+            this.token(joined, 0, joined.length);
         }
-    };
+        
+        for (;;) {
+            while (i < length && chunk[i] <= 32) i++;
+            if (i === length) break;
+            const start = i;
+            while (i < length && chunk[i] > 32) i++;
+            if (i === length) {
+                this.carry = chunk.slice(start);
+                break;
+            }
+            this.token(chunk, start, i);
+        }
+        this.bytesParsed += length;
+    }
+
+    token(bytes, start, end) {
+        if (this.expect === 0) {
+            // "vertex"
+            if (end - start === 6 && bytes[start] === 118 && bytes[start + 1] === 101 && bytes[start + 2] === 114 &&
+                bytes[start + 3] === 116 && bytes[start + 4] === 101 && bytes[start + 5] === 120) {
+                this.expect = 1;
+            }
+            return;
+        }
+        
+        const value = parseASCIIFloat(bytes, start, end);
+        if (value !== value) {
+            // Not a number: drop this vertex, like a failed regex match
+            this.expect = 0;
+            this.token(bytes, start, end);
+            return;
+        }
+        this.coords[this.expect - 1] = value;
+        if (this.expect < 3) {
+            this.expect++;
+            return;
+        }
+        
+        this.expect = 0;
+        if (this.vertexCount === this.index.length) {
+            const grown = new Uint32Array(this.index.length * 2);
+            grown.set(this.index);
+            this.index = grown;
+        }
+        this.index[this.vertexCount++] = this.welder.add(this.coords[0], this.coords[1], this.coords[2]);
+    }
+
+    finish() {
+        if (this.carry) {
+            this.token(this.carry, 0, this.carry.length);
+            this.carry = null;
+        }
+        const usable = this.vertexCount - (this.vertexCount % 3);
+        return {
+            positions: this.welder.finish(),
+            index: this.index.slice(0, usable),
+            boundingBox: this.welder.boundingBox(),
+            workingBytes: this.welder.peakBytes + this.index.byteLength
+        };
+    }
+}
+
+/**
+ * Parse binary STL file held fully in memory
+ */
+function parseBinarySTL(view) {
+    const parser = new BinarySTLStreamParser();
+    parser.onProgress = (progress) => reply({ type: 'parseProgress', progress });
+    parser.push(view);
+    return parser.finish();
+}
+
+/**
+ * Parse ASCII STL file held fully in memory, in slices so progress is exact
+ */
+function parseASCIISTL(view) {
+    const parser = new ASCIISTLStreamParser(view.byteLength);
+    const sliceSize = 1024 * 1024;
+    for (let offset = 0; offset < view.byteLength; offset += sliceSize) {
+        parser.push(view.subarray(offset, offset + sliceSize));
+        reply({
+            type: 'parseProgress',
+            progress: (parser.bytesParsed / view.byteLength) * 100
+        });
+    }
+    return parser.finish();
 }
 
 /**
@@ -210,7 +703,7 @@ function calculateBoundingBox(positions) {
  */
 function handleIsolateInnerSurface(payload) {
     if (!geometryData) {
-        self.postMessage({ error: 'No geometry data available' });
+        reply({ error: 'No geometry data available' });
         return;
     }
     
@@ -230,10 +723,11 @@ function handleIsolateInnerSurface(payload) {
     
     // Calculate face data
     const faceData = [];
-    const faces = geometryData.faces;
+    const index = geometryData.index;
+    const faceCount = index.length / 3;
     
-    for (let i = 0; i < faces.length; i++) {
-        const [i1, i2, i3] = faces[i];
+    for (let i = 0; i < faceCount; i++) {
+        const i1 = index[i * 3], i2 = index[i * 3 + 1], i3 = index[i * 3 + 2];
         
         // Get vertices
         const v1x = positions[i1 * 3], v1y = positions[i1 * 3 + 1], v1z = positions[i1 * 3 + 2];
@@ -258,9 +752,9 @@ function handleIsolateInnerSurface(payload) {
         });
         
         if (i % 50000 === 0) {
-            self.postMessage({
+            reply({
                 type: 'isolateProgress',
-                progress: (i / faces.length) * 50
+                progress: (i / faceCount) * 50
             });
         }
     }
@@ -273,12 +767,12 @@ function handleIsolateInnerSurface(payload) {
     
     const selectedFaces = faceData.filter(f => f.distance <= maxDist).map(f => f.index);
     
-    self.postMessage({
+    reply({
         type: 'isolateInnerSurface',
         success: true,
         data: {
             selectedFaceCount: selectedFaces.length,
-            totalFaceCount: faces.length,
+            totalFaceCount: faceCount,
             selectedFaces
         }
     });
@@ -291,14 +785,14 @@ function handleDetectWearZones(payload) {
     const { selectedFaceIndices } = payload;
     
     if (!geometryData) {
-        self.postMessage({ error: 'No geometry data available' });
+        reply({ error: 'No geometry data available' });
         return;
     }
     
     // Simplified clustering algorithm for wear zones
     const wearZones = [];
     
-    self.postMessage({
+    reply({
         type: 'detectWearZones',
         success: true,
         data: {
@@ -317,7 +811,7 @@ function handleCalculateVolumetricWear(payload) {
     // Placeholder for volumetric calculation
     const volume = calculateVolume(wearFaceIndices);
     
-    self.postMessage({
+    reply({
         type: 'calculateVolumetricWear',
         success: true,
         data: {
@@ -331,6 +825,110 @@ function calculateVolume(faceIndices) {
     return 0; // Placeholder
 }
 
+/**
+ * Build BVHs over the inner-surface triangles and vertices (see spatial-index.js).
+ * The coordinate arrays come in as transferables and go back with the node arrays.
+ */
+function handleBuildSpatialIndex(payload) {
+    const { triangles, vertices } = payload;
+    const startTime = performance.now();
+    
+    const triangleIndex = self.traceRecorder.span('worker:bvh-triangles', () => SpatialIndex.build(triangles, 9).toTransferable(),
+        { triangles: triangles.length / 9 }, 'spatial');
+    const vertexIndex = self.traceRecorder.span('worker:bvh-vertices', () => SpatialIndex.build(vertices, 3).toTransferable(),
+        { vertices: vertices.length / 3 }, 'spatial');
+    
+    reply({
+        type: 'buildSpatialIndex',
+        success: true,
+        trace: self.traceRecorder.drain(),
+        data: {
+            triangles: triangleIndex,
+            vertices: vertexIndex,
+            buildTime: performance.now() - startTime
+        }
+    }, [...SpatialIndex.transferList(triangleIndex), ...SpatialIndex.transferList(vertexIndex)]);
+}
+
+/**
+ * Precompression (mesh-decimation.js): grid-hash weld of the triangle soup, optional
+ * quadric decimation and the deviation report. The result comes back indexed.
+ */
+function handlePrecompress(payload) {
+    const result = MeshDecimator.precompress(payload.soup, {
+        ...payload,
+        onProgress: (progress) => reply({ type: 'precompressProgress', progress: progress * 100 })
+    });
+    reply({
+        type: 'precompress',
+        success: true,
+        trace: self.traceRecorder.drain(),
+        data: result
+    }, [result.positions.buffer, result.index.buffer]);
+}
+
+/**
+ * Rendering LOD chain (mesh-decimation.js) for the main viewer, run in a worker of its own
+ * so the analysis messages on the shared one are not held up
+ */
+function handleBuildLod(payload) {
+    const result = self.traceRecorder.span('worker:lod', () => MeshDecimator.levels(payload.soup, {
+        ...payload,
+        onProgress: (progress) => reply({ type: 'lodProgress', progress: progress * 100 })
+    }), { faces: payload.soup.length / 9 }, 'precompress');
+    reply({
+        type: 'buildLod',
+        success: true,
+        trace: self.traceRecorder.drain(),
+        data: result
+    }, result.levels.flatMap(level => [level.positions.buffer, level.index.buffer, level.sourceCorner.buffer]));
+}
+
+/**
+ * Per-vertex Gaussian, mean and principal curvature (curvature-engine.js) over an index
+ * buffer; payload.cornerPositions when the positions are the triangle soup
+ */
+function handleComputeCurvature(payload) {
+    const result = self.traceRecorder.span('worker:curvature', () => CurvatureEngine.compute(payload.positions, payload.index, {
+        ...payload,
+        onProgress: (progress) => reply({ type: 'curvatureProgress', progress: progress * 100 })
+    }), { faces: payload.index.length / 3 }, 'curvature');
+    reply({
+        type: 'computeCurvature',
+        success: true,
+        trace: self.traceRecorder.drain(),
+        data: result
+    }, CurvatureEngine.transferList(result));
+}
+
+/**
+ * Keep a view on a SharedArrayBuffer posted once by the WorkerPool
+ */
+function handleAttachBuffer(payload) {
+    const { name, buffer, arrayType } = payload;
+    sharedBuffers.set(name, new self[arrayType](buffer));
+}
+
+/**
+ * Run one block of a PoolKernels kernel (worker-pool.js). Buffers come either as
+ * transferred slices in the payload or from the shared views attached earlier.
+ */
+function handleRunKernel(payload) {
+    const { id, kernel, start, end, base, params } = payload;
+    try {
+        if (!PoolKernels[kernel]) {
+            throw new Error(`Unknown kernel: ${kernel}`);
+        }
+        const buffers = payload.buffers || Object.fromEntries(sharedBuffers);
+        const result = self.traceRecorder.span(`kernel:${kernel}`, () => PoolKernels[kernel](buffers, start, end, base, params),
+            { start, end }, 'kernel');
+        const transfer = Object.values(result.arrays || {}).map(array => array.buffer);
+        reply({ type: 'runKernel', id, data: result, trace: self.traceRecorder.drain() }, transfer);
+    } catch (error) {
+        reply({ type: 'runKernel', id, error: error.message, trace: self.traceRecorder.drain() });
+    }
+}
+
 /**
  * Clean up memory
  */
@@ -339,5 +937,5 @@ function handleMemoryCleanup() {
     if (global.gc) {
         global.gc();
     }
-    self.postMessage({ type: 'memoryCleanup', success: true });
+    reply({ type: 'memoryCleanup', success: true });
 }
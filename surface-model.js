@@ -0,0 +1,204 @@
+/**
+ * Surface Model
+ * Structure-of-arrays storage for the isolated inner surface and the wear zones.
+ *
+ * Positions are never copied per vertex: they stay in the geometry's shared Float32Array
+ * (non-indexed soup, face f = corners 3f, 3f+1, 3f+2).
+ *   VertexSet: Uint32Array of corner indices into those positions (4 bytes per vertex)
+ *   FaceSet:   Uint32Array of face indices, packed to 9 floats per face only for the kernels
+ *
+ * Sets keep the order they were built in, so item i of a derived set (worn, unworn, rim...)
+ * always refers to the same vertex across steps, caches and worker results.
+ */
+
+class VertexSet {
+    constructor(positions, indices) {
+        this.positions = positions;  // Shared Float32Array, 3 coords per corner
+        this.indices = indices;      // Uint32Array of corner indices
+    }
+
+    static empty() {
+        return new VertexSet(null, new Uint32Array(0));
+    }
+
+    /**
+     * Every corner of the given faces, in face order
+     */
+    static fromFaces(positions, faces) {
+        const indices = new Uint32Array(faces.length * 3);
+        for (let i = 0; i < faces.length; i++) {
+            indices[i * 3] = faces[i] * 3;
+            indices[i * 3 + 1] = faces[i] * 3 + 1;
+            indices[i * 3 + 2] = faces[i] * 3 + 2;
+        }
+        return new VertexSet(positions, indices);
+    }
+
+    get length() {
+        return this.indices.length;
+    }
+
+    get byteLength() {
+        return this.indices.byteLength;
+    }
+
+    // Corner index of item i
+    index(i) {
+        return this.indices[i];
+    }
+
+    // Copy the position of item i into target (anything with set(x, y, z), e.g. THREE.Vector3)
+    getPosition(i, target) {
+        const o = this.indices[i] * 3;
+        return target.set(this.positions[o], this.positions[o + 1], this.positions[o + 2]);
+    }
+
+    /**
+     * Items for which predicate(i, corner) is true, in the same order
+     */
+    filter(predicate) {
+        const builder = new VertexSetBuilder(this.positions, this.indices.length);
+        for (let i = 0; i < this.indices.length; i++) {
+            if (predicate(i, this.indices[i])) builder.push(this.indices[i]);
+        }
+        return builder.build();
+    }
+
+    /**
+     * Packed xyz (Float64Array by default) for the worker pool kernels and the BVH
+     */
+    toPoints(ArrayType = Float64Array) {
+        const points = new ArrayType(this.indices.length * 3);
+        for (let i = 0; i < this.indices.length; i++) {
+            const o = this.indices[i] * 3;
+            points[i * 3] = this.positions[o];
+            points[i * 3 + 1] = this.positions[o + 1];
+            points[i * 3 + 2] = this.positions[o + 2];
+        }
+        return points;
+    }
+
+    /**
+     * Short-lived vector objects for APIs that take point arrays (fitting, PCA)
+     */
+    toVectors(VectorType) {
+        const vectors = new Array(this.indices.length);
+        for (let i = 0; i < this.indices.length; i++) {
+            vectors[i] = this.getPosition(i, new VectorType());
+        }
+        return vectors;
+    }
+
+    // Mean position into target
+    centroid(target) {
+        let x = 0, y = 0, z = 0;
+        for (let i = 0; i < this.indices.length; i++) {
+            const o = this.indices[i] * 3;
+            x += this.positions[o];
+            y += this.positions[o + 1];
+            z += this.positions[o + 2];
+        }
+        const n = this.indices.length || 1;
+        return target.set(x / n, y / n, z / n);
+    }
+}
+
+/**
+ * Growable corner list; build() trims it into a VertexSet
+ */
+class VertexSetBuilder {
+    constructor(positions, capacity = 1024) {
+        this.positions = positions;
+        this.indices = new Uint32Array(Math.max(16, capacity));
+        this.length = 0;
+    }
+
+    push(corner) {
+        if (this.length === this.indices.length) {
+            const grown = new Uint32Array(this.indices.length * 2);
+            grown.set(this.indices);
+            this.indices = grown;
+        }
+        this.indices[this.length++] = corner;
+    }
+
+    build() {
+        return new VertexSet(this.positions, this.indices.slice(0, this.length));
+    }
+}
+
+class FaceSet {
+    constructor(positions, faces) {
+        this.positions = positions;  // Shared Float32Array, 9 coords per face
+        this.faces = faces;          // Uint32Array of face indices
+    }
+
+    static empty() {
+        return new FaceSet(null, new Uint32Array(0));
+    }
+
+    get length() {
+        return this.faces.length;
+    }
+
+    get byteLength() {
+        return this.faces.byteLength;
+    }
+
+    /**
+     * Triangles packed 9 floats per face, in set order (volumetric kernels, BVH)
+     */
+    packPositions() {
+        const packed = new Float32Array(this.faces.length * 9);
+        for (let i = 0; i < this.faces.length; i++) {
+            const base = this.faces[i] * 9;
+            packed.set(this.positions.subarray(base, base + 9), i * 9);
+        }
+        return packed;
+    }
+
+    // Per-face membership mask over the whole mesh
+    toMask(faceCount) {
+        const mask = new Uint8Array(faceCount);
+        for (let i = 0; i < this.faces.length; i++) {
+            mask[this.faces[i]] = 1;
+        }
+        return mask;
+    }
+}
+
+const SurfaceModel = {
+    // Heap cost of the object model this replaces (V8 heap, 64-bit, measured with 1M entries):
+    // { pos: Vector3, index } per vertex, { faceIndex, p1, p2, p3, vertexIndices } per face,
+    // and one array slot per entry in the sets that shared those vertex objects.
+    LEGACY_VERTEX_BYTES: 147,
+    LEGACY_TRIANGLE_BYTES: 434,
+    LEGACY_REFERENCE_BYTES: 8,
+
+    /**
+     * Typed bytes held by the model vs. the estimated object-model equivalent.
+     * parts: { vertices: VertexSet (owning), subsets: [VertexSet], faces: FaceSet, packed: TypedArray[] }
+     */
+    memoryReport({ vertices = null, subsets = [], faces = null, packed = [] }) {
+        const sets = subsets.filter(Boolean);
+        const typedBytes = (vertices ? vertices.byteLength : 0) +
+            sets.reduce((sum, set) => sum + set.byteLength, 0) +
+            (faces ? faces.byteLength : 0) +
+            packed.filter(Boolean).reduce((sum, array) => sum + array.byteLength, 0);
+        const legacyBytes = (vertices ? vertices.length * SurfaceModel.LEGACY_VERTEX_BYTES : 0) +
+            sets.reduce((sum, set) => sum + set.length * SurfaceModel.LEGACY_REFERENCE_BYTES, 0) +
+            (faces ? faces.length * SurfaceModel.LEGACY_TRIANGLE_BYTES : 0) +
+            packed.filter(Boolean).reduce((sum, array) => sum + array.byteLength, 0);
+        return {
+            typedBytes,
+            legacyBytes,
+            savedBytes: Math.max(0, legacyBytes - typedBytes),
+            vertexCount: vertices ? vertices.length : 0,
+            faceCount: faces ? faces.length : 0
+        };
+    }
+};
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { VertexSet, VertexSetBuilder, FaceSet, SurfaceModel };
+}
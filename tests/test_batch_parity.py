@@ -0,0 +1,396 @@
+"""
+Parity of the wear_batch engine with the browser code on synthetic worn cups, and of
+both with the cup's ground-truth radius. Wear is not checked against ground truth here: on
+the generator's displaced-head cups the scar covers most of the bowl and both detection
+methods take it as the reference (see wear_batch/synthetic.py).
+
+Kernel parity runs the browser side in node: PoolKernels straight from worker-pool.js,
+and MeshTopology / FittingService cut out of index.html with a minimal THREE.Vector3.
+Skipped when node is not installed.
+
+Full-pipeline parity loads index.html in headless Chrome (CHROME_BIN, or chromium /
+google-chrome on PATH) and runs the same file through window.wearPipeline, as
+benchmark.html does. Skipped without Chrome or before `python vendor_assets.py` has
+put three.js under vendor/.
+"""
+import fcntl
+import functools
+import http.server
+import json
+import os
+import re
+import select
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from wear_batch import analyze_stl, csv_text, json_document
+from wear_batch.__main__ import main as batch_main
+from wear_batch.fitting import fit_sphere_gauss_newton, fit_sphere_ransac
+from wear_batch.pipeline import face_metrics, linear_wear, norm, volumetric_wear
+from wear_batch.stl import prepare_geometry, read_triangles, write_binary_stl
+from wear_batch.synthetic import worn_cup
+from wear_batch.topology import largest_component, weld_corners
+import vendor_assets
+from server import send_isolation_headers
+from vendor_assets import VendorMixin
+
+ROOT = Path(__file__).resolve().parent.parent
+NODE = shutil.which('node')
+needs_node = pytest.mark.skipif(NODE is None, reason='node is required for browser parity')
+CHROME = os.environ.get('CHROME_BIN') or next(
+    filter(None, map(shutil.which, ('chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable'))), None)
+MISSING_VENDOR = vendor_assets.verify()[0]
+needs_browser = pytest.mark.skipif(
+    CHROME is None or bool(MISSING_VENDOR),
+    reason='headless Chrome is required for full-pipeline parity' if CHROME is None else
+    'vendor/ libraries missing (python vendor_assets.py); index.html cannot load three.js offline')
+BROWSER_TIMEOUT_S = 120
+
+VECTOR3 = """
+const THREE = { Vector3: class {
+    constructor(x = 0, y = 0, z = 0) { this.x = x; this.y = y; this.z = z; }
+    add(v) { this.x += v.x; this.y += v.y; this.z += v.z; return this; }
+    divideScalar(s) { const k = 1 / s; this.x *= k; this.y *= k; this.z *= k; return this; }
+    distanceTo(v) { const dx = this.x - v.x, dy = this.y - v.y, dz = this.z - v.z; return Math.sqrt(dx * dx + dy * dy + dz * dz); }
+} };
+const console = { log() {}, warn() {} };
+"""
+
+
+def browser_object(name):
+    """Source of `const <name> = {...};` from index.html."""
+    html = (ROOT / 'index.html').read_text(encoding='utf-8')
+    match = re.search(r'\n( *)const %s = \{.*?\n\1\};\n' % name, html, re.S)
+    assert match, f'{name} not found in index.html'
+    return match.group(0)
+
+
+def run_node(source, payload):
+    """Run `source` (which reads `input` and sets `output`) and return output as JSON."""
+    script = (f"const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));\nlet output;\n"
+              f"{source}\nprocess.stdout.write(JSON.stringify(output));\n")
+    completed = subprocess.run([NODE, '-e', script], input=json.dumps(payload), capture_output=True,
+                               text=True, check=True, cwd=ROOT)
+    return json.loads(completed.stdout)
+
+
+def run_kernel(kernel, buffers, params, count):
+    source = (f"const {{ PoolKernels }} = require('./worker-pool.js');\n"
+              f"const buffers = {{}};\n"
+              f"for (const [k, v] of Object.entries(input.buffers)) buffers[k] = Float64Array.from(v);\n"
+              f"const result = PoolKernels.{kernel}(buffers, 0, input.count, 0, input.params);\n"
+              f"output = {{ scalars: result.scalars || {{}}, arrays: {{}} }};\n"
+              f"for (const [k, v] of Object.entries(result.arrays || {{}})) output.arrays[k] = Array.from(v);\n")
+    payload = {'buffers': {k: v.reshape(-1).tolist() for k, v in buffers.items()}, 'params': params, 'count': count}
+    return run_node(source, payload)
+
+
+@pytest.fixture(scope='module')
+def cup(tmp_path_factory):
+    triangles, truth = worn_cup(rings=30, segments=60, wear_depth=0.6, noise=0.002, seed=3)
+    path = tmp_path_factory.mktemp('cups') / 'cup.stl'
+    write_binary_stl(path, triangles)
+    positions, normals, _ = prepare_geometry(read_triangles(path))
+    return {'path': path, 'truth': truth, 'positions': positions, 'normals': normals}
+
+
+@pytest.fixture(scope='module')
+def result(cup):
+    return analyze_stl(cup['path'])
+
+
+@needs_node
+def test_isolation_metrics_match_pool_kernel(cup):
+    points = cup['positions'].astype(np.float64)
+    center = points.sum(axis=0) / len(points)
+    dot, distance = face_metrics(points, cup['normals'], center)
+    browser = run_kernel('isolateFaceMetrics', {'positions': points, 'normals': cup['normals'].astype(np.float64)},
+                         dict(zip(('cx', 'cy', 'cz'), center.tolist())), len(points) // 3)
+    np.testing.assert_allclose(dot, browser['arrays']['dot'], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(distance, browser['arrays']['distance'], rtol=1e-12)
+
+
+@needs_node
+def test_largest_component_matches_mesh_topology(cup):
+    corner_vertex, _ = weld_corners(cup['positions'])
+    face_count = len(corner_vertex) // 3
+    mask = np.zeros(face_count, dtype=bool)
+    mask[::3] = True  # Several components of different sizes
+    mask[: face_count // 4] = True
+    faces, components = largest_component(corner_vertex, mask)
+
+    source = browser_object('MeshTopology') + (
+        "const performance = { now: () => 0 };\n"
+        "const topology = MeshTopology.build(Float32Array.from(input.positions));\n"
+        "const { faces, componentCount } = MeshTopology.largestComponent(topology, Uint8Array.from(input.mask));\n"
+        "output = { faces: Array.from(faces), componentCount, cornerVertex: Array.from(topology.cornerVertex) };\n")
+    browser = run_node(VECTOR3 + source, {'positions': cup['positions'].reshape(-1).tolist(),
+                                          'mask': mask.astype(int).tolist()})
+    assert corner_vertex.tolist() == browser['cornerVertex']
+    assert faces.tolist() == browser['faces']
+    assert components == browser['componentCount']
+
+
+def browser_fit(points, call):
+    source = VECTOR3 + browser_object('FittingService') + (
+        "const performance = { now: () => 0 };\n"
+        "const vertices = input.points.map(p => new THREE.Vector3(p[0], p[1], p[2]));\n"
+        f"const fit = FittingService.{call};\n"
+        "output = { center: [fit.center.x, fit.center.y, fit.center.z], radius: fit.radius,\n"
+        "           iterations: fit.iterations, inliers: fit.inliers, method: fit.method };\n")
+    return run_node(source, {'points': points.tolist()})
+
+
+@needs_node
+def test_gauss_newton_matches_fitting_service(cup):
+    points = cup['positions'][::7].astype(np.float64)
+    fit = fit_sphere_gauss_newton(points)
+    browser = browser_fit(points, 'fitSphereGaussNewton(vertices)')
+    np.testing.assert_allclose(fit['center'], browser['center'], rtol=0, atol=1e-9)
+    assert fit['radius'] == pytest.approx(browser['radius'], abs=1e-9)
+    assert fit['iterations'] == browser['iterations']
+
+
+@needs_node
+def test_seeded_ransac_matches_fitting_service(cup):
+    points = cup['positions'][::5].astype(np.float64)
+    fit = fit_sphere_ransac(points, seed=42)
+    browser = browser_fit(points, 'fitSphereRANSAC(vertices, { seed: 42 })')
+    assert fit['method'] == browser['method'] == 'RANSAC + LM'
+    assert fit['inliers'] == browser['inliers']
+    np.testing.assert_allclose(fit['center'], browser['center'], rtol=0, atol=1e-9)
+    assert fit['radius'] == pytest.approx(browser['radius'], abs=1e-9)
+
+
+@needs_node
+def test_wear_matches_pool_kernels(cup, result):
+    sphere, plane = result['unwornSphere'], result['transitionPlane']
+    center = np.array(sphere['center'])
+    params = {'nx': plane['normal'][0], 'ny': plane['normal'][1], 'nz': plane['normal'][2], 'd': plane['d'],
+              'cx': center[0], 'cy': center[1], 'cz': center[2], 'radius': sphere['radius']}
+    plane = {'normal': np.array(plane['normal']), 'd': plane['d']}
+    triangles = cup['positions'].astype(np.float64).reshape(-1, 9)
+
+    volume, clipped, processed = volumetric_wear(triangles, plane, center, sphere['radius'])
+    browser = run_kernel('volumetricWear', {'triangles': triangles}, params, len(triangles))['scalars']
+    assert (clipped, processed) == (browser['clipped'], browser['processed'])
+    assert volume == pytest.approx(browser['volume'] + browser['compensation'], rel=1e-12)
+
+    points = cup['positions'].astype(np.float64)
+    points = points[norm(points - center) > sphere['radius']]  # Worn-side candidates
+    linear = linear_wear(points, plane, center, sphere['radius'])
+    browser = run_kernel('linearWear', {'points': points}, params, len(points))['scalars']
+    assert linear['count'] == browser['count']
+    assert linear['mean'] == pytest.approx((browser['sum'] + browser['compensation']) / browser['count'], rel=1e-12)
+    assert (linear['min'], linear['max']) == (browser['min'], browser['max'])
+
+
+def test_radius_matches_ground_truth(cup, result):
+    assert result['mesh']['components'] >= 1
+    assert result['unwornSphere']['commercialRadius'] == cup['truth']['radius']
+    assert result['unwornSphere']['rawRadius'] == pytest.approx(cup['truth']['radius'], abs=0.1)
+
+
+class CupHandler(VendorMixin, http.server.SimpleHTTPRequestHandler):
+    """The app from the repository root (libraries from vendor/) plus the test cup at /cup.stl."""
+
+    def __init__(self, *args, cup_path, **kwargs):
+        self.cup_path = cup_path
+        super().__init__(*args, directory=str(ROOT), **kwargs)
+
+    def do_GET(self):
+        if self.path == '/cup.stl':
+            body = self.cup_path.read_bytes()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif not self.handle_vendor_request(head_only=False):
+            super().do_GET()
+
+    def end_headers(self):
+        send_isolation_headers(self)
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DevToolsPipe:
+    """
+    Headless Chrome driven over --remote-debugging-pipe: DevTools Protocol messages are
+    NUL-terminated JSON, read by Chrome from fd 3 and answered on fd 4.
+    """
+
+    def __init__(self, chrome, profile):
+        to_chrome, self.commands = os.pipe()
+        self.replies, from_chrome = os.pipe()
+
+        def attach_pipes():
+            # Move both ends above 3 / 4 first, so neither dup2 overwrites the other
+            read_end, write_end = (fcntl.fcntl(fd, fcntl.F_DUPFD, 10) for fd in (to_chrome, from_chrome))
+            os.dup2(read_end, 3)
+            os.dup2(write_end, 4)
+
+        self.process = subprocess.Popen(
+            [chrome, '--headless=new', '--remote-debugging-pipe', '--no-sandbox', '--no-first-run',
+             '--use-angle=swiftshader', '--enable-unsafe-swiftshader', f'--user-data-dir={profile}', 'about:blank'],
+            preexec_fn=attach_pipes, close_fds=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.close(to_chrome)
+        os.close(from_chrome)
+        self.buffer = b''
+        self.last_id = 0
+
+    def call(self, method, session=None, timeout=BROWSER_TIMEOUT_S, **params):
+        self.last_id += 1
+        message = {'id': self.last_id, 'method': method, 'params': params}
+        if session:
+            message['sessionId'] = session
+        with os.fdopen(os.dup(self.commands), 'wb') as commands:
+            commands.write(json.dumps(message).encode('utf-8') + b'\0')
+        deadline = time.monotonic() + timeout
+        while True:
+            while b'\0' not in self.buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([self.replies], [], [], remaining)[0]:
+                    raise TimeoutError(f'{method} took more than {timeout}s')
+                chunk = os.read(self.replies, 1 << 16)
+                if not chunk:
+                    raise RuntimeError(f'Chrome exited during {method}')
+                self.buffer += chunk
+            raw, _, self.buffer = self.buffer.partition(b'\0')
+            reply = json.loads(raw)
+            if reply.get('id') == self.last_id:
+                if 'error' in reply:
+                    raise RuntimeError(f"{method}: {reply['error']['message']}")
+                return reply['result']
+
+    def evaluate(self, session, expression, timeout=BROWSER_TIMEOUT_S):
+        result = self.call('Runtime.evaluate', session, timeout, expression=expression,
+                           awaitPromise=True, returnByValue=True)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise RuntimeError(details.get('exception', {}).get('description') or details['text'])
+        return result['result'].get('value')
+
+    def close(self):
+        try:
+            self.call('Browser.close', timeout=10)
+        except (RuntimeError, TimeoutError, OSError):
+            self.process.kill()
+        self.process.wait(10)
+        os.close(self.commands)
+        os.close(self.replies)
+
+
+# Steps 1-4 with the options analyze_stl() defaults to; returns what the JSON export reports
+BROWSER_PIPELINE = """(async () => {
+    const pipeline = window.wearPipeline;
+    const alerts = [];
+    window.alert = (message) => alerts.push(String(message));
+    const options = { 'detection-method': 'dual-sphere', 'fitting-shape': 'sphere', 'fitting-method': 'gauss-newton',
+                      'ransac-seed': '', 'commercial-radius': 'auto' };
+    for (const [id, value] of Object.entries(options)) document.getElementById(id).value = value;
+
+    const blob = await (await fetch('/cup.stl', { cache: 'no-store' })).blob();
+    await pipeline.load(new File([blob], 'cup.stl'));
+    for (const step of ['isolate', 'detect', 'fit', 'calculate']) await pipeline[step]();
+    const { state } = pipeline;
+    if (!state.wearData) throw new Error(`no wear result${alerts.length ? `: ${alerts.join('; ')}` : ''}`);
+    return {
+        zones: { worn: state.wornVertices.length, unworn: state.unwornVertices.length, rim: state.rimVertices.length },
+        unwornSphere: { center: state.unwornSphere.center.toArray(), radius: state.unwornSphere.radius,
+                        rawRadius: state.unwornSphere.rawRadius },
+        transitionPlane: { normal: state.transitionPlane.normal.toArray(), d: state.transitionPlane.d },
+        wear: state.wearData
+    };
+})()"""
+
+
+def browser_pipeline(cup_path, profile):
+    """Run BROWSER_PIPELINE on cup_path in index.html (fresh Chrome profile: no stage cache)."""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(CupHandler, cup_path=cup_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    chrome = DevToolsPipe(CHROME, profile)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/index.html'
+        target = chrome.call('Target.createTarget', url=url)['targetId']
+        session = chrome.call('Target.attachToTarget', targetId=target, flatten=True)['sessionId']
+        deadline = time.monotonic() + 30
+        while not chrome.evaluate(session, "typeof window.wearPipeline === 'object'"):
+            if time.monotonic() > deadline:
+                raise RuntimeError('index.html did not expose window.wearPipeline')
+            time.sleep(0.1)
+        return chrome.evaluate(session, BROWSER_PIPELINE)
+    finally:
+        chrome.close()
+        server.shutdown()
+        server.server_close()
+
+
+@needs_browser
+def test_full_pipeline_matches_browser(cup, result, tmp_path):
+    browser = browser_pipeline(cup['path'], tmp_path / 'profile')
+    assert browser['zones'] == {key: result['zones'][key] for key in ('worn', 'unworn', 'rim')}
+
+    sphere = result['unwornSphere']
+    np.testing.assert_allclose(sphere['center'], browser['unwornSphere']['center'], rtol=0, atol=1e-6)
+    assert sphere['radius'] == browser['unwornSphere']['radius']
+    assert sphere['rawRadius'] == pytest.approx(browser['unwornSphere']['rawRadius'], abs=1e-6)
+
+    plane = result['transitionPlane']
+    np.testing.assert_allclose(plane['normal'], browser['transitionPlane']['normal'], rtol=0, atol=1e-6)
+    assert plane['d'] == pytest.approx(browser['transitionPlane']['d'], abs=1e-6)
+
+    wear = result['wear']
+    for key in ('volumetricWear', 'linearWearMean', 'linearWearMax', 'linearWearMin'):
+        assert wear[key] == pytest.approx(browser['wear'][key], rel=1e-6, abs=1e-9), key
+
+
+def test_exports_follow_browser_layout(result):
+    lines = csv_text(result).split('\n')
+    assert lines[0] == 'Metric,Value,Unit'
+    assert len(lines) == 19
+    assert lines[10] == 'Unworn Sphere Radius (Commercial),16.000000,mm'
+    assert lines[12] == 'Commercial Radius Selection,16,mm'
+
+    document = json_document(result)
+    assert list(document)[:8] == ['metadata', 'wearMetrics', 'unwornSphere', 'transitionPlane', 'zoneAreas',
+                                  'fittingDiagnostics', 'curvatureAnalysis', 'inflectionPoints']
+    assert document['fittingDiagnostics']['totalPoints'] == result['zones']['unworn']
+    json.dumps(document, allow_nan=False)
+
+
+def test_cli_writes_per_file_results_and_summary(cup, tmp_path):
+    scans = tmp_path / 'scans'
+    scans.mkdir()
+    shutil.copy(cup['path'], scans / 'left.stl')
+    (scans / 'broken.stl').write_bytes(b'not an stl')
+    out = tmp_path / 'out'
+
+    assert batch_main([str(scans), '--out', str(out), '--workers', '2']) == 1  # One failure
+    assert (out / 'left.csv').read_text(encoding='utf-8').startswith('Metric,Value,Unit\n')
+    assert json.loads((out / 'left.json').read_text(encoding='utf-8'))['unwornSphere']['radius'] == 16
+    summary = (out / 'summary.csv').read_text(encoding='utf-8').splitlines()
+    assert summary[1].startswith('broken.stl,error') and summary[2].startswith('left.stl,ok')
+
+
+def test_cli_mirrors_subdirectories_so_same_named_scans_do_not_collide(cup, tmp_path):
+    scans = tmp_path / 'scans'
+    for side in ('a', 'b'):
+        (scans / side).mkdir(parents=True)
+        shutil.copy(cup['path'], scans / side / 'cup.stl')
+    out = tmp_path / 'out'
+
+    assert batch_main([str(scans), str(scans / 'a' / 'cup.stl'), '--out', str(out), '--workers', '2']) == 0
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob('*.json')) == [
+        'a/cup.json', 'b/cup.json', 'cup.json']
+    summary = (out / 'summary.csv').read_text(encoding='utf-8').splitlines()
+    assert [line.split(',')[0] for line in summary[1:]] == ['a/cup.stl', 'b/cup.stl', 'cup.stl']
@@ -0,0 +1,110 @@
+"""
+Files server.py writes under the served directory: the trace log and the benchmark
+history are only reachable through their /api routes, never as static files. Request
+bodies with a malformed Content-Length are refused with 400.
+"""
+import functools
+import http.client
+import http.server
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmark_history import BenchmarkHistory
+from case_storage import CaseStore
+from server import NoCacheHTTPRequestHandler, ProductionHTTPRequestHandler, StaticAssetCache
+from trace_log import DEFAULT_TRACE_LOG, TraceLog
+
+
+class QuietNoCacheHandler(NoCacheHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietProductionHandler(ProductionHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(params=[QuietNoCacheHandler, QuietProductionHandler], ids=['dev', 'production'])
+def served_root(request, tmp_path):
+    (tmp_path / 'benchmarks' / 'cups').mkdir(parents=True)
+    (tmp_path / 'benchmarks' / 'cups' / 'manifest.json').write_text('{"cups": []}', encoding='utf-8')
+    history = BenchmarkHistory(tmp_path / 'benchmarks' / 'history.json')
+    history.append({'results': []})
+    history.path.with_suffix('.tmp').write_text('{}', encoding='utf-8')
+    trace_log = TraceLog(tmp_path / DEFAULT_TRACE_LOG)
+    trace_log.append({'traceEvents': []}, client='10.0.0.1')
+    (tmp_path / 'traces' / 'older.ndjson').write_text('{}\n', encoding='utf-8')
+
+    handler = type(request.param.__name__, (request.param,), {
+        'benchmark_history': history,
+        'trace_log': trace_log,
+        'case_store': CaseStore(tmp_path / 'cases'),
+        'asset_cache': StaticAssetCache(tmp_path).warm(),
+    })
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def post(root, path, body, length, method='POST', headers=None):
+    """Send `body` with a raw Content-Length header; returns (status, json reply)."""
+    connection = http.client.HTTPConnection(root.removeprefix('http://'), timeout=10)
+    try:
+        connection.putrequest(method, path)
+        connection.putheader('Content-Type', 'application/json')
+        connection.putheader('Content-Length', length)
+        for name, value in (headers or {}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        connection.close()
+
+
+def status(url, method='GET'):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method=method)) as response:
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+@pytest.mark.parametrize('path', ['/traces/traces.ndjson', '/traces/older.ndjson', '/traces/', '/%74races/traces.ndjson',
+                                  '/cups/../traces/traces.ndjson', '/benchmarks/history.json',
+                                  '/benchmarks/history.tmp', '/benchmarks/./history.json?x=1'])
+def test_trace_log_and_benchmark_history_are_not_served(served_root, path):
+    assert status(served_root + path) == 404
+    assert status(served_root + path, method='HEAD') == 404
+
+
+def test_cups_and_api_routes_stay_available(served_root):
+    assert status(served_root + '/benchmarks/cups/manifest.json') == 200
+    with urllib.request.urlopen(served_root + '/api/benchmarks') as response:
+        assert len(json.load(response)['runs']) == 1
+    with urllib.request.urlopen(served_root + '/api/traces') as response:
+        assert json.load(response) == {'enabled': True}
+
+
+@pytest.mark.parametrize('route', ['/api/traces', '/api/benchmarks', '/api/uploads'])
+@pytest.mark.parametrize('length', ['abc', '1e3', '-5', '', str(64 * 1024 * 1024)])
+def test_malformed_or_oversized_content_length_is_rejected(served_root, route, length):
+    code, reply = post(served_root, route, b'{"traceEvents": [], "results": []}', length)
+    assert code == 400 and 'error' in reply
+
+
+@pytest.mark.parametrize('length', ['abc', '²', '-5', ''])
+def test_upload_chunk_without_a_plain_content_length_is_refused(served_root, length):
+    body = b'{"name": "cup.stl", "size": 4}'
+    code, upload = post(served_root, '/api/uploads', body, str(len(body)))
+    assert code == 201
+    code, reply = post(served_root, f"/api/uploads/{upload['id']}", b'solid', length, method='PUT',
+                       headers={'Upload-Offset': '0'})
+    assert code == 411 and 'error' in reply
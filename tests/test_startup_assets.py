@@ -0,0 +1,131 @@
+"""
+Offline startup assets: the prebuilt app.css matches the pages, and vendor/ files are
+served from disk, verified against SHA256SUMS, or redirected to their pinned CDN URL.
+"""
+import functools
+import http.server
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import build_css
+import vendor_assets
+from vendor_assets import VendorMixin
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_app_css_is_up_to_date_and_covers_every_class():
+    css, unknown = build_css.build()
+    assert unknown == {}
+    assert (ROOT / build_css.OUTPUT).read_text(encoding='utf-8') == css
+
+
+def test_utilities_follow_tailwind_values_and_order():
+    assert build_css.utility('px-3') == ('', 'padding-left: 0.75rem; padding-right: 0.75rem')
+    assert build_css.utility('text-gray-500') == ('', 'color: #6b7280')
+    assert build_css.utility('space-y-2')[0] == ' > :not([hidden]) ~ :not([hidden])'
+    assert build_css.utility('not-a-utility') is None
+    # Later rules win: hidden after flex, side padding after axis padding
+    assert build_css.rule_order('hidden') > build_css.rule_order('flex')
+    assert build_css.rule_order('pt-4') > build_css.rule_order('py-8')
+    css, _ = build_css.build()
+    assert css.index('.md\\:grid-cols-2') > css.index('.grid-cols-1 ')
+
+
+def test_index_loads_libraries_from_vendor_with_the_pinned_cdn_as_fallback():
+    head = (ROOT / 'index.html').read_text(encoding='utf-8').split('</head>', 1)[0]
+    assert 'cdn.tailwindcss.com' not in head
+    assert 'src="http' not in head and 'href="http' not in head
+    assert "probe.open('HEAD', 'vendor/SHA256SUMS', false)" in head
+    for prefix, base in vendor_assets.SOURCES.items():
+        if not prefix.startswith('@fontsource/'):
+            assert f"'{prefix}': '{base}'" in head
+    for relative in vendor_assets.FILES:
+        if relative.endswith('.js') and 'jspdf' not in relative:
+            assert f"'{relative}'" in head
+
+
+def test_app_css_fonts_fall_back_to_the_pinned_cdn():
+    css = (ROOT / build_css.OUTPUT).read_text(encoding='utf-8')
+    for relative in vendor_assets.FILES:
+        if relative.endswith('.woff2'):
+            assert f"url('vendor/{relative}') format('woff2'), url('{vendor_assets.upstream_url(relative)}')" in css
+
+
+def test_export_test_and_benchmark_scripts_load_on_first_use():
+    html = (ROOT / 'index.html').read_text(encoding='utf-8')
+    head = html.split('</head>', 1)[0]
+    for script in ('binary-export.js', 'mesh-decimation.js', 'optimization-tests.js',
+                   'stl-parse-benchmark.js', 'curvature-benchmark.js'):
+        assert f'src="{script}"' not in head
+        assert f"'{script}'" in html  # loadScriptOnce / CONSOLE_TOOLS
+
+
+def test_upstream_url_mirrors_the_cdn_layout():
+    assert vendor_assets.upstream_url('three@0.158.0/build/three.module.js') == \
+        'https://unpkg.com/three@0.158.0/build/three.module.js'
+    assert vendor_assets.upstream_url('jspdf@2.5.1/jspdf.umd.min.js') == \
+        'https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js'
+    assert vendor_assets.upstream_url('three@0.158.0/../secret') is None
+    assert vendor_assets.upstream_url('left-pad@1.0.0/index.js') is None
+
+
+def test_verify_reports_missing_and_modified_files(tmp_path):
+    files = ['three@0.158.0/build/three.module.js', 'jspdf@2.5.1/jspdf.umd.min.js']
+    target = tmp_path / files[0]
+    target.parent.mkdir(parents=True)
+    target.write_text('export const REVISION = "158";')
+    vendor_assets.write_checksums(tmp_path, {files[0]: vendor_assets.sha256(target)})
+    assert vendor_assets.verify(tmp_path, files) == ([files[1]], [])
+
+    target.write_text('export const REVISION = "159";')
+    assert vendor_assets.verify(tmp_path, files) == ([files[1]], [files[0]])
+
+
+class QuietVendorHandler(VendorMixin, http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if not self.handle_vendor_request(head_only=False):
+            super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args):
+        return None
+
+
+@pytest.fixture
+def vendor_server(tmp_path):
+    vendored = tmp_path / 'vendor' / 'three@0.158.0' / 'build' / 'three.module.js'
+    vendored.parent.mkdir(parents=True)
+    vendored.write_text('export {};')
+    handler = functools.partial(QuietVendorHandler, directory=str(tmp_path))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_vendor_files_are_served_locally_or_redirected(vendor_server):
+    opener = urllib.request.build_opener(NoRedirect)
+    with opener.open(f'{vendor_server}/vendor/three@0.158.0/build/three.module.js') as response:
+        assert response.status == 200
+        assert response.read() == b'export {};'
+
+    with pytest.raises(urllib.error.HTTPError) as redirect:
+        opener.open(f'{vendor_server}/vendor/three@0.158.0/examples/jsm/controls/OrbitControls.js')
+    assert redirect.value.code == 302
+    assert redirect.value.headers['Location'] == \
+        'https://unpkg.com/three@0.158.0/examples/jsm/controls/OrbitControls.js'
+
+    with pytest.raises(urllib.error.HTTPError) as missing:
+        opener.open(f'{vendor_server}/vendor/unknown@1.0.0/index.js')
+    assert missing.value.code == 404
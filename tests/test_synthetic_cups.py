@@ -0,0 +1,59 @@
+"""Ground truth and file output of the synthetic cup generator used by benchmark.html."""
+import json
+import math
+
+import numpy as np
+import pytest
+
+from wear_batch.stl import read_triangles
+from wear_batch.synthetic import (MAX_RESOLVABLE_SCAR_FRACTION, grid_for_faces, main, scar_fraction, wear_direction,
+                                  worn_cup, worn_volume)
+
+
+def test_worn_volume_matches_lens_formula_when_scar_stays_inside_the_cup():
+    # Straight down the axis the whole crescent S1 \ S0 lies in the bowl: V = V(sphere) - V(lens)
+    radius, depth = 16.0, 0.5
+    lens = math.pi * (4 * radius + depth) * (2 * radius - depth) ** 2 / 12
+    expected = 4 / 3 * math.pi * radius ** 3 - lens
+    assert worn_volume(radius, depth, wear_direction(0.0)) == pytest.approx(expected, rel=1e-6)
+
+
+def test_tilted_scar_loses_the_part_above_the_rim():
+    radius, depth = 16.0, 0.5
+    assert worn_volume(radius, depth, wear_direction(45.0)) < worn_volume(radius, depth, wear_direction(0.0))
+
+
+def test_scar_fraction_matches_the_cap_beyond_depth_over_2r():
+    # Straight down the axis the scar is every ray with cos θ > depth / 2R: a share 1 - depth / 2R
+    radius, depth = 16.0, 0.5
+    assert scar_fraction(radius, depth, wear_direction(0.0)) == pytest.approx(1 - depth / (2 * radius), abs=1e-3)
+    # Sideways migration leaves just under half of the bowl worn
+    assert scar_fraction(radius, depth, wear_direction(90.0)) <= MAX_RESOLVABLE_SCAR_FRACTION
+
+
+@pytest.mark.parametrize('tilt', [0.0, 30.0, 60.0, 80.0])
+def test_displaced_head_scar_covers_most_of_the_bowl_below_90_degrees(tilt):
+    assert scar_fraction(16.0, 0.5, wear_direction(tilt)) > MAX_RESOLVABLE_SCAR_FRACTION
+
+
+@pytest.mark.parametrize('faces', [10_000, 250_000])
+def test_face_count_tracks_the_request(faces):
+    rings, segments = grid_for_faces(faces)
+    triangles, truth = worn_cup(rings=rings, segments=segments)
+    assert truth['faces'] == len(triangles)
+    assert abs(len(triangles) - faces) / faces < 0.05
+
+
+def test_cli_writes_binary_and_ascii_with_manifest(tmp_path):
+    assert main(['--out', str(tmp_path), '--radius', '14', '--faces', '10000', '--format', 'binary', 'ascii',
+                 '--noise', '0.01']) == 0
+    manifest = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))
+    files = {cup['file']: cup for cup in manifest['cups']}
+    assert set(files) == {'cup-r14-10k-binary.stl', 'cup-r14-10k-ascii.stl'}
+    binary = read_triangles(tmp_path / 'cup-r14-10k-binary.stl')
+    ascii_ = read_triangles(tmp_path / 'cup-r14-10k-ascii.stl')
+    assert np.array_equal(binary, ascii_)
+    cup = files['cup-r14-10k-binary.stl']
+    assert cup['faces'] == len(binary) and cup['radius'] == 14 and cup['linearWear'] == 0.5
+    assert cup['wornVolume'] > 0
+    assert cup['scarFraction'] > MAX_RESOLVABLE_SCAR_FRACTION and cup['referenceResolvable'] is False
@@ -0,0 +1,208 @@
+/**
+ * Trace Recorder
+ * Structured spans for the analysis pipeline, exported as Chrome trace-event JSON
+ * (open in chrome://tracing or https://ui.perfetto.dev).
+ *
+ * - Timestamps are absolute microseconds (performance.timeOrigin + now), so spans recorded
+ *   in workers line up with the main thread once merged.
+ * - Each thread records under its own tid; workers ship their events back with their
+ *   result messages (`trace` field, see drain()) and the main thread merges them.
+ * - Events live in a bounded buffer (MAX_EVENTS); the oldest are dropped first.
+ *
+ * Loaded by index.html (defer) and by the workers (importScripts); both get a global
+ * `traceRecorder`. Usage (F12): traceRecorder.summary(), traceRecorder.download()
+ */
+class TraceRecorder {
+    static MAX_EVENTS = 200000;
+    static MAIN_TID = 1;
+    static WORKER_TID = 2;
+
+    // Absolute time in trace units (µs)
+    static now() {
+        return (performance.timeOrigin + performance.now()) * 1000;
+    }
+
+    // performance.now() value (ms, this thread) -> absolute µs
+    static toTraceTime(ms) {
+        return (performance.timeOrigin + ms) * 1000;
+    }
+
+    constructor(options = {}) {
+        const { pid = 1, tid = TraceRecorder.MAIN_TID, threadName = 'main', maxEvents = TraceRecorder.MAX_EVENTS } = options;
+        this.pid = pid;
+        this.tid = tid;
+        this.maxEvents = maxEvents;
+        this.events = [];
+        this.dropped = 0;
+        this.threads = new Map([[tid, threadName]]);  // tid -> thread name (metadata events)
+    }
+
+    setThread(tid, threadName) {
+        this.threads.delete(this.tid);
+        this.tid = tid;
+        this.threads.set(tid, threadName);
+    }
+
+    push(event) {
+        this.events.push(event);
+        if (this.events.length > this.maxEvents) {
+            // Drop a tenth at once so trimming stays amortized O(1)
+            const excess = this.events.length - Math.floor(this.maxEvents * 0.9);
+            this.events.splice(0, excess);
+            this.dropped += excess;
+        }
+    }
+
+    /**
+     * Open a span; close it with end(). Spans may overlap and nest freely.
+     */
+    begin(name, args = {}, cat = 'pipeline') {
+        return { name, cat, args, ts: TraceRecorder.now() };
+    }
+
+    end(span, args = null) {
+        if (!span) return;
+        const ts = TraceRecorder.now();
+        this.push({
+            name: span.name, cat: span.cat, ph: 'X', ts: span.ts, dur: ts - span.ts,
+            pid: this.pid, tid: this.tid, args: args ? { ...span.args, ...args } : span.args
+        });
+    }
+
+    /**
+     * Span from two performance.now() readings taken by existing timing code
+     */
+    complete(name, startMs, endMs, args = {}, cat = 'pipeline') {
+        const ts = TraceRecorder.toTraceTime(startMs);
+        this.push({ name, cat, ph: 'X', ts, dur: (endMs - startMs) * 1000, pid: this.pid, tid: this.tid, args });
+    }
+
+    /**
+     * Run fn inside a span; async functions are timed until their promise settles
+     */
+    span(name, fn, args = {}, cat = 'pipeline') {
+        const span = this.begin(name, args, cat);
+        let result;
+        try {
+            result = fn();
+        } catch (error) {
+            this.end(span, { error: error.message });
+            throw error;
+        }
+        if (result && typeof result.then === 'function') {
+            return result.then(
+                (value) => { this.end(span); return value; },
+                (error) => { this.end(span, { error: error.message }); throw error; }
+            );
+        }
+        this.end(span);
+        return result;
+    }
+
+    instant(name, args = {}, cat = 'pipeline') {
+        this.push({ name, cat, ph: 'i', s: 't', ts: TraceRecorder.now(), pid: this.pid, tid: this.tid, args });
+    }
+
+    // Counter track (e.g. residual per fit iteration); values: { series: number }
+    counter(name, values, cat = 'pipeline') {
+        this.push({ name, cat, ph: 'C', ts: TraceRecorder.now(), pid: this.pid, tid: this.tid, args: values });
+    }
+
+    /**
+     * Worker side: hand over the events recorded since the last drain
+     */
+    drain() {
+        if (this.events.length === 0) return null;
+        const batch = { tid: this.tid, threadName: this.threads.get(this.tid), events: this.events };
+        this.events = [];
+        return batch;
+    }
+
+    /**
+     * Main side: merge a batch from drain() (pid is rewritten to this page's)
+     */
+    addEvents(batch) {
+        if (!batch || !batch.events) return;
+        this.threads.set(batch.tid, batch.threadName);
+        for (const event of batch.events) {
+            event.pid = this.pid;
+            this.push(event);
+        }
+    }
+
+    clear() {
+        this.events = [];
+        this.dropped = 0;
+    }
+
+    get eventCount() {
+        return this.events.length;
+    }
+
+    toChromeTrace(metadata = {}) {
+        const threadEvents = [{ name: 'process_name', ph: 'M', pid: this.pid, tid: 0, args: { name: 'Acetabular Wear Analysis' } }];
+        for (const [tid, name] of this.threads) {
+            threadEvents.push({ name: 'thread_name', ph: 'M', pid: this.pid, tid, args: { name } });
+        }
+        const events = this.events.slice().sort((a, b) => a.ts - b.ts);
+        return {
+            traceEvents: [...threadEvents, ...events],
+            displayTimeUnit: 'ms',
+            otherData: { ...metadata, droppedEvents: this.dropped }
+        };
+    }
+
+    download(fileName = `wear-trace-${new Date().toISOString().replace(/[:.]/g, '-')}.json`, metadata = {}) {
+        const blob = new Blob([JSON.stringify(this.toChromeTrace(metadata))], { type: 'application/json' });
+        const url = URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = fileName;
+        a.click();
+        URL.revokeObjectURL(url);
+        console.log(`📈 Trace exported: ${this.events.length.toLocaleString()} events (load in chrome://tracing or ui.perfetto.dev)`);
+    }
+
+    /**
+     * POST the trace to server.py (/api/traces, enabled with --trace-log)
+     */
+    async upload(url = '/api/traces', metadata = {}) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(this.toChromeTrace(metadata))
+        });
+        if (!response.ok) throw new Error(`Trace upload failed: HTTP ${response.status}`);
+        return response.json();
+    }
+
+    /**
+     * Total / max time per span name, longest first
+     */
+    summary() {
+        const byName = new Map();
+        for (const event of this.events) {
+            if (event.ph !== 'X') continue;
+            const entry = byName.get(event.name) || { span: event.name, count: 0, totalMs: 0, maxMs: 0 };
+            entry.count++;
+            entry.totalMs += event.dur / 1000;
+            entry.maxMs = Math.max(entry.maxMs, event.dur / 1000);
+            byName.set(event.name, entry);
+        }
+        const rows = [...byName.values()].sort((a, b) => b.totalMs - a.totalMs);
+        if (typeof console.table === 'function') console.table(rows);
+        return rows;
+    }
+}
+
+// One recorder per thread; workers are renamed by the 'traceInit' message
+if (typeof performance !== 'undefined' && typeof globalThis.traceRecorder === 'undefined') {
+    const inWorker = typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope;
+    globalThis.traceRecorder = inWorker
+        ? new TraceRecorder({ tid: TraceRecorder.WORKER_TID, threadName: 'stl worker' })
+        : new TraceRecorder();
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { TraceRecorder };
+}
@@ -0,0 +1,104 @@
+"""
+Opt-in trace telemetry for server.py: Chrome trace JSON posted by index.html after each
+finished analysis (trace-recorder.js) is appended to an NDJSON log, one trace per line.
+
+    python server.py --trace-log                    -> traces/traces.ndjson
+    python server.py --trace-log /data/wear.ndjson  (or WEAR_TRACE_LOG=...)
+
+Without the flag the endpoint only answers {"enabled": false} and nothing is stored.
+The log holds client addresses and user agents, so the handler answers 404 for it and for
+anything under traces/ in the served directory instead of serving it as a static file.
+
+HTTP API (see TraceLogMixin):
+    GET  /api/traces     {"enabled": bool}; the page checks this once at startup
+    POST /api/traces     {"traceEvents": [...], "otherData": {...}} -> 201 {"events"}
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TRACE_LOG = 'traces/traces.ndjson'
+MAX_TRACE_BYTES = 32 * 1024 * 1024  # ~200k events, the recorder's own cap
+
+
+class TraceLog:
+    """Append-only NDJSON file; lines from concurrent requests never interleave."""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+    def append(self, trace, client=None, user_agent=None):
+        if not isinstance(trace, dict) or not isinstance(trace.get('traceEvents'), list):
+            raise ValueError('expected a Chrome trace {"traceEvents": [...]}')
+        record = {
+            'receivedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'client': client,
+            'userAgent': user_agent,
+            'trace': trace,
+        }
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as log:
+                log.write(line)
+        return len(trace['traceEvents'])
+
+    def count(self):
+        try:
+            with open(self.path, 'rb') as log:
+                return sum(1 for _ in log)
+        except FileNotFoundError:
+            return 0
+
+
+class TraceLogMixin:
+    """
+    /api/traces for a handler that also mixes in CaseStorageMixin (for send_json and the
+    do_POST fallthrough). List it first so its do_POST runs before the other routes.
+    """
+
+    trace_log = None  # TraceLog, set by run_server when --trace-log is given
+
+    def handle_trace_request(self, head_only=False):
+        if self.is_trace_log_path():
+            self.send_json(404, {'error': 'not found'}, head_only=head_only)
+            return True
+        if self.path.split('?', 1)[0] != '/api/traces':
+            return False
+        self.send_json(200, {'enabled': self.trace_log is not None}, head_only=head_only)
+        return True
+
+    def is_trace_log_path(self):
+        """True when the request maps to the trace log or into the default traces/ directory."""
+        target = Path(self.translate_path(self.path)).resolve()
+        private = (Path(self.directory) / DEFAULT_TRACE_LOG).resolve().parent
+        return (target == private or private in target.parents or
+                (self.trace_log is not None and target == self.trace_log.path))
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != '/api/traces':
+            super().do_POST()
+            return
+        if self.trace_log is None:
+            self.close_connection = True
+            self.send_json(403, {'error': 'trace collection disabled (start server.py with --trace-log)'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:  # Malformed header: rejected below like a missing body
+            length = 0
+        if length <= 0 or length > MAX_TRACE_BYTES:
+            self.close_connection = True
+            self.send_json(400, {'error': f'expected a JSON body up to {MAX_TRACE_BYTES} bytes'})
+            return
+        try:
+            events = self.trace_log.append(json.loads(self.rfile.read(length)),
+                                           client=self.client_address[0],
+                                           user_agent=self.headers.get('User-Agent'))
+        except ValueError as error:
+            self.send_json(400, {'error': str(error)})
+            return
+        print(f"[TRACE] Stored {events} events from {self.client_address[0]} ({length / 1024:.0f} KB)")
+        self.send_json(201, {'events': events})
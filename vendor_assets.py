@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Third-party libraries served from ./vendor, so index.html starts without a CDN (offline
+workstations) and without waiting on one.
+
+    python vendor_assets.py            download the missing files, then verify them
+    python vendor_assets.py --check    verify only; exit 1 if a file is missing or modified
+
+Local paths mirror the CDN layout under a pinned version (vendor/three@0.158.0/build/...),
+so index.html and the import map reference vendor/ only. The first download records a
+SHA-256 per file in vendor/SHA256SUMS; later runs and --check compare against it, so a
+re-download that does not match the pinned version is reported instead of served.
+
+server.py and dev-server.py mix in VendorMixin: vendor files are served from disk, and a
+file that has not been downloaded yet is answered with a redirect to its CDN URL, so a
+fresh checkout still works online before this script has been run.
+"""
+import argparse
+import hashlib
+import sys
+import urllib.request
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).resolve().parent / 'vendor'
+CHECKSUMS = 'SHA256SUMS'
+
+# Local prefix -> CDN base URL (pinned versions)
+SOURCES = {
+    'three@0.158.0/': 'https://unpkg.com/three@0.158.0/',
+    'es-module-shims@1.6.3/': 'https://unpkg.com/es-module-shims@1.6.3/',
+    'jspdf@2.5.1/': 'https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/',
+    '@fontsource/inter@5.0.16/': 'https://unpkg.com/@fontsource/inter@5.0.16/',
+}
+
+# Every file the app loads (index.html, benchmark.html and app.css)
+FILES = [
+    'three@0.158.0/build/three.module.js',
+    'three@0.158.0/examples/jsm/controls/OrbitControls.js',
+    'three@0.158.0/examples/jsm/loaders/STLLoader.js',
+    'es-module-shims@1.6.3/dist/es-module-shims.js',
+    'jspdf@2.5.1/jspdf.umd.min.js',
+    *(f'@fontsource/inter@5.0.16/files/inter-latin-{weight}-normal.woff2' for weight in (400, 500, 600, 700, 800)),
+]
+
+
+def upstream_url(relative):
+    """CDN URL of a path under vendor/, or None if it is not from a pinned source."""
+    for prefix, base in SOURCES.items():
+        if relative.startswith(prefix) and '..' not in relative.split('/'):
+            return base + relative[len(prefix):]
+    return None
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_checksums(root):
+    try:
+        lines = (root / CHECKSUMS).read_text(encoding='utf-8').splitlines()
+    except FileNotFoundError:
+        return {}
+    checksums = {}
+    for line in lines:
+        digest, _, relative = line.strip().partition('  ')
+        if relative:
+            checksums[relative] = digest
+    return checksums
+
+
+def write_checksums(root, checksums):
+    lines = [f'{checksums[relative]}  {relative}' for relative in sorted(checksums)]
+    (root / CHECKSUMS).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def download(relative, root, timeout=60):
+    url = upstream_url(relative)
+    target = root / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.with_name(target.name + '.part')
+    with urllib.request.urlopen(url, timeout=timeout) as response, open(staging, 'wb') as out:
+        while block := response.read(1 << 20):
+            out.write(block)
+    staging.replace(target)
+    return target
+
+
+def verify(root=VENDOR_DIR, files=FILES):
+    """(missing, modified) relative paths; files without a recorded checksum only need to exist."""
+    checksums = read_checksums(root)
+    missing, modified = [], []
+    for relative in files:
+        path = root / relative
+        if not path.is_file():
+            missing.append(relative)
+        elif relative in checksums and sha256(path) != checksums[relative]:
+            modified.append(relative)
+    return missing, modified
+
+
+def fetch(root=VENDOR_DIR, files=FILES):
+    """Download missing files and record checksums for new ones. Returns the number downloaded."""
+    checksums = read_checksums(root)
+    downloaded = 0
+    for relative in files:
+        path = root / relative
+        if not path.is_file():
+            print(f"[VENDOR] {upstream_url(relative)}")
+            download(relative, root)
+            downloaded += 1
+        checksums.setdefault(relative, sha256(path))
+    write_checksums(root, checksums)
+    return downloaded
+
+
+class VendorMixin:
+    """
+    /vendor/... for a SimpleHTTPRequestHandler: files on disk are left to the static file
+    handling; a pinned file that has not been downloaded is redirected to the CDN.
+    """
+
+    def handle_vendor_request(self, head_only=False):
+        path = self.path.split('?', 1)[0]
+        if not path.startswith('/vendor/'):
+            return False
+        if Path(self.translate_path(path)).is_file():
+            return False
+        url = upstream_url(path[len('/vendor/'):])
+        if url is None:
+            return False
+        self.send_response(302)
+        self.send_header('Location', url)
+        self.send_header('Content-Length', '0')
+        self.send_header('Cache-Control', 'no-cache')  # Until the file is vendored
+        self.end_headers()
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Download and verify the vendored third-party libraries')
+    parser.add_argument('--check', action='store_true', help='verify only, do not download')
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        try:
+            downloaded = fetch()
+        except OSError as error:
+            print(f"[VENDOR] Download failed: {error}")
+            return 1
+        print(f"[VENDOR] {downloaded} downloaded, {len(FILES) - downloaded} already present")
+    missing, modified = verify()
+    for relative in missing:
+        print(f"[VENDOR] Missing: {relative}")
+    for relative in modified:
+        print(f"[VENDOR] Checksum mismatch: {relative}")
+    if missing or modified:
+        return 1
+    print(f"[VENDOR] {len(FILES)} files verified against {VENDOR_DIR / CHECKSUMS}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""
+Headless batch analysis of acetabular liner STL files.
+
+The browser pipeline (isolation, wear zones, unworn sphere fit, transition plane,
+volumetric and linear wear) reimplemented with NumPy over memory-mapped STL files,
+so a folder of retrievals can be processed on a lab machine without opening the UI:
+
+    python -m wear_batch scans/ --out results/ --workers 8
+
+Requires numpy (pip install numpy). Outputs match the Export CSV / Export JSON buttons.
+"""
+from .export import csv_text, json_document, write_result
+from .pipeline import analyze_stl
+
+__all__ = ['analyze_stl', 'csv_text', 'json_document', 'write_result']
@@ -0,0 +1,123 @@
+"""
+python -m wear_batch <dir-or-files...> [--out results] [--workers N]
+
+One process per worker; each STL gets <stem>.csv and <stem>.json in --out, at the same
+path relative to --out as the scan has under its input directory (so scans/a/cup.stl and
+scans/b/cup.stl do not overwrite each other), and a summary.csv lists every file by that
+relative path (including failures) for spreadsheet import.
+"""
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .export import summary_row, write_result, write_summary
+from .pipeline import COMMERCIAL_RADII, DETECTION_METHODS, FITTING_METHODS, analyze_stl
+
+
+def collect_files(inputs):
+    """
+    (path, relative) pairs: `relative` is the scan's path under its input directory (just
+    the name for files given directly), made unique across inputs with a -2, -3... suffix.
+    """
+    files = []
+    taken = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found = [(p, p.relative_to(path)) for p in sorted(path.rglob('*')) if p.suffix.lower() == '.stl']
+        elif path.is_file():
+            found = [(path, Path(path.name))]
+        else:
+            print(f"[BATCH] ⚠️ Skipping {item}: not found")
+            continue
+        for file, relative in found:
+            unique, n = relative, 1
+            while unique.as_posix().lower() in taken:
+                n += 1
+                unique = relative.with_name(f'{relative.stem}-{n}{relative.suffix}')
+            taken.add(unique.as_posix().lower())
+            files.append((file, unique))
+    return files
+
+
+def process_file(path, relative, out_dir, options):
+    """Worker entry point: analyze one file and write its exports under out_dir/relative."""
+    start = time.perf_counter()
+    try:
+        result = analyze_stl(path, **options)
+        write_result(result, out_dir, relative)
+        return summary_row(result, file=relative.as_posix(), seconds=round(time.perf_counter() - start, 3))
+    except Exception as exc:  # One bad scan must not stop the batch
+        traceback.print_exc()
+        return summary_row(file=relative.as_posix(), error=f'{type(exc).__name__}: {exc}',
+                           seconds=round(time.perf_counter() - start, 3))
+
+
+def parse_commercial_radius(value):
+    if value == 'auto':
+        return value
+    radius = float(value)
+    if radius not in COMMERCIAL_RADII:
+        raise argparse.ArgumentTypeError(f'choose auto or one of {COMMERCIAL_RADII}')
+    return radius
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m wear_batch',
+                                     description='Batch wear analysis of acetabular liner STL files')
+    parser.add_argument('inputs', nargs='+', help='STL files or directories (searched recursively)')
+    parser.add_argument('--out', default='batch-results', help='output directory (default ./batch-results)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: CPU count)')
+    parser.add_argument('--detection', choices=DETECTION_METHODS, default='dual-sphere')
+    parser.add_argument('--fitting', choices=FITTING_METHODS, default='gauss-newton')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='RANSAC seed; same seed as the browser gives the same fit')
+    parser.add_argument('--commercial-radius', type=parse_commercial_radius, default='auto',
+                        help='auto or a commercial radius in mm (14, 16, 18, 20)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect_files(args.inputs)
+    if not files:
+        print("[BATCH] ❌ No STL files found")
+        return 1
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    options = {
+        'detection_method': args.detection,
+        'fitting_method': args.fitting,
+        'ransac_seed': args.seed,
+        'commercial_radius': args.commercial_radius,
+    }
+    workers = max(1, min(args.workers, len(files)))
+    print(f"[BATCH] 🚀 {len(files)} files, {workers} workers → {out_dir}")
+
+    start = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_file, path, relative, out_dir, options): path for path, relative in files}
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            rows.append(row)
+            if row['status'] == 'ok':
+                print(f"[BATCH] ✅ {done}/{len(files)} {row['file']}: "
+                      f"{row['volumetricWear']} mm³, max {row['linearWearMax']} mm ({row['seconds']}s)")
+            else:
+                print(f"[BATCH] ❌ {done}/{len(files)} {row['file']}: {row['error']}")
+
+    rows.sort(key=lambda row: row['file'])
+    write_summary(rows, out_dir / 'summary.csv')
+    failed = sum(row['status'] != 'ok' for row in rows)
+    print(f"[BATCH] Done in {time.perf_counter() - start:.1f}s: {len(rows) - failed} ok, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
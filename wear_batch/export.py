@@ -0,0 +1,182 @@
+"""
+Result files with the same fields as the browser's Export CSV / Export JSON buttons.
+"""
+import csv
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+SYSTEM_VERSION = '2.0-Enhanced'
+
+
+def csv_rows(result):
+    """(metric, value, unit) rows in the order of #btn-export-csv."""
+    wear = result['wear']
+    sphere = result['unwornSphere']
+    plane = result['transitionPlane']
+    cx, cy, cz = sphere['center']
+    nx, ny, nz = plane['normal']
+    return [
+        ('Volumetric Wear (plane-surface minus spherical-cap)', f"{wear['volumetricWear']:.6f}", 'mm³'),
+        ('Volume Plane to Surface', f"{wear['volumePlaneToSurface']:.6f}", 'mm³'),
+        ('Volume Spherical Cap', f"{wear['sphericalCapVolume']:.6f}", 'mm³'),
+        ('Linear Wear Mean Penetration', f"{wear['linearWearMean']:.6f}", 'mm'),
+        ('Linear Wear Max Penetration', f"{wear['linearWearMax']:.6f}", 'mm'),
+        ('Linear Wear Min Penetration', f"{wear['linearWearMin']:.6f}", 'mm'),
+        ('Unworn Sphere Center X', f'{cx:.6f}', 'mm'),
+        ('Unworn Sphere Center Y', f'{cy:.6f}', 'mm'),
+        ('Unworn Sphere Center Z', f'{cz:.6f}', 'mm'),
+        ('Unworn Sphere Radius (Commercial)', f"{sphere['radius']:.6f}", 'mm'),
+        ('Unworn Sphere Radius (Raw Fitted)', f"{sphere['rawRadius']:.6f}", 'mm'),
+        ('Commercial Radius Selection', f"{sphere['commercialRadius']:g}", 'mm'),
+        ('Transition Plane Normal X', f'{nx:.6f}', '-'),
+        ('Transition Plane Normal Y', f'{ny:.6f}', '-'),
+        ('Transition Plane Normal Z', f'{nz:.6f}', '-'),
+        ('Transition Plane D', f"{plane['d']:.6f}", 'mm'),
+        ('Worn Zone Area', f"{wear['wornArea']:.4f}", 'mm²'),
+        ('Unworn Zone Area', f"{wear['unwornArea']:.4f}", 'mm²'),
+    ]
+
+
+def csv_text(result):
+    """The browser CSV verbatim (no quoting, '\\n' line ends)."""
+    return '\n'.join(['Metric,Value,Unit'] + [','.join(row) for row in csv_rows(result)])
+
+
+def json_document(result):
+    """The browser JSON export, plus a `batch` block with the engine's own diagnostics."""
+    wear = result['wear']
+    sphere = result['unwornSphere']
+    plane = result['transitionPlane']
+    fit = result['fit']
+    residuals = fit['residuals']
+    total_points = result['zones']['unworn']
+    xyz = lambda v: {'x': v[0], 'y': v[1], 'z': v[2]}
+    return {
+        'metadata': {
+            'exportDate': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'systemVersion': SYSTEM_VERSION,
+            'analysisMethod': 'Gaussian Curvature + PCA + ' + fit['method'],
+        },
+        'wearMetrics': {
+            'volumetric': {
+                'total': wear['volumetricWear'],
+                'planeToSurface': wear['volumePlaneToSurface'],
+                'sphericalCap': wear['sphericalCapVolume'],
+                'unit': 'mm³',
+            },
+            'linear': {
+                'mean': wear['linearWearMean'],
+                'max': wear['linearWearMax'],
+                'min': wear['linearWearMin'],
+                'unit': 'mm',
+            },
+        },
+        'unwornSphere': {
+            'center': xyz(sphere['center']),
+            'radius': sphere['radius'],
+            'rawRadius': sphere['rawRadius'],
+            'commercialRadius': sphere['commercialRadius'],
+            'unit': 'mm',
+        },
+        'transitionPlane': {
+            'normal': xyz(plane['normal']),
+            'd': plane['d'],
+            'method': 'PCA (Principal Component Analysis)',
+            'unit': 'mm',
+        },
+        'zoneAreas': {
+            'worn': wear['wornArea'],
+            'unworn': wear['unwornArea'],
+            'unit': 'mm²',
+        },
+        'fittingDiagnostics': {
+            'method': fit['method'],
+            'iterations': fit['iterations'],
+            'rmsError': fit['rms_error'],
+            'inlierCount': fit['inliers'],
+            'totalPoints': total_points,
+            'inlierRatio': fit['inliers'] / total_points if total_points else None,
+            'residualStatistics': {
+                'min': float(residuals.min()) if len(residuals) else None,
+                'max': float(residuals.max()) if len(residuals) else None,
+                'mean': float(residuals.mean()) if len(residuals) else None,
+                'unit': 'mm',
+            },
+        },
+        'curvatureAnalysis': {
+            'method': 'Meyer et al. 2003 Gaussian Curvature',
+            'rimExclusion': True,
+            'combinedScoring': 'Curvature + Radial Deviation',
+        },
+        'inflectionPoints': {
+            'count': result['zones']['inflectionPoints'],
+            'visualized': None,  # 3D markers only exist in the browser viewer
+        },
+        'batch': {
+            'file': result['file'],
+            'options': result['options'],
+            'mesh': result['mesh'],
+            'zones': result['zones'],
+            'radiusWarning': sphere['radiusWarning'],
+            'transitionPlaneMethod': plane['method'],
+            'transitionPlanePoint': xyz(plane['point']),
+            'timingsMs': result['timings'],
+        },
+    }
+
+
+def write_result(result, directory, relative=None):
+    """
+    <stem>.csv and <stem>.json next to each other, in the subdirectory of `directory` given
+    by `relative` (the scan's path under its input directory); returns both paths.
+    """
+    relative = Path(relative or result['file'])
+    folder = directory / relative.parent
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = relative.name.rsplit('.', 1)[0]
+    csv_path = folder / f'{stem}.csv'
+    json_path = folder / f'{stem}.json'
+    csv_path.write_text(csv_text(result), encoding='utf-8')
+    json_path.write_text(json.dumps(json_document(result), indent=2, ensure_ascii=False), encoding='utf-8')
+    return csv_path, json_path
+
+
+SUMMARY_FIELDS = [
+    'file', 'status', 'volumetricWear', 'linearWearMean', 'linearWearMax', 'linearWearMin',
+    'radius', 'rawRadius', 'centerX', 'centerY', 'centerZ', 'fitMethod', 'rmsError',
+    'innerFaces', 'worn', 'unworn', 'seconds', 'error',
+]
+
+
+def summary_row(result=None, file=None, error=None, seconds=None):
+    """One row of summary.csv for a processed (or failed) file; `file` overrides the result's name."""
+    if result is None:
+        return {'file': file, 'status': 'error', 'error': error, 'seconds': seconds}
+    wear, sphere = result['wear'], result['unwornSphere']
+    return {
+        'file': file or result['file'],
+        'status': 'ok',
+        'volumetricWear': f"{wear['volumetricWear']:.6f}",
+        'linearWearMean': f"{wear['linearWearMean']:.6f}",
+        'linearWearMax': f"{wear['linearWearMax']:.6f}",
+        'linearWearMin': f"{wear['linearWearMin']:.6f}",
+        'radius': f"{sphere['radius']:g}",
+        'rawRadius': f"{sphere['rawRadius']:.6f}",
+        'centerX': f"{sphere['center'][0]:.6f}",
+        'centerY': f"{sphere['center'][1]:.6f}",
+        'centerZ': f"{sphere['center'][2]:.6f}",
+        'fitMethod': result['fit']['method'],
+        'rmsError': f"{result['fit']['rms_error']:.6f}",
+        'innerFaces': result['mesh']['innerFaces'],
+        'worn': result['zones']['worn'],
+        'unworn': result['zones']['unworn'],
+        'seconds': seconds,
+    }
+
+
+def write_summary(rows, path):
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        writer = csv.DictWriter(target, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
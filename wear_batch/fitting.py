@@ -0,0 +1,204 @@
+"""
+Sphere fitting for the batch engine (FittingService in index.html).
+
+Gauss-Newton with Levenberg-Marquardt damping, and RANSAC with the browser's sampling:
+the same mulberry32 generator, preemptive T(1,1) test, batched scoring on float32
+points and adaptive iteration bound, so a seeded fit draws the same samples as the
+browser and lands on the same consensus.
+"""
+import math
+import random as _random
+
+import numpy as np
+
+GN_MAX_ITERATIONS = 20
+GN_TOLERANCE = 1e-6
+RANSAC_THRESHOLD = 1.5  # mm, as fitSphereRANSAC
+RANSAC_MAX_ITERATIONS = 100
+RANSAC_CONFIDENCE = 0.99
+RANSAC_PREEMPTIVE = 1
+RANSAC_BATCH = 8
+
+
+class Mulberry32:
+    """FittingService.createRandom(seed): floats in [0, 1) bit-identical to the browser."""
+
+    def __init__(self, seed):
+        self.state = int(seed) & 0xFFFFFFFF
+
+    def __call__(self):
+        self.state = (self.state + 0x6D2B79F5) & 0xFFFFFFFF
+        t = self.state
+        t = _imul(t ^ (t >> 15), t | 1)
+        t ^= (t + _imul(t ^ (t >> 7), t | 61)) & 0xFFFFFFFF
+        return ((t ^ (t >> 14)) & 0xFFFFFFFF) / 4294967296
+
+
+def _imul(a, b):
+    return (a * b) & 0xFFFFFFFF
+
+
+def create_random(seed=None):
+    if seed is None or not math.isfinite(seed):
+        return _random.random
+    return Mulberry32(seed)
+
+
+def solve_4x4(matrix, rhs):
+    """Gaussian elimination with partial pivoting; None if a pivot is below 1e-10."""
+    aug = [list(row) + [rhs[i]] for i, row in enumerate(matrix)]
+    for i in range(4):
+        pivot = max(range(i, 4), key=lambda k: abs(aug[k][i]))  # First maximum, like the strict > scan
+        aug[i], aug[pivot] = aug[pivot], aug[i]
+        if abs(aug[i][i]) < 1e-10:
+            return None
+        for k in range(i + 1, 4):
+            factor = aug[k][i] / aug[i][i]
+            for j in range(i, 5):
+                aug[k][j] -= factor * aug[i][j]
+    solution = [0.0] * 4
+    for i in range(3, -1, -1):
+        solution[i] = aug[i][4]
+        for j in range(i + 1, 4):
+            solution[i] -= aug[i][j] * solution[j]
+        solution[i] /= aug[i][i]
+    return solution
+
+
+def fit_sphere_gauss_newton(points):
+    """Sphere through (n, 3) points. Returns center, radius, method, iterations, rms_error, residuals, inliers."""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    center = points.sum(axis=0) * (1.0 / n)
+    radius = float(np.sqrt(((points - center) ** 2).sum(axis=1)).sum() / n)
+
+    damping = 0.001
+    previous = math.inf
+    iterations = 0
+    for _ in range(GN_MAX_ITERATIONS):
+        iterations += 1
+        offset = points - center
+        dist = np.sqrt((offset * offset).sum(axis=1))
+        residual = dist - radius
+        safe = np.where(dist > 1e-10, dist, 1.0)
+        rows = np.empty((n, 4))
+        rows[:, :3] = np.where((dist > 1e-10)[:, None], -offset / safe[:, None], 0.0)
+        rows[:, 3] = -1.0
+
+        current = math.sqrt(float((residual * residual).sum()) / n)
+        if current < GN_TOLERANCE or abs(previous - current) < GN_TOLERANCE * 0.1:
+            break
+
+        normal = rows.T @ rows + np.eye(4) * damping
+        gradient = rows.T @ residual
+        delta = solve_4x4(normal.tolist(), (-gradient).tolist())
+        if delta is None:
+            damping *= 10
+            continue
+
+        new_radius = radius + delta[3]
+        if new_radius > 0:
+            center = center + np.array(delta[:3])
+            radius = new_radius
+            damping *= 0.1
+        else:
+            damping *= 10
+        previous = current
+
+    residuals = np.abs(np.sqrt(((points - center) ** 2).sum(axis=1)) - radius)
+    return {
+        'center': center,
+        'radius': float(radius),
+        'method': 'Gauss-Newton + LM',
+        'iterations': iterations,
+        'rms_error': math.sqrt(float((residuals * residuals).sum()) / n),
+        'residuals': residuals,
+        'inliers': n,
+    }
+
+
+def iteration_bound(inlier_ratio, sample_size, preemptive, confidence, max_iterations):
+    """FittingService.ransacIterationBound"""
+    if inlier_ratio <= 0:
+        return max_iterations
+    if inlier_ratio >= 1:
+        return 1
+    good = inlier_ratio ** (sample_size + preemptive)
+    if good <= 0:
+        return max_iterations
+    if good >= 1:
+        return 1
+    return min(max_iterations, math.ceil(math.log(1 - confidence) / math.log(1 - good)))
+
+
+def sphere_residuals(points32, center, radius):
+    """|‖p - c‖ - r| on float32 points, evaluated in double like the SoA scorer."""
+    offset = points32.astype(np.float64) - center
+    return np.abs(np.sqrt((offset * offset).sum(axis=-1)) - radius)
+
+
+def fit_sphere_ransac(points, seed=None):
+    """RANSAC consensus refined with Gauss-Newton on its inliers (fitSphereRANSAC)."""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    sample_size = min(20, int(n * 0.1))
+    random = create_random(seed)
+    points32 = points.astype(np.float32)
+
+    best_fit, best_count = None, 0
+    bound = RANSAC_MAX_ITERATIONS
+    iterations = rejected = scored = 0
+    batch = []
+
+    def flush():
+        nonlocal best_fit, best_count, bound, scored
+        if not batch:
+            return
+        scored += len(batch)
+        for fit in batch:
+            count = int((sphere_residuals(points32, fit['center'], fit['radius']) < RANSAC_THRESHOLD).sum())
+            if count > best_count:
+                best_count, best_fit = count, fit
+        batch.clear()
+        bound = iteration_bound(best_count / n, sample_size, RANSAC_PREEMPTIVE, RANSAC_CONFIDENCE, RANSAC_MAX_ITERATIONS)
+
+    while iterations < bound:
+        iterations += 1
+        sample, used = [], set()
+        while len(sample) < sample_size and len(used) < n:
+            index = math.floor(random() * n)
+            if index not in used:
+                sample.append(index)
+                used.add(index)
+        if len(sample) < 4:
+            continue
+
+        fit = fit_sphere_gauss_newton(points[sample])
+        passed = True
+        for _ in range(RANSAC_PREEMPTIVE):
+            index = math.floor(random() * n)
+            if not sphere_residuals(points32[index], fit['center'], fit['radius']) < RANSAC_THRESHOLD:
+                passed = False
+        if not passed:
+            rejected += 1
+            continue
+        batch.append(fit)
+        if len(batch) == RANSAC_BATCH:
+            flush()
+    flush()
+
+    inliers = np.zeros(n, dtype=bool)
+    if best_fit is not None:
+        inliers = sphere_residuals(points32, best_fit['center'], best_fit['radius']) < RANSAC_THRESHOLD
+    if inliers.sum() < sample_size:
+        print(f"[FIT] RANSAC found no consensus, falling back to Gauss-Newton on all {n} points")
+        return fit_sphere_gauss_newton(points)
+
+    refined = fit_sphere_gauss_newton(points[inliers])
+    refined['method'] = 'RANSAC + LM'
+    refined['inliers'] = int(inliers.sum())
+    refined['ransac'] = {
+        'iterations': iterations, 'rejected': rejected, 'scored': scored, 'seed': seed,
+        'inlier_ratio': best_count / n if n else 0,
+    }
+    return refined
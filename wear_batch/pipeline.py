@@ -0,0 +1,436 @@
+"""
+Headless wear analysis: the index.html pipeline as vectorized NumPy.
+
+    isolate → detect → fit → transition plane → wear
+
+Each step mirrors its browser counterpart (named in the docstrings) so that a file run
+here reports the same numbers as clicking through the UI with the same options.
+Coordinates are in the browser's frame: the mesh translated to its bounding-box center.
+"""
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .fitting import fit_sphere_gauss_newton, fit_sphere_ransac
+from .stl import prepare_geometry, read_triangles
+from .topology import largest_component, mark_vertices, neighbor_flags, weld_corners
+
+DETECTION_METHODS = ('dual-sphere', 'hemisphere')
+FITTING_METHODS = ('gauss-newton', 'ransac')
+COMMERCIAL_RADII = (14, 16, 18, 20)  # Available commercial radii for acetabular cups (mm)
+RIM_FRACTION = 0.15  # Inner vertices farthest from the centroid excluded as rim
+MIN_PURE_UNWORN = 100
+CLUSTER_MAX_ITERATIONS = 30
+HEMISPHERE_DIRECTIONS = np.array([
+    (1, 0, 0), (0, 1, 0), (0, 0, 1),
+    (1, 1, 0), (1, 0, 1), (0, 1, 1),
+    (1, 1, 1), (-1, 1, 0),
+], dtype=np.float64)
+HEMISPHERE_DIRECTIONS /= np.linalg.norm(HEMISPHERE_DIRECTIONS, axis=1)[:, None]
+
+
+def norm(vectors):
+    return np.sqrt((vectors * vectors).sum(axis=-1))
+
+
+def normalize(vectors):
+    """THREE.Vector3.normalize: v * (1 / (length || 1))"""
+    length = norm(vectors)
+    length = np.where(length == 0, 1.0, length)
+    return vectors * (1.0 / length)[..., None]
+
+
+def isolate_inner_surface(positions, normals, corner_vertex):
+    """
+    findInnerSurfaceFaces: faces whose normal points toward the mesh centroid
+    (dot > 0.5) within the third distance quartile, largest connected component.
+    """
+    points = positions.astype(np.float64)
+    centroid = points.sum(axis=0) / len(points)
+    dot, distance = face_metrics(points, normals, centroid)
+    q3 = np.sort(distance)[int(len(distance) * 0.75)]
+    candidates = (dot > 0.5) & (distance <= q3)
+    faces, component_count = largest_component(corner_vertex, candidates)
+    return faces, int(candidates.sum()), component_count
+
+
+def face_metrics(points, normals, center):
+    """PoolKernels.isolateFaceMetrics: normal · unit(center - face centroid) and that distance."""
+    faces = points.reshape(-1, 3, 3)
+    face_centroid = (faces[:, 0] + faces[:, 1] + faces[:, 2]) * (1 / 3)
+    toward = center - face_centroid
+    distance = norm(toward)
+    inverse = 1 / np.where(distance == 0, 1.0, distance)
+    face_normals = normals[0::3].astype(np.float64)
+    return (face_normals * (toward * inverse[:, None])).sum(axis=1), distance
+
+
+def reference_sphere(points):
+    """Centroid start plus 10 projection iterations (classifyWearZones step 3)."""
+    center = points.sum(axis=0) / len(points)
+    radius = norm(points - center).sum() / len(points)
+    for _ in range(10):
+        on_sphere = center + normalize(points - center) * radius
+        center = on_sphere.sum(axis=0) / len(points)
+        radius = norm(points - center).sum() / len(points)
+    return center, float(radius)
+
+
+def ray_convergence_center(origins, directions):
+    """Least-squares point closest to every ray: (Σ I - d⊗d) p = Σ (I - d⊗d) o"""
+    count = len(origins)
+    a = np.eye(3) * count - directions.T @ directions
+    b = origins.sum(axis=0) - directions.T @ (directions * origins).sum(axis=1)
+    try:
+        return np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        return np.linalg.lstsq(a, b, rcond=None)[0]
+
+
+def ray_distance(point, origins, directions):
+    offset = point - origins
+    along = (offset * directions).sum(axis=1)
+    return norm(offset - directions * along[:, None])
+
+
+def nearest_commercial_radius(radius):
+    """First commercial radius at the minimum distance (ties go to the smaller size)."""
+    best, best_diff = None, math.inf
+    for candidate in COMMERCIAL_RADII:
+        diff = abs(radius - candidate)
+        if diff < best_diff:
+            best, best_diff = candidate, diff
+    return best, best_diff
+
+
+def classify_dual_sphere(points, ray_normals, sphere_center, sphere_radius, commercial_radius):
+    """Ray-based least-squares clustering (dual-sphere branch of classifyWearZones)."""
+    normals = normalize(ray_normals)
+    to_center = normalize(sphere_center - points)
+    flip = (normals * to_center).sum(axis=1) < 0
+    directions = np.where(flip[:, None], -normals, normals)
+
+    penetration = sphere_radius - norm(points - sphere_center)
+    deepest = int(np.argmax(penetration)) if penetration.max() > 0 else 0
+    max_penetration = max(0.0, float(penetration.max()))
+    worn_direction = normalize(points[deepest] - sphere_center)
+    centers = [sphere_center.copy(), sphere_center + worn_direction * (max_penetration * 2)]
+
+    cluster = np.full(len(points), -1)
+    for _ in range(CLUSTER_MAX_ITERATIONS):
+        assigned = np.where(ray_distance(centers[0], points, directions) <=
+                            ray_distance(centers[1], points, directions), 0, 1)
+        changed = not np.array_equal(assigned, cluster)
+        cluster = assigned
+        for k in (0, 1):
+            members = cluster == k
+            if members.sum() > 10:
+                centers[k] = ray_convergence_center(points[members], directions[members])
+        if not changed:
+            break
+
+    if commercial_radius == 'auto':
+        target, _ = nearest_commercial_radius(sphere_radius)
+    else:
+        target = float(commercial_radius)
+
+    residuals = []
+    for k in (0, 1):
+        members = cluster == k
+        if not members.any():
+            residuals.append(math.inf)
+        else:
+            residuals.append(math.sqrt(float(((norm(points[members] - centers[k]) - target) ** 2).mean())))
+
+    if abs(residuals[0] - residuals[1]) > 0.5:
+        unworn = 0 if residuals[0] <= residuals[1] else 1
+    else:
+        unworn = 0 if norm(centers[0] - sphere_center) >= norm(centers[1] - sphere_center) else 1
+    return cluster != unworn, centers[1 - unworn]
+
+
+def classify_hemisphere(points, centroid):
+    """Axis-dispersion branch: the hemisphere farther from the centroid is worn."""
+    offset = points - centroid
+    distance = norm(offset)
+    best = None
+    max_asymmetry = 0.0
+    for direction in HEMISPHERE_DIRECTIONS:
+        positive = (offset @ direction) > 0
+        with np.errstate(invalid='ignore'):
+            positive_avg = distance[positive].mean() if positive.any() else math.nan
+            negative_avg = distance[~positive].mean() if (~positive).any() else math.nan
+        asymmetry = abs(positive_avg - negative_avg)
+        if asymmetry > max_asymmetry:
+            max_asymmetry = asymmetry
+            best = (direction, positive_avg > negative_avg)
+    if best is None:
+        raise ValueError('hemisphere detection found no asymmetric division axis')
+    direction, worn_is_positive = best
+    return ((offset @ direction) > 0) == worn_is_positive
+
+
+def detect_wear_zones(points, corners, normals, corner_vertex, inner_face_mask, vertex_count,
+                      detection_method, commercial_radius):
+    """
+    classifyWearZones + the boundary steps of the detect handler. Returns per inner vertex
+    masks (rim / worn / unworn) and the rim boundary positions for the transition plane.
+    """
+    count = len(points)
+    rim_centroid = points.sum(axis=0) / count
+    order = np.argsort(-norm(points - rim_centroid), kind='stable')
+    rim = np.zeros(count, dtype=bool)
+    rim[order[:int(count * RIM_FRACTION)]] = True
+
+    non_rim = np.flatnonzero(~rim)
+    sphere_center, sphere_radius = reference_sphere(points[non_rim])
+    worn = np.zeros(count, dtype=bool)
+    preliminary_worn_center = None
+    if detection_method == 'dual-sphere':
+        worn_non_rim, preliminary_worn_center = classify_dual_sphere(
+            points[non_rim], normals[corners[non_rim]].astype(np.float64),
+            sphere_center, sphere_radius, commercial_radius)
+    else:
+        worn_non_rim = classify_hemisphere(points[non_rim], sphere_center)
+    worn[non_rim[worn_non_rim]] = True
+    unworn = ~rim & ~worn
+
+    # Rim boundary: both sides of the rim / non-rim interface, non-rim side first
+    rim_flags = mark_vertices(corner_vertex, corners[rim], vertex_count)
+    non_rim_flags = mark_vertices(corner_vertex, corners[~rim], vertex_count)
+    touches_rim = neighbor_flags(corner_vertex, inner_face_mask, rim_flags)[corner_vertex[corners]]
+    touches_non_rim = neighbor_flags(corner_vertex, inner_face_mask, non_rim_flags)[corner_vertex[corners]]
+    boundary = np.concatenate([np.flatnonzero(~rim & touches_rim), np.flatnonzero(rim & touches_non_rim)])
+
+    # Inflection points (worn/unworn interface), reported for reference as in the JSON export
+    worn_flags = mark_vertices(corner_vertex, corners[worn], vertex_count)
+    other_flags = mark_vertices(corner_vertex, corners, vertex_count)
+    other_flags[corner_vertex[corners[worn]]] = False
+    other_flags[corner_vertex[corners[rim]]] = False
+    touches_worn = neighbor_flags(corner_vertex, inner_face_mask, worn_flags)[corner_vertex[corners]]
+    touches_other = neighbor_flags(corner_vertex, inner_face_mask, other_flags)[corner_vertex[corners]]
+    inflection_count = int((worn & touches_other).sum() + (unworn & touches_worn).sum())
+
+    return {
+        'rim': rim,
+        'worn': worn,
+        'unworn': unworn,
+        'touches_worn': touches_worn,
+        'boundary_points': points[boundary],
+        'inflection_count': inflection_count,
+        'reference_sphere': (sphere_center, sphere_radius),
+        'preliminary_worn_center': preliminary_worn_center,
+    }
+
+
+def fit_unworn_sphere(points, zones, fitting_method, ransac_seed):
+    """computeRawSurfaceFit (sphere): unworn vertices without worn neighbours, if enough."""
+    pure = zones['unworn'] & ~zones['touches_worn']
+    selected = points[pure] if pure.sum() >= MIN_PURE_UNWORN else points[zones['unworn']]
+    if fitting_method == 'ransac':
+        return fit_sphere_ransac(selected, seed=ransac_seed), selected
+    return fit_sphere_gauss_newton(selected), selected
+
+
+def constrain_radius(raw_radius, commercial_radius):
+    """computeSurfaceFit: commercial radius (auto = nearest) and the >1 mm warning."""
+    if commercial_radius == 'auto':
+        selected, diff = nearest_commercial_radius(raw_radius)
+        warning = (f'The fitted radius ({raw_radius:.2f} mm) differs from the nearest commercial size '
+                   f'({selected} mm) by {diff:.2f} mm.') if diff > 1.0 else None
+    else:
+        selected = float(commercial_radius)
+        diff = abs(raw_radius - selected)
+        warning = (f'The fitted radius ({raw_radius:.2f} mm) differs from the selected commercial size '
+                   f'({selected:g} mm) by {diff:.2f} mm.') if diff > 1.0 else None
+    return selected, warning
+
+
+def transition_plane(boundary_points, worn_points, center, radius):
+    """computeTransitionPlane: PCA plane through the rim boundary, normal toward the center."""
+    if len(boundary_points) < 3:
+        # Fallback: z-normal plane halfway between the sphere and the mean worn distance
+        avg_worn = norm(worn_points - center).mean() if len(worn_points) else radius * 0.9
+        normal = np.array([0.0, 0.0, 1.0])
+        point = center + normal * ((radius + avg_worn) / 2)
+        return {'normal': normal, 'point': point, 'd': float(normal @ point), 'method': 'fallback'}
+
+    centroid = boundary_points.sum(axis=0) / len(boundary_points)
+    offset = boundary_points - centroid
+    covariance = offset.T @ offset / len(boundary_points)
+    _, vectors = np.linalg.eigh(covariance)
+    normal = vectors[:, 0]  # Smallest eigenvalue = least-variance direction
+    if (center - centroid) @ normal < 0:
+        normal = -normal
+    return {'normal': normal, 'point': centroid, 'd': float(normal @ centroid), 'method': 'PCA'}
+
+
+def clip_below_plane(triangles, normal, d):
+    """
+    clipBelowPlane (worker-pool.js) for every triangle at once: the parts with n·x - d <= 0,
+    as (pieces, 3, 3). A triangle with two corners inside yields two pieces.
+    """
+    corners = triangles.reshape(-1, 3, 3)
+    dist = corners @ normal - d
+    inside = dist <= 0
+    inside_count = inside.sum(axis=1)
+    rows = np.arange(len(corners))
+
+    def intersect(rows, a, b):
+        # Lerp from the inside corner a to the outside corner b
+        da, db = dist[rows, a], dist[rows, b]
+        t = -da / (db - da)
+        pa, pb = corners[rows, a], corners[rows, b]
+        return pa + (pb - pa) * t[:, None]
+
+    pieces = [corners[inside_count == 3]]
+
+    two = rows[inside_count == 2]
+    out = np.argmin(inside[two], axis=1)
+    in1 = np.where(out == 0, 1, 0)
+    in2 = np.where(out == 2, 1, 2)
+    cut1, cut2 = intersect(two, in1, out), intersect(two, in2, out)
+    pieces.append(np.stack([corners[two, in1], cut1, cut2], axis=1))
+    pieces.append(np.stack([corners[two, in1], cut2, corners[two, in2]], axis=1))
+
+    one = rows[inside_count == 1]
+    keep = np.argmax(inside[one], axis=1)
+    out1 = np.where(keep == 0, 1, 0)
+    out2 = np.where(keep == 2, 1, 2)
+    pieces.append(np.stack([corners[one, keep], intersect(one, keep, out1), intersect(one, keep, out2)], axis=1))
+    return np.concatenate(pieces)
+
+
+def volumetric_wear(triangles, plane, center, radius):
+    """PoolKernels.volumetricWear: Σ mean positive penetration × area of the clipped pieces."""
+    pieces = clip_below_plane(triangles, plane['normal'], plane['d'])
+    penetration = (norm(pieces - center) - radius).sum(axis=1) / 3.0
+    positive = penetration > 0
+    kept = pieces[positive]
+    area = norm(np.cross(kept[:, 1] - kept[:, 0], kept[:, 2] - kept[:, 0])) / 2.0
+    return math.fsum(penetration[positive] * area), len(pieces), int(positive.sum())
+
+
+def linear_wear(worn_points, plane, center, radius):
+    """PoolKernels.linearWear: positive radial penetration of worn vertices inside the plane."""
+    side = worn_points @ plane['normal'] - plane['d']
+    penetration = norm(worn_points - center) - radius
+    selected = penetration[(side <= 0) & (penetration > 0)]
+    if len(selected) == 0:
+        return {'count': 0, 'mean': 0.0, 'max': 0.0, 'min': 0.0}
+    return {
+        'count': len(selected),
+        'mean': math.fsum(selected) / len(selected),
+        'max': float(selected.max()),
+        'min': float(selected.min()),
+    }
+
+
+def analyze_stl(path, detection_method='dual-sphere', fitting_method='gauss-newton',
+                ransac_seed=None, commercial_radius='auto'):
+    """
+    Run the full pipeline on one STL file. Options match the browser controls:
+    detection-method, fitting-method, ransac-seed and commercial-radius ('auto' or mm).
+    """
+    if detection_method not in DETECTION_METHODS:
+        raise ValueError(f'unknown detection method {detection_method!r}')
+    if fitting_method not in FITTING_METHODS:
+        raise ValueError(f'unknown fitting method {fitting_method!r}')
+    timings = {}
+    start = step = time.perf_counter()
+
+    def lap(name):
+        nonlocal step
+        now = time.perf_counter()
+        timings[name] = (now - step) * 1000
+        step = now
+
+    positions, normals, offset = prepare_geometry(read_triangles(path))
+    corner_vertex, vertex_count = weld_corners(positions)
+    face_count = len(positions) // 3
+    lap('load')
+
+    inner_faces, candidate_count, component_count = isolate_inner_surface(positions, normals, corner_vertex)
+    if len(inner_faces) == 0:
+        raise ValueError('no inner surface candidates (is this an acetabular liner?)')
+    inner_face_mask = np.zeros(face_count, dtype=bool)
+    inner_face_mask[inner_faces] = True
+    corners = (inner_faces.astype(np.int64)[:, None] * 3 + np.arange(3)).reshape(-1)
+    points = positions[corners].astype(np.float64)
+    lap('isolate')
+
+    zones = detect_wear_zones(points, corners, normals, corner_vertex, inner_face_mask, vertex_count,
+                              detection_method, commercial_radius)
+    lap('detect')
+
+    fit, fitted_points = fit_unworn_sphere(points, zones, fitting_method, ransac_seed)
+    radius, radius_warning = constrain_radius(fit['radius'], commercial_radius)
+    center = fit['center']
+    lap('fit')
+
+    worn_points = points[zones['worn']]
+    plane = transition_plane(zones['boundary_points'], worn_points, center, radius)
+    lap('plane')
+
+    volume, clipped, processed = volumetric_wear(points.reshape(-1, 9), plane, center, radius)
+    linear = linear_wear(worn_points, plane, center, radius)
+    lap('wear')
+    timings['total'] = (time.perf_counter() - start) * 1000
+
+    worn_count = int(zones['worn'].sum())
+    unworn_count = int(zones['unworn'].sum())
+    return {
+        'file': Path(path).name,
+        'options': {
+            'detectionMethod': detection_method,
+            'fittingMethod': fitting_method,
+            'ransacSeed': ransac_seed,
+            'commercialRadius': commercial_radius,
+        },
+        'mesh': {
+            'faces': face_count,
+            'weldedVertices': vertex_count,
+            'centeringOffset': offset.tolist(),
+            'candidateFaces': candidate_count,
+            'components': component_count,
+            'innerFaces': len(inner_faces),
+        },
+        'wear': {
+            'volumetricWear': max(0.0, volume),
+            'volumePlaneToSurface': volume,
+            'sphericalCapVolume': 0.0,
+            'linearWearMean': linear['mean'],
+            'linearWearMax': linear['max'],
+            'linearWearMin': linear['min'],
+            'filteredWornCount': linear['count'],
+            'clippedTriangles': clipped,
+            'processedTriangles': processed,
+            'wornArea': worn_count * 0.1,
+            'unwornArea': unworn_count * 0.1,
+        },
+        'unwornSphere': {
+            'center': center.tolist(),
+            'radius': radius,
+            'rawRadius': fit['radius'],
+            'commercialRadius': radius,
+            'radiusWarning': radius_warning,
+        },
+        'transitionPlane': {
+            'normal': plane['normal'].tolist(),
+            'd': plane['d'],
+            'point': plane['point'].tolist(),
+            'method': plane['method'],
+        },
+        'fit': fit,
+        'fitPoints': len(fitted_points),
+        'zones': {
+            'worn': worn_count,
+            'unworn': unworn_count,
+            'rim': int(zones['rim'].sum()),
+            'rimBoundaryPoints': len(zones['boundary_points']),
+            'inflectionPoints': zones['inflection_count'],
+        },
+        'timings': timings,
+    }
@@ -0,0 +1,104 @@
+"""
+STL input for the batch engine.
+
+Binary STL is memory-mapped as a structured array (no parsing loop, pages are read on
+demand); ASCII STL falls back to a text scan. The geometry is then prepared the way
+index.html does after loading: translated so the bounding-box center is the origin and
+given flat per-face normals (THREE.BufferGeometry.computeVertexNormals on a triangle soup),
+both stored as float32 like the browser's BufferAttributes.
+"""
+import re
+from pathlib import Path
+
+import numpy as np
+
+BINARY_FACE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('corners', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+HEADER_BYTES = 84
+
+VERTEX_LINE = re.compile(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)')
+
+
+def is_ascii_stl(path):
+    """Same test as the worker parser: 'solid' header unless the size matches the binary layout."""
+    path = Path(path)
+    size = path.stat().st_size
+    with open(path, 'rb') as source:
+        head = source.read(HEADER_BYTES)
+    if not head.startswith(b'solid'):
+        return False
+    if len(head) == HEADER_BYTES:
+        triangles = int.from_bytes(head[80:84], 'little')
+        if HEADER_BYTES + triangles * BINARY_FACE.itemsize == size:
+            return False
+    return True
+
+
+def read_triangles(path):
+    """Triangle corners as a float32 (faces, 9) array; a read-only memmap for binary files."""
+    path = Path(path)
+    if is_ascii_stl(path):
+        coords = VERTEX_LINE.findall(path.read_bytes())
+        if len(coords) % 3:
+            raise ValueError(f'{path.name}: ASCII STL with {len(coords)} vertices (not a multiple of 3)')
+        return np.array(coords, dtype=np.float64).astype(np.float32).reshape(-1, 9)
+
+    with open(path, 'rb') as source:
+        source.seek(80)
+        count = int.from_bytes(source.read(4), 'little')
+    if count == 0:
+        raise ValueError(f'{path.name}: empty STL')
+    faces = np.memmap(path, dtype=BINARY_FACE, mode='r', offset=HEADER_BYTES, shape=(count,))
+    return faces['corners'].reshape(count, 9)
+
+
+def prepare_geometry(triangles):
+    """
+    Centered float32 corner positions (faces * 3, 3) and flat per-corner normals, matching
+    geometry.translate(-center) and computeVertexNormals() in index.html.
+    """
+    corners = np.asarray(triangles, dtype=np.float32).reshape(-1, 3)
+    center = (corners.min(axis=0).astype(np.float64) + corners.max(axis=0).astype(np.float64)) * 0.5
+    positions = (corners.astype(np.float64) - center).astype(np.float32)
+
+    # cross(c - b, a - b) per face, stored as float32, then normalized (normalizeNormals)
+    p = positions.astype(np.float64).reshape(-1, 3, 3)
+    cross = np.cross(p[:, 2] - p[:, 1], p[:, 0] - p[:, 1]).astype(np.float32).astype(np.float64)
+    length = np.sqrt((cross * cross).sum(axis=1))
+    length[length == 0] = 1.0
+    face_normals = (cross * (1.0 / length)[:, None]).astype(np.float32)
+    normals = np.repeat(face_normals, 3, axis=0)
+    return positions, normals, center
+
+
+WRITE_CHUNK_FACES = 1 << 18
+ASCII_FACET = ('facet normal 0 0 0\n outer loop\n'
+               '  vertex %.9g %.9g %.9g\n  vertex %.9g %.9g %.9g\n  vertex %.9g %.9g %.9g\n'
+               ' endloop\nendfacet\n')
+
+
+def write_binary_stl(path, triangles, header=b'wear_batch'):
+    """Write (faces, 9) corners as binary STL with zero normals (readers recompute them)."""
+    triangles = np.asarray(triangles, dtype=np.float32).reshape(-1, 9)
+    with open(path, 'wb') as target:
+        target.write(header[:80].ljust(80, b' '))
+        target.write(len(triangles).to_bytes(4, 'little'))
+        for start in range(0, len(triangles), WRITE_CHUNK_FACES):
+            chunk = triangles[start:start + WRITE_CHUNK_FACES]
+            faces = np.zeros(len(chunk), dtype=BINARY_FACE)
+            faces['corners'] = chunk.reshape(-1, 3, 3)
+            faces.tofile(target)
+
+
+def write_ascii_stl(path, triangles, name='wear_batch'):
+    """Write (faces, 9) corners as ASCII STL; %.9g round-trips float32 exactly."""
+    triangles = np.asarray(triangles, dtype=np.float32).reshape(-1, 9)
+    with open(path, 'w', encoding='ascii') as target:
+        target.write(f'solid {name}\n')
+        for start in range(0, len(triangles), WRITE_CHUNK_FACES):
+            chunk = triangles[start:start + WRITE_CHUNK_FACES].astype(np.float64)
+            target.write((ASCII_FACET * len(chunk)) % tuple(chunk.reshape(-1).tolist()))
+        target.write(f'endsolid {name}\n')
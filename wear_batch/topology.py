@@ -0,0 +1,79 @@
+"""
+Mesh topology for the batch engine (MeshTopology in index.html, vectorized).
+
+Corners are welded on a 0.001 mm grid, faces are adjacent when they share a welded
+vertex, and neighbourhood queries run over the faces of a mask (the inner surface).
+"""
+import numpy as np
+
+WELD_PRECISION = 1000  # 0.001 mm weld grid, as MeshTopology.precision
+
+
+def weld_corners(positions, precision=WELD_PRECISION):
+    """Welded vertex id per corner and the vertex count (ids follow first appearance)."""
+    # Math.round rounds halves up; np.round would round them to even
+    keys = np.floor(positions.astype(np.float64) * precision + 0.5).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # Renumber so vertex ids are assigned in corner order like the JS hash table
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[inverse.reshape(-1)], len(first)
+
+
+def largest_component(corner_vertex, face_mask):
+    """
+    Faces (ascending) of the largest connected component among masked faces, and the
+    number of components. Ties go to the component holding the lowest face index, as
+    in the sequential flood fill.
+    """
+    face_count = len(face_mask)
+    faces = np.flatnonzero(face_mask)
+    if len(faces) == 0:
+        return faces.astype(np.uint32), 0
+
+    # Bipartite face/vertex graph; face nodes come first so every root is a face index
+    vertex_nodes = face_count + corner_vertex.reshape(-1, 3)[faces]
+    u = np.repeat(faces, 3)
+    v = vertex_nodes.reshape(-1)
+    parent = np.arange(face_count + int(corner_vertex.max()) + 1)
+
+    while True:
+        pu, pv = parent[u], parent[v]
+        low = np.minimum(pu, pv)
+        high = np.maximum(pu, pv)
+        pending = low != high
+        if not pending.any():
+            break
+        np.minimum.at(parent, high[pending], low[pending])
+        # Pointer jumping until every node points at its root
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    roots, counts = np.unique(parent[faces], return_counts=True)
+    best = roots[np.argmax(counts)]  # First maximum = lowest root face
+    return faces[parent[faces] == best].astype(np.uint32), len(roots)
+
+
+def neighbor_flags(corner_vertex, face_mask, flags):
+    """
+    Per welded vertex: True if a 1-ring neighbour through a masked face is flagged
+    (MeshTopology.hasFlaggedNeighbor for every vertex at once).
+    """
+    face_vertices = corner_vertex.reshape(-1, 3)[face_mask]
+    src = face_vertices[:, [0, 0, 1, 1, 2, 2]].reshape(-1)
+    dst = face_vertices[:, [1, 2, 0, 2, 0, 1]].reshape(-1)
+    hit = (src != dst) & flags[dst]
+    result = np.zeros(len(flags), dtype=bool)
+    result[src[hit]] = True
+    return result
+
+
+def mark_vertices(corner_vertex, corners, vertex_count):
+    """Per welded vertex flags from a list of corner indices (MeshTopology.markVertices)."""
+    flags = np.zeros(vertex_count, dtype=bool)
+    flags[corner_vertex[corners]] = True
+    return flags
@@ -0,0 +1,652 @@
+/**
+ * Worker Pool for face-range kernels
+ * Runs N copies of stl-processor-worker.js (N = navigator.hardwareConcurrency) over
+ * contiguous item ranges and merges the partial results on the main thread.
+ *
+ * - Geometry lives once in SharedArrayBuffers when the page is crossOriginIsolated
+ *   (server.py sends COOP/COEP); otherwise every block travels as a transferable copy.
+ * - Work is cut into fixed-size blocks that do not depend on the pool size, and results
+ *   come back in block order, so merges are bit-identical for any core count.
+ * - With no workers at all the same blocks run in-thread.
+ *
+ * Loaded by index.html (defer) and by the worker itself (importScripts) for PoolKernels.
+ */
+
+/**
+ * Kernels run over items [start, end). Buffers hold items from `base` onwards
+ * (base = 0 for shared buffers, base = start for transferred slices).
+ * Each returns { arrays: { name: TypedArray per item }, scalars: { name: number } }.
+ */
+const PoolKernels = {
+    /**
+     * Isolation Step 2: per face, normal · unit(centroid - center) and |center - centroid|.
+     * Mirrors the THREE.Vector3 arithmetic of the original loop so values match exactly.
+     */
+    isolateFaceMetrics(buffers, start, end, base, params) {
+        const { positions, normals } = buffers;
+        const { cx, cy, cz } = params;
+        const third = 1 / 3;
+        const dot = new Float64Array(end - start);
+        const distance = new Float64Array(end - start);
+
+        for (let f = start; f < end; f++) {
+            const i = (f - base) * 9;
+            const fx = (positions[i] + positions[i + 3] + positions[i + 6]) * third;
+            const fy = (positions[i + 1] + positions[i + 4] + positions[i + 7]) * third;
+            const fz = (positions[i + 2] + positions[i + 5] + positions[i + 8]) * third;
+
+            const tx = cx - fx, ty = cy - fy, tz = cz - fz;
+            const length = Math.sqrt(tx * tx + ty * ty + tz * tz);
+            const inv = 1 / (length || 1);
+
+            dot[f - start] = normals[i] * (tx * inv) + normals[i + 1] * (ty * inv) + normals[i + 2] * (tz * inv);
+            distance[f - start] = length;
+        }
+
+        return { arrays: { dot, distance } };
+    },
+
+    /**
+     * Deviation of points from the fitted surface: |‖p - c‖ - r| for a sphere,
+     * |‖(p - c) / radii‖ - 1| for an ellipsoid (params.rx/ry/rz set).
+     * Returns min/max, count within params.tolerance and a Neumaier sum of squares.
+     */
+    surfaceResiduals(buffers, start, end, base, params) {
+        const { points } = buffers;
+        const { cx, cy, cz, radius, rx, ry, rz, tolerance } = params;
+        const ellipsoid = rx !== undefined;
+        let min = Infinity, max = -Infinity, within = 0;
+        let sumSq = 0, compensation = 0;
+
+        for (let p = start; p < end; p++) {
+            const i = (p - base) * 3;
+            const dx = points[i] - cx;
+            const dy = points[i + 1] - cy;
+            const dz = points[i + 2] - cz;
+            let deviation;
+            if (ellipsoid) {
+                const tx = dx / rx, ty = dy / ry, tz = dz / rz;
+                deviation = Math.abs(Math.sqrt(tx * tx + ty * ty + tz * tz) - 1.0);
+            } else {
+                deviation = Math.abs(Math.sqrt(dx * dx + dy * dy + dz * dz) - radius);
+            }
+
+            if (deviation < min) min = deviation;
+            if (deviation > max) max = deviation;
+            if (deviation <= tolerance) within++;
+
+            const term = deviation * deviation;
+            const t = sumSq + term;
+            compensation += Math.abs(sumSq) >= Math.abs(term) ? (sumSq - t) + term : (term - t) + sumSq;
+            sumSq = t;
+        }
+
+        return { scalars: { min, max, within, sumSq, compensation } };
+    },
+
+    /**
+     * Volumetric wear over inner-surface triangles (9 coords each): clip every triangle
+     * against the transition plane (keep n·x - d <= 0), then integrate mean radial
+     * penetration × area over the sub-triangles with positive penetration.
+     * Arithmetic mirrors the THREE.Vector3 helpers it replaced (distanceToPlane,
+     * clipTriangleByPlane/findIntersection, triangleArea), with no per-triangle allocation.
+     * Returns the kept sub-triangles (wearTriangles, 9 per) with their mean penetration,
+     * a Neumaier partial of the volume and the clipped/processed counts.
+     */
+    volumetricWear(buffers, start, end, base, params) {
+        const { triangles } = buffers;
+        const { nx, ny, nz, d, cx, cy, cz } = params;
+        const count = end - start;
+        const wearTriangles = new Float64Array(count * 18);  // At most two sub-triangles per face
+        const wearPenetration = new Float64Array(count * 2);
+        const corners = new Float64Array(9);
+        const dist = new Float64Array(3);
+        const pieces = new Float64Array(18);
+        let processed = 0, clipped = 0;
+        let volume = 0, compensation = 0;
+
+        for (let f = start; f < end; f++) {
+            const i = (f - base) * 9;
+            for (let k = 0; k < 9; k++) corners[k] = triangles[i + k];
+            const pieceCount = clipBelowPlane(corners, pieces, dist, nx, ny, nz, d);
+            clipped += pieceCount;
+
+            for (let p = 0; p < pieceCount; p++) {
+                const o = p * 9;
+                const pen1 = acetabularPenetration(pieces[o] - cx, pieces[o + 1] - cy, pieces[o + 2] - cz, params);
+                const pen2 = acetabularPenetration(pieces[o + 3] - cx, pieces[o + 4] - cy, pieces[o + 5] - cz, params);
+                const pen3 = acetabularPenetration(pieces[o + 6] - cx, pieces[o + 7] - cy, pieces[o + 8] - cz, params);
+                const avgPenetration = (pen1 + pen2 + pen3) / 3.0;
+                if (avgPenetration <= 0) continue;
+
+                const contribution = avgPenetration * pieceArea(pieces, o);
+                const t = volume + contribution;
+                compensation += Math.abs(volume) >= Math.abs(contribution) ? (volume - t) + contribution : (contribution - t) + volume;
+                volume = t;
+
+                for (let k = 0; k < 9; k++) wearTriangles[processed * 9 + k] = pieces[o + k];
+                wearPenetration[processed] = avgPenetration;
+                processed++;
+            }
+        }
+
+        return {
+            arrays: {
+                wearTriangles: wearTriangles.slice(0, processed * 9),
+                wearPenetration: wearPenetration.slice(0, processed)
+            },
+            scalars: { volume, compensation, clipped, processed }
+        };
+    },
+
+    /**
+     * Linear wear over worn vertices: positive radial penetration of the points on the
+     * worn side of the transition plane. Returns count, Neumaier sum, min and the first max.
+     */
+    linearWear(buffers, start, end, base, params) {
+        const { points } = buffers;
+        const { nx, ny, nz, d, cx, cy, cz } = params;
+        let count = 0, sum = 0, compensation = 0;
+        let min = Infinity, max = 0, maxItem = -1;
+
+        for (let p = start; p < end; p++) {
+            const i = (p - base) * 3;
+            const x = points[i], y = points[i + 1], z = points[i + 2];
+            if (x * nx + y * ny + z * nz - d > 0) continue;
+
+            const penetration = acetabularPenetration(x - cx, y - cy, z - cz, params);
+            if (penetration <= 0) continue;
+
+            count++;
+            const t = sum + penetration;
+            compensation += Math.abs(sum) >= Math.abs(penetration) ? (sum - t) + penetration : (penetration - t) + sum;
+            sum = t;
+            if (penetration < min) min = penetration;
+            if (penetration > max) {
+                max = penetration;
+                maxItem = p;
+            }
+        }
+
+        return { scalars: { count, sum, compensation, min, max, maxItem } };
+    },
+
+    /**
+     * Commercial-radius sweep (sphere only): the volumetricWear and linearWear scalars for
+     * every radius in params.radii from one pass. Clipping, areas and center distances do
+     * not depend on the radius, so they are computed once; only the positive-penetration
+     * threshold differs per radius. Scalars carry the radius index as a suffix (volume0, ...).
+     */
+    volumetricWearSweep(buffers, start, end, base, params) {
+        const { triangles } = buffers;
+        const { nx, ny, nz, d, cx, cy, cz, radii } = params;
+        const corners = new Float64Array(9);
+        const dist = new Float64Array(3);
+        const pieces = new Float64Array(18);
+        const volume = new Float64Array(radii.length);
+        const compensation = new Float64Array(radii.length);
+        const processed = new Float64Array(radii.length);
+        let clipped = 0;
+
+        for (let f = start; f < end; f++) {
+            const i = (f - base) * 9;
+            for (let k = 0; k < 9; k++) corners[k] = triangles[i + k];
+            const pieceCount = clipBelowPlane(corners, pieces, dist, nx, ny, nz, d);
+            clipped += pieceCount;
+
+            for (let p = 0; p < pieceCount; p++) {
+                const o = p * 9;
+                // Same expressions as volumetricWear, so the current radius matches it bit for bit
+                let dx = pieces[o] - cx, dy = pieces[o + 1] - cy, dz = pieces[o + 2] - cz;
+                const dist1 = Math.sqrt(dx * dx + dy * dy + dz * dz);
+                dx = pieces[o + 3] - cx; dy = pieces[o + 4] - cy; dz = pieces[o + 5] - cz;
+                const dist2 = Math.sqrt(dx * dx + dy * dy + dz * dz);
+                dx = pieces[o + 6] - cx; dy = pieces[o + 7] - cy; dz = pieces[o + 8] - cz;
+                const dist3 = Math.sqrt(dx * dx + dy * dy + dz * dz);
+                let area = -1;
+                for (let r = 0; r < radii.length; r++) {
+                    const radius = radii[r];
+                    const avgPenetration = ((dist1 - radius) + (dist2 - radius) + (dist3 - radius)) / 3.0;
+                    if (avgPenetration <= 0) continue;
+                    if (area < 0) area = pieceArea(pieces, o);
+
+                    const contribution = avgPenetration * area;
+                    const t = volume[r] + contribution;
+                    compensation[r] += Math.abs(volume[r]) >= Math.abs(contribution) ? (volume[r] - t) + contribution : (contribution - t) + volume[r];
+                    volume[r] = t;
+                    processed[r]++;
+                }
+            }
+        }
+
+        const scalars = { clipped };
+        for (let r = 0; r < radii.length; r++) {
+            scalars[`volume${r}`] = volume[r];
+            scalars[`compensation${r}`] = compensation[r];
+            scalars[`processed${r}`] = processed[r];
+        }
+        return { scalars };
+    },
+
+    linearWearSweep(buffers, start, end, base, params) {
+        const { points } = buffers;
+        const { nx, ny, nz, d, cx, cy, cz, radii } = params;
+        const count = new Float64Array(radii.length);
+        const sum = new Float64Array(radii.length);
+        const compensation = new Float64Array(radii.length);
+        const min = new Float64Array(radii.length).fill(Infinity);
+        const max = new Float64Array(radii.length);
+        const maxItem = new Float64Array(radii.length).fill(-1);
+
+        for (let p = start; p < end; p++) {
+            const i = (p - base) * 3;
+            const x = points[i], y = points[i + 1], z = points[i + 2];
+            if (x * nx + y * ny + z * nz - d > 0) continue;
+
+            const dx = x - cx, dy = y - cy, dz = z - cz;
+            const distance = Math.sqrt(dx * dx + dy * dy + dz * dz);
+            for (let r = 0; r < radii.length; r++) {
+                const penetration = distance - radii[r];
+                if (penetration <= 0) continue;
+
+                count[r]++;
+                const t = sum[r] + penetration;
+                compensation[r] += Math.abs(sum[r]) >= Math.abs(penetration) ? (sum[r] - t) + penetration : (penetration - t) + sum[r];
+                sum[r] = t;
+                if (penetration < min[r]) min[r] = penetration;
+                if (penetration > max[r]) {
+                    max[r] = penetration;
+                    maxItem[r] = p;
+                }
+            }
+        }
+
+        const scalars = {};
+        for (let r = 0; r < radii.length; r++) {
+            Object.assign(scalars, {
+                [`count${r}`]: count[r], [`sum${r}`]: sum[r], [`compensation${r}`]: compensation[r],
+                [`min${r}`]: min[r], [`max${r}`]: max[r], [`maxItem${r}`]: maxItem[r]
+            });
+        }
+        return { scalars };
+    }
+};
+
+/**
+ * Clip triangle `corners` (9 coords) to the inner side of the plane n·x - d <= 0.
+ * Writes up to two sub-triangles into `pieces` (18 coords) and returns how many;
+ * `dist` is a 3-element scratch array for the corner distances.
+ */
+function clipBelowPlane(corners, pieces, dist, nx, ny, nz, d) {
+    dist[0] = corners[0] * nx + corners[1] * ny + corners[2] * nz - d;
+    dist[1] = corners[3] * nx + corners[4] * ny + corners[5] * nz - d;
+    dist[2] = corners[6] * nx + corners[7] * ny + corners[8] * nz - d;
+    const inside1 = dist[0] <= 0, inside2 = dist[1] <= 0, inside3 = dist[2] <= 0;
+    const insideCount = (inside1 ? 1 : 0) + (inside2 ? 1 : 0) + (inside3 ? 1 : 0);
+
+    if (insideCount === 3) {
+        copyCorner(pieces, 0, corners, 0); copyCorner(pieces, 3, corners, 1); copyCorner(pieces, 6, corners, 2);
+        return 1;
+    }
+    if (insideCount === 2) {
+        // Quadrilateral split into (in1, int1, int2) and (in1, int2, in2)
+        const out = !inside1 ? 0 : !inside2 ? 1 : 2;
+        const in1 = out === 0 ? 1 : 0;
+        const in2 = out === 2 ? 1 : 2;
+        copyCorner(pieces, 0, corners, in1);
+        intersectEdge(pieces, 3, corners, in1, out, dist[in1], dist[out]);
+        intersectEdge(pieces, 6, corners, in2, out, dist[in2], dist[out]);
+        copyCorner(pieces, 9, corners, in1);
+        pieces[12] = pieces[6]; pieces[13] = pieces[7]; pieces[14] = pieces[8];
+        copyCorner(pieces, 15, corners, in2);
+        return 2;
+    }
+    if (insideCount === 1) {
+        const inside = inside1 ? 0 : inside2 ? 1 : 2;
+        const out1 = inside === 0 ? 1 : 0;
+        const out2 = inside === 2 ? 1 : 2;
+        copyCorner(pieces, 0, corners, inside);
+        intersectEdge(pieces, 3, corners, inside, out1, dist[inside], dist[out1]);
+        intersectEdge(pieces, 6, corners, inside, out2, dist[inside], dist[out2]);
+        return 1;
+    }
+    return 0;
+}
+
+function copyCorner(pieces, o, corners, a) {
+    pieces[o] = corners[a * 3];
+    pieces[o + 1] = corners[a * 3 + 1];
+    pieces[o + 2] = corners[a * 3 + 2];
+}
+
+// Edge/plane intersection: lerp from the inside corner a to the outside corner b
+function intersectEdge(pieces, o, corners, a, b, da, db) {
+    const t = -da / (db - da);
+    pieces[o] = corners[a * 3] + (corners[b * 3] - corners[a * 3]) * t;
+    pieces[o + 1] = corners[a * 3 + 1] + (corners[b * 3 + 1] - corners[a * 3 + 1]) * t;
+    pieces[o + 2] = corners[a * 3 + 2] + (corners[b * 3 + 2] - corners[a * 3 + 2]) * t;
+}
+
+// Area of sub-triangle o (9 coords) in `pieces`
+function pieceArea(pieces, o) {
+    const ax = pieces[o + 3] - pieces[o], ay = pieces[o + 4] - pieces[o + 1], az = pieces[o + 5] - pieces[o + 2];
+    const bx = pieces[o + 6] - pieces[o], by = pieces[o + 7] - pieces[o + 1], bz = pieces[o + 8] - pieces[o + 2];
+    const crossX = ay * bz - az * by;
+    const crossY = az * bx - ax * bz;
+    const crossZ = ax * by - ay * bx;
+    return Math.sqrt(crossX * crossX + crossY * crossY + crossZ * crossZ) / 2.0;
+}
+
+/**
+ * Radial penetration of an acetabular surface point (offset dx/dy/dz from the center):
+ * positive = farther out than the reference sphere/ellipsoid (worn).
+ */
+function acetabularPenetration(dx, dy, dz, params) {
+    const dist = Math.sqrt(dx * dx + dy * dy + dz * dz);
+    const { rx, ry, rz } = params;
+    if (rx === undefined) {
+        return dist - params.radius;
+    }
+    if (dist < 1e-10) {
+        return -((rx + ry + rz) / 3);
+    }
+    const f = Math.sqrt((dx * dx) / (rx * rx) + (dy * dy) / (ry * ry) + (dz * dz) / (rz * rz));
+    return -(dist / f - dist);
+}
+
+class WorkerPool {
+    static BLOCK_SIZE = 65536;  // Items per task; fixed so partials never depend on the pool size
+    static MAX_WORKERS = 16;
+
+    static defaultSize() {
+        const cores = (typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 4;
+        return Math.max(1, Math.min(cores, WorkerPool.MAX_WORKERS));
+    }
+
+    /**
+     * SharedArrayBuffer is only usable on crossOriginIsolated pages (COOP + COEP headers)
+     */
+    static sharedMemoryAvailable() {
+        return typeof SharedArrayBuffer !== 'undefined' && globalThis.crossOriginIsolated === true;
+    }
+
+    /**
+     * Merge Neumaier partials ({sum, compensation} per block) in block order
+     */
+    static mergeSums(partials, sumKey = 'sumSq', compensationKey = 'compensation') {
+        let sum = 0, compensation = 0;
+        for (const partial of partials) {
+            const value = partial[sumKey];
+            const t = sum + value;
+            compensation += Math.abs(sum) >= Math.abs(value) ? (sum - t) + value : (value - t) + sum;
+            sum = t;
+            compensation += partial[compensationKey];
+        }
+        return sum + compensation;
+    }
+
+    constructor(scriptUrl = 'stl-processor-worker.js', size = WorkerPool.defaultSize()) {
+        this.scriptUrl = scriptUrl;
+        this.size = typeof Worker === 'undefined' ? 0 : size;
+        this.shared = WorkerPool.sharedMemoryAvailable();
+        this.workers = [];      // { worker, busy }
+        this.buffers = new Map();  // name -> { source, array, shared }
+        this.queue = [];
+        this.pending = new Map();  // task id -> task
+        this.nextTaskId = 1;
+        this.tasksCompleted = 0;
+    }
+
+    get mode() {
+        if (this.size === 0) return 'main thread';
+        return this.shared ? 'SharedArrayBuffer' : 'transferables';
+    }
+
+    getStats() {
+        return {
+            size: this.size,
+            spawned: this.workers.length,
+            mode: this.mode,
+            busy: this.workers.filter(w => w.busy).length,
+            queued: this.queue.length,
+            tasksCompleted: this.tasksCompleted,
+            sharedBytes: [...this.buffers.values()]
+                .reduce((sum, b) => sum + (b.shared ? b.array.byteLength : 0), 0)
+        };
+    }
+
+    /**
+     * Workers are spawned on first use so page load does not pay for them
+     */
+    ensureWorkers() {
+        while (this.workers.length < this.size) {
+            let worker;
+            try {
+                worker = new Worker(this.scriptUrl);
+            } catch (error) {
+                console.warn('⚠️  Worker pool: could not spawn worker, running kernels in-thread:', error);
+                this.size = this.workers.length;
+                break;
+            }
+            const slot = { worker, busy: false };
+            worker.onmessage = (event) => this.handleMessage(slot, event.data);
+            worker.onerror = (event) => this.handleError(slot, event);
+            // Own trace thread per worker (the single STL worker keeps tid 2)
+            worker.postMessage({ type: 'traceInit', payload: { tid: 100 + this.workers.length, threadName: `pool worker ${this.workers.length}` } });
+            this.workers.push(slot);
+            for (const [name, entry] of this.buffers) {
+                if (entry.shared) this.postAttach(slot, name, entry.array);
+            }
+        }
+    }
+
+    /**
+     * Register a typed array for kernels under `name`. In shared mode it is copied once
+     * into a SharedArrayBuffer visible to every worker; re-sharing the same array is a no-op.
+     */
+    share(name, array) {
+        const existing = this.buffers.get(name);
+        if (existing && existing.source === array) return existing.array;
+
+        if (!this.shared || this.size === 0) {
+            this.buffers.set(name, { source: array, array, shared: false });
+            return array;
+        }
+
+        let sharedArray = array;
+        if (!(array.buffer instanceof SharedArrayBuffer)) {
+            sharedArray = new array.constructor(new SharedArrayBuffer(array.byteLength));
+            sharedArray.set(array);
+        }
+        this.buffers.set(name, { source: array, array: sharedArray, shared: true });
+        for (const slot of this.workers) {
+            this.postAttach(slot, name, sharedArray);
+        }
+        return sharedArray;
+    }
+
+    postAttach(slot, name, array) {
+        slot.worker.postMessage({
+            type: 'attachBuffer',
+            payload: { name, buffer: array.buffer, arrayType: array.constructor.name }
+        });
+    }
+
+    /**
+     * Drop shared geometry (new file loaded / cleanup)
+     */
+    release() {
+        this.buffers.clear();
+        for (const slot of this.workers) {
+            slot.worker.postMessage({ type: 'releaseBuffers' });
+        }
+    }
+
+    /**
+     * Run `kernel` over `count` items.
+     * options.buffers: { name: itemStride } for arrays registered with share()
+     * options.params: plain object passed to every block
+     * options.onProgress(itemsDone, count)
+     * Resolves with { arrays: per-item arrays concatenated in item order, partials: scalars per block in block order }
+     */
+    run(kernel, count, options = {}) {
+        const { buffers = {}, params = {}, onProgress = null, blockSize = WorkerPool.BLOCK_SIZE } = options;
+        const blockCount = Math.ceil(count / blockSize);
+        const results = new Array(blockCount);
+
+        if (!PoolKernels[kernel]) {
+            return Promise.reject(new Error(`Unknown kernel: ${kernel}`));
+        }
+        if (count === 0) {
+            return Promise.resolve({ arrays: {}, partials: [] });
+        }
+
+        if (this.size > 0) this.ensureWorkers();
+        const trace = globalThis.traceRecorder;
+        const span = trace?.begin(`pool:${kernel}`, { count, blocks: blockCount, mode: this.size === 0 ? 'local' : this.mode }, 'kernel');
+        if (this.size === 0) {
+            const local = this.runLocal(kernel, count, buffers, params, onProgress, blockSize);
+            return trace ? local.finally(() => trace.end(span)) : local;
+        }
+
+        const pooled = new Promise((resolve, reject) => {
+            const job = { remaining: blockCount, done: 0, failed: false, reject };
+            for (let b = 0; b < blockCount; b++) {
+                const start = b * blockSize;
+                const end = Math.min(count, start + blockSize);
+                this.queue.push({
+                    id: this.nextTaskId++,
+                    kernel, start, end, params, buffers, job,
+                    resolve: (data) => {
+                        results[b] = data;
+                        job.done += end - start;
+                        if (onProgress) onProgress(job.done, count);
+                        if (--job.remaining === 0) resolve(this.mergeResults(results));
+                    }
+                });
+            }
+            this.dispatch();
+        });
+        return trace ? pooled.finally(() => trace.end(span)) : pooled;
+    }
+
+    async runLocal(kernel, count, buffers, params, onProgress, blockSize) {
+        const views = {};
+        for (const name of Object.keys(buffers)) {
+            views[name] = this.buffers.get(name).array;
+        }
+        const results = [];
+        for (let start = 0; start < count; start += blockSize) {
+            const end = Math.min(count, start + blockSize);
+            const block = () => PoolKernels[kernel](views, start, end, 0, params);
+            results.push(globalThis.traceRecorder ? globalThis.traceRecorder.span(`kernel:${kernel}`, block, { start, end }, 'kernel') : block());
+            if (onProgress) {
+                onProgress(end, count);
+                await new Promise(resolve => setTimeout(resolve, 0));
+            }
+        }
+        return this.mergeResults(results);
+    }
+
+    dispatch() {
+        for (const slot of this.workers) {
+            if (slot.busy) continue;
+            let task = this.queue.shift();
+            while (task && task.job.failed) task = this.queue.shift();
+            if (!task) return;
+            slot.busy = true;
+            slot.task = task;
+            this.pending.set(task.id, task);
+
+            const payload = { id: task.id, kernel: task.kernel, start: task.start, end: task.end, base: 0, params: task.params };
+            const transfer = [];
+            const slices = {};
+            let sliced = false;
+            for (const [name, stride] of Object.entries(task.buffers)) {
+                const entry = this.buffers.get(name);
+                if (entry.shared) continue;
+                const slice = entry.array.slice(task.start * stride, task.end * stride);
+                slices[name] = slice;
+                transfer.push(slice.buffer);
+                sliced = true;
+            }
+            if (sliced) {
+                payload.buffers = slices;
+                payload.base = task.start;
+            }
+            slot.worker.postMessage({ type: 'runKernel', payload }, transfer);
+        }
+    }
+
+    handleMessage(slot, message) {
+        if (message.trace) globalThis.traceRecorder?.addEvents(message.trace);
+        if (message.type !== 'runKernel') return;
+        const task = this.pending.get(message.id);
+        slot.busy = false;
+        slot.task = null;
+        if (task) {
+            this.pending.delete(message.id);
+            if (message.error) {
+                this.failJob(task.job, new Error(message.error));
+            } else if (!task.job.failed) {
+                this.tasksCompleted++;
+                task.resolve(message.data);
+            }
+        }
+        this.dispatch();
+    }
+
+    handleError(slot, event) {
+        const task = slot.task;
+        slot.busy = false;
+        slot.task = null;
+        if (task) {
+            this.pending.delete(task.id);
+            this.failJob(task.job, new Error(event.message || 'Worker pool task failed'));
+        }
+        this.dispatch();
+    }
+
+    failJob(job, error) {
+        if (job.failed) return;
+        job.failed = true;
+        job.reject(error);
+    }
+
+    /**
+     * Concatenate per-item arrays and collect scalar partials, both in block order
+     */
+    mergeResults(results) {
+        const arrays = {};
+        const partials = [];
+        for (const result of results) {
+            if (result.scalars) partials.push(result.scalars);
+            for (const [name, array] of Object.entries(result.arrays || {})) {
+                (arrays[name] = arrays[name] || []).push(array);
+            }
+        }
+        for (const [name, parts] of Object.entries(arrays)) {
+            const merged = new parts[0].constructor(parts.reduce((sum, part) => sum + part.length, 0));
+            let offset = 0;
+            for (const part of parts) {
+                merged.set(part, offset);
+                offset += part.length;
+            }
+            arrays[name] = merged;
+        }
+        return { arrays, partials };
+    }
+
+    terminate() {
+        for (const slot of this.workers) {
+            slot.worker.terminate();
+        }
+        this.workers = [];
+        this.queue = [];
+        this.pending.clear();
+    }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { WorkerPool, PoolKernels };
+}